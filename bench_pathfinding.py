@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Siedler AI - Benchmark für die Pfadsuche
+
+Misst Knoten/Sekunde und ms/Abfrage von A* und JPS (GridSearch) auf dem
+754x747 Spieler-1-Grid mit zufälligen Start/Ziel-Paaren.
+
+    python bench_pathfinding.py --queries 200 --seed 0
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from pathfinding import MapManager
+
+
+def _random_queries(manager: MapManager, n_queries: int, seed: int):
+    """Zufällige Paare begehbarer Zellen (als lokale Koordinaten)."""
+    rng = np.random.default_rng(seed)
+    free_y, free_x = np.nonzero(manager.grid.get_walkable_grid())
+    picks = rng.integers(len(free_x), size=(n_queries, 2))
+    return [((free_x[a] + 0.5) * 33.5, (free_y[a] + 0.5) * 33.8,
+             (free_x[b] + 0.5) * 33.5, (free_y[b] + 0.5) * 33.8) for a, b in picks]
+
+
+def benchmark(n_queries: int = 200, seed: int = 0) -> dict:
+    """Knoten/Sekunde und Latenz pro Modus (astar, jps)."""
+    manager = MapManager()
+    manager.load_from_files()
+    queries = _random_queries(manager, n_queries, seed)
+    pathfinder = manager.pathfinder
+
+    results = {}
+    distances = {}
+    for mode in ("astar", "jps"):
+        pathfinder.use_jps = mode == "jps"
+        engine = pathfinder.engine
+        engine.total_nodes_expanded = 0
+
+        start = time.perf_counter()
+        distances[mode] = [pathfinder.get_path_distance((sx, sy), (gx, gy))
+                           for sx, sy, gx, gy in queries]
+        elapsed = time.perf_counter() - start
+
+        results[mode] = {
+            "ms_per_query": elapsed / n_queries * 1000,
+            "nodes_expanded": engine.total_nodes_expanded,
+            "nodes_per_sec": engine.total_nodes_expanded / max(elapsed, 1e-9),
+        }
+
+    results["distances_equal"] = distances["astar"] == distances["jps"]
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="A*/JPS Benchmark")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    res = benchmark(args.queries, args.seed)
+    print("=" * 60)
+    print("PATHFINDING BENCHMARK")
+    print("=" * 60)
+    for mode in ("astar", "jps"):
+        r = res[mode]
+        print(f"  {mode:6s} {r['ms_per_query']:8.2f} ms/Abfrage  "
+              f"{r['nodes_per_sec']:12,.0f} Knoten/s  ({r['nodes_expanded']:,} expandiert)")
+    print(f"  Distanzen identisch: {res['distances_equal']}")
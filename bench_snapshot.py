@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Siedler AI - Benchmark für snapshot()/restore()
+
+Misst Latenz und Speicher pro Snapshot im Vergleich zu copy.deepcopy(env).
+
+    python bench_snapshot.py --warmup-steps 300 --repeats 200
+"""
+
+import argparse
+import copy
+import time
+import tracemalloc
+
+import numpy as np
+
+from environment import SiedlerScharfschuetzenEnv
+
+
+def _play(env, n_steps: int, seed: int = 0):
+    """Spielt n_steps zufällige gültige Aktionen (für einen realistischen Zustand)."""
+    rng = np.random.default_rng(seed)
+    for _ in range(n_steps):
+        action = int(rng.choice(np.flatnonzero(env.action_masks())))
+        _, _, terminated, _, _ = env.step(action)
+        if terminated:
+            env.reset()
+
+
+def _time_ms(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def _memory_kb(fn) -> float:
+    """Netto-Speicher den das Ergebnis von fn() belegt."""
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1024
+
+
+def benchmark(warmup_steps: int = 300, repeats: int = 200, seed: int = 0) -> dict:
+    """Latenz (ms) und Speicher (KB) von snapshot/restore vs. deepcopy."""
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=seed)
+    _play(env, warmup_steps, seed)
+
+    snap = env.snapshot()
+    results = {
+        "snapshot_ms": _time_ms(env.snapshot, repeats),
+        "restore_ms": _time_ms(lambda: env.restore(snap), repeats),
+        "deepcopy_ms": _time_ms(lambda: copy.deepcopy(env), max(1, repeats // 10)),
+        "snapshot_kb": _memory_kb(env.snapshot),
+        "deepcopy_kb": _memory_kb(lambda: copy.deepcopy(env)),
+    }
+    results["speedup"] = results["deepcopy_ms"] / max(results["snapshot_ms"], 1e-9)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="snapshot()/restore() Benchmark")
+    parser.add_argument("--warmup-steps", type=int, default=300)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    res = benchmark(args.warmup_steps, args.repeats, args.seed)
+    print("=" * 60)
+    print("SNAPSHOT/RESTORE BENCHMARK")
+    print("=" * 60)
+    print(f"  snapshot():     {res['snapshot_ms']:.3f} ms  ({res['snapshot_kb']:.0f} KB)")
+    print(f"  restore():      {res['restore_ms']:.3f} ms")
+    print(f"  deepcopy(env):  {res['deepcopy_ms']:.3f} ms  ({res['deepcopy_kb']:.0f} KB)")
+    print(f"  Speedup:        {res['speedup']:.1f}x")
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+Siedler AI - Benchmark-Suite für die Simulator-Hot-Paths
+
+Misst in einem Lauf:
+- reset()-Latenz
+- Steps/Sekunde mit zufälligen gültigen Aktionen
+- get_action_mask() / action_masks() nach jedem Schritt
+- _get_observation() (voll neu geschrieben und aus dem Puffer)
+- _tick_time() aufgeteilt nach Subsystem (Messpunkte aus perf_stats.py)
+- A*-Abfragen vom HQ zu Bäumen und Vorkommen
+- can_build_at() und find_valid_building_positions()
+
+Die Ergebnisse sind eine flache Zuordnung Metrik -> Wert. Metriken auf
+"_per_sec" sind besser wenn größer, alle anderen (Latenzen) wenn kleiner.
+Mit --baseline werden sie gegen eine gespeicherte Datei verglichen;
+Verschlechterungen über --tolerance werden als Regression gemeldet.
+
+    python bench_suite.py --json bench_results.json
+    python bench_suite.py --save-baseline bench_baseline.json
+    python bench_suite.py --baseline bench_baseline.json --fail-on-regression
+    python bench_suite.py --only reset,steps
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from environment import SiedlerScharfschuetzenEnv
+from pathfinding import SCALE_X, SCALE_Y
+
+
+# =============================================================================
+# HILFSFUNKTIONEN
+# =============================================================================
+
+def _play(env: SiedlerScharfschuetzenEnv, n_steps: int, rng: np.random.Generator,
+          on_step: Optional[Callable[[], None]] = None):
+    """Spielt n_steps zufällige gültige Aktionen (mit Reset bei Episodenende)."""
+    for _ in range(n_steps):
+        action = int(rng.choice(np.flatnonzero(env.action_masks())))
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+        if on_step is not None:
+            on_step()
+
+
+def _warm_env(warmup_steps: int, seed: int) -> SiedlerScharfschuetzenEnv:
+    """Env in einem Zustand mitten in der Episode (Gebäude, Queues, Worker)."""
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=seed)
+    _play(env, warmup_steps, np.random.default_rng(seed))
+    return env
+
+
+def _hq_door(env: SiedlerScharfschuetzenEnv) -> tuple:
+    """Nächste begehbare Zelle am HQ als Welt-Position.
+
+    Die HQ-Mitte ist blockiert und liegt weiter als SNAP_RADIUS vom Rand,
+    daher mit größerem Suchradius.
+    """
+    manager = env.map_manager
+    cell = manager._resolve_cell(env.hq_position[0], env.hq_position[1], 16)
+    return manager.to_world_coords((cell.x + 0.5) * SCALE_X, (cell.y + 0.5) * SCALE_Y)
+
+
+def _route_targets(env: SiedlerScharfschuetzenEnv, n_routes: int) -> List[tuple]:
+    """Repräsentative Ziele vom HQ aus: Bäume der Holz-Zonen und Vorkommen."""
+    trees = env.tree_table.trees
+    targets = [(float(trees["x"][row]), float(trees["y"][row]))
+               for rows in env._tree_layout.zone_rows for row in rows[:3]]
+    for cat_data in env.deposit_categories.values():
+        targets.extend((d["x"], d["y"]) for d in cat_data["deposits"][:3])
+    return targets[:n_routes]
+
+
+# =============================================================================
+# BENCHMARKS (jeweils Metrik -> Wert)
+# =============================================================================
+
+def bench_reset(repeats: int = 200, seed: int = 0) -> Dict[str, float]:
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=seed)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        env.reset()
+    return {"reset_ms": (time.perf_counter() - start) / repeats * 1000}
+
+
+def bench_steps(n_steps: int = 5000, seed: int = 0) -> Dict[str, float]:
+    """Steps/s inkl. Maskenabfrage pro Schritt (wie beim Training)."""
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=seed)
+    start = time.perf_counter()
+    _play(env, n_steps, np.random.default_rng(seed))
+    return {"steps_per_sec": n_steps / (time.perf_counter() - start)}
+
+
+def bench_masks(n_steps: int = 1000, warmup_steps: int = 300, seed: int = 0) -> Dict[str, float]:
+    """Latenz der ersten Maskenabfrage nach jedem Schritt (Cache bereits invalidiert)."""
+    env = _warm_env(warmup_steps, seed)
+    totals = {"action_masks": 0.0, "get_action_mask": 0.0}
+
+    def measure():
+        start = time.perf_counter()
+        env.get_action_mask()
+        totals["get_action_mask"] += time.perf_counter() - start
+        start = time.perf_counter()
+        env.action_masks()
+        totals["action_masks"] += time.perf_counter() - start
+
+    _play(env, n_steps, np.random.default_rng(seed + 1), on_step=measure)
+    return {"get_action_mask_us": totals["get_action_mask"] / n_steps * 1e6,
+            "action_masks_us": totals["action_masks"] / n_steps * 1e6}
+
+
+def bench_observation(repeats: int = 2000, warmup_steps: int = 300, seed: int = 0) -> Dict[str, float]:
+    """_get_observation(): komplett neu geschrieben vs. unveränderter Zustand."""
+    env = _warm_env(warmup_steps, seed)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        env._invalidate_obs_cache()
+        env._get_observation()
+    full = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        env._get_observation()
+    cached = (time.perf_counter() - start) / repeats
+    return {"observation_full_us": full * 1e6, "observation_cached_us": cached * 1e6}
+
+
+def bench_tick(n_ticks: int = 500, rounds: int = 5, warmup_steps: int = 300, seed: int = 0) -> Dict[str, float]:
+    """_tick_time() pro Tick, aufgeteilt nach den Messpunkten aus perf_stats (ab demselben Snapshot)."""
+    env = _warm_env(warmup_steps, seed)
+    snap = env.snapshot()
+    env.enable_perf_stats()
+    for _ in range(rounds):
+        env.restore(snap)
+        for _ in range(n_ticks):
+            env._tick_time()
+    timers = env.perf_stats()["timers"]
+    ticks = n_ticks * rounds
+    result = {}
+    for name, timer in timers.items():
+        if name == "tick" or name.startswith("tick.") or name.endswith(".tick"):
+            key = "total" if name == "tick" else name.replace("tick.", "").replace(".tick", "")
+            result[f"tick_{key}_us"] = timer["total_ms"] * 1000 / ticks
+    result["ticks_per_sec"] = ticks / (timers["tick"]["total_ms"] / 1000)
+    return result
+
+
+def bench_astar(n_routes: int = 40, repeats: int = 3, seed: int = 0) -> Dict[str, float]:
+    """A* (find_path) vom HQ zu Bäumen und Vorkommen."""
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=seed)
+    manager = env.map_manager
+    targets = _route_targets(env, n_routes)
+    engine = manager.pathfinder.engine
+    door = _hq_door(env)
+    engine.total_nodes_expanded = 0
+    found = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for target in targets:
+            found += manager.find_path(door, target).found
+    elapsed = time.perf_counter() - start
+    queries = len(targets) * repeats
+    return {"astar_queries_per_sec": queries / elapsed,
+            "astar_nodes_per_sec": engine.total_nodes_expanded / elapsed,
+            "astar_found_ratio": found / max(queries, 1)}
+
+
+def bench_building_positions(n_checks: int = 5000, n_searches: int = 20, seed: int = 0) -> Dict[str, float]:
+    """can_build_at() an zufälligen Punkten um das HQ und Bauplatzsuche ab dem HQ."""
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=seed)
+    manager = env.map_manager
+    hq_x, hq_y = env.hq_position
+    rng = np.random.default_rng(seed)
+    points = np.column_stack([hq_x + rng.uniform(-6000, 6000, n_checks),
+                              hq_y + rng.uniform(-6000, 6000, n_checks)]).tolist()
+    types = ("Wohnhaus", "Hochschule", "Kaserne")
+
+    start = time.perf_counter()
+    for i, (x, y) in enumerate(points):
+        manager.can_build_at(x, y, types[i % len(types)])
+    checks = time.perf_counter() - start
+
+    local_x, local_y = manager.to_local_coords(hq_x, hq_y)
+    start = time.perf_counter()
+    for i in range(n_searches):
+        manager.grid.find_valid_building_positions(types[i % len(types)], local_x, local_y)
+    searches = time.perf_counter() - start
+    return {"can_build_at_per_sec": n_checks / checks,
+            "find_valid_positions_per_sec": n_searches / searches}
+
+
+BENCHMARKS = {
+    "reset": bench_reset,
+    "steps": bench_steps,
+    "masks": bench_masks,
+    "observation": bench_observation,
+    "tick": bench_tick,
+    "astar": bench_astar,
+    "building_positions": bench_building_positions,
+}
+
+# Metriken ohne Richtung (Kontrollwerte, nicht verglichen)
+INFO_METRICS = {"astar_found_ratio"}
+
+
+def run_suite(only: Optional[List[str]] = None, seed: int = 0, quick: bool = False) -> Dict[str, float]:
+    """Führt die gewählten Benchmarks aus (quick: kleinere Wiederholungszahlen)."""
+    quick_args = {
+        "reset": {"repeats": 10},
+        "steps": {"n_steps": 300},
+        "masks": {"n_steps": 200, "warmup_steps": 100},
+        "observation": {"repeats": 300, "warmup_steps": 100},
+        "tick": {"n_ticks": 50, "rounds": 2, "warmup_steps": 100},
+        "astar": {"n_routes": 10, "repeats": 1},
+        "building_positions": {"n_checks": 500, "n_searches": 3},
+    }
+    results = {}
+    for name in only or BENCHMARKS:
+        kwargs = quick_args[name] if quick else {}
+        results.update(BENCHMARKS[name](seed=seed, **kwargs))
+    return results
+
+
+# =============================================================================
+# BASELINE-VERGLEICH
+# =============================================================================
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_sec")
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float = 0.15) -> Dict[str, dict]:
+    """
+    Vergleicht results mit baseline.
+
+    Returns:
+        Metrik -> {"baseline", "current", "change", "regression"}; change ist
+        die relative Verbesserung (positiv = besser, unabhängig von der Richtung)
+    """
+    comparison = {}
+    for metric, current in results.items():
+        old = baseline.get(metric)
+        if old is None or metric in INFO_METRICS or old == 0:
+            continue
+        if higher_is_better(metric):
+            change = current / old - 1
+        else:
+            change = old / current - 1 if current > 0 else float("inf")
+        comparison[metric] = {"baseline": old, "current": current, "change": change,
+                              "regression": change < -tolerance}
+    return comparison
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _load_results(path: str) -> Dict[str, float]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("results", data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Siedler AI - Benchmark-Suite")
+    parser.add_argument("--only", default=None,
+                        help=f"Kommagetrennte Auswahl aus {', '.join(BENCHMARKS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="Wenige Wiederholungen (Smoke-Test)")
+    parser.add_argument("--json", default=None, help="Ergebnisse als JSON speichern")
+    parser.add_argument("--baseline", default=None, help="Mit gespeicherter Baseline vergleichen")
+    parser.add_argument("--save-baseline", default=None, help="Ergebnisse als neue Baseline speichern")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Erlaubte relative Verschlechterung (Standard 15%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit-Code 1 bei Regression")
+    args = parser.parse_args()
+
+    selected = args.only.split(",") if args.only else None
+    unknown = [name for name in selected or [] if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unbekannte Benchmarks: {', '.join(unknown)}")
+
+    res = run_suite(selected, args.seed, args.quick)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git": _git_revision(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "quick": args.quick,
+        },
+        "results": res,
+    }
+
+    print("=" * 60)
+    print("SIEDLER BENCHMARK-SUITE")
+    print("=" * 60)
+    for metric, value in res.items():
+        print(f"  {metric:32s} {value:14,.2f}")
+
+    regressions = []
+    if args.baseline:
+        report["comparison"] = compare(res, _load_results(args.baseline), args.tolerance)
+        print("\n" + "-" * 60)
+        print(f"VERGLEICH MIT {args.baseline} (Toleranz {args.tolerance:.0%})")
+        print("-" * 60)
+        for metric, entry in report["comparison"].items():
+            flag = "  REGRESSION" if entry["regression"] else ""
+            print(f"  {metric:32s} {entry['baseline']:12,.2f} -> {entry['current']:12,.2f}  "
+                  f"{entry['change']:+7.1%}{flag}")
+            if entry["regression"]:
+                regressions.append(metric)
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"\nGespeichert: {path}")
+
+    if regressions and args.fail_on_regression:
+        print(f"\n{len(regressions)} Regression(en): {', '.join(regressions)}")
+        sys.exit(1)
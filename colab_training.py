@@ -3,11 +3,15 @@
 Siedler 5 - Scharfschützen Training Script für Google Colab
 
 Dieses Script kann in Google Colab ausgeführt werden.
-Kopiere map_config_wintersturm.py und environment.py ebenfalls in Colab.
+Kopiere map_config_wintersturm.py, environment.py, vec_env.py und evaluation.py ebenfalls in Colab.
 
 Verwendung in Colab:
-1. Lade alle 3 Dateien hoch (map_config_wintersturm.py, environment.py, colab_training.py)
+1. Lade alle Dateien hoch (map_config_wintersturm.py, environment.py, vec_env.py, evaluation.py, colab_training.py)
 2. Führe dieses Script aus
+
+Mit TRAINING_CONFIG["n_envs"] > 1 laufen die Environments parallel in
+Subprozessen (ein Env pro Kern); evaluate() verteilt die Episoden dann
+ebenfalls auf mehrere Envs.
 """
 
 # =============================================================================
@@ -38,6 +42,7 @@ def install_dependencies():
 
 import os
 import json
+import time
 import numpy as np
 from datetime import datetime
 
@@ -47,7 +52,7 @@ try:
     from sb3_contrib.common.wrappers import ActionMasker
     from sb3_contrib.common.maskable.callbacks import MaskableEvalCallback
     from stable_baselines3.common.callbacks import CheckpointCallback, BaseCallback
-    from stable_baselines3.common.vec_env import DummyVecEnv
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecMonitor
 except ImportError:
     print("Installiere Abhängigkeiten...")
     install_dependencies()
@@ -56,10 +61,12 @@ except ImportError:
     from sb3_contrib.common.wrappers import ActionMasker
     from sb3_contrib.common.maskable.callbacks import MaskableEvalCallback
     from stable_baselines3.common.callbacks import CheckpointCallback, BaseCallback
-    from stable_baselines3.common.vec_env import DummyVecEnv
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecMonitor
 
 # Importiere unser Environment
 from environment import SiedlerScharfschuetzenEnv
+from vec_env import SiedlerSubprocVecEnv, padded_action_mask
+from evaluation import evaluate_parallel, print_episode
 
 
 # =============================================================================
@@ -75,25 +82,26 @@ class ScharfschuetzenCallback(BaseCallback):
         self.best_scharfschuetzen = 0
         self.episode_rewards = []
         self.episode_scharfschuetzen = []
+        self.start_time = None
+
+    def _on_training_start(self) -> None:
+        self.start_time = time.perf_counter()
 
     def _on_step(self) -> bool:
         if self.n_calls % self.check_freq == 0:
-            # Hole Infos aus dem Environment
-            if hasattr(self.training_env, 'envs'):
-                env = self.training_env.envs[0]
-                if hasattr(env, 'unwrapped'):
-                    env = env.unwrapped
-
-                scharfschuetzen = getattr(env, 'scharfschuetzen', 0)
+            # Hole Infos aus dem Environment (get_attr: auch für Subprozesse)
+            scharfschuetzen = max(self.training_env.get_attr('scharfschuetzen'))
 
-                if scharfschuetzen > self.best_scharfschuetzen:
-                    self.best_scharfschuetzen = scharfschuetzen
-                    if self.verbose > 0:
-                        print(f"Neuer Rekord: {scharfschuetzen} Scharfschützen!")
+            if scharfschuetzen > self.best_scharfschuetzen:
+                self.best_scharfschuetzen = scharfschuetzen
+                if self.verbose > 0:
+                    print(f"Neuer Rekord: {scharfschuetzen} Scharfschützen!")
 
             # Log zum TensorBoard
             if self.verbose > 0 and self.n_calls % (self.check_freq * 10) == 0:
-                print(f"Step {self.n_calls}: Best Scharfschützen = {self.best_scharfschuetzen}")
+                steps_per_sec = self.num_timesteps / max(time.perf_counter() - self.start_time, 1e-9)
+                print(f"Step {self.num_timesteps}: Best Scharfschützen = {self.best_scharfschuetzen}, "
+                      f"{steps_per_sec:.0f} Steps/s ({self.training_env.num_envs} Envs)")
 
         return True
 
@@ -106,6 +114,9 @@ TRAINING_CONFIG = {
     # Timesteps - ERHÖHT für sparse rewards (nur Scharfschützen am Ende)
     "total_timesteps": 5_000_000,  # 5M Steps für sparse rewards
 
+    # Parallele Environments (> 1: Subprozesse, n_steps gilt pro Env)
+    "n_envs": 1,
+
     # Modell-Hyperparameter
     "learning_rate": 0.0003,
     "n_steps": 2048,
@@ -138,6 +149,18 @@ def create_env():
     return env
 
 
+def create_vec_env(n_envs: int):
+    """Erstellt n_envs Environments in Subprozessen (Masken über die VecEnv-Schnittstelle, Statistik über VecMonitor)"""
+    return VecMonitor(SiedlerSubprocVecEnv(n_envs=n_envs, player_id=1))
+
+
+def get_action_mask(env, model):
+    """Maske passend zur Action-Space des Modells (Subprozess-Training: gepaddete Phasen-Maske)"""
+    if model.action_space.n == env.unwrapped.total_actions:
+        return env.unwrapped.get_action_mask()
+    return padded_action_mask(env.unwrapped, model.action_space.n)
+
+
 def train(config: dict = None, save_path: str = "./siedler_model"):
     """
     Trainiert das Modell
@@ -158,10 +181,12 @@ def train(config: dict = None, save_path: str = "./siedler_model"):
     print(f"Timesteps: {config['total_timesteps']:,}")
     print(f"Learning Rate: {config['learning_rate']}")
     print(f"Batch Size: {config['batch_size']}")
+    n_envs = config.get("n_envs", 1)
+    print(f"Environments: {n_envs}{' (Subprozesse)' if n_envs > 1 else ''}")
     print("=" * 60)
 
     # Environment erstellen
-    env = create_env()
+    env = create_env() if n_envs == 1 else create_vec_env(n_envs)
     eval_env = create_env()
 
     print(f"\nAction Space: {env.action_space}")
@@ -198,11 +223,16 @@ def train(config: dict = None, save_path: str = "./siedler_model"):
     print("-" * 60)
 
     # Training
+    start = time.perf_counter()
     model.learn(
         total_timesteps=config["total_timesteps"],
         callback=[checkpoint_callback, scharfschuetzen_callback],
         progress_bar=True,
     )
+    elapsed = time.perf_counter() - start
+    print(f"\nDurchsatz: {model.num_timesteps / elapsed:.0f} Steps/s ({n_envs} Envs)")
+    if n_envs > 1:
+        env.close()
 
     # Finales Modell speichern
     final_path = f"{save_path}/siedler_final"
@@ -219,19 +249,37 @@ def train(config: dict = None, save_path: str = "./siedler_model"):
 # EVALUATION FUNKTION
 # =============================================================================
 
-def evaluate(model, n_episodes: int = 10, render: bool = False):
+def evaluate(model, n_episodes: int = 10, render: bool = False, n_envs: int = None):
     """
     Evaluiert das trainierte Modell
 
+    Modelle mit gepaddeter Phasen-Action-Space (Training mit n_envs > 1)
+    werden parallel auf n_envs Environments evaluiert (siehe evaluation.py),
+    außer render ist gesetzt.
+
     Args:
         model: Trainiertes Modell
         n_episodes: Anzahl der Evaluations-Episoden
         render: Ob der Output gerendert werden soll
+        n_envs: Parallele Environments (Standard: os.cpu_count())
 
     Returns:
         Dictionary mit Evaluations-Ergebnissen
     """
     env = create_env()
+    if not render and model.action_space.n != env.unwrapped.total_actions:
+        env.close()
+        report = evaluate_parallel(model, n_episodes=n_episodes, n_envs=n_envs or os.cpu_count() or 1,
+                                   on_episode=print_episode)
+        report.print_summary()
+        return {
+            "rewards": [r.reward for r in report.episodes],
+            "scharfschuetzen": [r.scharfschuetzen for r in report.episodes],
+            "times": [r.time for r in report.episodes],
+            "action_histories": [r.action_history for r in report.episodes],
+            "summary": report.summary(),
+        }
+
     results = {
         "rewards": [],
         "scharfschuetzen": [],
@@ -245,7 +293,7 @@ def evaluate(model, n_episodes: int = 10, render: bool = False):
         done = False
 
         while not done:
-            action_mask = env.unwrapped.get_action_mask()
+            action_mask = get_action_mask(env, model)
             action, _ = model.predict(obs, deterministic=True, action_masks=action_mask)
             obs, reward, terminated, truncated, info = env.step(action)
             total_reward += reward
@@ -298,7 +346,7 @@ def export_strategy(model, save_path: str = "./strategy_export.json"):
     }
 
     while not done:
-        action_mask = env.unwrapped.get_action_mask()
+        action_mask = get_action_mask(env, model)
         action, _ = model.predict(obs, deterministic=True, action_masks=action_mask)
         obs, reward, terminated, truncated, info = env.step(action)
         done = terminated or truncated
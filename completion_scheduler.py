@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Siedler AI - Fertigstellungs-Planer
+
+Baustellen, Bau-, Upgrade- und Rekrutierungs-Queue sowie die laufende
+Forschung sind Countdowns: pro Tick sinkt `remaining` um TIME_STEP × Rate,
+bei remaining <= 0 ist der Eintrag fertig. Statt jeden Eintrag in jedem
+Tick zu dekrementieren, liegt jeder Eintrag mit seinem projizierten
+Fertigstellungs-Tick in einem Min-Heap. Ein Tick holt nur die fälligen
+Einträge; ändert sich die Rate (Leibeigene auf der Baustelle,
+Gelehrten-Effizienz), wird der Eintrag neu eingeplant.
+
+Der Fertigstellungs-Tick wird mit derselben schrittweisen Subtraktion
+berechnet wie der frühere Tick, die Rundung ist dadurch identisch.
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def steps_until_done(remaining: float, delta: float) -> Optional[int]:
+    """Anzahl Ticks bis remaining <= 0 bei Abzug delta pro Tick (None wenn nie)."""
+    if delta <= 0:
+        return None
+    steps = 0
+    while remaining > 0:
+        remaining -= delta
+        steps += 1
+    return max(steps, 1)
+
+
+@dataclass
+class ScheduledEntry:
+    """Ein Countdown: remaining gilt nach Tick anchor, danach -delta pro Tick."""
+    kind: str
+    payload: Any
+    remaining: float
+    anchor: int
+    delta: float
+    due: Optional[int]  # Tick in dem remaining <= 0 wird (None = steht still)
+    seq: int
+    version: int = 0
+
+    def remaining_at(self, tick: int) -> float:
+        """Restwert nach Tick `tick` (geschlossen, für Anzeige/Beobachtung)."""
+        return self.remaining - self.delta * (tick - self.anchor)
+
+    def replay(self, tick: int) -> float:
+        """Restwert nach Tick `tick`, schrittweise wie der frühere Tick (bitgenau)."""
+        remaining = self.remaining
+        for _ in range(tick - self.anchor):
+            remaining -= self.delta
+        return remaining
+
+
+class CompletionScheduler:
+    """
+    Min-Heap über die Fertigstellungs-Ticks aller Countdowns.
+
+    `now` zählt die ausgeführten Ticks. Einträge werden nur beim Hinzufügen
+    und bei Ratenänderungen (rekey) eingeplant; veraltete Heap-Einträge
+    werden über die Version erkannt und beim Herausnehmen verworfen.
+    """
+
+    def __init__(self, step: float = 1):
+        self.step = step
+        self.now = 0
+        self.entries: Dict[int, ScheduledEntry] = {}  # seq -> Eintrag (Einfüge-Reihenfolge)
+        self._heap: List[Tuple[int, int, int]] = []   # (due, seq, version)
+        self._next_seq = 0
+        self.revision = 0  # ändert sich wenn Einträge hinzukommen oder wegfallen
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _push(self, entry: ScheduledEntry):
+        if entry.due is not None:
+            heapq.heappush(self._heap, (entry.due, entry.seq, entry.version))
+
+    def add(self, kind: str, payload: Any, remaining: float, rate: float = 1) -> ScheduledEntry:
+        """Plant einen neuen Countdown ein (läuft ab dem nächsten Tick)."""
+        delta = self.step * rate
+        steps = steps_until_done(remaining, delta)
+        entry = ScheduledEntry(kind=kind, payload=payload, remaining=remaining, anchor=self.now,
+                               delta=delta, due=None if steps is None else self.now + steps,
+                               seq=self._next_seq)
+        self._next_seq += 1
+        self.revision += 1
+        self.entries[entry.seq] = entry
+        self._push(entry)
+        return entry
+
+    def rekey(self, entry: ScheduledEntry, rate: float, tick: Optional[int] = None):
+        """
+        Neue Rate für alle Ticks nach `tick` (Standard: now).
+
+        Mitten in einem Tick (z.B. Forschung nach den Fertigstellungen)
+        tick=now-1 übergeben, damit die Rate schon für den laufenden Tick gilt.
+        """
+        tick = self.now if tick is None else tick
+        delta = self.step * rate
+        if delta == entry.delta:
+            return
+        entry.remaining = entry.replay(tick)
+        entry.anchor = tick
+        entry.delta = delta
+        steps = steps_until_done(entry.remaining, delta)
+        entry.due = None if steps is None else tick + steps
+        entry.version += 1
+        self._push(entry)
+
+    def remove(self, entry: ScheduledEntry):
+        """Entfernt einen Eintrag (der Heap-Eintrag verfällt)."""
+        if self.entries.pop(entry.seq, None) is not None:
+            self.revision += 1
+
+    def advance(self, ticks: int = 1):
+        self.now += ticks
+
+    def _valid(self, item: Tuple[int, int, int]) -> Optional[ScheduledEntry]:
+        entry = self.entries.get(item[1])
+        if entry is None or entry.version != item[2]:
+            return None
+        return entry
+
+    def pop_due(self, kinds: Tuple[str, ...]) -> List[ScheduledEntry]:
+        """
+        Entfernt alle bis `now` fälligen Einträge der Arten `kinds`.
+
+        Returns:
+            Einträge sortiert nach Reihenfolge in kinds, dann Einfüge-Reihenfolge
+        """
+        due, keep = [], []
+        while self._heap and self._heap[0][0] <= self.now:
+            item = heapq.heappop(self._heap)
+            entry = self._valid(item)
+            if entry is None:
+                continue
+            if entry.kind in kinds:
+                due.append(entry)
+                del self.entries[entry.seq]
+            else:
+                keep.append(item)
+        for item in keep:
+            heapq.heappush(self._heap, item)
+        if due:
+            self.revision += 1
+        due.sort(key=lambda e: (kinds.index(e.kind), e.seq))
+        return due
+
+    def next_due(self) -> Optional[int]:
+        """Frühester Fertigstellungs-Tick (None wenn nichts läuft)."""
+        while self._heap and self._valid(self._heap[0]) is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def view(self, kind: str) -> List[ScheduledEntry]:
+        """Alle Einträge einer Art in Einfüge-Reihenfolge."""
+        return [entry for entry in self.entries.values() if entry.kind == kind]
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Siedler AI - Wirtschafts-Ledger (Struct-of-Arrays)
+
+Die skalaren Wirtschaftsgrößen einer Episode stehen als Zeile in NumPy
+Arrays: Ressourcen (N, R), Zeit, Glaube, Alarm, Steuerstufe, Motivation
+und Segen-Cooldowns/-Dauern (N, Kategorien). Ein Einzel-Env besitzt ein
+Ledger mit einer Zeile; SiedlerVecEnv legt ein Ledger mit N Zeilen an und
+hängt seine Envs daran (attach_ledger). Zeit, Cooldowns, Glaube und
+Einkommen lassen sich dann für alle Episoden in einer Array-Operation
+ticken, Masken und Beobachtungen direkt aus den Spalten bilden.
+
+Das Env greift über Sichten zu: resources, bless_cooldowns und
+bless_active_times sind dict-artige Sichten auf eine Zeile (LedgerRow),
+die Skalare sind Properties der Env-Klasse (ledger_field).
+"""
+
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator
+
+import numpy as np
+
+
+class EconomyLedger:
+    """Wirtschaftsgrößen von N Episoden, eine Zeile pro Episode."""
+
+    # Skalare Spalten: Name -> dtype
+    SCALARS = {
+        "time": np.int64,
+        "faith": np.int64,
+        "alarm_cooldown": np.int64,
+        "alarm_active": np.bool_,
+        "tax_level": np.int64,
+        "motivation": np.float64,
+    }
+
+    def __init__(self, n_rows: int, resource_names: Iterable[str], bless_categories: Iterable):
+        self.n_rows = n_rows
+        self.resource_names = list(resource_names)
+        self.resource_index = {name: i for i, name in enumerate(self.resource_names)}
+        self.bless_categories = list(bless_categories)
+        self.bless_index = {cat: i for i, cat in enumerate(self.bless_categories)}
+
+        self.resources = np.zeros((n_rows, len(self.resource_names)), dtype=np.float64)
+        for name, dtype in self.SCALARS.items():
+            setattr(self, name, np.zeros(n_rows, dtype=dtype))
+        self.bless_cooldowns = np.zeros((n_rows, len(self.bless_categories)), dtype=np.int64)
+        self.bless_active = np.zeros((n_rows, len(self.bless_categories)), dtype=np.int64)
+
+    def _columns(self) -> Iterator[str]:
+        yield "resources"
+        yield from self.SCALARS
+        yield "bless_cooldowns"
+        yield "bless_active"
+
+    def row_state(self, row: int) -> Dict[str, np.ndarray]:
+        """Kopie aller Werte einer Zeile (für Snapshots und Umhängen)."""
+        return {name: np.copy(getattr(self, name)[row]) for name in self._columns()}
+
+    def set_row_state(self, row: int, state: Dict[str, np.ndarray]):
+        for name, values in state.items():
+            getattr(self, name)[row] = values
+
+
+class LedgerRow(MutableMapping):
+    """
+    Dict-Sicht auf eine Zeile einer (N, k) Ledger-Spalte.
+
+    Die Schlüssel sind fest (Spalten); Zuweisen eines ganzen Dicts über
+    assign() setzt nicht enthaltene Schlüssel auf 0. Werte kommen als
+    Python-Zahlen zurück.
+    """
+
+    __slots__ = ("_values", "_index")
+
+    def __init__(self, values: np.ndarray, index: Dict):
+        self._values = values  # 1D-Sicht auf die Zeile
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._values.item(self._index[key])
+
+    def get(self, key, default=None):
+        column = self._index.get(key)
+        return default if column is None else self._values.item(column)
+
+    def __setitem__(self, key, value):
+        self._values[self._index[key]] = value
+
+    def __delitem__(self, key):
+        raise TypeError("Ledger-Spalten können nicht entfernt werden")
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def assign(self, mapping):
+        """Übernimmt alle Werte aus mapping, fehlende Schlüssel werden 0."""
+        values = np.zeros_like(self._values)
+        for key, value in mapping.items():
+            values[self._index[key]] = value
+        self._values[:] = values
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+def ledger_field(column: str) -> property:
+    """Property für eine skalare Ledger-Spalte (Zeile = self._ledger_row)."""
+
+    def get(self):
+        return getattr(self._ledger, column).item(self._ledger_row)
+
+    def set(self, value):
+        getattr(self._ledger, column)[self._ledger_row] = value
+
+    return property(get, set, doc=f"Ledger-Spalte '{column}' dieser Episode")
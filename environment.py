@@ -11,7 +11,6 @@ NEU: Integriert WorkTime/Pausen-System und 2-Tier Produktion
 
 import copy
 import json
-import os
 from enum import Enum
 import gymnasium as gym
 import numpy as np
@@ -56,6 +55,9 @@ ACTION_FLOWS = {
 
 MAIN_ACTIONS = list(ACTION_FLOWS.keys())
 
+# Mengen der QUANTITY-Phase (Index über 5 -> 20)
+QUANTITY_VALUES = (1, 2, 3, 5, 10, 20)
+
 
 # ============================================================================
 # SERF AREA SYSTEM (NEU - 26 feste Bereiche + dynamische Baustellen)
@@ -97,6 +99,15 @@ class SerfArea(Enum):
     # Baustellen ab 25 (dynamisch, max 10)
 
 
+SERF_AREA_BY_VALUE = {area.value: area for area in SerfArea}
+
+# Holz-Bereiche -> Index in wood_zone_names
+WOOD_AREA_ZONES = {
+    SerfArea.WOOD_HQ: 0, SerfArea.WOOD_SULFUR: 1, SerfArea.WOOD_CLAY: 2,
+    SerfArea.WOOD_STONE: 3, SerfArea.WOOD_VILLAGE: 4, SerfArea.WOOD_IRON: 5,
+}
+
+
 # ============================================================================
 # TECHNOLOGY EFFECTS SYSTEM (NEU - Effekte werden jetzt angewendet!)
 # ============================================================================
@@ -150,12 +161,17 @@ from worker_simulation import (
     WorkerState, WORKER_PARAMS, WORKER_SPEEDS
 )
 from production_system import (
-    ProductionSystem, Mine, Refiner, Serf, ResourceType,
+    ProductionSystem, Mine, Refiner, Serf, SerfState, ResourceType,
     SERF_EXTRACTION
 )
 
 # NEU: Pfadfindung für exakte Laufwege
 from pathfinding import MapManager, PathResult
+from static_map_data import load_static_map
+from completion_scheduler import CompletionScheduler
+from economy_ledger import EconomyLedger, LedgerRow, ledger_field
+from tree_table import TreeLayout, TreeTable
+from perf_stats import PerfStats, timed
 
 # =============================================================================
 # RESSOURCEN-DEFINITIONEN
@@ -171,6 +187,16 @@ RESOURCE_TALER = "Taler"
 RESOURCE_NAMES = [RESOURCE_HOLZ, RESOURCE_STEIN, RESOURCE_LEHM, RESOURCE_EISEN, RESOURCE_SCHWEFEL, RESOURCE_TALER]
 RESOURCE_MAP = [RESOURCE_HOLZ, RESOURCE_STEIN, RESOURCE_LEHM, RESOURCE_EISEN, RESOURCE_SCHWEFEL]
 
+# ProductionSystem-Ressourcen -> Inventar-Namen
+RESOURCE_TYPE_NAMES = {
+    ResourceType.WOOD: RESOURCE_HOLZ,
+    ResourceType.STONE: RESOURCE_STEIN,
+    ResourceType.CLAY: RESOURCE_LEHM,
+    ResourceType.IRON: RESOURCE_EISEN,
+    ResourceType.SULFUR: RESOURCE_SCHWEFEL,
+    ResourceType.GOLD: RESOURCE_TALER,
+}
+
 # Sammelraten pro Arbeiter pro Zeiteinheit
 gather_rates = {
     RESOURCE_HOLZ: 1.038,
@@ -187,6 +213,8 @@ SERF_SEARCH_RADIUS = 4500  # ResourceSearchRadius aus PU_Serf.xml
 WOOD_PER_TREE = 75  # ResourceAmount aus XD_Tree*.xml (Standard-Bäume)
 WOOD_PER_EXTRACTION = 2  # Amount aus PU_Serf.xml
 EXTRACTION_TIME_WOOD = 5.52  # Sekunden (4s delay + 1.52s animation)
+# Vorkommen-Erschöpfung pro Leibeigenem und Sekunde (1 / Gesamtzeit einer Extraktion)
+DEPOSIT_EXTRACTION_RATES = {"Eisen": 1.0/4.54, "Stein": 1.0/5.54, "Lehm": 1.0/5.54, "Schwefel": 1.0/4.54}
 
 # =============================================================================
 # VOLLSTÄNDIGE GEBÄUDE-DATENBANK (80+ Gebäude)
@@ -855,6 +883,31 @@ soldiers_db = {
 
 TIME_STEP = 1
 INCOME_CYCLE = 40
+# Attribute die __init__ anlegt, die aber zum Episoden-Zustand gehören
+# (werden von snapshot()/restore() kopiert statt geteilt)
+EPISODE_STATE_KEYS_FROM_INIT = frozenset({
+    "action_space", "active_tech_effects", "current_flow", "current_phase",
+    "flow_step", "pending_selections", "serf_areas",
+    "_mask_cache", "_mask_signatures", "_depletion_epoch",
+    "_obs_buffer", "_obs_signatures",
+})
+# Zeit-Modi: "fixed" = jede Sekunde einzeln, "event" = Sekunden ohne Ereignis
+# (Worker-Übergang, Serf-Ankunft, Erschöpfung, Einkommen, Fertigstellung) in
+# geschlossener Form fortschreiben (gleiches Ergebnis). step() simuliert in
+# beiden Modi eine Sekunde; advance_time/idle_fast_forward springen im
+# "event"-Modus bis vor das nächste Ereignis.
+TIME_MODES = ("fixed", "event")
+# Schlüssel der Ledger-Zeile in snapshot() (liegt nicht im __dict__ des Env)
+LEDGER_SNAPSHOT_KEY = "_ledger_state"
+# Obergrenze für ein vorgespultes "wait" (idle_fast_forward): ohne laufende
+# Prozesse passiert sonst bis Episodenende nichts und ein wait beendet die Episode
+MAX_IDLE_SECONDS = 120
+# Arten im CompletionScheduler, in der Reihenfolge in der ein Tick sie abschließt
+SCHEDULE_SITE = "site"          # Baustelle (Rate = effektive Leibeigene)
+SCHEDULE_BUILD = "build"        # Legacy Bau-Queue
+SCHEDULE_UPGRADE = "upgrade"
+SCHEDULE_RESEARCH = "research"  # Rate = Gelehrten-Effizienz
+SCHEDULE_RECRUIT = "recruit"
 TOTAL_SIM_TIME = 1800  # 30 Minuten
 MAX_POSSIBLE_LEIBEIGENE = 300
 
@@ -894,6 +947,8 @@ BLESS_COOLDOWN = 180  # 3 Minuten Cooldown wie im Original (extra2/logic.xml)
 BLESS_DURATION = 180  # Sekunden wie lange der Bonus hält (aus extra2!)
 BLESS_MOTIVATION_BONUS = 0.3  # +30% Motivation (aus extra2!)
 BLESS_REQUIRED_FAITH = 5000  # Benötigter Glaube pro Kategorie
+MONASTERY_BUILDINGS = ("Kloster_1", "Kloster_2", "Kloster_3")  # Glaubensquellen
+PRIESTS_PER_MONASTERY = 6  # Vereinfacht: 6 Priester pro Kloster, je 1 Glaube/Sekunde
 
 # 5 Segen-Kategorien (aus extra2/logic.xml)
 BLESS_CATEGORIES = {
@@ -1012,11 +1067,32 @@ class SiedlerScharfschuetzenEnv(gym.Env):
 
     metadata = {"render_modes": ["human", "ansi"]}
 
-    def __init__(self, player_id: int = 1, render_mode: str = None):
+    # Skalare Wirtschaftsgrößen liegen im EconomyLedger (siehe attach_ledger)
+    current_time = ledger_field("time")
+    faith = ledger_field("faith")
+    alarm_cooldown = ledger_field("alarm_cooldown")
+    alarm_active = ledger_field("alarm_active")
+    current_tax_level = ledger_field("tax_level")
+    base_motivation = ledger_field("motivation")
+
+    def __init__(self, player_id: int = 1, render_mode: str = None, time_mode: str = "fixed",
+                 mask_debug: bool = False, data_root: Optional[str] = None, perf_stats: bool = False,
+                 idle_fast_forward: bool = False):
         super().__init__()
 
+        if time_mode not in TIME_MODES:
+            raise ValueError(f"Unbekannter time_mode '{time_mode}', erlaubt: {TIME_MODES}")
+
+        # Wirtschaftsgrößen dieser Episode (SiedlerVecEnv hängt sie in ein gemeinsames Ledger um)
+        self.attach_ledger(EconomyLedger(1, RESOURCE_NAMES, BLESS_CATEGORIES), 0)
+
         self.player_id = player_id
         self.render_mode = render_mode
+        self.time_mode = time_mode
+        # Nach "wait" bis zum nächsten entscheidungsrelevanten Ereignis vorspulen
+        self.idle_fast_forward = idle_fast_forward
+        self.mask_debug = mask_debug  # Gecachte Maske/Beobachtung gegen Vollberechnung prüfen
+        self.perf = PerfStats() if perf_stats else None  # Laufzeit-Messpunkte (None = aus)
 
         # Gebäude-Listen für Actions
         self.buildable_buildings = [b for b in buildings_db.keys() if get_building_level(b) == 1]
@@ -1164,6 +1240,9 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         # Gymnasium-kompatible action_space Property (dynamisch je nach Phase)
         self.action_space = self.action_spaces[ActionPhase.MAIN]
 
+        # Dekodier-Tabellen für Multi-Step- und Legacy-Space (statisch)
+        self._compile_action_tables()
+
         # Serf Areas tracking
         self.serf_areas = {area: {"count": 0} for area in SerfArea}
         self.serf_areas[SerfArea.FREE]["count"] = 30  # Start-Leibeigene
@@ -1209,44 +1288,45 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         hq_data = PLAYER_HQ_POSITIONS.get(player_id, {"x": 0, "y": 0})
         self.hq_position = (hq_data["x"], hq_data["y"])
 
-        # Numpy-Daten einmal laden und cachen
-        import os
-        import copy
-        base_dir = r"c:\Users\marku\OneDrive\Desktop\siedler_ai"
-        walkable_file = os.path.join(base_dir, "player1_walkable.npy")
-        resources_file = os.path.join(base_dir, "player1_resources.json")
+        # PERFORMANCE: Statische Kartendaten (Terrain, Bäume, Tree-ID Mapping)
+        # werden einmal gebaut und von allen Instanzen/Prozessen schreibgeschützt
+        # per Memory-Map geteilt
+        static = load_static_map(data_root, PLAYER_1_TREES_NEAREST)
+        self.data_root = static.data_root
+        self._cached_resources = static.resources
 
-        self._cached_walkable = np.load(walkable_file)
-        with open(resources_file, 'r') as f:
-            self._cached_resources = json.load(f)
-
-        # PERFORMANCE: Vollständigen MapManager mit Bäumen einmal aufbauen und cachen
+        # MapManager mit Bäumen einmal aufbauen und cachen
         self._cached_map_manager = MapManager()
-        self._cached_map_manager.grid.load_terrain_from_array(self._cached_walkable)
-        cached_trees = self._cached_resources.get('trees_all', self._cached_resources.get('trees_nearest_50', []))
-        self._cached_map_manager._load_trees_from_data(cached_trees)
-
-        # Cache die Grid-Arrays für schnelles Reset
-        self._cached_terrain_base = self._cached_map_manager.grid.terrain_base.copy()
-        self._cached_trees_layer = self._cached_map_manager.grid.trees.copy()
-        self._cached_tree_positions = dict(self._cached_map_manager.grid.tree_positions)
-        self._cached_tree_world_positions = dict(self._cached_map_manager.tree_world_positions)
-
-        # PERFORMANCE: Tree-ID Mapping einmal berechnen (war 95% der Reset-Zeit!)
-        self._cached_tree_id_mapping = {}
-        trees_list = list(PLAYER_1_TREES_NEAREST)
-        for i, tree in enumerate(trees_list):
-            nearest = self._cached_map_manager.get_nearest_tree(tree["x"], tree["y"])
-            if nearest:
-                self._cached_tree_id_mapping[i] = nearest[0]
-
-        print(f"Walkable Grid geladen: {self._cached_walkable.shape}")
-        print(f"Bäume geladen: {len(cached_trees)} (gecached)")
+        self._cached_map_manager.load_static_data(static)
+
+        # Baum-Tabelle: Positionen, Zonen und Baum-IDs sind statisch (vor dem HQ
+        # ermittelt wie das Tree-ID Mapping im statischen Cache)
+        self._tree_layout = TreeLayout(WOOD_ZONES, PLAYER_1_TREES_NEAREST, self._cached_map_manager)
+
+        # Distanzfelder beziehen sich auf den Startzustand jeder Episode (inkl. HQ)
+        # und werden neben player1_walkable.npy gespeichert
+        self._cached_map_manager.add_building(self.hq_position[0], self.hq_position[1], "Hauptquartier")
+        self._cached_map_manager.enable_distance_fields(cache_dir=self.data_root)
+
+        # Terrain ist schreibgeschützt und wird bei jedem Reset nur referenziert
+        self._cached_terrain_base = static.terrain_base
+
+        self._init_mask_cache()
+        self._init_obs_writer()
+
+        # Alles was bis hier existiert ist statisch und wird von Snapshots geteilt
+        self._static_state_keys = ((frozenset(self.__dict__) - EPISODE_STATE_KEYS_FROM_INIT) |
+                                   {"_static_state_keys", "_snapshot_memo_template"})
+
+        print(f"Walkable Grid geladen: {static.terrain_base.shape}")
+        print(f"Bäume geladen: {static.n_trees} (gecached)")
 
         self.reset()
 
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
+        self._invalidate_mask_cache()
+        self._invalidate_obs_cache()
 
         self.resources = dict(START_RESOURCES)
         self.total_leibeigene = 30
@@ -1267,21 +1347,24 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         self.buildings = {b: 0 for b in buildings_db.keys()}
         self.buildings["Hauptquartier_1"] = 1
 
-        self.construction_queue = []  # Legacy: [(building, remaining_time, position)]
-        self.upgrade_queue = []
-        self.current_research = None
-        self.recruit_queue = []
+        # Alle Countdowns (Baustellen, Queues, Forschung) im Fertigstellungs-Planer;
+        # construction_queue, upgrade_queue, recruit_queue, current_research und
+        # construction_sites sind Nur-Lese-Sichten darauf (siehe Properties)
+        # - construction_queue: (building, remaining_time, position)  [Legacy]
+        # - upgrade_queue: (old_building, new_building, remaining_time)
+        # - current_research: (tech, remaining_time) oder None
+        # - recruit_queue: (soldier, remaining_time)
+        self.completion_scheduler = CompletionScheduler(TIME_STEP)
 
         # NEU: Realistisches Bau-System mit Leibeigenen-Zuweisung
-        # Format: [{
+        # construction_sites: ({
         #   "building": str,           # Gebäude-Name
         #   "position": (x, y),        # Bauplatz-Position
         #   "total_time": float,       # Basis-Bauzeit
         #   "remaining_work": float,   # Verbleibende Arbeit
         #   "serfs_assigned": int,     # Anzahl zugewiesener Leibeigener
         #   "site_id": int,            # Eindeutige ID
-        # }]
-        self.construction_sites = []
+        # }, ...)
         self.next_site_id = 0
 
         # Serf-Tracking (vereinfacht - keine IDs mehr nötig)
@@ -1320,7 +1403,8 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         # Bäume: für Holz
         # ResourceAmount: 75 pro Baum, Amount: 2 pro Extraktion = 37 Extraktionen pro Baum!
         self.available_trees = PLAYER_1_TREES_SUMMARY.get("total_trees", 888)
-        self.trees_list = list(PLAYER_1_TREES_NEAREST)  # Kopie der nächsten Bäume
+        # Alle sammelbaren Bäume in einer Tabelle (Zonen-Bäume, nächste Bäume am HQ)
+        self.tree_table = TreeTable(self._tree_layout)
 
         # =================================================================
         # VEREINFACHTES RESSOURCEN-TRACKING (ohne Serf-IDs!)
@@ -1335,26 +1419,11 @@ class SiedlerScharfschuetzenEnv(gym.Env):
                 "center": zone_data["center"],
                 "radius": zone_data["radius"],
                 "raffinerie": zone_data.get("raffinerie", ""),
-                "trees": [
-                    {"x": t["x"], "y": t["y"], "dist": t["dist"],
-                     "resource_remaining": 75, "serfs_assigned": 0}
-                    for t in zone_data.get("trees", [])
-                ],
                 "serfs_assigned": 0,
                 "total_trees": zone_data.get("tree_count", 0),
             }
 
-        # Legacy: Alte tree_list_internal für Kompatibilität (alle Bäume flach)
-        self.tree_list_internal = []
-        for zone_name, zone_cat in self.wood_zone_categories.items():
-            for tree in zone_cat["trees"]:
-                self.tree_list_internal.append({
-                    "x": tree["x"], "y": tree["y"],
-                    "resource_remaining": tree["resource_remaining"],
-                    "serfs_assigned": tree["serfs_assigned"],
-                    "zone": zone_name  # Zusätzliches Feld für Zonen-Tracking
-                })
-        self.available_tree_count = len(self.tree_list_internal)
+        self.available_tree_count = self._tree_layout.n_zone_trees
 
         # VORKOMMEN: Zähler pro Kategorie (keine IDs!)
         self.deposit_categories = {
@@ -1429,7 +1498,12 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         }
 
         # NEU: WorkTime/Pausen-System initialisieren
+        # Ein Camp beim HQ (Fallback wenn keine Farm/Residence in Reichweite);
+        # Farms/Residences kommen über _register_workforce_building dazu
+        from worker_simulation import Position
         self.workforce_manager = WorkforceManager()
+        self.workforce_manager.add_camp(Position(x=self.hq_position[0], y=self.hq_position[1]))
+        self.workforce_sites = {}
 
         # NEU: Produktionssystem initialisieren
         self.production_system = ProductionSystem(workforce_manager=self.workforce_manager)
@@ -1437,23 +1511,24 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         # =====================================================================
         # PERFORMANCE: Map-Daten aus Cache verwenden (schnelles Array-Copy!)
         # =====================================================================
-        self.map_manager = MapManager()
-        # Direkt gecachte Arrays kopieren (VIEL schneller als neu aufbauen!)
-        self.map_manager.grid.terrain_base = self._cached_terrain_base.copy()
-        self.map_manager.grid.trees = self._cached_trees_layer.copy()
-        self.map_manager.grid.tree_positions = dict(self._cached_tree_positions)
-        self.map_manager.tree_world_positions = dict(self._cached_tree_world_positions)
-        self.map_manager.grid.next_tree_id = max(self._cached_tree_positions.keys()) + 1 if self._cached_tree_positions else 1
-
-        # HQ als erstes Gebäude im Grid blockieren
-        self.map_manager.add_building(self.hq_position[0], self.hq_position[1], "Hauptquartier")
-
-        # PERFORMANCE: Tree-ID Mapping aus Cache (nicht neu berechnen!)
-        self.tree_id_mapping = dict(self._cached_tree_id_mapping)
+        if getattr(self, "map_manager", None) is not None:
+            # Overlay: nur die in der Episode geänderten Zellen zurücksetzen
+            self.map_manager.reset_overlay()
+        else:
+            self.map_manager = MapManager()
+            # Statisches Terrain teilen (schreibgeschützt, keine Kopie nötig)
+            self.map_manager.grid.terrain_base = self._cached_terrain_base
+            # Bäume inkl. räumlicher Indizes übernehmen
+            self.map_manager.copy_trees_from(self._cached_map_manager)
+
+            # HQ als erstes Gebäude im Grid blockieren
+            self.map_manager.add_building(self.hq_position[0], self.hq_position[1], "Hauptquartier")
+            self.map_manager.enable_overlay()
+        self.map_manager.share_distance_fields(self._cached_map_manager)
+        self.map_manager.perf = self.perf
 
         # Initiale Serfs erstellen (30 Leibeigene zu Start)
         # VEREINFACHT: Keine IDs mehr, nur Zähler
-        from worker_simulation import Position
         hq_pos = Position(x=self.hq_position[0], y=self.hq_position[1])
         for i in range(self.total_leibeigene):
             serf = Serf(
@@ -1483,73 +1558,216 @@ class SiedlerScharfschuetzenEnv(gym.Env):
 
         return self._get_observation(), {}
 
-    def _get_observation(self):
-        obs = []
+    # =========================================================================
+    # WIRTSCHAFTS-LEDGER (Struct-of-Arrays, siehe economy_ledger.py)
+    # =========================================================================
 
-        for r in RESOURCE_NAMES:
-            obs.append(self.resources.get(r, 0) / 1000.0)
+    def attach_ledger(self, ledger: EconomyLedger, row: int):
+        """
+        Verlegt Ressourcen, Zeit, Glaube, Alarm, Steuer, Motivation und Segen
+        in Zeile `row` von `ledger`; die aktuellen Werte werden mitgenommen.
+        """
+        previous = self.__dict__.get("_ledger")
+        state = previous.row_state(self._ledger_row) if previous is not None else None
+        self._ledger = ledger
+        self._ledger_row = row
+        self._resources_view = LedgerRow(ledger.resources[row], ledger.resource_index)
+        self._bless_cooldowns_view = LedgerRow(ledger.bless_cooldowns[row], ledger.bless_index)
+        self._bless_active_view = LedgerRow(ledger.bless_active[row], ledger.bless_index)
+        if state is not None:
+            ledger.set_row_state(row, state)
+
+    @property
+    def resources(self) -> LedgerRow:
+        return self._resources_view
+
+    @resources.setter
+    def resources(self, values):
+        self._resources_view.assign(values)
+
+    @property
+    def bless_cooldowns(self) -> LedgerRow:
+        return self._bless_cooldowns_view
+
+    @bless_cooldowns.setter
+    def bless_cooldowns(self, values):
+        self._bless_cooldowns_view.assign(values)
+
+    @property
+    def bless_active_times(self) -> LedgerRow:
+        return self._bless_active_view
+
+    @bless_active_times.setter
+    def bless_active_times(self, values):
+        self._bless_active_view.assign(values)
+
+    # =========================================================================
+    # BEOBACHTUNG (vorallokierter Puffer, inkrementell)
+    # =========================================================================
+    # Feste Slot-Aufteilung; jeder Abschnitt schreibt nur seine Slots und hängt
+    # wie die Action-Maske von Eingabe-Gruppen ab. Abschnitte ohne Gruppen
+    # (Zeit, WorkTime, Segen/Alarm) ändern sich praktisch jeden Tick und
+    # werden immer geschrieben.
+
+    def _init_obs_writer(self):
+        """Definiert die Beobachtungs-Abschnitte, ihre Slots und Abhängigkeiten."""
+        n_bless = len(BLESS_CATEGORIES)
+        sections = [
+            # (Schreib-Methode, Anzahl Slots, Eingabe-Gruppen)
+            (self._write_obs_resources, len(RESOURCE_NAMES), ("resources",)),
+            (self._write_obs_workers, len(RESOURCE_MAP) + 2, ("workers",)),
+            (self._write_obs_buildings, len(self.buildable_buildings) * 2 + len(self.upgradeable_buildings),
+             ("buildings", "queues")),
+            (self._write_obs_techs, len(self.tech_list) * 2, ("techs", "queues")),
+            (self._write_obs_soldiers, len(self.soldier_types), ("soldiers",)),
+            (self._write_obs_time, 2, ()),
+            (self._write_obs_production, len(RESOURCE_MAP) + 1, ("workers", "buildings")),
+            (self._write_obs_worktime, 6, ()),
+            (self._write_obs_capacity, 4, ("buildings", "population")),
+            (self._write_obs_efficiency, 2, ()),
+            (self._write_obs_actions, 4 + n_bless * 2, ()),
+        ]
+        self._obs_sections = []
+        offset = 0
+        for write, size, groups in sections:
+            self._obs_sections.append((write, slice(offset, offset + size), groups))
+            offset += size
+        assert offset == self.observation_space.shape[0], (offset, self.observation_space.shape)
+        self._obs_buffer = np.zeros(offset, dtype=np.float32)
+        self._invalidate_obs_cache()
+
+    def _invalidate_obs_cache(self):
+        """Erzwingt beim nächsten Aufruf das Schreiben aller Slots (z.B. nach reset)."""
+        self._obs_signatures = {}
+
+    def _obs_input_signatures(self) -> dict:
+        """Billige Signaturen der Eingaben mit eigenem Abschnitt."""
+        return {
+            "resources": tuple(self.resources.get(r, 0) for r in RESOURCE_NAMES),
+            "workers": (tuple(self.resource_workers.get(r, 0) for r in RESOURCE_MAP),
+                        self.free_leibeigene, self.total_leibeigene),
+            "buildings": tuple(self.buildings.items()),
+            "queues": self.completion_scheduler.revision,
+            "techs": len(self.researched_techs),
+            "soldiers": tuple(self.soldiers.items()),
+            "population": len(self.workforce_manager.workers),
+        }
 
-        for r in RESOURCE_MAP:
-            obs.append(self.resource_workers.get(r, 0) / 50.0)
-        obs.append(self.free_leibeigene / 100.0)
-        obs.append(self.total_leibeigene / 100.0)
+    @timed("observation")
+    def get_observation(self, copy: bool = True) -> np.ndarray:
+        """
+        Aktuelle Beobachtung; nur Abschnitte mit geänderten Eingaben werden neu geschrieben.
 
-        for b in self.buildable_buildings:
-            obs.append(self.buildings.get(b, 0) / 10.0)
-            in_construction = sum(1 for c in self.construction_queue if c[0] == b)
-            obs.append(in_construction / 5.0)
+        Args:
+            copy: False liefert eine schreibgeschützte Sicht auf den Puffer
+                  (ohne Kopie, wird beim nächsten Aufruf überschrieben)
+        """
+        signatures = self._obs_input_signatures()
+        if self._obs_signatures:
+            changed = {g for g, sig in signatures.items() if self._obs_signatures[g] != sig}
+        else:
+            changed = set(signatures)
+        buffer = self._obs_buffer
+        for write, slots, groups in self._obs_sections:
+            if not groups or not changed.isdisjoint(groups):
+                write(buffer[slots])
+        self._obs_signatures = signatures
+
+        if self.mask_debug:
+            full = self._compute_full_observation()
+            if not np.array_equal(full, buffer):
+                diff = np.flatnonzero(full != buffer).tolist()
+                raise RuntimeError(f"Beobachtungs-Puffer veraltet an Slots {diff}")
+
+        if copy:
+            return buffer.copy()
+        view = buffer.view()
+        view.flags.writeable = False
+        return view
 
+    def _get_observation(self):
+        return self.get_observation()
+
+    def _compute_full_observation(self) -> np.ndarray:
+        """Schreibt alle Abschnitte in einen neuen Puffer (ohne Cache)."""
+        obs = np.zeros_like(self._obs_buffer)
+        for write, slots, _ in self._obs_sections:
+            write(obs[slots])
+        return obs
+
+    def _write_obs_resources(self, out):
+        out[:] = [self.resources.get(r, 0) / 1000.0 for r in RESOURCE_NAMES]
+
+    def _write_obs_workers(self, out):
+        out[:] = [self.resource_workers.get(r, 0) / 50.0 for r in RESOURCE_MAP] + \
+                 [self.free_leibeigene / 100.0, self.total_leibeigene / 100.0]
+
+    def _write_obs_buildings(self, out):
+        in_construction = {}
+        for entry in self.completion_scheduler.view(SCHEDULE_BUILD):
+            building = entry.payload[0]
+            in_construction[building] = in_construction.get(building, 0) + 1
+        values = []
+        for b in self.buildable_buildings:
+            values.append(self.buildings.get(b, 0) / 10.0)
+            values.append(in_construction.get(b, 0) / 5.0)
         for b in self.upgradeable_buildings:
-            obs.append(self.buildings.get(b, 0) / 5.0)
+            values.append(self.buildings.get(b, 0) / 5.0)
+        out[:] = values
 
+    def _write_obs_techs(self, out):
+        current_research = self.current_research
+        researching = current_research[0] if current_research else None
+        values = []
         for t in self.tech_list:
-            obs.append(1.0 if t in self.researched_techs else 0.0)
-            obs.append(1.0 if self.current_research and self.current_research[0] == t else 0.0)
+            values.append(1.0 if t in self.researched_techs else 0.0)
+            values.append(1.0 if t == researching else 0.0)
+        out[:] = values
 
-        for s in self.soldier_types:
-            obs.append(self.soldiers.get(s, 0) / 50.0)
+    def _write_obs_soldiers(self, out):
+        out[:] = [self.soldiers.get(s, 0) / 50.0 for s in self.soldier_types]
 
-        obs.append(self.current_time / self.max_time)
-        obs.append((self.max_time - self.current_time) / self.max_time)
+    def _write_obs_time(self, out):
+        out[0] = self.current_time / self.max_time
+        out[1] = (self.max_time - self.current_time) / self.max_time
 
-        for r in RESOURCE_MAP:
-            obs.append(self._get_production_rate(r) / 10.0)
-        obs.append(self._get_taler_income() / 100.0)
+    def _write_obs_production(self, out):
+        out[:] = [self._get_production_rate(r) / 10.0 for r in RESOURCE_MAP] + \
+                 [self._get_taler_income() / 100.0]
 
-        # NEU: WorkTime-System Observations
+    def _write_obs_worktime(self, out):
         workforce_stats = self.workforce_manager.get_stats()
-        obs.append(workforce_stats.get("avg_work_time", 100) / 400.0)  # Max WorkTime ist 400
-        obs.append(workforce_stats.get("exhausted_ratio", 0))
-        obs.append(workforce_stats.get("eating_workers", 0) / 50.0)
-        obs.append(workforce_stats.get("resting_workers", 0) / 50.0)
-        obs.append(workforce_stats.get("working_workers", 0) / 50.0)
-        obs.append(workforce_stats.get("walking_workers", 0) / 50.0)
-
-        # Kapazitäts-Stats
+        out[0] = workforce_stats.get("avg_work_time", 100) / 400.0  # Max WorkTime ist 400
+        out[1] = workforce_stats.get("exhausted_ratio", 0)
+        out[2] = workforce_stats.get("eating_workers", 0) / 50.0
+        out[3] = workforce_stats.get("resting_workers", 0) / 50.0
+        out[4] = workforce_stats.get("working_workers", 0) / 50.0
+        out[5] = workforce_stats.get("walking_workers", 0) / 50.0
+
+    def _write_obs_capacity(self, out):
         total_farm_capacity = self._get_total_farm_capacity()
         total_residence_capacity = self._get_total_residence_capacity()
-        obs.append(total_farm_capacity / 50.0)
-        obs.append(len(self.workforce_manager.workers) / max(1, total_farm_capacity))  # Farm-Auslastung
-        obs.append(total_residence_capacity / 50.0)
-        obs.append(len(self.workforce_manager.workers) / max(1, total_residence_capacity))  # Wohnhaus-Auslastung
-
-        # Effizienz und Serf-Count
-        obs.append(self.workforce_manager.get_average_efficiency())
-        obs.append(len(self.production_system.serfs) / 100.0)
-
-        # NEU: Observations für neue Actions (erweitert für 5 Kategorien + Alarm)
-        obs.append(self.current_tax_level / 4.0)  # Normalisiert auf 0-1
-        obs.append(1.0 if self.alarm_active else 0.0)  # Alarm aktiv?
-        obs.append(self.alarm_cooldown / ALARM_RECHARGE_TIME)  # Alarm-Cooldown
-        obs.append(self.faith / BLESS_REQUIRED_FAITH)  # Faith normalisiert
-
-        # Segen pro Kategorie (5x Cooldown + 5x aktiv)
-        for cat in BLESS_CATEGORIES:
-            obs.append(self.bless_cooldowns.get(cat, 0) / BLESS_COOLDOWN)
-        for cat in BLESS_CATEGORIES:
-            obs.append(1.0 if self.bless_active_times.get(cat, 0) > 0 else 0.0)
-
-        return np.array(obs, dtype=np.float32)
+        n_workers = len(self.workforce_manager.workers)
+        out[0] = total_farm_capacity / 50.0
+        out[1] = n_workers / max(1, total_farm_capacity)  # Farm-Auslastung
+        out[2] = total_residence_capacity / 50.0
+        out[3] = n_workers / max(1, total_residence_capacity)  # Wohnhaus-Auslastung
+
+    def _write_obs_efficiency(self, out):
+        out[0] = self.workforce_manager.get_average_efficiency()
+        out[1] = len(self.production_system.serfs) / 100.0
+
+    def _write_obs_actions(self, out):
+        """Steuer, Alarm, Glaube und Segen (5x Cooldown + 5x aktiv)."""
+        values = [
+            self.current_tax_level / 4.0,  # Normalisiert auf 0-1
+            1.0 if self.alarm_active else 0.0,
+            self.alarm_cooldown / ALARM_RECHARGE_TIME,
+            self.faith / BLESS_REQUIRED_FAITH,
+        ]
+        values += [self.bless_cooldowns.get(cat, 0) / BLESS_COOLDOWN for cat in BLESS_CATEGORIES]
+        values += [1.0 if self.bless_active_times.get(cat, 0) > 0 else 0.0 for cat in BLESS_CATEGORIES]
+        out[:] = values
 
     def _get_production_rate(self, resource):
         rate = 0.0
@@ -1596,13 +1814,11 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         Gelehrte mit niedriger WorkTime arbeiten langsamer (nur 10% bei Erschöpfung).
         Returns: 0.1 (alle erschöpft) bis 1.0 (alle fit)
         """
-        scholars = [w for w in self.workforce_manager.workers
-                    if w.worker_type == "scholar"]
-        if not scholars:
+        efficiency = self.workforce_manager.get_type_efficiency("scholar")
+        if efficiency is None:
             # Keine Gelehrten = volle Geschwindigkeit (Fallback)
             return 1.0
-        total_efficiency = sum(w.get_efficiency() for w in scholars)
-        return total_efficiency / len(scholars)
+        return efficiency
 
     def _can_buy_serf(self) -> bool:
         """Prüft ob ein Leibeigener gekauft werden kann."""
@@ -1640,6 +1856,10 @@ class SiedlerScharfschuetzenEnv(gym.Env):
             return False
         return True
 
+    def _count_monasteries(self) -> int:
+        """Anzahl fertiger Klöster aller Stufen (Glaubensquelle)."""
+        return sum(self.buildings.get(name, 0) for name in MONASTERY_BUILDINGS)
+
     def _can_bless(self, category: int = None) -> bool:
         """Prüft ob Segnung möglich ist.
 
@@ -1647,10 +1867,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
             category: Segen-Kategorie (0-4). Wenn None, prüft allgemein.
         """
         # Kloster (Monastery) muss gebaut sein (nicht Kapelle!)
-        total_monasteries = (self.buildings.get("Kloster_1", 0) +
-                            self.buildings.get("Kloster_2", 0) +
-                            self.buildings.get("Kloster_3", 0))
-        if total_monasteries < 1:
+        if self._count_monasteries() < 1:
             return False
 
         # Faith muss ausreichen
@@ -1695,85 +1912,175 @@ class SiedlerScharfschuetzenEnv(gym.Env):
             total += self.buildings.get(res_type, 0) * capacity
         return total
 
-    def _sync_workforce_infrastructure(self):
-        """Synchronisiert Farms/Residences/Camps mit dem WorkforceManager"""
-        from worker_simulation import Position
-
-        # Helper: Position in Position-Objekt umwandeln
-        def to_position(raw_pos):
-            if isinstance(raw_pos, Position):
-                return raw_pos
-            elif isinstance(raw_pos, dict):
-                return Position(x=raw_pos.get('x', 0), y=raw_pos.get('y', 0))
-            elif isinstance(raw_pos, tuple):
-                return Position(x=raw_pos[0], y=raw_pos[1])
-            else:
-                return Position(x=0, y=0)
-
-        # DORFZENTRUM-KAPAZITÄT setzen (bestimmt max. Arbeiter!)
-        village_capacity = self._get_total_village_capacity()
-        self.workforce_manager.set_village_capacity(village_capacity)
-
-        # Farms synchronisieren (für Essen/WorkTime-Regeneration)
-        self.workforce_manager.farms.clear()
-        for farm_type in FARM_EAT_CAPACITY.keys():
-            count = self.buildings.get(farm_type, 0)
-            level = get_building_level(farm_type)
-            for i in range(count):
-                pos_key = f"{farm_type}_{i}"
-                raw_pos = self.building_position_map.get(pos_key, self.hq_position)
-                pos_obj = to_position(raw_pos)
-                farm = Farm(position=pos_obj, level=level)
-                self.workforce_manager.farms.append(farm)
-
-        # Residences synchronisieren
-        self.workforce_manager.residences.clear()
-        for res_type in RESIDENCE_CAPACITY.keys():
-            count = self.buildings.get(res_type, 0)
-            level = get_building_level(res_type)
-            for i in range(count):
-                pos_key = f"{res_type}_{i}"
-                raw_pos = self.building_position_map.get(pos_key, self.hq_position)
-                pos_obj = to_position(raw_pos)
-                residence = Residence(position=pos_obj, level=level)
-                self.workforce_manager.residences.append(residence)
-
-        # Ein Camp beim HQ (Fallback wenn keine Farm/Residence in Reichweite)
-        if not self.workforce_manager.camps:
-            hq_pos = to_position(self.hq_position)
-            self.workforce_manager.camps.append(Camp(position=hq_pos))
+    # -------------------------------------------------------------------------
+    # Workforce-Infrastruktur (ereignisgesteuert)
+    # -------------------------------------------------------------------------
+    # Bauernhöfe, Wohnhäuser und Dorfzentrum-Kapazität werden nur bei
+    # Fertigstellung, Upgrade und Abriss angepasst. Farm-/Wohnhaus-Objekte
+    # bleiben dabei erhalten (inkl. aktueller Esser/Bewohner).
+    # workforce_sites: Gebäudename -> Farm/Residence-Objekte in Bau-Reihenfolge
+
+    def _register_workforce_building(self, building: str, pos_obj):
+        """Meldet ein fertiges Dorfzentrum/Bauernhof/Wohnhaus beim WorkforceManager an."""
+        manager = self.workforce_manager
+        if building in VILLAGE_CENTER_CAPACITY:
+            manager.set_village_capacity(manager.max_workers_from_village +
+                                         VILLAGE_CENTER_CAPACITY[building])
+        elif building in FARM_EAT_CAPACITY:
+            farm = manager.add_farm(pos_obj, level=get_building_level(building))
+            self.workforce_sites.setdefault(building, []).append(farm)
+        elif building in RESIDENCE_CAPACITY:
+            residence = manager.add_residence(pos_obj, level=get_building_level(building))
+            self.workforce_sites.setdefault(building, []).append(residence)
+
+    def _upgrade_workforce_building(self, old_building: str, new_building: str):
+        """Überträgt ein Upgrade auf Dorfzentrum-Kapazität bzw. Farm/Residence-Level."""
+        manager = self.workforce_manager
+        if old_building in VILLAGE_CENTER_CAPACITY:
+            manager.set_village_capacity(manager.max_workers_from_village -
+                                         VILLAGE_CENTER_CAPACITY[old_building] +
+                                         VILLAGE_CENTER_CAPACITY.get(new_building, 0))
+            return
+        sites = self.workforce_sites.get(old_building)
+        if not sites:
+            return
+        site = sites.pop(0)
+        if isinstance(site, Farm):
+            manager.set_farm_level(site, get_building_level(new_building))
+        else:
+            manager.set_residence_level(site, get_building_level(new_building))
+        self.workforce_sites.setdefault(new_building, []).append(site)
+
+    def _unregister_workforce_building(self, building: str, position=None):
+        """Entfernt ein abgerissenes Gebäude (bevorzugt das an position)."""
+        manager = self.workforce_manager
+        if building in VILLAGE_CENTER_CAPACITY:
+            manager.set_village_capacity(manager.max_workers_from_village -
+                                         VILLAGE_CENTER_CAPACITY[building])
+            return
+        sites = self.workforce_sites.get(building)
+        if not sites:
+            return
+        index = 0
+        if isinstance(position, dict):
+            position = (position.get('x', 0), position.get('y', 0))
+        if isinstance(position, tuple):
+            index = next((i for i, site in enumerate(sites)
+                          if (site.position.x, site.position.y) == position), 0)
+        site = sites.pop(index)
+        if isinstance(site, Farm):
+            manager.remove_farm(site)
+        else:
+            manager.remove_residence(site)
+
+    # =========================================================================
+    # ACTION-MASKE (inkrementell mit Dirty-Flags)
+    # =========================================================================
+    # Jeder Masken-Abschnitt hängt nur von einigen Eingabe-Gruppen ab. Pro
+    # Aufruf werden billige Signaturen der Gruppen gebildet; nur Abschnitte
+    # deren Gruppen sich geändert haben werden neu berechnet.
+    # mask_debug=True vergleicht jedes Ergebnis mit der Vollberechnung.
+
+    def _init_mask_cache(self):
+        """Definiert die Masken-Abschnitte und ihre Abhängigkeiten."""
+        self._mask_sections = [
+            # (Füll-Methode, Eingabe-Gruppen)
+            (self._fill_mask_build, ("resources", "techs", "positions")),
+            (self._fill_mask_upgrade, ("resources", "buildings")),
+            (self._fill_mask_tech, ("resources", "buildings", "techs")),
+            (self._fill_mask_recruit, ("resources", "buildings", "techs")),
+            (self._fill_mask_resource_batch, ("serfs", "gathering", "positions")),
+            (self._fill_mask_serf, ("resources", "buildings", "serfs")),
+            (self._fill_mask_batch_recruit, ("resources", "buildings", "techs")),
+            (self._fill_mask_demolish, ("buildings",)),
+            (self._fill_mask_bless, ("buildings", "cooldowns")),
+            (self._fill_mask_tax_alarm, ("cooldowns",)),
+            (self._fill_mask_build_serf, ("serfs", "sites")),
+        ]
+        self._invalidate_mask_cache()
+
+    def _invalidate_mask_cache(self):
+        """Verwirft die gecachte Maske (z.B. nach reset)."""
+        self._mask_cache = None
+        self._mask_signatures = {}
+        self._depletion_epoch = 0
+
+    def _mask_input_signatures(self) -> dict:
+        """Billige Signaturen aller Eingaben der Action-Maske."""
+        current_research = self.current_research
+        return {
+            "resources": tuple(self.resources.get(r, 0) for r in RESOURCE_NAMES),
+            "buildings": tuple(self.buildings.items()),
+            "techs": (len(self.researched_techs),
+                      current_research[0] if current_research else None),
+            "positions": (len(self.available_positions),
+                          tuple(len(v) for v in self.built_mines.values())),
+            "serfs": (self.free_leibeigene, self.total_leibeigene),
+            "gathering": (
+                tuple(z["serfs_assigned"] for z in self.wood_zone_categories.values()),
+                tuple(c["serfs_assigned"] for c in self.deposit_categories.values()),
+                tuple(c.get("serfs_assigned", 0) for c in self.shaft_categories.values()),
+                self._depletion_epoch,
+            ),
+            "sites": tuple(site["serfs_assigned"] for site in self.construction_sites),
+            "cooldowns": (
+                tuple(self.bless_cooldowns.get(c, 0) > 0 for c in BLESS_CATEGORIES),
+                self.faith >= BLESS_REQUIRED_FAITH,
+                self.alarm_active, self.alarm_cooldown <= 0, self.current_tax_level,
+            ),
+        }
 
+    @timed("get_action_mask")
     def get_action_mask(self):
+        """Flache Action-Maske (Legacy-Space), inkrementell aktualisiert."""
+        signatures = self._mask_input_signatures()
+        if self._mask_cache is None:
+            self._mask_cache = self._compute_full_action_mask()
+        else:
+            changed = {g for g, sig in signatures.items() if self._mask_signatures.get(g) != sig}
+            if changed:
+                for fill, groups in self._mask_sections:
+                    if not changed.isdisjoint(groups):
+                        fill(self._mask_cache)
+        self._mask_signatures = signatures
+
+        if self.mask_debug:
+            full = self._compute_full_action_mask()
+            if not np.array_equal(full, self._mask_cache):
+                diff = np.flatnonzero(full != self._mask_cache).tolist()
+                raise RuntimeError(f"Action-Masken-Cache veraltet an Indizes {diff}")
+
+        return self._mask_cache.copy()
+
+    def _compute_full_action_mask(self) -> np.ndarray:
+        """Berechnet die komplette Maske ohne Cache."""
         mask = np.zeros(self.total_actions, dtype=np.int8)
         mask[0] = 1  # Wait immer möglich
+        for fill, _ in self._mask_sections:
+            fill(mask)
+        return mask
 
-        # =================================================================
-        # GEBÄUDE-BATCH-BAU (1x, 3x, 5x pro Gebäude)
-        # =================================================================
+    def _fill_mask_build(self, mask):
+        """GEBÄUDE-BATCH-BAU (1x, 3x, 5x pro Gebäude)"""
         for i, building in enumerate(self.buildable_buildings):
             for j, batch_size in enumerate(self.build_batch_sizes):
                 action_idx = self.offset_build_batch + i * len(self.build_batch_sizes) + j
-                if self._can_build_batch(building, batch_size):
-                    mask[action_idx] = 1
+                mask[action_idx] = self._can_build_batch(building, batch_size)
 
-        # Upgrades (unverändert)
+    def _fill_mask_upgrade(self, mask):
         for i, building in enumerate(self.upgradeable_buildings):
-            if self._can_upgrade(building):
-                mask[self.offset_upgrade + i] = 1
+            mask[self.offset_upgrade + i] = self._can_upgrade(building)
 
-        # Technologien (unverändert)
+    def _fill_mask_tech(self, mask):
         for i, tech in enumerate(self.tech_list):
-            if self._can_research(tech):
-                mask[self.offset_tech + i] = 1
+            mask[self.offset_tech + i] = self._can_research(tech)
 
-        # Soldaten (unverändert)
+    def _fill_mask_recruit(self, mask):
         for i, soldier in enumerate(self.soldier_types):
-            if self._can_recruit(soldier):
-                mask[self.offset_recruit + i] = 1
+            mask[self.offset_recruit + i] = self._can_recruit(soldier)
 
-        # =================================================================
-        # RESSOURCEN-BATCH-ACTIONS (1x, 3x, 5x)
-        # =================================================================
+    def _fill_mask_resource_batch(self, mask):
+        """RESSOURCEN-BATCH-ACTIONS (1x, 3x, 5x)"""
         n_batch = len(self.resource_batch_sizes)
         offset = self.offset_resource_batch
 
@@ -1781,88 +2088,74 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         # Layout: [Zone0_assign_x1, Zone0_assign_x3, Zone0_assign_x5, Zone1_assign_x1, ...]
         for i, zone_name in enumerate(self.wood_zone_names):
             for j, batch_size in enumerate(self.resource_batch_sizes):
-                if self._can_assign_wood_zone_batch(zone_name, batch_size):
-                    mask[offset + i * n_batch + j] = 1
+                mask[offset + i * n_batch + j] = self._can_assign_wood_zone_batch(zone_name, batch_size)
         offset += len(self.wood_zone_names) * n_batch
 
         # Entfernen aus Holz-Zonen
         for i, zone_name in enumerate(self.wood_zone_names):
             for j, batch_size in enumerate(self.resource_batch_sizes):
-                if self._can_recall_wood_zone_batch(zone_name, batch_size):
-                    mask[offset + i * n_batch + j] = 1
+                mask[offset + i * n_batch + j] = self._can_recall_wood_zone_batch(zone_name, batch_size)
         offset += len(self.wood_zone_names) * n_batch
 
         # Vorkommen-Kategorien: Zuweisen und Entfernen
         for i, category in enumerate(self.deposit_category_names):
             for j, batch_size in enumerate(self.resource_batch_sizes):
-                if self._can_assign_deposit_batch(category, batch_size):
-                    mask[offset + i * n_batch + j] = 1
+                mask[offset + i * n_batch + j] = self._can_assign_deposit_batch(category, batch_size)
         offset += len(self.deposit_category_names) * n_batch
 
         for i, category in enumerate(self.deposit_category_names):
             for j, batch_size in enumerate(self.resource_batch_sizes):
-                if self._can_recall_deposit_batch(category, batch_size):
-                    mask[offset + i * n_batch + j] = 1
+                mask[offset + i * n_batch + j] = self._can_recall_deposit_batch(category, batch_size)
         offset += len(self.deposit_category_names) * n_batch
 
         # Stollen-Kategorien: Zuweisen und Entfernen (ersetzt alte Mine-Serf-Zuweisung)
         for i, shaft_type in enumerate(self.shaft_category_names):
             for j, batch_size in enumerate(self.resource_batch_sizes):
-                if self._can_assign_shaft_batch(shaft_type, batch_size):
-                    mask[offset + i * n_batch + j] = 1
+                mask[offset + i * n_batch + j] = self._can_assign_shaft_batch(shaft_type, batch_size)
         offset += len(self.shaft_category_names) * n_batch
 
         for i, shaft_type in enumerate(self.shaft_category_names):
             for j, batch_size in enumerate(self.resource_batch_sizes):
-                if self._can_recall_shaft_batch(shaft_type, batch_size):
-                    mask[offset + i * n_batch + j] = 1
+                mask[offset + i * n_batch + j] = self._can_recall_shaft_batch(shaft_type, batch_size)
 
-        # Leibeigene kaufen/entlassen (Batch-Actions: 1x, 3x, 5x)
+    def _fill_mask_serf(self, mask):
+        """Leibeigene kaufen/entlassen (Batch-Actions: 1x, 3x, 5x)"""
         for i, batch_size in enumerate(self.serf_batch_sizes):
-            if self._can_buy_serf_batch(batch_size):
-                mask[self.offset_serf + i] = 1
-            if self._can_dismiss_serf_batch(batch_size):
-                mask[self.offset_serf + len(self.serf_batch_sizes) + i] = 1
+            mask[self.offset_serf + i] = self._can_buy_serf_batch(batch_size)
+            mask[self.offset_serf + len(self.serf_batch_sizes) + i] = self._can_dismiss_serf_batch(batch_size)
 
-        # Batch-Rekrutierung für Scharfschützen (3x, 5x)
+    def _fill_mask_batch_recruit(self, mask):
+        """Batch-Rekrutierung für Scharfschützen (3x, 5x)"""
         action_idx = 0
         for soldier_type in self.scharfschuetzen_types:
             for batch_size in self.scharfschuetzen_batch_sizes:
-                if self._can_recruit_batch(soldier_type, batch_size):
-                    mask[self.offset_batch_recruit + action_idx] = 1
+                mask[self.offset_batch_recruit + action_idx] = self._can_recruit_batch(soldier_type, batch_size)
                 action_idx += 1
 
-        # Gebäude abreißen
+    def _fill_mask_demolish(self, mask):
         for i, building in enumerate(self.buildable_buildings):
-            if self._can_demolish(building):
-                mask[self.offset_demolish + i] = 1
+            mask[self.offset_demolish + i] = self._can_demolish(building)
 
-        # Segnen (5 Kategorien)
+    def _fill_mask_bless(self, mask):
         for cat in BLESS_CATEGORIES:
-            if self._can_bless(cat):
-                mask[self.offset_bless + cat] = 1
+            mask[self.offset_bless + cat] = self._can_bless(cat)
 
+    def _fill_mask_tax_alarm(self, mask):
         # Steuern (immer möglich, außer aktuelles Level)
         for i in range(len(TAX_LEVELS)):
-            if i != self.current_tax_level:
-                mask[self.offset_tax + i] = 1
-
+            mask[self.offset_tax + i] = i != self.current_tax_level
         # Alarm (AN wenn aus und kein Cooldown, AUS wenn an)
-        if not self.alarm_active and self.alarm_cooldown <= 0:
-            mask[self.offset_alarm] = 1
-        if self.alarm_active:
-            mask[self.offset_alarm + 1] = 1
+        mask[self.offset_alarm] = not self.alarm_active and self.alarm_cooldown <= 0
+        mask[self.offset_alarm + 1] = self.alarm_active
 
-        # NEU: Bau-Serfs zuweisen/zurückrufen
+    def _fill_mask_build_serf(self, mask):
+        """Bau-Serfs zuweisen/zurückrufen"""
         for i, batch_size in enumerate(self.build_serf_batch_sizes):
             # Zuweisen möglich wenn freie Serfs und Baustellen vorhanden
-            if self._can_assign_build_batch(batch_size):
-                mask[self.offset_build_serf + i] = 1
+            mask[self.offset_build_serf + i] = self._can_assign_build_batch(batch_size)
             # Zurückrufen möglich wenn Serfs auf Baustellen arbeiten
-            if self._can_recall_build_batch(batch_size):
-                mask[self.offset_build_serf + len(self.build_serf_batch_sizes) + i] = 1
-
-        return mask
+            mask[self.offset_build_serf + len(self.build_serf_batch_sizes) + i] = \
+                self._can_recall_build_batch(batch_size)
 
     def _can_build(self, building):
         b_info = buildings_db.get(building)
@@ -2057,10 +2350,11 @@ class SiedlerScharfschuetzenEnv(gym.Env):
             return dist <= SERF_RESOURCE_SEARCH_RADIUS
 
         if resource == RESOURCE_HOLZ:
-            # Nächster verfügbarer Baum INNERHALB des Suchradius
-            for tree in self.trees_list:
-                if is_in_search_radius(tree["x"], tree["y"]):
-                    return Position(x=tree["x"], y=tree["y"])
+            # Nächster nicht reservierter Baum INNERHALB des Suchradius
+            for row in self.tree_table.unreserved_nearest():
+                x, y = self.tree_table.position(row)
+                if is_in_search_radius(x, y):
+                    return Position(x=x, y=y)
             return None
 
         mine_type_map = {
@@ -2093,7 +2387,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         Der Serf läuft zur Ressource und bleibt dort.
 
         NEU: Verwendet A* Pfadfindung für exakte Laufwege!
-        HOLZ: Baum wird aus trees_list entfernt (reserviert)
+        HOLZ: nächster freier Baum wird in der Baum-Tabelle reserviert
         """
         from worker_simulation import Position
         from production_system import ResourceType, SerfState
@@ -2123,17 +2417,20 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         # Hole Position der Ressource und ggf. tree_id
         tree_id = None
         if resource == RESOURCE_HOLZ:
-            # Holz: Baum aus Liste nehmen und reservieren
-            if not self.trees_list:
+            # Holz: nächsten freien Baum reservieren
+            row = self.tree_table.reserve_next()
+            if row is None:
                 return
-            tree = self.trees_list.pop(0)  # Ersten Baum nehmen und entfernen
             self.available_trees -= 1
-            target_pos = Position(x=tree["x"], y=tree["y"])
-
-            # Tree-ID für MapManager ermitteln
-            nearest = self.map_manager.get_nearest_tree(tree["x"], tree["y"])
-            if nearest:
-                tree_id = nearest[0]
+            x, y = self.tree_table.position(row)
+            target_pos = Position(x=x, y=y)
+
+            # Tree-ID für MapManager: statische ID solange der Baum steht
+            # (Bäume werden nur gefällt, nie hinzugefügt), sonst nächster Baum
+            tree_id = int(self.tree_table.trees["grid_id"][row])
+            if tree_id not in self.map_manager.tree_world_positions:
+                nearest = self.map_manager.get_nearest_tree(x, y)
+                tree_id = nearest[0] if nearest else None
         else:
             target_pos = self._get_resource_collection_position(resource)
             if not target_pos:
@@ -2142,16 +2439,14 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         # HQ Position als Startpunkt
         hq_pos = Position(x=self.hq_position[0], y=self.hq_position[1])
 
-        # NEU: A* Pfadfindung für exakte Distanz
-        path_result = self.map_manager.find_path(
+        # Laufdistanz aus dem HQ-Distanzfeld (ein Lookup statt A* pro Serf,
+        # gleiche Start-Verschiebung wie find_path)
+        real_distance = self.map_manager.get_field_distance(
             (hq_pos.x, hq_pos.y),
             (target_pos.x, target_pos.y)
         )
 
-        # Berechne echte Laufdistanz (A* Pfad statt Luftlinie)
-        if path_result.found:
-            real_distance = path_result.world_distance
-        else:
+        if real_distance == float('inf'):
             # Fallback auf Luftlinie wenn kein Pfad gefunden
             import math
             real_distance = math.sqrt(
@@ -2161,6 +2456,23 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         # Serf zur Ressource schicken mit korrekter Distanz und tree_id
         idle_serf.assign_to_resource(resource_type, target_pos, hq_pos, real_distance, tree_id)
 
+    def precompute_distance_fields(self) -> int:
+        """Berechnet die Distanzfelder aller statischen Quellen vorab und speichert sie.
+
+        Quellen: HQ, alle Bauplätze aus building_zones, Minen-Schächte und Vorkommen
+        (ohne begehbare Zelle im SNAP_RADIUS entfällt das Feld, wie bei find_path).
+        Returns: Anzahl Felder
+        """
+        sources = [self.hq_position]
+        for zone_positions in self.building_zones.values():
+            if isinstance(zone_positions, list):
+                sources.extend((p["x"], p["y"]) for p in zone_positions)
+        for shafts in PLAYER_1_MINE_SHAFTS.values():
+            sources.extend((p["x"], p["y"]) for p in shafts)
+        for deposits in PLAYER_1_SMALL_DEPOSITS.values():
+            sources.extend((d["x"], d["y"]) for d in deposits)
+        return self._cached_map_manager.precompute_distance_fields(sources)
+
     def _recall_serf_from_resource(self, resource: str):
         """
         Ruft einen Serf von einer Ressource zurück.
@@ -2202,9 +2514,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         """Prüft ob batch_size Serfs zu Bäumen zugewiesen werden können."""
         if self.free_leibeigene < batch_size:
             return False
-        # Mindestens batch_size Bäume mit Ressourcen verfügbar
-        available = sum(1 for t in self.tree_list_internal if t["resource_remaining"] > 0)
-        return available > 0  # Mindestens 1 Baum muss verfügbar sein
+        return self.tree_table.live_count > 0  # Mindestens 1 Baum muss verfügbar sein
 
     def _can_recall_wood_batch(self, batch_size: int) -> bool:
         """Prüft ob batch_size Serfs von Holz-Arbeit zurückgerufen werden können."""
@@ -2212,24 +2522,24 @@ class SiedlerScharfschuetzenEnv(gym.Env):
 
     def _assign_wood_batch(self, batch_size: int):
         """Weist batch_size Serfs zum Holzsammeln zu."""
+        from worker_simulation import Position
+        from production_system import ResourceType
+
+        # Nächster verfügbarer Baum (Zuweisen ändert das Restholz nicht)
+        row = self.tree_table.first_live_row()
         assigned = 0
-        for serf in self.production_system.serfs:
-            if assigned >= batch_size:
-                break
-            if serf.is_idle():
-                # Finde nächsten verfügbaren Baum
-                for tree in self.tree_list_internal:
-                    if tree["resource_remaining"] > 0:
-                        # Serf zuweisen (vereinfacht, ohne ID-Tracking)
-                        from worker_simulation import Position
-                        from production_system import ResourceType
-                        target_pos = Position(x=tree["x"], y=tree["y"])
-                        hq_pos = Position(x=self.hq_position[0], y=self.hq_position[1])
-                        serf.assign_to_resource(ResourceType.WOOD, target_pos, hq_pos, None)
-                        serf.work_location = "wood"  # Markiere als Holz-Serf
-                        tree["serfs_assigned"] += 1
-                        assigned += 1
-                        break
+        if row is not None:
+            x, y = self.tree_table.position(row)
+            hq_pos = Position(x=self.hq_position[0], y=self.hq_position[1])
+            for serf in self.production_system.serfs:
+                if assigned >= batch_size:
+                    break
+                if serf.is_idle():
+                    # Serf zuweisen (vereinfacht, ohne ID-Tracking)
+                    serf.assign_to_resource(ResourceType.WOOD, Position(x=x, y=y), hq_pos, None)
+                    serf.work_location = "wood"  # Markiere als Holz-Serf
+                    assigned += 1
+            self.tree_table.assign(row, assigned)
 
         self.wood_serfs += assigned
         self.free_leibeigene -= assigned
@@ -2263,8 +2573,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         if self.free_leibeigene < batch_size:
             return False
         # Mindestens 1 Baum mit Ressourcen in dieser Zone
-        zone_data = self.wood_zone_categories[zone_name]
-        return any(t["resource_remaining"] > 0 for t in zone_data["trees"])
+        return self.tree_table.zone_has_live(zone_name)
 
     def _can_recall_wood_zone_batch(self, zone_name: str, batch_size: int) -> bool:
         """Prüft ob batch_size Serfs von einer Holz-Zone zurückgerufen werden können."""
@@ -2284,11 +2593,10 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         if not zone_data:
             return
 
-        # Finde verfügbare Bäume, sortiert nach Distanz zum Zonenzentrum (nächste zuerst)
-        available_trees = [t for t in zone_data["trees"] if t["resource_remaining"] > 0]
-        available_trees.sort(key=lambda t: t["dist"])
+        # Verfügbare Bäume, sortiert nach Distanz zum Zonenzentrum (nächste zuerst)
+        available_trees = self.tree_table.zone_live_rows(zone_name)
 
-        if not available_trees:
+        if not len(available_trees):
             return
 
         assigned = 0
@@ -2298,12 +2606,13 @@ class SiedlerScharfschuetzenEnv(gym.Env):
                 break
             if serf.is_idle():
                 # Verteile Serfs auf verschiedene Bäume (spread)
-                tree = available_trees[tree_idx % len(available_trees)]
-                target_pos = Position(x=tree["x"], y=tree["y"])
+                row = int(available_trees[tree_idx % len(available_trees)])
+                x, y = self.tree_table.position(row)
+                target_pos = Position(x=x, y=y)
                 hq_pos = Position(x=self.hq_position[0], y=self.hq_position[1])
                 serf.assign_to_resource(ResourceType.WOOD, target_pos, hq_pos, None)
                 serf.work_location = f"wood_zone_{zone_name}"  # Zone-spezifisch
-                tree["serfs_assigned"] += 1
+                self.tree_table.assign(row)
                 assigned += 1
                 tree_idx += 1
 
@@ -2341,41 +2650,33 @@ class SiedlerScharfschuetzenEnv(gym.Env):
 
         Returns: Anzahl erfolgreich zugewiesener Serfs
         """
-        import math
         reassigned = 0
+        if num_serfs <= 0:
+            return 0
 
-        # Finde alle Bäume im Suchradius, sortiert nach Distanz
-        trees_in_radius = []
-        for i, tree in enumerate(self.tree_list_internal):
-            if tree["resource_remaining"] > 0:
-                dx = tree["x"] - from_x
-                dy = tree["y"] - from_y
-                distance = math.sqrt(dx*dx + dy*dy)
-                if distance <= SERF_SEARCH_RADIUS:
-                    trees_in_radius.append((distance, i, tree))
+        # Einen arbeitenden Serf suchen der umgeleitet werden kann
+        wood_serf = None
+        for serf in self.production_system.serfs:
+            if serf.target_resource and serf.target_resource.value == "wood":
+                wood_serf = serf
+                break
+        if wood_serf is None:
+            return 0
 
-        # Sortiere nach Distanz (nächster zuerst)
-        trees_in_radius.sort(key=lambda x: x[0])
+        from worker_simulation import Position
+        from production_system import ResourceType
+        hq_pos = Position(x=self.hq_position[0], y=self.hq_position[1])
 
-        # Weise Serfs den nächsten Bäumen zu
-        for _, tree_idx, tree in trees_in_radius:
+        # Lebende Bäume im Suchradius, nächster zuerst
+        for row in self.tree_table.live_in_radius(from_x, from_y, SERF_SEARCH_RADIUS):
             if reassigned >= num_serfs:
                 break
-            # Finde einen arbeitenden Serf der umgeleitet werden kann
-            for serf in self.production_system.serfs:
-                if reassigned >= num_serfs:
-                    break
-                if serf.target_resource and serf.target_resource.value == "wood":
-                    # Serf zum neuen Baum schicken
-                    from worker_simulation import Position
-                    from production_system import ResourceType
-                    target_pos = Position(x=tree["x"], y=tree["y"])
-                    hq_pos = Position(x=self.hq_position[0], y=self.hq_position[1])
-                    serf.assign_to_resource(ResourceType.WOOD, target_pos, hq_pos, None)
-                    serf.work_location = "wood"  # Behalte work_location
-                    tree["serfs_assigned"] += 1
-                    reassigned += 1
-                    break
+            # Serf zum neuen Baum schicken
+            x, y = self.tree_table.position(row)
+            wood_serf.assign_to_resource(ResourceType.WOOD, Position(x=x, y=y), hq_pos, None)
+            wood_serf.work_location = "wood"  # Behalte work_location
+            self.tree_table.assign(row)
+            reassigned += 1
 
         return reassigned
 
@@ -2433,7 +2734,6 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         """Weist batch_size Serfs zu einer Vorkommen-Kategorie zu."""
         from worker_simulation import Position
         from production_system import ResourceType
-        import random
 
         resource_type_map = {
             "Eisen": ResourceType.IRON,
@@ -2459,8 +2759,8 @@ class SiedlerScharfschuetzenEnv(gym.Env):
             if assigned >= batch_size:
                 break
             if serf.is_idle():
-                # Zufällig ein Deposit wählen
-                deposit = random.choice(available_deposits)
+                # Zufällig ein Deposit wählen (über np_random -> reproduzierbar mit Seed)
+                deposit = available_deposits[self.np_random.integers(len(available_deposits))]
                 target_pos = Position(x=deposit["x"], y=deposit["y"])
                 hq_pos = Position(x=self.hq_position[0], y=self.hq_position[1])
                 serf.assign_to_resource(resource_type, target_pos, hq_pos, None)
@@ -2766,6 +3066,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
                 assigned += 1
 
         target_site["serfs_assigned"] += assigned
+        self._reschedule_site(target_site)
         self.free_leibeigene -= assigned
 
     def _can_recall_build_batch(self, batch_size: int) -> bool:
@@ -2784,6 +3085,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
                 for site in self.construction_sites:
                     if site["site_id"] == serf.build_site_id:
                         site["serfs_assigned"] = max(0, site["serfs_assigned"] - 1)
+                        self._reschedule_site(site)
                         break
                 serf.stop()
                 recalled += 1
@@ -2792,19 +3094,154 @@ class SiedlerScharfschuetzenEnv(gym.Env):
 
     def _release_serfs_from_site(self, site: dict):
         """Gibt alle Serfs einer fertiggestellten Baustelle frei."""
-        released = 0
-        for serf in self.production_system.serfs:
-            if serf.build_site_id == site["site_id"]:
-                serf.stop()
-                released += 1
-        self.free_leibeigene += released
+        released = self.production_system.serfs.at_build_site(site["site_id"])
+        for serf in released:
+            serf.stop()
+        self.free_leibeigene += len(released)
 
     def _get_active_construction_sites(self) -> int:
         """Gibt Anzahl aktiver Baustellen zurück."""
         return len(self.construction_sites)
 
+    # =========================================================================
+    # ACTION-DEKODIERUNG (einmal pro Env kompiliert)
+    # =========================================================================
+
+    def _compile_action_tables(self):
+        """
+        Baut die Dekodier-Tabellen für beide Action-Spaces.
+
+        Multi-Step: Haupt-Index -> (Name, Handler, Auswahl-Tabellen); jede
+        Auswahl-Tabelle bildet den Index einer Phase auf das Handler-Argument
+        ab (None = Index selbst). Legacy: flacher Index -> (Handler, Argumente).
+        Handler sind ungebundene Methoden und werden mit (env, *args) aufgerufen.
+        """
+        cls = type(self)
+        buildable = tuple(self.buildable_buildings)
+        selection_values = {
+            ActionPhase.TECH: (tuple(self.tech_list), None),
+            ActionPhase.SOLDIER: (tuple(self.soldier_types), None),
+            ActionPhase.QUANTITY: (QUANTITY_VALUES, QUANTITY_VALUES[-1]),
+            ActionPhase.SOURCE: (tuple(SERF_AREA_BY_VALUE.get(i) for i in range(self.action_spaces[ActionPhase.SOURCE].n)), None),
+            ActionPhase.TARGET: (tuple(SERF_AREA_BY_VALUE.get(i) for i in range(self.action_spaces[ActionPhase.TARGET].n)), None),
+            ActionPhase.CATEGORY: (tuple(c if c in BLESS_CATEGORIES else None for c in range(self.action_spaces[ActionPhase.CATEGORY].n)), None),
+            ActionPhase.TAX_LEVEL: (tuple(t if t in TAX_LEVELS else None for t in range(self.action_spaces[ActionPhase.TAX_LEVEL].n)), None),
+            ActionPhase.ON_OFF: ((0, 1), 1),  # alles außer 0 = Alarm AUS
+            ActionPhase.POSITION: (None, None),
+        }
+        building_values = {
+            "build": (buildable, None),
+            "upgrade": (tuple(self.upgradeable_buildings), None),
+            "demolish": (buildable, None),
+        }
+        handlers = {
+            "wait": cls._do_wait, "build": cls._do_build, "upgrade": cls._do_upgrade,
+            "research": cls._do_research, "recruit": cls._do_recruit, "buy_serf": cls._do_buy_serf,
+            "dismiss_serf": cls._do_dismiss_serf, "assign_serf": cls._do_move_serfs,
+            "demolish": cls._do_demolish, "bless": cls._do_bless, "tax": cls._do_tax, "alarm": cls._do_alarm,
+        }
+
+        self._flow_table = {}
+        for action_name, phases in ACTION_FLOWS.items():
+            tables = tuple((phase,) + (building_values[action_name] if phase == ActionPhase.BUILDING
+                                       else selection_values[phase])
+                           for phase in phases[1:])
+            self._flow_table[action_name] = (handlers[action_name], tables)
+        self._main_decode = tuple((name,) + self._flow_table[name] for name in MAIN_ACTIONS)
+
+        # Legacy: ein Eintrag pro flachem Index (Layout wie get_action_mask)
+        legacy = [(cls._do_wait, ())]
+        legacy += [(cls._do_build_batch, (b, n)) for b in buildable for n in self.build_batch_sizes]
+        legacy += [(cls._do_upgrade, (b,)) for b in self.upgradeable_buildings]
+        legacy += [(cls._do_research, (t,)) for t in self.tech_list]
+        legacy += [(cls._do_recruit, (s, 1)) for s in self.soldier_types]
+        for names, can, do in (
+                (self.wood_zone_names, cls._can_assign_wood_zone_batch, cls._assign_wood_zone_batch),
+                (self.wood_zone_names, cls._can_recall_wood_zone_batch, cls._recall_wood_zone_batch),
+                (self.deposit_category_names, cls._can_assign_deposit_batch, cls._assign_deposit_batch),
+                (self.deposit_category_names, cls._can_recall_deposit_batch, cls._recall_deposit_batch),
+                (self.shaft_category_names, cls._can_assign_shaft_batch, cls._assign_shaft_batch),
+                (self.shaft_category_names, cls._can_recall_shaft_batch, cls._recall_shaft_batch)):
+            legacy += [(cls._do_guarded, (can, do, name, n)) for name in names for n in self.resource_batch_sizes]
+        legacy += [(cls._do_buy_serf, (n,)) for n in self.serf_batch_sizes]
+        legacy += [(cls._do_dismiss_serf, (None, n)) for n in self.serf_batch_sizes]
+        legacy += [(cls._do_recruit, (s, n)) for s in self.scharfschuetzen_types for n in self.scharfschuetzen_batch_sizes]
+        legacy += [(cls._do_demolish, (b,)) for b in buildable]
+        legacy += [(cls._do_bless, (c,)) for c in BLESS_CATEGORIES]
+        legacy += [(cls._do_tax, (t,)) for t in TAX_LEVELS]
+        legacy += [(cls._do_alarm, (0,)), (cls._do_alarm, (1,))]
+        legacy += [(cls._do_guarded, (cls._can_assign_build_batch, cls._assign_build_batch, n))
+                   for n in self.build_serf_batch_sizes]
+        legacy += [(cls._do_guarded, (cls._can_recall_build_batch, cls._recall_build_batch, n))
+                   for n in self.build_serf_batch_sizes]
+        assert len(legacy) == self.total_actions, (len(legacy), self.total_actions)
+        self._legacy_decode = tuple(legacy)
+
+    @staticmethod
+    def _decode_selection(values, default, index):
+        """Index einer Phase -> Argument (außerhalb des Spaces: default)."""
+        if values is None:
+            return index
+        return values[index] if 0 <= index < len(values) else default
+
+    def decode_action(self, actions) -> Tuple[str, object, tuple]:
+        """
+        Dekodiert einen kompletten Flow (Haupt-Index, Auswahl Phase 1, ...) in einem Aufruf.
+
+        Fehlende Auswahlen zählen als 0, wie im schrittweisen Flow.
+
+        Returns:
+            (action_name, handler, args) - Ausführen mit handler(env, *args)
+        """
+        main = actions[0]
+        if main >= len(MAIN_ACTIONS):
+            main = 0
+        action_name, handler, tables = self._main_decode[main]
+        args = tuple(self._decode_selection(values, default, actions[i + 1] if i + 1 < len(actions) else 0)
+                     for i, (_phase, values, default) in enumerate(tables))
+        return action_name, handler, args
+
+    @timed("step")
+    def step_flat(self, actions):
+        """
+        Schneller Pfad: führt einen kompletten Flow in einem Aufruf aus.
+
+        Gleiches Ergebnis wie die einzelnen step()-Aufrufe (Haupt-Aktion,
+        dann je Phase eine Auswahl), ohne Zwischen-Beobachtungen.
+        """
+        if self.current_phase != ActionPhase.MAIN:
+            raise RuntimeError(f"step_flat nur in Phase MAIN möglich (aktuell: {self.current_phase.value})")
+        action_name, handler, args = self.decode_action(actions)
+        reward = handler(self, *args)
+        self.flow_step = len(ACTION_FLOWS[action_name]) if len(ACTION_FLOWS[action_name]) > 1 else 0
+        return self._finish_step(action_name, reward)
+
+    def decode_legacy_action(self, action: int) -> Tuple[object, tuple]:
+        """Flacher Index (Legacy Discrete(total_actions)) -> (handler, args)."""
+        return self._legacy_decode[action]
+
+    def execute_legacy_action(self, action: int) -> float:
+        """Führt einen flachen Legacy-Index aus (ohne Zeitsimulation)."""
+        handler, args = self._legacy_decode[action]
+        return handler(self, *args)
+
+    @timed("step")
     def step(self, action):
         """Multi-Step Action Flow."""
+        completed = self._apply_step_action(action)
+        if completed is None:
+            obs = self._get_observation()
+            return obs, 0.0, False, False, {"multi_step": True, "phase": self.current_phase.value}
+        return self._finish_step(*completed)
+
+    def _apply_step_action(self, action) -> Optional[Tuple[str, float]]:
+        """
+        Nimmt die Auswahl der aktuellen Phase an, ohne Zeitsimulation.
+
+        Returns:
+            None wenn der Flow noch eine Phase erwartet, sonst
+            (action_name, reward) der ausgeführten Aktion
+        """
         # =================================================================
         # MULTI-STEP FLOW MANAGEMENT
         # =================================================================
@@ -2825,8 +3262,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
                 self.flow_step = 1
                 self.current_phase = flow_phases[1]
                 self.action_space = self.action_spaces[self.current_phase]
-                obs = self._get_observation()
-                return obs, 0.0, False, False, {"multi_step": True, "phase": self.current_phase.value}
+                return None
         else:
             action_name = self.current_flow
             self.pending_selections[self.current_phase] = action
@@ -2840,15 +3276,33 @@ class SiedlerScharfschuetzenEnv(gym.Env):
             else:
                 self.current_phase = flow_phases[self.flow_step]
                 self.action_space = self.action_spaces[self.current_phase]
-                obs = self._get_observation()
-                return obs, 0.0, False, False, {"multi_step": True, "phase": self.current_phase.value}
+                return None
 
+        return action_name, reward
+
+    def _finish_step(self, action_name, reward):
+        """Abschluss einer kompletten Aktion: zurück zu MAIN und Zeitsimulation."""
         # Zurueck zu MAIN Phase
         self.action_space = self.action_spaces[ActionPhase.MAIN]
 
         # Zeitsimulation (nur wenn Aktion komplett)
+        start_time = self.current_time
+        self._advance_step_time(action_name)
+        reward, terminated, info = self._step_outcome(action_name, reward, start_time)
+        return self._get_observation(), reward, terminated, False, info
+
+    def _advance_step_time(self, action_name: str):
+        """Spielzeit nach einer kompletten Aktion: Vorspulen (wait), Ereignis- oder fester Tick."""
+        if self.idle_fast_forward and action_name == "wait":
+            self._fast_forward_idle()
+        elif self.time_mode == "event":
+            self._tick_event(TIME_STEP)
+        else:
+            self._tick_time()
+
+    def _step_outcome(self, action_name: str, reward: float, start_time: int) -> Tuple[float, bool, dict]:
+        """Historie, Info und Episodenende nach der Zeitsimulation -> (reward, terminated, info)."""
         info = {}
-        self._tick_time()
         efficiency = self.workforce_manager.get_average_efficiency()
         exhausted_ratio = self.workforce_manager.get_exhausted_ratio()
         completed_action = action_name
@@ -2856,116 +3310,113 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         info["action_name"] = completed_action
         info["efficiency"] = efficiency
         info["exhausted_ratio"] = exhausted_ratio
+        info["elapsed_time"] = self.current_time - start_time
         terminated = self.current_time >= self.max_time
         if terminated:
             reward += self.scharfschuetzen * 20.0
-        return self._get_observation(), reward, terminated, False, info
+            info["episode_summary"] = self.episode_summary()
+        return reward, terminated, info
 
     def _execute_action(self, action_name, selections):
         """Fuehrt die komplette Aktion aus basierend auf Selections."""
-        if action_name == "wait":
+        entry = self._flow_table.get(action_name)
+        if entry is None:
             return 0.0
-        elif action_name == "build":
-            building_idx = selections.get(ActionPhase.BUILDING, 0)
-            if building_idx < len(self.buildable_buildings):
-                building = self.buildable_buildings[building_idx]
+        handler, tables = entry
+        decode = self._decode_selection
+        return handler(self, *[decode(values, default, selections.get(phase, 0))
+                               for phase, values, default in tables])
+
+    # --- Handler (Argumente bereits dekodiert, None = ungültiger Index) ---
+    def _do_wait(self):
+        return 0.0
+
+    def _do_build(self, building, position_idx=0):
+        if building is not None and self._can_build(building):
+            return self._build_building(building, position_idx)
+        return 0.0
+
+    def _do_build_batch(self, building, batch_size):
+        reward = 0.0
+        if self._can_build_batch(building, batch_size):
+            for _ in range(batch_size):
                 if self._can_build(building):
-                    return self._build_building(building)
-            return 0.0
-        elif action_name == "upgrade":
-            building_idx = selections.get(ActionPhase.BUILDING, 0)
-            if building_idx < len(self.upgradeable_buildings):
-                building = self.upgradeable_buildings[building_idx]
-                if self._can_upgrade(building):
-                    return self._upgrade_building(building)
-            return 0.0
-        elif action_name == "research":
-            tech_idx = selections.get(ActionPhase.TECH, 0)
-            if tech_idx < len(self.tech_list):
-                tech = self.tech_list[tech_idx]
-                if self._can_research(tech):
-                    return self._research_tech(tech)
-            return 0.0
-        elif action_name == "recruit":
-            soldier_idx = selections.get(ActionPhase.SOLDIER, 0)
-            quantity_idx = selections.get(ActionPhase.QUANTITY, 0)
-            quantity = [1, 2, 3, 5, 10, 20][min(quantity_idx, 5)]
-            if soldier_idx < len(self.soldier_types):
-                soldier = self.soldier_types[soldier_idx]
-                reward = 0.0
-                for _ in range(quantity):
-                    if self._can_recruit(soldier):
-                        reward += self._recruit_soldier(soldier)
-                return reward
-            return 0.0
-        elif action_name == "buy_serf":
-            quantity_idx = selections.get(ActionPhase.QUANTITY, 0)
-            quantity = [1, 2, 3, 5, 10, 20][min(quantity_idx, 5)]
-            reward = 0.0
-            for _ in range(quantity):
-                if self._can_buy_serf():
-                    reward += self._buy_serf()
-            return reward
-        elif action_name == "dismiss_serf":
-            source_idx = selections.get(ActionPhase.SOURCE, 0)
-            quantity_idx = selections.get(ActionPhase.QUANTITY, 0)
-            quantity = [1, 2, 3, 5, 10, 20][min(quantity_idx, 5)]
-            reward = 0.0
-            for _ in range(quantity):
-                if self._can_dismiss_serf():
-                    reward += self._dismiss_serf()
-            return reward
-        elif action_name == "assign_serf":
-            source_idx = selections.get(ActionPhase.SOURCE, 0)
-            quantity_idx = selections.get(ActionPhase.QUANTITY, 0)
-            target_idx = selections.get(ActionPhase.TARGET, 0)
-            quantity = [1, 2, 3, 5, 10, 20][min(quantity_idx, 5)]
-            return self._do_assign_serf(source_idx, quantity, target_idx)
-        elif action_name == "demolish":
-            building_idx = selections.get(ActionPhase.BUILDING, 0)
-            if building_idx < len(self.buildable_buildings):
-                building = self.buildable_buildings[building_idx]
-                if self._can_demolish(building):
-                    return self._demolish_building(building)
-            return 0.0
-        elif action_name == "bless":
-            category_idx = selections.get(ActionPhase.CATEGORY, 0)
-            if category_idx in BLESS_CATEGORIES and self._can_bless(category_idx):
-                return self._bless(category_idx)
-            return 0.0
-        elif action_name == "tax":
-            tax_level = selections.get(ActionPhase.TAX_LEVEL, 0)
-            if tax_level != self.current_tax_level and tax_level in TAX_LEVELS:
-                return self._set_tax_level(tax_level)
-            return 0.0
-        elif action_name == "alarm":
-            on_off = selections.get(ActionPhase.ON_OFF, 0)
-            if on_off == 0:
-                if not self.alarm_active and self.alarm_cooldown <= 0:
-                    self.alarm_active = True
-            else:
-                if self.alarm_active:
-                    self.alarm_active = False
-                    self.alarm_cooldown = ALARM_RECHARGE_TIME
+                    reward += self._build_building(building)
+        return reward
+
+    def _do_upgrade(self, building, position_idx=0):
+        if building is not None and self._can_upgrade(building):
+            return self._upgrade_building(building)
+        return 0.0
+
+    def _do_research(self, tech):
+        if tech is not None and self._can_research(tech):
+            return self._research_tech(tech)
+        return 0.0
+
+    def _do_recruit(self, soldier, quantity):
+        if soldier is None:
             return 0.0
+        reward = 0.0
+        for _ in range(quantity):
+            if self._can_recruit(soldier):
+                reward += self._recruit_soldier(soldier)
+        return reward
+
+    def _do_buy_serf(self, quantity):
+        reward = 0.0
+        for _ in range(quantity):
+            if self._can_buy_serf():
+                reward += self._buy_serf()
+        return reward
+
+    def _do_dismiss_serf(self, source_area, quantity):
+        reward = 0.0
+        for _ in range(quantity):
+            if self._can_dismiss_serf():
+                reward += self._dismiss_serf()
+        return reward
+
+    def _do_demolish(self, building, position_idx=0):
+        if building is not None and self._can_demolish(building):
+            return self._demolish_building(building)
+        return 0.0
+
+    def _do_bless(self, category):
+        if category is not None and self._can_bless(category):
+            return self._bless(category)
+        return 0.0
+
+    def _do_tax(self, tax_level):
+        if tax_level is not None and tax_level != self.current_tax_level:
+            return self._set_tax_level(tax_level)
+        return 0.0
+
+    def _do_alarm(self, on_off):
+        if on_off == 0:
+            if not self.alarm_active and self.alarm_cooldown <= 0:
+                self.alarm_active = True
+        else:
+            if self.alarm_active:
+                self.alarm_active = False
+                self.alarm_cooldown = ALARM_RECHARGE_TIME
+        return 0.0
+
+    def _do_guarded(self, can, do, *args):
+        """Legacy-Batch-Aktionen: do(env, *args) nur wenn can(env, *args)."""
+        if can(self, *args):
+            do(self, *args)
         return 0.0
 
     def _do_assign_serf(self, source_idx, quantity, target_idx):
+        """Leibeigene von source_area nach target_area verschieben (Bereichs-Indizes)."""
+        return self._do_move_serfs(SERF_AREA_BY_VALUE.get(source_idx), quantity,
+                                   SERF_AREA_BY_VALUE.get(target_idx))
+
+    def _do_move_serfs(self, source_area, quantity, target_area):
         """Leibeigene von source_area nach target_area verschieben."""
         reward = 0.0
-        source_area = None
-        for area in SerfArea:
-            if area.value == source_idx:
-                source_area = area
-                break
-        if source_area is None:
-            return 0.0
-        target_area = None
-        for area in SerfArea:
-            if area.value == target_idx:
-                target_area = area
-                break
-        if target_area is None:
+        if source_area is None or target_area is None:
             return 0.0
         available = self.serf_areas.get(source_area, {}).get("count", 0)
         actual_quantity = min(quantity, available)
@@ -2975,23 +3426,18 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         if target_area not in self.serf_areas:
             self.serf_areas[target_area] = {"count": 0}
         self.serf_areas[target_area]["count"] += actual_quantity
-        if target_area in [SerfArea.WOOD_HQ, SerfArea.WOOD_SULFUR, SerfArea.WOOD_CLAY,
-                           SerfArea.WOOD_STONE, SerfArea.WOOD_VILLAGE, SerfArea.WOOD_IRON]:
-            zone_map = {
-                SerfArea.WOOD_HQ: 0, SerfArea.WOOD_SULFUR: 1, SerfArea.WOOD_CLAY: 2,
-                SerfArea.WOOD_STONE: 3, SerfArea.WOOD_VILLAGE: 4, SerfArea.WOOD_IRON: 5,
-            }
-            zone_idx = zone_map.get(target_area, 0)
-            if zone_idx < len(self.wood_zone_names):
-                zone_name = self.wood_zone_names[zone_idx]
-                if self._can_assign_wood_zone_batch(zone_name, actual_quantity):
-                    self._assign_wood_zone_batch(zone_name, actual_quantity)
+        zone_idx = WOOD_AREA_ZONES.get(target_area)
+        if zone_idx is not None and zone_idx < len(self.wood_zone_names):
+            zone_name = self.wood_zone_names[zone_idx]
+            if self._can_assign_wood_zone_batch(zone_name, actual_quantity):
+                self._assign_wood_zone_batch(zone_name, actual_quantity)
         if source_area == SerfArea.FREE:
             self.free_leibeigene = max(0, self.free_leibeigene - actual_quantity)
         if target_area == SerfArea.FREE:
             self.free_leibeigene += actual_quantity
         return reward
 
+    @timed("action_masks")
     def action_masks(self):
         """Dynamische Maske basierend auf aktueller Phase."""
         if self.current_phase == ActionPhase.MAIN:
@@ -3021,33 +3467,29 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         return np.ones(size, dtype=bool)
 
     def _mask_main_actions(self):
-        """Maske fuer die 12 Hauptaktionen."""
+        """Maske fuer die 12 Hauptaktionen (abgeleitet aus der gecachten flachen Maske)."""
+        flat = self.get_action_mask()
+        n_build_batch = len(self.build_batch_sizes)
         mask = np.ones(12, dtype=bool)
         # 0=wait immer erlaubt
-        # 1=build: nur wenn Ressourcen und Positionen vorhanden
-        can_build_any = any(self._can_build(b) for b in self.buildable_buildings)
-        mask[1] = can_build_any
+        # 1=build: nur wenn Ressourcen und Positionen vorhanden (Batch x1 == _can_build)
+        build_x1 = flat[self.offset_build_batch:self.offset_upgrade:n_build_batch]
+        mask[1] = build_x1.any()
         # 2=upgrade: nur wenn upgradeable Gebaeude vorhanden
-        can_upgrade_any = any(self._can_upgrade(b) for b in self.upgradeable_buildings)
-        mask[2] = can_upgrade_any
-        # 3=research: nur wenn Hochschule vorhanden und Tech verfuegbar
-        has_university = (self.buildings.get("Hochschule_1", 0) > 0 or
-                         self.buildings.get("Hochschule_2", 0) > 0)
-        can_research_any = has_university and any(self._can_research(t) for t in self.tech_list)
-        mask[3] = can_research_any
+        mask[2] = flat[self.offset_upgrade:self.offset_tech].any()
+        # 3=research: _can_research prueft bereits die Hochschule
+        mask[3] = flat[self.offset_tech:self.offset_recruit].any()
         # 4=recruit: nur wenn Kaserne/Schmiede vorhanden
-        can_recruit_any = any(self._can_recruit(s) for s in self.soldier_types)
-        mask[4] = can_recruit_any
+        mask[4] = flat[self.offset_recruit:self.offset_resource_batch].any()
         # 5=buy_serf
-        mask[5] = self._can_buy_serf()
+        mask[5] = bool(flat[self.offset_serf])
         # 6=dismiss_serf
-        mask[6] = self._can_dismiss_serf()
+        mask[6] = bool(flat[self.offset_serf + len(self.serf_batch_sizes)])
         # 7=assign_serf: nur wenn freie Leibeigene vorhanden
         has_assignable = any(self.serf_areas.get(a, {}).get("count", 0) > 0 for a in SerfArea)
         mask[7] = has_assignable
         # 8=demolish: nur wenn Gebaeude vorhanden
-        can_demolish_any = any(self._can_demolish(b) for b in self.buildable_buildings)
-        mask[8] = can_demolish_any
+        mask[8] = flat[self.offset_demolish:self.offset_bless].any()
         # 9=bless
         mask[9] = self._can_bless()
         # 10=tax: immer erlaubt
@@ -3059,10 +3501,8 @@ class SiedlerScharfschuetzenEnv(gym.Env):
     def _mask_buildings(self):
         """Maske fuer Gebaeude-Auswahl."""
         if self.current_flow == "build":
-            mask = np.zeros(len(self.buildable_buildings), dtype=bool)
-            for i, b in enumerate(self.buildable_buildings):
-                mask[i] = self._can_build(b)
-            return mask
+            flat = self.get_action_mask()
+            return flat[self.offset_build_batch:self.offset_upgrade:len(self.build_batch_sizes)].astype(bool)
         elif self.current_flow == "upgrade":
             mask = np.zeros(len(self.buildable_buildings), dtype=bool)
             for i, b in enumerate(self.upgradeable_buildings):
@@ -3070,40 +3510,48 @@ class SiedlerScharfschuetzenEnv(gym.Env):
                     mask[i] = self._can_upgrade(b)
             return mask
         elif self.current_flow == "demolish":
-            mask = np.zeros(len(self.buildable_buildings), dtype=bool)
-            for i, b in enumerate(self.buildable_buildings):
-                mask[i] = self._can_demolish(b)
-            return mask
+            flat = self.get_action_mask()
+            return flat[self.offset_demolish:self.offset_bless].astype(bool)
         size = self.action_spaces[ActionPhase.BUILDING].n
         return np.ones(size, dtype=bool)
 
     def _mask_positions(self):
-        """Maske fuer Positions-Auswahl."""
+        """Maske fuer Positions-Auswahl.
+
+        Position i = available_positions[i]. Beim Bauen wird per buildable_map
+        (Summed-Area-Tables) in einer Array-Operation geprüft, ob das gewählte
+        Gebäude an den Plätzen Platz hat.
+        """
         mask = np.zeros(2200, dtype=bool)
-        # Vereinfacht: erste N Positionen erlaubt basierend auf verfuegbaren Plaetzen
-        n_available = len(self.available_positions)
-        for i in range(min(n_available, 2200)):
-            mask[i] = True
+        n_available = min(len(self.available_positions), 2200)
+        mask[:n_available] = True
+
+        if n_available and self.current_flow == "build":
+            building_idx = self.pending_selections.get(ActionPhase.BUILDING, 0)
+            if building_idx < len(self.buildable_buildings):
+                building = self.buildable_buildings[building_idx]
+                if not buildings_db[building].get("mine_type"):
+                    buildable = self.map_manager.buildable_map(get_base_building_name(building))
+                    cells = np.array([self.map_manager.world_to_cell(p["x"], p["y"])
+                                      for p in self.available_positions[:n_available]])
+                    xs, ys = cells[:, 0], cells[:, 1]
+                    inside = (xs >= 0) & (xs < buildable.shape[1]) & (ys >= 0) & (ys < buildable.shape[0])
+                    mask[:n_available] = inside & buildable[np.where(inside, ys, 0), np.where(inside, xs, 0)]
+
         if not mask.any():
             mask[0] = True  # Mindestens eine Position
         return mask
 
     def _mask_technologies(self):
         """Maske fuer Technologie-Auswahl."""
-        mask = np.zeros(len(self.tech_list), dtype=bool)
-        for i, tech in enumerate(self.tech_list):
-            if i < mask.shape[0]:
-                mask[i] = self._can_research(tech)
+        mask = self.get_action_mask()[self.offset_tech:self.offset_recruit].astype(bool)
         if not mask.any():
             mask[0] = True
         return mask
 
     def _mask_soldiers(self):
         """Maske fuer Soldaten-Auswahl."""
-        mask = np.zeros(len(self.soldier_types), dtype=bool)
-        for i, soldier in enumerate(self.soldier_types):
-            if i < mask.shape[0]:
-                mask[i] = self._can_recruit(soldier)
+        mask = self.get_action_mask()[self.offset_recruit:self.offset_resource_batch].astype(bool)
         if not mask.any():
             mask[0] = True
         return mask
@@ -3143,10 +3591,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
 
     def _mask_bless_categories(self):
         """Maske fuer Segen-Kategorien."""
-        mask = np.zeros(len(BLESS_CATEGORIES), dtype=bool)
-        for i in range(len(BLESS_CATEGORIES)):
-            if i in BLESS_CATEGORIES:
-                mask[i] = self._can_bless(i)
+        mask = self.get_action_mask()[self.offset_bless:self.offset_tax].astype(bool)
         if not mask.any():
             mask[0] = True
         return mask
@@ -3156,7 +3601,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         mask = np.ones(len(TAX_LEVELS), dtype=bool)
         return mask
 
-    def _build_building(self, building):
+    def _build_building(self, building, position_idx: int = 0):
         """
         Startet ein Bauprojekt. Erstellt eine Baustelle die Leibeigene braucht.
 
@@ -3178,7 +3623,9 @@ class SiedlerScharfschuetzenEnv(gym.Env):
                 self.built_mines[mine_type].append(position)
         else:
             if self.available_positions:
-                position = self.available_positions.pop(0)
+                if position_idx >= len(self.available_positions):
+                    position_idx = 0
+                position = self.available_positions.pop(position_idx)
                 self.used_positions.append(position)
 
         # NEU: Erstelle Baustelle statt direkt zur Queue
@@ -3190,7 +3637,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
             "serfs_assigned": 0,
             "site_id": self.next_site_id,
         }
-        self.construction_sites.append(site)
+        self.completion_scheduler.add(SCHEDULE_SITE, site, site["remaining_work"], self._site_rate(site))
         self.next_site_id += 1
 
         # MINIMALER REWARD: Agent soll selbst die optimale Strategie finden
@@ -3203,7 +3650,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         for resource, amount in b_info["upgrade_cost"].items():
             self.resources[resource] -= amount
 
-        self.upgrade_queue.append((building, new_building, b_info["upgrade_time"]))
+        self.completion_scheduler.add(SCHEDULE_UPGRADE, (building, new_building), b_info["upgrade_time"])
 
         # MINIMALER REWARD: Agent soll selbst die optimale Strategie finden
         return 0.0
@@ -3237,7 +3684,8 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         for resource, amount in tech_info["cost"].items():
             self.resources[resource] -= amount
 
-        self.current_research = (tech, tech_info["research_time"])
+        self.completion_scheduler.add(SCHEDULE_RESEARCH, tech, tech_info["research_time"],
+                                      self._get_scholar_efficiency())
 
         # MINIMALER REWARD: Agent soll selbst die optimale Strategie finden
         return 0.0
@@ -3248,7 +3696,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         for resource, amount in s_info["cost"].items():
             self.resources[resource] -= amount
 
-        self.recruit_queue.append((soldier, s_info.get("train_time", 20)))
+        self.completion_scheduler.add(SCHEDULE_RECRUIT, soldier, s_info.get("train_time", 20))
 
         # HAUPT-REWARD: Nur Scharfschützen zählen!
         if "Scharfschützen" in soldier:
@@ -3300,11 +3748,14 @@ class SiedlerScharfschuetzenEnv(gym.Env):
             self.resources[resource] = self.resources.get(resource, 0) + refund
 
         # Position wieder freigeben
+        freed_pos = None
         for pos_key, pos in list(self.building_position_map.items()):
             if pos_key.startswith(building):
                 self.available_positions.append(pos)
                 del self.building_position_map[pos_key]
+                freed_pos = pos
                 break
+        self._unregister_workforce_building(building, freed_pos)
 
         return 0.0  # MINIMALER REWARD
 
@@ -3335,93 +3786,327 @@ class SiedlerScharfschuetzenEnv(gym.Env):
 
         return 0.0  # MINIMALER REWARD
 
+    # =========================================================================
+    # BÄUME (Nur-Lese-Sichten auf die Baum-Tabelle)
+    # =========================================================================
+
+    @property
+    def trees_list(self) -> tuple:
+        """Noch nicht reservierte Bäume aus PLAYER_1_TREES_NEAREST."""
+        trees = self.tree_table.trees
+        return tuple(PLAYER_1_TREES_NEAREST[trees["nearest_rank"][row]]
+                     for row in self.tree_table.unreserved_nearest())
+
+    @property
+    def tree_list_internal(self) -> tuple:
+        """Alle Zonen-Bäume flach (Kopien mit resource_remaining/serfs_assigned/zone)."""
+        return tuple(self.tree_table.tree_dicts(range(self._tree_layout.n_zone_trees)))
+
+    @property
+    def tree_id_mapping(self) -> Dict[int, int]:
+        return self.tree_table.tree_id_mapping()
+
+    # =========================================================================
+    # COUNTDOWNS (Nur-Lese-Sichten auf den CompletionScheduler)
+    # =========================================================================
+
+    @property
+    def construction_sites(self) -> tuple:
+        """Laufende Baustellen; remaining_work wird beim Lesen aktualisiert."""
+        now = self.completion_scheduler.now
+        sites = []
+        for entry in self.completion_scheduler.view(SCHEDULE_SITE):
+            entry.payload["remaining_work"] = entry.remaining_at(now)
+            sites.append(entry.payload)
+        return tuple(sites)
+
+    @property
+    def construction_queue(self) -> tuple:
+        now = self.completion_scheduler.now
+        return tuple((building, entry.remaining_at(now), pos)
+                     for entry in self.completion_scheduler.view(SCHEDULE_BUILD)
+                     for building, pos in (entry.payload,))
+
+    @property
+    def upgrade_queue(self) -> tuple:
+        now = self.completion_scheduler.now
+        return tuple((old_b, new_b, entry.remaining_at(now))
+                     for entry in self.completion_scheduler.view(SCHEDULE_UPGRADE)
+                     for old_b, new_b in (entry.payload,))
+
+    @property
+    def current_research(self) -> Optional[tuple]:
+        research = self.completion_scheduler.view(SCHEDULE_RESEARCH)
+        if not research:
+            return None
+        return (research[0].payload, research[0].remaining_at(self.completion_scheduler.now))
+
+    @property
+    def recruit_queue(self) -> tuple:
+        now = self.completion_scheduler.now
+        return tuple((entry.payload, entry.remaining_at(now))
+                     for entry in self.completion_scheduler.view(SCHEDULE_RECRUIT))
+
+    @staticmethod
+    def _site_rate(site: dict) -> float:
+        """Bau-Fortschritt pro Sekunde: 1 Serf = 1.0, jeder weitere +0.5; ohne Serfs 0."""
+        if site["serfs_assigned"] <= 0:
+            return 0
+        return 1.0 + 0.5 * (site["serfs_assigned"] - 1)
+
+    def _reschedule_site(self, site: dict):
+        """Plant eine Baustelle nach Änderung von serfs_assigned neu ein."""
+        for entry in self.completion_scheduler.view(SCHEDULE_SITE):
+            if entry.payload is site:
+                self.completion_scheduler.rekey(entry, self._site_rate(site))
+                return
+
+    def _sync_research_rate(self, tick: Optional[int] = None):
+        """Plant die Forschung neu ein, wenn sich die Gelehrten-Effizienz geändert hat."""
+        for entry in self.completion_scheduler.view(SCHEDULE_RESEARCH):
+            self.completion_scheduler.rekey(entry, self._get_scholar_efficiency(), tick)
+
+    # =========================================================================
+    # ZEIT-FORTSCHRITT (fixed / event)
+    # =========================================================================
+
+    def advance_time(self, seconds: int):
+        """Simuliert `seconds` Spielsekunden ohne Agenten-Entscheidung.
+
+        Im "event"-Modus wird jeweils bis vor das nächste Ereignis gesprungen
+        (siehe _tick_event); Ereignisse selbst laufen über den normalen
+        1-Sekunden-Tick -> identisches Ergebnis wie im "fixed"-Modus.
+        """
+        target = min(self.current_time + seconds, self.max_time)
+        while self.current_time < target:
+            if self.time_mode == "event":
+                self._tick_event(target - self.current_time)
+            else:
+                self._tick_time()
+
+    def _fast_forward_idle(self):
+        """Simuliert nach "wait" weiter bis zum nächsten entscheidungsrelevanten Ereignis.
+
+        Ereignisse: Fertigstellung im CompletionScheduler (Bau, Upgrade,
+        Forschung, Rekrutierung), frei gewordene Leibeigene, geänderte
+        Action-Maske (Ressourcen reichen für eine weitere Aktion, Cooldown
+        abgelaufen), MAX_IDLE_SECONDS erreicht oder Episodenende. Mindestens
+        ein Tick wie beim normalen wait; jeder Tick ist identisch zu einzelnen
+        waits. Die Eingaben der Maske ändern sich nur bei Ereignissen, Cooldown-
+        Enden, genug Glauben und Produktion; der "event"-Modus prüft die Maske
+        deshalb erst nach der nächsten dieser Sekunden wieder.
+        """
+        mask = self.get_action_mask()
+        revision = self.completion_scheduler.revision
+        free_serfs = self.free_leibeigene
+        deadline = self.current_time + MAX_IDLE_SECONDS
+        while True:
+            seconds = 1
+            idle = self.production_system.idle_ticks() if self.time_mode == "event" else 0
+            if idle > 0:
+                seconds = max(1, min(self._quiet_seconds(deadline - self.current_time),
+                                     self._seconds_until_unlock(), idle + 1))
+            self.advance_time(seconds)
+            if (self.current_time >= min(deadline, self.max_time)
+                    or self.completion_scheduler.revision != revision
+                    or self.free_leibeigene > free_serfs
+                    or not np.array_equal(self.get_action_mask(), mask)):
+                return
+
+    def _seconds_until_unlock(self) -> int:
+        """Sekunden bis ein Segen-/Alarm-Cooldown abläuft oder der Glaube für
+        einen Segen reicht (max_time wenn nichts davon ansteht)."""
+        waits = [c / TIME_STEP for c in self.bless_cooldowns.values() if c > 0]
+        if self.alarm_cooldown > 0:
+            waits.append(self.alarm_cooldown / TIME_STEP)
+        priests = PRIESTS_PER_MONASTERY * self._count_monasteries()
+        if priests > 0 and self.faith < BLESS_REQUIRED_FAITH:
+            waits.append((BLESS_REQUIRED_FAITH - self.faith) / (priests * TIME_STEP))
+        return int(np.ceil(min(waits))) if waits else self.max_time
+
+    def _tick_event(self, limit: int) -> int:
+        """Ein Schritt im "event"-Modus: bis vor das nächste Ereignis springen
+        (höchstens `limit` Sekunden) oder das Ereignis normal ticken.
+
+        Eine einzelne Sekunde tickt direkt: der normale Tick ist billiger als
+        Planung plus Fortschreibung.
+
+        Returns:
+            Simulierte Sekunden
+        """
+        quiet = self._quiet_seconds(limit) if limit > TIME_STEP else 0
+        if quiet > 0:
+            self._advance_quiet(quiet)
+            return quiet
+        self._tick_time()
+        return TIME_STEP
+
+    def _quiet_seconds(self, limit: int) -> int:
+        """Sekunden bis vor das nächste Ereignis (0 = der nächste Tick ist eins).
+
+        Ereignisse: Einkommen, fällige Countdowns im CompletionScheduler,
+        Worker-Übergänge (Hunger, Pause fertig, Ankunft), Serf-Ankunft,
+        leerlaufende Refiner-Inputs, geleerte Bäume und Vorkommen. Alles
+        dazwischen schreibt _advance_quiet() in einem Schritt fort.
+        """
+        quiet = [limit, INCOME_CYCLE - self.current_time % INCOME_CYCLE - 1]
+
+        # Forschung mit aktueller Gelehrten-Effizienz, dann frühester Fertigstellungs-Tick
+        self._sync_research_rate()
+        next_due = self.completion_scheduler.next_due()
+        if next_due is not None:
+            quiet.append(next_due - self.completion_scheduler.now - 1)
+
+        quiet.append(self.workforce_manager.quiet_ticks())
+        quiet.append(self.production_system.quiet_ticks())
+        if self.wood_serfs > 0:
+            quiet.append(self.tree_table.quiet_extractions(self._wood_per_tick()))
+        for category, cat_data in self.deposit_categories.items():
+            if cat_data["serfs_assigned"] > 0:
+                per_tick = self._deposit_per_tick(category, cat_data)
+                deposit = next((d for d in cat_data["deposits"] if d["remaining"] > 0), None)
+                if deposit is not None:
+                    quiet.append(int(deposit["remaining"] // per_tick) - 2)
+        return max(0, int(min(quiet)))
+
+    @timed("tick.quiet")
+    def _advance_quiet(self, seconds: int):
+        """Schreibt `seconds` ereignisfreie Sekunden fort (seconds <= _quiet_seconds()).
+
+        Cooldowns, Glaube, Timer und Extraktions-Zyklen sind ganzzahlig und
+        werden in einem Schritt fortgeschrieben. Gleitkomma-Ketten (WorkTime,
+        Laufwege, Lager, Restholz) laufen mit denselben Additionen pro
+        Sekunde wie in _tick_time, aber ohne dessen Übergangs-Prüfungen.
+        """
+        self._tick_clock(seconds)
+
+        # Keine Übergänge -> Motivation wirkt erst beim nächsten Ereignis-Tick
+        self.workforce_manager.set_motivation_modifier(self._get_total_motivation())
+        self.workforce_manager.advance_quiet(seconds)
+
+        # Produktion pro Sekunde wie in _tick_time gutschreiben
+        names = [RESOURCE_TYPE_NAMES.get(res_type) for res_type in ResourceType]
+        for amounts in self.production_system.advance_quiet(seconds):
+            for res_name, amount in zip(names, amounts):
+                if res_name:
+                    self.resources[res_name] = self.resources.get(res_name, 0) + amount
+
+        if self.wood_serfs > 0:
+            self.tree_table.extract_repeated(self._wood_per_tick(), seconds)
+        for category, cat_data in self.deposit_categories.items():
+            if cat_data["serfs_assigned"] > 0:
+                per_tick = self._deposit_per_tick(category, cat_data)
+                deposit = next((d for d in cat_data["deposits"] if d["remaining"] > 0), None)
+                if deposit is not None:
+                    remaining = deposit["remaining"]
+                    for _ in range(seconds):
+                        remaining -= min(remaining, per_tick)
+                    deposit["remaining"] = remaining
+
+    def _wood_per_tick(self) -> float:
+        """Restholz, das die Holz-Leibeigenen pro Tick von den Bäumen abziehen."""
+        # 2 Holz pro ~5.5s = ~0.36 Holz pro Sekunde pro Serf
+        wood_per_second = WOOD_PER_EXTRACTION / EXTRACTION_TIME_WOOD
+        return self.wood_serfs * wood_per_second * TIME_STEP
+
+    def _deposit_per_tick(self, category: str, cat_data: dict) -> float:
+        """Menge, die die Leibeigenen einer Kategorie pro Tick von Vorkommen abziehen."""
+        return cat_data["serfs_assigned"] * DEPOSIT_EXTRACTION_RATES.get(category, 0.2) * TIME_STEP
+
+    @timed("tick")
     def _tick_time(self):
-        self.current_time += TIME_STEP
+        """Eine Spielsekunde: Uhr und Cooldowns, Simulation, Einkommen, Fertigstellungen.
+
+        SiedlerVecEnv führt dieselben Teile aus, Uhr und Einkommen aber als
+        Array-Operation über alle Episoden (siehe vec_env.py).
+        """
+        perf = self.perf
+        if perf is not None:
+            perf.mark()
+        self._tick_clock()
+        self._tick_simulation(perf)
+        self._tick_income()
+        if perf is not None:
+            perf.lap("tick.income")
+        self._tick_completions()
+        if perf is not None:
+            perf.lap("tick.completions")
+
+    def _tick_clock(self, seconds: int = 1):
+        """Zeit, Scheduler-Uhr, Segen-/Alarm-Cooldowns und Glaube (exakt auch für seconds > 1)."""
+        self.current_time += seconds * TIME_STEP
+        self.completion_scheduler.advance(seconds)
 
         # NEU: Segnungs-Cooldown und Dauer ticken (pro Kategorie)
         for cat in BLESS_CATEGORIES:
             if self.bless_cooldowns.get(cat, 0) > 0:
-                self.bless_cooldowns[cat] = max(0, self.bless_cooldowns[cat] - TIME_STEP)
+                self.bless_cooldowns[cat] = max(0, self.bless_cooldowns[cat] - seconds * TIME_STEP)
             if self.bless_active_times.get(cat, 0) > 0:
-                self.bless_active_times[cat] = max(0, self.bless_active_times[cat] - TIME_STEP)
+                self.bless_active_times[cat] = max(0, self.bless_active_times[cat] - seconds * TIME_STEP)
 
         # NEU: Alarm-Cooldown ticken
         if self.alarm_cooldown > 0:
-            self.alarm_cooldown = max(0, self.alarm_cooldown - TIME_STEP)
+            self.alarm_cooldown = max(0, self.alarm_cooldown - seconds * TIME_STEP)
 
         # NEU: Faith generieren (durch Priester im Kloster)
-        total_monasteries = (self.buildings.get("Kloster_1", 0) +
-                            self.buildings.get("Kloster_2", 0) +
-                            self.buildings.get("Kloster_3", 0))
+        total_monasteries = self._count_monasteries()
         if total_monasteries > 0:
             # Faith pro Sekunde = Anzahl Priester (vereinfacht)
-            priests = total_monasteries * 6  # Vereinfacht: 6 pro Kloster
-            self.faith = min(self.faith + priests * TIME_STEP, BLESS_REQUIRED_FAITH * 5)
-
-        # NEU: Infrastruktur synchronisieren
-        self._sync_workforce_infrastructure()
+            priests = total_monasteries * PRIESTS_PER_MONASTERY
+            self.faith = min(self.faith + priests * TIME_STEP * seconds, BLESS_REQUIRED_FAITH * 5)
 
+    def _tick_simulation(self, perf=None):
+        """Worker, Produktion und Erschöpfung von Bäumen/Vorkommen für eine Sekunde."""
         # NEU: Motivation auf WorkTime-Regeneration anwenden
         total_motivation = self._get_total_motivation()
         self.workforce_manager.set_motivation_modifier(total_motivation)
+        if perf is not None:
+            perf.lap("tick.cooldowns_motivation")
 
         # NEU: WorkTime-System ticken (Worker Pausen-Simulation)
         self.workforce_manager.tick(TIME_STEP)
+        if perf is not None:
+            perf.lap("workforce.tick")
 
         # Produktionssystem ticken (mit WorkTime-Effizienz)
         production_output = self.production_system.tick(TIME_STEP)
+        if perf is not None:
+            perf.lap("production.tick")
 
         # Produzierte Ressourcen zu Inventar hinzufügen
-        resource_name_map = {
-            ResourceType.WOOD: RESOURCE_HOLZ,
-            ResourceType.STONE: RESOURCE_STEIN,
-            ResourceType.CLAY: RESOURCE_LEHM,
-            ResourceType.IRON: RESOURCE_EISEN,
-            ResourceType.SULFUR: RESOURCE_SCHWEFEL,
-            ResourceType.GOLD: RESOURCE_TALER,
-        }
         for res_type, amount in production_output.items():
-            res_name = resource_name_map.get(res_type)
+            res_name = RESOURCE_TYPE_NAMES.get(res_type)
             if res_name:
                 self.resources[res_name] = self.resources.get(res_name, 0) + amount
 
         # VEREINFACHTES TRACKING: Ressourcen-Erschöpfung
         # Bäume: Reduziere resource_remaining basierend auf aktiven Holz-Serfs
         if self.wood_serfs > 0:
-            # 2 Holz pro ~5.5s = ~0.36 Holz pro Sekunde pro Serf
-            wood_per_second = WOOD_PER_EXTRACTION / EXTRACTION_TIME_WOOD
-            total_wood_extracted = self.wood_serfs * wood_per_second * TIME_STEP
+            total_wood_extracted = self._wood_per_tick()
             # Verteile auf Bäume (vereinfacht: erster nicht-leerer Baum)
-            for i, tree in enumerate(self.tree_list_internal):
-                if total_wood_extracted <= 0:
-                    break
-                if tree["resource_remaining"] > 0:
-                    extracted = min(tree["resource_remaining"], total_wood_extracted)
-                    tree["resource_remaining"] -= extracted
-                    total_wood_extracted -= extracted
-                    # Wenn Baum leer, versuche automatisches Weitersammeln
-                    if tree["resource_remaining"] <= 0 and tree["serfs_assigned"] > 0:
-                        serfs_to_reassign = tree["serfs_assigned"]
-                        tree["serfs_assigned"] = 0
-                        # AUTOMATISCHES WEITERSAMMELN: Suche nächsten Baum im Radius
-                        reassigned = self._auto_reassign_wood_serfs(
-                            tree["x"], tree["y"], serfs_to_reassign
-                        )
-                        # Nur nicht-zugewiesene Serfs werden frei
-                        freed_serfs = serfs_to_reassign - reassigned
-                        if freed_serfs > 0:
-                            self.wood_serfs = max(0, self.wood_serfs - freed_serfs)
-                            self.free_leibeigene += freed_serfs
-                            self.resource_workers[RESOURCE_HOLZ] = max(0,
-                                self.resource_workers.get(RESOURCE_HOLZ, 0) - freed_serfs)
+            trees = self.tree_table.trees
+            for row in self.tree_table.extract(total_wood_extracted):
+                self._depletion_epoch += 1
+                # Wenn Baum leer, versuche automatisches Weitersammeln
+                if trees["serfs_assigned"][row] > 0:
+                    serfs_to_reassign = int(trees["serfs_assigned"][row])
+                    trees["serfs_assigned"][row] = 0
+                    # AUTOMATISCHES WEITERSAMMELN: Suche nächsten Baum im Radius
+                    x, y = self.tree_table.position(row)
+                    reassigned = self._auto_reassign_wood_serfs(x, y, serfs_to_reassign)
+                    # Nur nicht-zugewiesene Serfs werden frei
+                    freed_serfs = serfs_to_reassign - reassigned
+                    if freed_serfs > 0:
+                        self.wood_serfs = max(0, self.wood_serfs - freed_serfs)
+                        self.free_leibeigene += freed_serfs
+                        self.resource_workers[RESOURCE_HOLZ] = max(0,
+                            self.resource_workers.get(RESOURCE_HOLZ, 0) - freed_serfs)
 
         # Vorkommen-Erschöpfung (vereinfacht)
         for category, cat_data in self.deposit_categories.items():
             if cat_data["serfs_assigned"] > 0:
                 # Extraktionsrate basierend auf Kategorie
-                extraction_rates = {"Eisen": 1.0/4.54, "Stein": 1.0/5.54, "Lehm": 1.0/5.54, "Schwefel": 1.0/4.54}
-                rate = extraction_rates.get(category, 0.2)
-                total_extracted = cat_data["serfs_assigned"] * rate * TIME_STEP
+                total_extracted = self._deposit_per_tick(category, cat_data)
                 # Verteile auf Deposits
                 for deposit in cat_data["deposits"]:
                     if total_extracted <= 0:
@@ -3432,6 +4117,7 @@ class SiedlerScharfschuetzenEnv(gym.Env):
                         total_extracted -= extracted
                         # Wenn Deposit leer, versuche automatisches Weitersammeln
                         if deposit["remaining"] <= 0:
+                            self._depletion_epoch += 1
                             # AUTOMATISCHES WEITERSAMMELN: Suche nächstes Deposit im Radius
                             reassigned = self._auto_reassign_deposit_serf(
                                 category, deposit["x"], deposit["y"]
@@ -3443,6 +4129,11 @@ class SiedlerScharfschuetzenEnv(gym.Env):
                                 self.resource_workers[category] = max(0,
                                     self.resource_workers.get(category, 0) - 1)
 
+        if perf is not None:
+            perf.lap("tick.extraction")
+
+    def _tick_income(self):
+        """Steuer- und Gebäude-Einkommen samt Motivations-Änderung alle INCOME_CYCLE Sekunden."""
         # Steuer-Einkommen (aus extra2/logic.xml)
         # RegularTax = fester Betrag PRO WORKER (nicht Multiplikator!)
         if self.current_time % INCOME_CYCLE == 0:
@@ -3459,91 +4150,50 @@ class SiedlerScharfschuetzenEnv(gym.Env):
             motivation_change = tax_info["motivation_change"]
             self.base_motivation = max(0.25, min(3.0, self.base_motivation + motivation_change))
 
-        # NEU: Baustellen mit Leibeigenen-System verarbeiten
-        completed_sites = []
-        for i, site in enumerate(self.construction_sites):
-            if site["serfs_assigned"] > 0:
-                # Bau-Fortschritt: Mehr Serfs = schnellerer Bau
-                # Formel: 1 Serf = normale Geschwindigkeit, jeder weitere +50% (abnehmend)
-                # Effektive Serfs: 1 + 0.5 * (n-1) für n Serfs
-                n_serfs = site["serfs_assigned"]
-                effective_workers = 1.0 + 0.5 * (n_serfs - 1)
-                work_done = TIME_STEP * effective_workers
-                site["remaining_work"] -= work_done
-
-                if site["remaining_work"] <= 0:
-                    # Gebäude fertig!
-                    building = site["building"]
-                    pos = site["position"]
-                    self.buildings[building] = self.buildings.get(building, 0) + 1
-                    if pos:
-                        self.building_position_map[f"{building}_{len(self.building_position_map)}"] = pos
-                    # Bei Gebäude-Fertigstellung Worker/Mine/Refiner erstellen
-                    self._on_building_completed(building, pos)
-                    # Serfs werden frei
-                    self._release_serfs_from_site(site)
-                    completed_sites.append(i)
-
-        for i in reversed(completed_sites):
-            self.construction_sites.pop(i)
-
-        # Legacy: Alte Bau-Queue verarbeiten (falls noch Einträge vorhanden)
-        completed = []
-        for i, (building, remaining, pos) in enumerate(self.construction_queue):
-            remaining -= TIME_STEP
-            if remaining <= 0:
+    def _tick_completions(self):
+        """Fällige Countdowns abschließen (nur diese, nichts wird pro Tick dekrementiert)."""
+        # Reihenfolge wie früher: Baustellen, Legacy-Bau-Queue, Upgrades, ...
+        scheduler = self.completion_scheduler
+        for entry in scheduler.pop_due((SCHEDULE_SITE, SCHEDULE_BUILD, SCHEDULE_UPGRADE)):
+            if entry.kind == SCHEDULE_SITE:
+                # Baustelle fertig (Fortschritt: 1 Serf = 1.0, jeder weitere +0.5)
+                site = entry.payload
+                building = site["building"]
+                pos = site["position"]
+                site["remaining_work"] = entry.replay(scheduler.now)
+                self.buildings[building] = self.buildings.get(building, 0) + 1
+                if pos:
+                    self.building_position_map[f"{building}_{len(self.building_position_map)}"] = pos
+                # Bei Gebäude-Fertigstellung Worker/Mine/Refiner erstellen
+                self._on_building_completed(building, pos)
+                # Serfs werden frei
+                self._release_serfs_from_site(site)
+            elif entry.kind == SCHEDULE_BUILD:
+                building, pos = entry.payload
                 self.buildings[building] = self.buildings.get(building, 0) + 1
                 if pos:
                     self.building_position_map[f"{building}_{len(self.building_position_map)}"] = pos
                 self._on_building_completed(building, pos)
-                completed.append(i)
             else:
-                self.construction_queue[i] = (building, remaining, pos)
-        for i in reversed(completed):
-            self.construction_queue.pop(i)
-
-        # Upgrade-Queue verarbeiten
-        completed = []
-        for i, (old_b, new_b, remaining) in enumerate(self.upgrade_queue):
-            remaining -= TIME_STEP
-            if remaining <= 0:
+                old_b, new_b = entry.payload
                 self.buildings[old_b] = max(0, self.buildings.get(old_b, 0) - 1)
                 self.buildings[new_b] = self.buildings.get(new_b, 0) + 1
                 # Upgrade in ProductionSystem propagieren
                 self._on_upgrade_completed(old_b, new_b)
-                completed.append(i)
-            else:
-                self.upgrade_queue[i] = (old_b, new_b, remaining)
-        for i in reversed(completed):
-            self.upgrade_queue.pop(i)
 
-        # Forschung verarbeiten (abhängig von Gelehrten-Effizienz)
-        if self.current_research:
-            tech, remaining = self.current_research
-            # NEU: Forschungsgeschwindigkeit hängt von Gelehrten-WorkTime ab
-            scholar_efficiency = self._get_scholar_efficiency()
-            remaining -= TIME_STEP * scholar_efficiency
-            if remaining <= 0:
-                self.researched_techs.add(tech)
-                self.current_research = None
+        # ... dann Forschung (Geschwindigkeit hängt von der Gelehrten-WorkTime in
+        # diesem Tick ab -> bei Änderung für diesen Tick neu einplanen) und Rekrutierung
+        self._sync_research_rate(tick=scheduler.now - 1)
+        for entry in scheduler.pop_due((SCHEDULE_RESEARCH, SCHEDULE_RECRUIT)):
+            if entry.kind == SCHEDULE_RESEARCH:
+                self.researched_techs.add(entry.payload)
                 # NEU: Technologie-Effekte anwenden (aus GEPLANTE_AENDERUNGEN.md)
                 self._apply_technology_effects()
             else:
-                self.current_research = (tech, remaining)
-
-        # Rekrutierung verarbeiten
-        completed = []
-        for i, (soldier, remaining) in enumerate(self.recruit_queue):
-            remaining -= TIME_STEP
-            if remaining <= 0:
+                soldier = entry.payload
                 self.soldiers[soldier] = self.soldiers.get(soldier, 0) + 1
                 if "Scharfschützen" in soldier:
                     self.scharfschuetzen += 1
-                completed.append(i)
-            else:
-                self.recruit_queue[i] = (soldier, remaining)
-        for i in reversed(completed):
-            self.recruit_queue.pop(i)
 
     def _on_building_completed(self, building: str, position):
         """Callback wenn ein Gebäude fertig wird - erstellt Worker/Minen/Refiner"""
@@ -3566,6 +4216,9 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         # NEU: Gebäude im MapManager-Grid blockieren (für Pfadfindung)
         self.map_manager.add_building(pos_obj.x, pos_obj.y, base_name)
 
+        # Bauernhof/Wohnhaus/Dorfzentrum beim WorkforceManager anmelden
+        self._register_workforce_building(building, pos_obj)
+
         # Minen erstellen
         if "mine" in building.lower() or base_name in ["Steinmine", "Lehmmine", "Eisenmine", "Schwefelmine"]:
             resource_map = {
@@ -3680,6 +4333,8 @@ class SiedlerScharfschuetzenEnv(gym.Env):
         new_base = get_base_building_name(new_building)
         new_level = get_building_level(new_building)
 
+        self._upgrade_workforce_building(old_building, new_building)
+
         # --- Minen upgraden ---
         if old_base in ["Steinmine", "Lehmmine", "Eisenmine", "Schwefelmine"]:
             old_key = f"{old_base}_{get_building_level(old_building)}"
@@ -3719,9 +4374,99 @@ class SiedlerScharfschuetzenEnv(gym.Env):
                     pos_obj = pos
                 self.workforce_manager.add_worker("scholar", pos_obj, pos_obj)
 
+    # =========================================================================
+    # SNAPSHOT / RESTORE (für MCTS, Beam Search, Planer)
+    # =========================================================================
+
+    def _snapshot_memo(self) -> dict:
+        """deepcopy-Memo das alle statischen Objekte teilt statt kopiert."""
+        template = self.__dict__.get("_snapshot_memo_template")
+        if template is None:
+            template = {}
+
+            def collect(obj):
+                # Konfigurationsdaten (Baupositionen, Bäume, Ressourcen-JSON)
+                # werden nie verändert und dürfen geteilt werden
+                if id(obj) in template:
+                    return
+                template[id(obj)] = obj
+                if isinstance(obj, dict):
+                    for value in obj.values():
+                        collect(value)
+                elif isinstance(obj, (list, tuple)):
+                    for value in obj:
+                        collect(value)
+
+            for key in self._static_state_keys:
+                if key in self.__dict__:
+                    template[id(self.__dict__[key])] = self.__dict__[key]
+            for space in self.action_spaces.values():
+                template[id(space)] = space
+            collect(self.building_zones)
+            collect(self._cached_resources)
+            collect(PLAYER_1_TREES_NEAREST)
+            self._snapshot_memo_template = template
+        return dict(template)
+
+    def snapshot(self) -> dict:
+        """Erstellt einen Snapshot des veränderlichen Episoden-Zustands.
+
+        Statische Daten (Terrain, buildings_db, gecachte Baum-Layer, Action-Spaces)
+        werden geteilt. Die Grid-Layer von MapManager werden per Copy-on-Write
+        geteilt und erst beim nächsten Schreibzugriff kopiert.
+        """
+        state = {k: v for k, v in self.__dict__.items() if k not in self._static_state_keys}
+        snap = copy.deepcopy(state, self._snapshot_memo())
+        snap[LEDGER_SNAPSHOT_KEY] = self._ledger.row_state(self._ledger_row)
+        return snap
+
+    def restore(self, snap: dict):
+        """Stellt einen mit snapshot() erstellten Zustand wieder her.
+
+        Der Snapshot bleibt unverändert und kann mehrfach verwendet werden.
+        """
+        state = copy.deepcopy(snap, self._snapshot_memo())
+        self._ledger.set_row_state(self._ledger_row, state.pop(LEDGER_SNAPSHOT_KEY))
+        self.__dict__.update(state)
+        self.map_manager.perf = self.perf
+
     def get_action_history(self):
         return self.action_history
 
+    def enable_perf_stats(self, enabled: bool = True):
+        """Schaltet die Laufzeit-Messpunkte ein/aus (auch über VecEnv.env_method)."""
+        if not enabled:
+            self.perf = None
+        elif self.perf is None:
+            self.perf = PerfStats()
+        self.map_manager.perf = self.perf
+
+    def perf_stats(self, reset: bool = False) -> dict:
+        """
+        Kumulierte Laufzeiten seit Start/letztem reset=True (leer wenn aus).
+
+        Messpunkte: step, tick (mit tick.*, workforce.tick, production.tick),
+        get_action_mask, action_masks, observation, map.find_path /
+        map.path_distance (Zähler *.nodes = expandierte A*-Knoten) und
+        map.field_distance.
+        """
+        if self.perf is None:
+            return {}
+        stats = self.perf.as_dict()
+        if reset:
+            self.perf.reset()
+        return stats
+
+    def episode_summary(self) -> dict:
+        """Ergebnis der Episode (steht bei Episodenende in info["episode_summary"],
+        damit Vector-Envs es vor dem Auto-Reset weitergeben)."""
+        return {
+            "scharfschuetzen": self.scharfschuetzen,
+            "techs": sorted(self.researched_techs),
+            "time": self.current_time,
+            "action_history": self.action_history,
+        }
+
     def get_building_positions(self):
         positions = []
         for building_id, pos in self.building_position_map.items():
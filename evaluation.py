@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Siedler AI - Parallele Evaluation
+
+Verteilt Evaluations-Episoden auf N Environments (SiedlerSubprocVecEnv oder
+SiedlerVecEnv) und fragt die Policy einmal pro Schritt für alle laufenden
+Episoden gebündelt ab (ein model.predict auf (N, obs_dim) statt N Aufrufen).
+
+Jede beendete Episode wird sofort als EpisodeResult geliefert (Streaming)
+und in einen EvaluationReport eingerechnet: Mittelwert, Standardabweichung
+und 95%-Konfidenzintervall (Student-t) für Scharfschützen, Techs, Reward
+und Spielzeit.
+
+Die Episoden werden fest auf die Envs verteilt (Env i spielt
+(n_episodes + i) // N Episoden), damit kurze Episoden nicht bevorzugt
+gezählt werden.
+
+Das Modell muss mit der gepaddeten Phasen-Action-Space der Vector-Envs
+trainiert sein (train_100k.py / colab_training.py mit n_envs > 1).
+
+    python evaluation.py ./models/siedler_100k_final.zip --episodes 1000 --n-envs 8
+"""
+
+import argparse
+import json
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+from environment import SiedlerScharfschuetzenEnv
+from vec_env import SiedlerVecEnv, SiedlerSubprocVecEnv
+
+
+# Zweiseitige 97.5%-Quantile der t-Verteilung für df = 1..30 (darüber Normalverteilung)
+_T_975 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+          2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+          2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+METRICS = ("scharfschuetzen", "techs", "reward", "time")
+
+
+def t_critical(df: int) -> float:
+    """97.5%-Quantil der t-Verteilung (für 95%-Konfidenzintervalle)."""
+    if df < 1:
+        return float("nan")
+    return _T_975[df - 1] if df <= len(_T_975) else 1.960
+
+
+@dataclass
+class EpisodeResult:
+    """Ergebnis einer Evaluations-Episode."""
+    episode: int          # Reihenfolge der Fertigstellung
+    env_index: int
+    scharfschuetzen: int
+    techs: List[str]
+    reward: float
+    time: int
+    action_history: Optional[List[dict]] = None
+
+
+@dataclass
+class RunningStat:
+    """Mittelwert/Varianz nach Welford (ein Wert nach dem anderen)."""
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+
+    def add(self, value: float):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def ci95(self) -> tuple:
+        """95%-Konfidenzintervall des Mittelwerts (bei n = 1: nur der Wert)."""
+        if self.n < 2:
+            return (self.mean, self.mean)
+        half = t_critical(self.n - 1) * self.std / math.sqrt(self.n)
+        return (self.mean - half, self.mean + half)
+
+    def to_dict(self) -> dict:
+        low, high = self.ci95()
+        return {"mean": self.mean, "std": self.std, "ci95": [low, high],
+                "min": self.min, "max": self.max}
+
+
+@dataclass
+class EvaluationReport:
+    """Laufend aggregierte Evaluations-Ergebnisse."""
+    episodes: List[EpisodeResult] = field(default_factory=list)
+    stats: Dict[str, RunningStat] = field(default_factory=lambda: {m: RunningStat() for m in METRICS})
+    tech_counts: Dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    def add(self, result: EpisodeResult):
+        self.episodes.append(result)
+        self.stats["scharfschuetzen"].add(result.scharfschuetzen)
+        self.stats["techs"].add(len(result.techs))
+        self.stats["reward"].add(result.reward)
+        self.stats["time"].add(result.time)
+        for tech in result.techs:
+            self.tech_counts[tech] = self.tech_counts.get(tech, 0) + 1
+
+    @property
+    def n_episodes(self) -> int:
+        return len(self.episodes)
+
+    def summary(self) -> dict:
+        """JSON-taugliche Zusammenfassung (ohne Aktions-Historien)."""
+        n = self.n_episodes
+        return {
+            "n_episodes": n,
+            "elapsed_s": self.elapsed,
+            "episodes_per_s": n / self.elapsed if self.elapsed > 0 else None,
+            "metrics": {name: stat.to_dict() for name, stat in self.stats.items()},
+            "tech_rates": {tech: count / n for tech, count in sorted(self.tech_counts.items())},
+            "best_episode": max(self.episodes, key=lambda r: r.scharfschuetzen).episode if n else None,
+        }
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print(f"EVALUATION ZUSAMMENFASSUNG ({self.n_episodes} Episoden, {self.elapsed:.1f}s)")
+        print("=" * 60)
+        for name in METRICS:
+            stat = self.stats[name]
+            low, high = stat.ci95()
+            print(f"  {name:16s} {stat.mean:9.2f} ± {stat.std:7.2f}  "
+                  f"95%-KI [{low:.2f}, {high:.2f}]  min {stat.min:.0f}  max {stat.max:.0f}")
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def iter_episodes(model, vec: VecEnv, n_episodes: int, deterministic: bool = True,
+                  keep_histories: bool = True) -> Iterator[EpisodeResult]:
+    """
+    Spielt n_episodes auf allen Envs von vec und liefert jede Episode sobald sie endet.
+
+    Pro Schritt ein gebündeltes model.predict für alle Envs. Envs die ihr
+    Kontingent erfüllt haben laufen mit, ihre weiteren Episoden werden
+    verworfen.
+    """
+    if model.action_space.n != vec.action_space.n:
+        raise ValueError(f"Action-Space des Modells ({model.action_space.n}) passt nicht zur "
+                         f"Vector-Env ({vec.action_space.n}); Modell mit n_envs > 1 trainieren")
+    n_envs = vec.num_envs
+    targets = np.array([(n_episodes + i) // n_envs for i in range(n_envs)])
+    counts = np.zeros(n_envs, dtype=np.int64)
+    returns = np.zeros(n_envs, dtype=np.float64)
+    finished = 0
+
+    obs = vec.reset()
+    while (counts < targets).any():
+        actions, _ = model.predict(obs, deterministic=deterministic, action_masks=vec.action_masks())
+        obs, rewards, dones, infos = vec.step(actions)
+        returns += rewards
+        for i in np.flatnonzero(dones):
+            if counts[i] < targets[i]:
+                summary = infos[i]["episode_summary"]
+                yield EpisodeResult(
+                    episode=finished,
+                    env_index=int(i),
+                    scharfschuetzen=int(summary["scharfschuetzen"]),
+                    techs=list(summary["techs"]),
+                    reward=float(returns[i]),
+                    time=int(summary["time"]),
+                    action_history=list(summary["action_history"]) if keep_histories else None,
+                )
+                counts[i] += 1
+                finished += 1
+            returns[i] = 0.0
+
+
+def evaluate_parallel(model, n_episodes: int = 10, n_envs: int = 8, subproc: bool = True,
+                      seed: Optional[int] = None, deterministic: bool = True,
+                      keep_histories: bool = True,
+                      env_fns: Optional[Sequence[Callable[[], SiedlerScharfschuetzenEnv]]] = None,
+                      on_episode: Optional[Callable[[EpisodeResult], None]] = None) -> EvaluationReport:
+    """
+    Evaluiert model über n_episodes, verteilt auf n_envs Environments.
+
+    Args:
+        model: MaskablePPO-Modell mit gepaddeter Phasen-Action-Space
+        n_episodes: Anzahl Episoden
+        n_envs: Anzahl paralleler Envs (höchstens n_episodes)
+        subproc: Envs in Subprozessen (sonst alle im aktuellen Prozess)
+        seed: Seed für den ersten Reset (Env i: seed + i)
+        keep_histories: Aktions-Historien in den Ergebnissen behalten
+        env_fns: eigene Env-Fabriken (überschreibt n_envs)
+        on_episode: wird für jede beendete Episode aufgerufen
+
+    Returns:
+        EvaluationReport mit allen Episoden und der Aggregation
+    """
+    if env_fns is None:
+        env_fns = [lambda: SiedlerScharfschuetzenEnv(player_id=1)] * max(1, min(n_envs, n_episodes))
+    vec_cls = SiedlerSubprocVecEnv if subproc and len(env_fns) > 1 else SiedlerVecEnv
+    vec = vec_cls(env_fns=env_fns)
+    report = EvaluationReport()
+    start = time.perf_counter()
+    try:
+        if seed is not None:
+            vec.seed(seed)
+        for result in iter_episodes(model, vec, n_episodes, deterministic, keep_histories):
+            report.add(result)
+            report.elapsed = time.perf_counter() - start
+            if on_episode is not None:
+                on_episode(result)
+    finally:
+        vec.close()
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def print_episode(result: EpisodeResult):
+    """Standard-Ausgabe pro Episode (für on_episode)."""
+    print(f"Episode {result.episode + 1} (Env {result.env_index}): "
+          f"Scharfschützen={result.scharfschuetzen}, Techs={len(result.techs)}, "
+          f"Reward={result.reward:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Siedler AI - Parallele Evaluation")
+    parser.add_argument("model", help="Pfad zum MaskablePPO-Modell (.zip)")
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--n-envs", type=int, default=8)
+    parser.add_argument("--in-process", action="store_true", help="Envs ohne Subprozesse")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--stochastic", action="store_true", help="Aktionen samplen statt argmax")
+    parser.add_argument("--json", default=None, help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    from sb3_contrib import MaskablePPO
+
+    eval_model = MaskablePPO.load(args.model)
+    eval_report = evaluate_parallel(eval_model, n_episodes=args.episodes, n_envs=args.n_envs,
+                                    subproc=not args.in_process, seed=args.seed,
+                                    deterministic=not args.stochastic,
+                                    keep_histories=args.json is not None, on_episode=print_episode)
+    eval_report.print_summary()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": eval_report.summary(),
+                       "episodes": [asdict(r) for r in eval_report.episodes]}, f, indent=2)
+        print(f"\nErgebnisse gespeichert: {args.json}")
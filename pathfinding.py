@@ -9,13 +9,19 @@ Dieses Modul enthält:
 4. Bauplatz-Validierung - Prüft ob Gebäude platziert werden können
 """
 
+import copy
+import hashlib
 import numpy as np
 import heapq
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple, Optional, Set
+from typing import List, Dict, Tuple, Optional
 from enum import IntEnum
 import json
 import os
+import time
+
+from perf_stats import timed
 
 # =============================================================================
 # KONSTANTEN
@@ -71,6 +77,13 @@ DIRECTIONS = [
 COST_STRAIGHT = 10
 COST_DIAGONAL = 14  # ~sqrt(2) * 10
 
+# Anzahl protokollierter Grid-Versionen für die inkrementelle Feld-Aktualisierung
+CHANGE_LOG_LIMIT = 256
+
+# Suchradius (Zellen) um blockierte Start-/Zielpunkte auf die nächste
+# begehbare Zelle zu verschieben (A* und Distanzfelder)
+SNAP_RADIUS = 10
+
 # =============================================================================
 # HILFSKLASSEN
 # =============================================================================
@@ -122,6 +135,219 @@ class PathResult:
         return [pos.to_world() for pos in self.path]
 
 
+# =============================================================================
+# RÄUMLICHER INDEX FÜR BÄUME
+# =============================================================================
+
+class TreeSpatialIndex:
+    """
+    Uniformes Bucket-Grid über Punkt-Positionen (Bäume).
+
+    Unterstützt Einfügen, Entfernen, k-nächste Nachbarn, Radius- und
+    Rechteck-Abfragen ohne über alle Bäume zu iterieren.
+
+    Bei gleicher Distanz gewinnt die kleinere ID (entspricht der
+    Einfüge-Reihenfolge der bisherigen linearen Suche).
+    """
+
+    def __init__(self, bucket_size: float, metric: str = "euclidean"):
+        if metric not in ("euclidean", "manhattan"):
+            raise ValueError(f"Unbekannte Metrik '{metric}'")
+        self.bucket_size = bucket_size
+        self.metric = metric
+        self.buckets: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = {}
+        self.positions: Dict[int, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def copy(self) -> 'TreeSpatialIndex':
+        """Flache Kopie (Positionen sind unveränderliche Tupel)."""
+        new_index = TreeSpatialIndex.__new__(TreeSpatialIndex)
+        new_index.bucket_size = self.bucket_size
+        new_index.metric = self.metric
+        new_index.buckets = {key: dict(bucket) for key, bucket in self.buckets.items()}
+        new_index.positions = dict(self.positions)
+        return new_index
+
+    def _bucket_key(self, x: float, y: float) -> Tuple[int, int]:
+        return (int(x // self.bucket_size), int(y // self.bucket_size))
+
+    def _distance(self, ax: float, ay: float, bx: float, by: float) -> float:
+        if self.metric == "manhattan":
+            return abs(ax - bx) + abs(ay - by)
+        return float(np.sqrt((ax - bx)**2 + (ay - by)**2))
+
+    def insert(self, item_id: int, x: float, y: float):
+        """Fügt einen Punkt ein (überschreibt vorhandene ID)."""
+        if item_id in self.positions:
+            self.remove(item_id)
+        self.positions[item_id] = (x, y)
+        self.buckets.setdefault(self._bucket_key(x, y), {})[item_id] = (x, y)
+
+    def remove(self, item_id: int):
+        """Entfernt einen Punkt (ignoriert unbekannte IDs)."""
+        pos = self.positions.pop(item_id, None)
+        if pos is None:
+            return
+        key = self._bucket_key(*pos)
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            bucket.pop(item_id, None)
+            if not bucket:
+                del self.buckets[key]
+
+    def nearest(self, x: float, y: float, k: int = 1) -> List[Tuple[float, int]]:
+        """
+        k nächste Punkte.
+
+        Returns:
+            Liste von (distanz, id), aufsteigend sortiert
+        """
+        if not self.positions or k <= 0:
+            return []
+
+        cx, cy = self._bucket_key(x, y)
+        keys = self.buckets.keys()
+        min_bx = min(key[0] for key in keys)
+        max_bx = max(key[0] for key in keys)
+        min_by = min(key[1] for key in keys)
+        max_by = max(key[1] for key in keys)
+        max_ring = max(abs(cx - min_bx), abs(cx - max_bx), abs(cy - min_by), abs(cy - max_by))
+
+        best: List[Tuple[float, int]] = []
+        for ring in range(max_ring + 1):
+            for key in self._ring_keys(cx, cy, ring):
+                bucket = self.buckets.get(key)
+                if not bucket:
+                    continue
+                for item_id, (px, py) in bucket.items():
+                    best.append((self._distance(px, py, x, y), item_id))
+            if len(best) >= k:
+                best.sort()
+                del best[k:]
+                # Punkte in weiteren Ringen sind mindestens ring * bucket_size entfernt
+                if best[-1][0] < ring * self.bucket_size:
+                    break
+        best.sort()
+        return best[:k]
+
+    @staticmethod
+    def _ring_keys(cx: int, cy: int, ring: int):
+        """Bucket-Koordinaten mit Chebyshev-Abstand ring um (cx, cy)."""
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
+
+    def within_radius(self, x: float, y: float, radius: float) -> List[Tuple[float, int]]:
+        """Alle Punkte mit Distanz <= radius als (distanz, id), aufsteigend sortiert."""
+        result = []
+        r_buckets = int(radius // self.bucket_size) + 1
+        cx, cy = self._bucket_key(x, y)
+        for bx in range(cx - r_buckets, cx + r_buckets + 1):
+            for by in range(cy - r_buckets, cy + r_buckets + 1):
+                bucket = self.buckets.get((bx, by))
+                if not bucket:
+                    continue
+                for item_id, (px, py) in bucket.items():
+                    dist = self._distance(px, py, x, y)
+                    if dist <= radius:
+                        result.append((dist, item_id))
+        result.sort()
+        return result
+
+    def within_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[int]:
+        """IDs aller Punkte im achsenparallelen Rechteck (inklusive Ränder), nach ID sortiert."""
+        result = []
+        min_bx, min_by = self._bucket_key(min_x, min_y)
+        max_bx, max_by = self._bucket_key(max_x, max_y)
+        for bx in range(min_bx, max_bx + 1):
+            for by in range(min_by, max_by + 1):
+                bucket = self.buckets.get((bx, by))
+                if not bucket:
+                    continue
+                for item_id, (px, py) in bucket.items():
+                    if min_x <= px <= max_x and min_y <= py <= max_y:
+                        result.append(item_id)
+        result.sort()
+        return result
+
+
+def _summed_area_table(layer: np.ndarray) -> np.ndarray:
+    """Integralbild mit führender Null-Zeile/-Spalte: sat[y, x] = Summe layer[:y, :x]."""
+    sat = np.zeros((layer.shape[0] + 1, layer.shape[1] + 1), dtype=np.int32)
+    np.cumsum(np.cumsum(layer, axis=0, dtype=np.int32), axis=1, out=sat[1:, 1:])
+    return sat
+
+
+def _label_components(walkable: np.ndarray) -> np.ndarray:
+    """Zusammenhangskomponenten (4er-Nachbarschaft) per Run-Length-Labeling.
+
+    Horizontale Läufe werden über ihre vertikalen Nachbarn per vektorisiertem
+    Union-Find (Min-Label + Pointer-Jumping) verbunden.
+
+    Returns:
+        int32-Array gleicher Form, 0 = blockiert, sonst Label ab 1
+    """
+    walk = walkable.astype(bool)
+    height, width = walk.shape
+    padded = np.zeros((height, width + 1), dtype=bool)
+    padded[:, :width] = walk
+    flat = padded.ravel()
+    starts = flat & ~np.concatenate(([False], flat[:-1]))
+    runs = np.where(flat, np.cumsum(starts), 0).reshape(height, width + 1)[:, :width]
+
+    vertical = walk[:-1] & walk[1:]
+    a = runs[:-1][vertical]
+    b = runs[1:][vertical]
+    parent = np.arange(int(starts.sum()) + 1)
+    while True:
+        before = parent.copy()
+        pa, pb = parent[a], parent[b]
+        low = np.minimum(pa, pb)
+        np.minimum.at(parent, pa, low)
+        np.minimum.at(parent, pb, low)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+        if np.array_equal(parent, before):
+            break
+
+    # Lauf 0 (blockiert) hat Wurzel 0 und bleibt 0
+    _, compact = np.unique(parent, return_inverse=True)
+    return compact[runs].astype(np.int32)
+
+
+def _component_stats(labels: np.ndarray) -> Tuple[Dict[int, int], Dict[int, Tuple[int, int, int, int]]]:
+    """Zellenzahl und Bounding-Box (y0, y1, x0, x1, inklusive) pro Label (ohne 0)."""
+    height, width = labels.shape
+    flat = labels.ravel()
+    n = int(flat.max()) + 1
+    counts = np.bincount(flat, minlength=n)
+    rows = np.repeat(np.arange(height), width)
+    cols = np.tile(np.arange(width), height)
+    y0 = np.full(n, height)
+    y1 = np.full(n, -1)
+    x0 = np.full(n, width)
+    x1 = np.full(n, -1)
+    np.minimum.at(y0, flat, rows)
+    np.maximum.at(y1, flat, rows)
+    np.minimum.at(x0, flat, cols)
+    np.maximum.at(x1, flat, cols)
+    labels_present = np.flatnonzero(counts[1:]) + 1
+    sizes = {int(l): int(counts[l]) for l in labels_present}
+    bounds = {int(l): (int(y0[l]), int(y1[l]), int(x0[l]), int(x1[l])) for l in labels_present}
+    return sizes, bounds
+
+
 # =============================================================================
 # WALKABLE GRID
 # =============================================================================
@@ -155,12 +381,142 @@ class WalkableGrid:
 
         # Baum-Tracking
         self.tree_positions: Dict[int, GridPosition] = {}
+        self.tree_index = TreeSpatialIndex(bucket_size=16, metric="manhattan")
         self.next_tree_id = 1
 
         # Cache für Pfade (optional)
         self.path_cache: Dict[Tuple[GridPosition, GridPosition], PathResult] = {}
         self.cache_valid = True
 
+        # Zählt Änderungen der Begehbarkeit (für Distanzfelder und GridSearch)
+        self.version = 0
+        self._padded_cache: Optional[Tuple[int, np.ndarray, bytes]] = None
+        # Geänderte Zellen (x, y) pro Version ab _change_log_start, None = ganzes
+        # Grid kann sich geändert haben (z.B. neues Terrain)
+        self._change_log: List[Optional[Tuple[Tuple[int, int], ...]]] = []
+        self._change_log_start = 0
+
+        # Zusammenhangskomponenten (0 = blockiert), lazy aufgebaut und danach
+        # lokal um geänderte Zellen aktualisiert
+        self.component_labels: Optional[np.ndarray] = None
+        self._labels_version = -1
+        self._next_component_label = 1
+        # Zellenzahl und Bounding-Box (y0, y1, x0, x1) pro Label; die Box darf
+        # nach Aufteilungen größer als nötig sein
+        self._component_sizes: Dict[int, int] = {}
+        self._component_bounds: Dict[int, Tuple[int, int, int, int]] = {}
+
+        # Summed-Area-Tables für Bauplatz-Abfragen (lazy, pro version)
+        self._sat_cache: Optional[Tuple[Tuple[int, int], np.ndarray, np.ndarray, np.ndarray]] = None
+        self._buildable_cache: Dict[Tuple[int, bool], Tuple[Tuple[int, int], np.ndarray]] = {}
+
+        # Copy-on-Write: dynamische Layer werden mit Snapshots geteilt und erst
+        # beim ersten Schreibzugriff kopiert
+        self._layers_shared = False
+
+        # Overlay-Modus: Änderungsprotokoll seit enable_overlay() (None = aus)
+        self._overlay_log: Optional[List[tuple]] = None
+        self._overlay_ids = (1, 1)
+
+    def share_layers(self):
+        """Markiert buildings/trees als geteilt (Copy-on-Write für Snapshots)."""
+        self._layers_shared = True
+
+    def _own_layers(self):
+        """Kopiert geteilte Layer vor dem ersten Schreibzugriff."""
+        if self._layers_shared:
+            self.buildings = self.buildings.copy()
+            self.trees = self.trees.copy()
+            if self.component_labels is not None:
+                self.component_labels = self.component_labels.copy()
+                self._component_sizes = dict(self._component_sizes)
+                self._component_bounds = dict(self._component_bounds)
+            self._layers_shared = False
+
+    def __deepcopy__(self, memo):
+        """Snapshot-Kopie: Layer werden geteilt (COW), Tracking-Dicts flach kopiert.
+
+        GridPosition-Objekte werden nie verändert und können geteilt werden.
+        """
+        new_grid = WalkableGrid.__new__(WalkableGrid)
+        memo[id(self)] = new_grid
+        new_grid.__dict__.update(self.__dict__)
+        self._layers_shared = True
+        new_grid._layers_shared = True
+        new_grid.building_positions = dict(self.building_positions)
+        new_grid.tree_positions = dict(self.tree_positions)
+        new_grid.tree_index = self.tree_index.copy()
+        new_grid.path_cache = dict(self.path_cache)
+        new_grid._buildable_cache = dict(self._buildable_cache)
+        new_grid._change_log = list(self._change_log)
+        if self._overlay_log is not None:
+            new_grid._overlay_log = list(self._overlay_log)
+        return new_grid
+
+    # -------------------------------------------------------------------------
+    # Overlay (schnelles Reset)
+    # -------------------------------------------------------------------------
+
+    def enable_overlay(self):
+        """
+        Macht den aktuellen Stand zur Basis für revert_overlay().
+
+        Danach protokollieren add/remove_building und add/remove_tree den
+        alten Wert jeder geschriebenen Zelle und jede Tracking-Änderung.
+        """
+        self._overlay_log = []
+        self._overlay_ids = (self.next_building_id, self.next_tree_id)
+
+    def revert_overlay(self):
+        """
+        Stellt die Basis von enable_overlay() wieder her.
+
+        Kosten proportional zu den protokollierten Änderungen, nicht zur
+        Kartengröße. Komponenten werden lokal um die Zellen aktualisiert,
+        deren Begehbarkeit sich zurückändert.
+        """
+        log = self._overlay_log
+        if log is None:
+            raise RuntimeError("Overlay-Modus nicht aktiv (enable_overlay() fehlt)")
+        self.next_building_id, self.next_tree_id = self._overlay_ids
+        if not log:
+            return
+
+        self._own_layers()
+        walkable_before = {}
+        for entry in log:
+            if entry[0] == "cell":
+                cell = (entry[3], entry[2])
+                if cell not in walkable_before:
+                    walkable_before[cell] = self.is_walkable(*cell)
+
+        for entry in reversed(log):
+            kind = entry[0]
+            if kind == "cell":
+                _, layer, y, x, old = entry
+                getattr(self, layer)[y, x] = old
+            elif kind == "building_added":
+                del self.building_positions[entry[1]]
+            elif kind == "building_removed":
+                self.building_positions[entry[1]] = entry[2]
+            elif kind == "tree_added":
+                del self.tree_positions[entry[1]]
+                self.tree_index.remove(entry[1])
+            elif kind == "tree_removed":
+                pos = entry[2]
+                self.tree_positions[entry[1]] = pos
+                self.tree_index.insert(entry[1], pos.x, pos.y)
+        log.clear()
+
+        blocked, freed = [], []
+        for cell, was_walkable in walkable_before.items():
+            now_walkable = self.is_walkable(*cell)
+            if was_walkable and not now_walkable:
+                blocked.append(cell)
+            elif now_walkable and not was_walkable:
+                freed.append(cell)
+        self._walkability_changed(blocked=blocked, freed=freed)
+
     def copy_fresh(self) -> 'WalkableGrid':
         """Erstellt eine frische Kopie mit nur dem Basis-Terrain (für schnelles Reset)."""
         new_grid = WalkableGrid(self.width, self.height)
@@ -209,6 +565,7 @@ class WalkableGrid:
         if walkable_array.shape != (self.height, self.width):
             raise ValueError(f"Array-Größe {walkable_array.shape} passt nicht zu Grid {self.height}x{self.width}")
         self.terrain_base = walkable_array.astype(np.uint8)
+        self.invalidate_walkability()
 
     def is_walkable(self, x: int, y: int) -> bool:
         """Prüft ob eine Zelle begehbar ist."""
@@ -229,6 +586,245 @@ class WalkableGrid:
                 (1 - self.buildings) &
                 (1 - self.trees)).astype(np.uint8)
 
+    def get_padded_walkable(self) -> Tuple[np.ndarray, bytes]:
+        """Begehbarkeit als flaches Array mit blockiertem Rand (siehe _padded_walkable).
+
+        Zusätzlich als bytes für schnelle Einzelzugriffe. Gecacht bis zur
+        nächsten Änderung - Ergebnis nicht verändern!
+        """
+        if self._padded_cache is None or self._padded_cache[0] != self.version:
+            walk = _padded_walkable(self)
+            self._padded_cache = (self.version, walk, walk.tobytes())
+        return self._padded_cache[1], self._padded_cache[2]
+
+    # -------------------------------------------------------------------------
+    # Zusammenhangskomponenten
+    # -------------------------------------------------------------------------
+
+    def _log_change(self, cells: Optional[Tuple[Tuple[int, int], ...]]):
+        """Neue Version mit den geänderten Zellen (None = unbekannt)."""
+        self.version += 1
+        log = self._change_log
+        log.append(cells)
+        if len(log) > CHANGE_LOG_LIMIT:
+            drop = len(log) - CHANGE_LOG_LIMIT // 2
+            self._change_log = log[drop:]
+            self._change_log_start += drop
+
+    def invalidate_walkability(self):
+        """Begehbarkeit hat sich beliebig geändert (Terrain/Baum-Layer ersetzt)."""
+        self.cache_valid = False
+        self._log_change(None)
+
+    def changed_cells_since(self, version: int) -> Optional[List[Tuple[int, int]]]:
+        """Zellen (x, y), deren Begehbarkeit sich seit version geändert hat.
+
+        Kann Duplikate und zurückgeänderte Zellen enthalten. None wenn die
+        Änderungen nicht mehr (oder nie) protokolliert sind.
+        """
+        offset = version - self._change_log_start
+        if offset < 0 or version > self.version:
+            return None
+        cells = []
+        for entry in self._change_log[offset:]:
+            if entry is None:
+                return None
+            cells.extend(entry)
+        return cells
+
+    def _walkability_changed(self, blocked: List[Tuple[int, int]] = (),
+                             freed: List[Tuple[int, int]] = ()):
+        """Invalidiert Caches und aktualisiert die Komponenten lokal."""
+        labels_current = self.component_labels is not None and self._labels_version == self.version
+        self.cache_valid = False
+        self._log_change(tuple(blocked) + tuple(freed))
+        if labels_current:
+            self._own_layers()
+            if blocked:
+                self._split_components(blocked)
+            if freed:
+                self._merge_components(freed)
+            self._labels_version = self.version
+
+    def get_component_labels(self) -> np.ndarray:
+        """Label pro Zelle (0 = blockiert).
+
+        Zellen mit gleichem Label sind gegenseitig erreichbar. Diagonalen
+        brauchen freie Ecken, daher genügt die 4er-Nachbarschaft.
+        """
+        if self.component_labels is None or self._labels_version != self.version:
+            self.component_labels = _label_components(self.get_walkable_grid())
+            self._component_sizes, self._component_bounds = _component_stats(self.component_labels)
+            self._next_component_label = int(self.component_labels.max()) + 1
+            self._labels_version = self.version
+        return self.component_labels
+
+    def component_at(self, x: int, y: int) -> int:
+        """Komponente einer Zelle (0 = blockiert oder außerhalb)."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        return int(self.get_component_labels()[y, x])
+
+    def is_reachable(self, a: GridPosition, b: GridPosition) -> bool:
+        """O(1): Gibt es einen Pfad zwischen zwei begehbaren Zellen?"""
+        label = self.component_at(a.x, a.y)
+        return label != 0 and label == self.component_at(b.x, b.y)
+
+    def _cell_neighbors(self, i: int) -> List[int]:
+        """4er-Nachbarn einer flachen Zelle (ohne Padding)."""
+        width = self.width
+        x = i % width
+        result = []
+        if x > 0:
+            result.append(i - 1)
+        if x < width - 1:
+            result.append(i + 1)
+        if i >= width:
+            result.append(i - width)
+        if i + width < width * self.height:
+            result.append(i + width)
+        return result
+
+    def _split_components(self, cells: List[Tuple[int, int]]):
+        """Blockierte Zellen: betroffene Komponenten ggf. aufteilen."""
+        flat = self.component_labels.ravel()
+        sizes = self._component_sizes
+        cell_idx = [y * self.width + x for x, y in cells]
+        for i in cell_idx:
+            label = int(flat[i])
+            if label:
+                sizes[label] -= 1
+                if not sizes[label]:
+                    del sizes[label]
+                    del self._component_bounds[label]
+            flat[i] = 0
+
+        seeds_by_label: Dict[int, List[int]] = {}
+        for i in cell_idx:
+            for nb in self._cell_neighbors(i):
+                label = int(flat[nb])
+                if label:
+                    seeds_by_label.setdefault(label, []).append(nb)
+
+        for label, seeds in seeds_by_label.items():
+            if len(seeds) > 1:
+                self._split_component(flat, label, seeds)
+
+    def _split_component(self, flat: np.ndarray, label: int, seeds: List[int]):
+        """
+        Flutet gleichzeitig von allen Randzellen einer Komponente.
+
+        Treffen sich alle Fluten, bleibt die Komponente ganz. Eine Flut die
+        vorher ausläuft ist eine abgetrennte Komponente. Der Aufwand hängt
+        so von der Größe der abgetrennten Teile ab, nicht von der Karte.
+        """
+        owner: Dict[int, int] = {}
+        group_parent: Dict[int, int] = {}
+        pending: Dict[int, int] = {}
+        queue = deque()
+        for seed in seeds:
+            if seed not in owner:
+                owner[seed] = seed
+                group_parent[seed] = seed
+                pending[seed] = 1
+                queue.append(seed)
+
+        def find(group):
+            while group_parent[group] != group:
+                group_parent[group] = group_parent[group_parent[group]]
+                group = group_parent[group]
+            return group
+
+        active = len(pending)
+        exhausted = []
+        while queue and active > 1:
+            cell = queue.popleft()
+            group = find(owner[cell])
+            pending[group] -= 1
+            for nb in self._cell_neighbors(cell):
+                if flat[nb] != label:
+                    continue
+                other = owner.get(nb)
+                if other is None:
+                    owner[nb] = group
+                    pending[group] += 1
+                    queue.append(nb)
+                else:
+                    other = find(other)
+                    if other != group:
+                        group_parent[other] = group
+                        pending[group] += pending.pop(other)
+                        active -= 1
+            if pending[group] == 0:
+                exhausted.append(group)
+                active -= 1
+
+        # Ausgelaufene Fluten bekommen neue Labels
+        new_labels = {}
+        for group in exhausted:
+            new_labels[group] = self._next_component_label
+            self._next_component_label += 1
+        if new_labels:
+            moved: Dict[int, List[int]] = {}
+            for cell, group in owner.items():
+                new_label = new_labels.get(find(group))
+                if new_label is not None:
+                    flat[cell] = new_label
+                    moved.setdefault(new_label, []).append(cell)
+            for new_label, cells in moved.items():
+                ys, xs = np.divmod(np.array(cells), self.width)
+                self._component_sizes[new_label] = len(cells)
+                self._component_bounds[new_label] = (int(ys.min()), int(ys.max()),
+                                                      int(xs.min()), int(xs.max()))
+                self._component_sizes[label] -= len(cells)
+
+    def _merge_components(self, cells: List[Tuple[int, int]]):
+        """Freigegebene Zellen: angrenzende Komponenten vereinigen."""
+        flat = self.component_labels.ravel()
+        # Überlappende Gebäude: Zellen können schon vorher frei gewesen sein
+        freed = {i for i in (y * self.width + x for x, y in cells) if not flat[i]}
+        done = set()
+        for start in freed:
+            if start in done:
+                continue
+            # Zusammenhängender Cluster freigegebener Zellen
+            cluster = [start]
+            done.add(start)
+            neighbor_labels = set()
+            for cell in cluster:
+                for nb in self._cell_neighbors(cell):
+                    if nb in freed:
+                        if nb not in done:
+                            done.add(nb)
+                            cluster.append(nb)
+                    elif flat[nb]:
+                        neighbor_labels.add(int(flat[nb]))
+
+            sizes, bounds = self._component_sizes, self._component_bounds
+            if neighbor_labels:
+                # Größte Komponente behält ihr Label, die anderen werden
+                # innerhalb ihrer Bounding-Box umbenannt
+                target = max(neighbor_labels, key=lambda l: (sizes[l], -l))
+                box = bounds[target]
+                for label in neighbor_labels:
+                    if label == target:
+                        continue
+                    y0, y1, x0, x1 = bounds.pop(label)
+                    window = self.component_labels[y0:y1 + 1, x0:x1 + 1]
+                    window[window == label] = target
+                    sizes[target] += sizes.pop(label)
+                    box = (min(box[0], y0), max(box[1], y1), min(box[2], x0), max(box[3], x1))
+            else:
+                target = self._next_component_label
+                self._next_component_label += 1
+                sizes[target] = 0
+                box = (self.height, -1, self.width, -1)
+            flat[cluster] = target
+            ys, xs = np.divmod(np.array(cluster), self.width)
+            sizes[target] += len(cluster)
+            bounds[target] = (min(box[0], int(ys.min())), max(box[1], int(ys.max())),
+                              min(box[2], int(xs.min())), max(box[3], int(xs.max())))
+
     # -------------------------------------------------------------------------
     # Gebäude-Management
     # -------------------------------------------------------------------------
@@ -247,20 +843,29 @@ class WalkableGrid:
         center = GridPosition.from_world(world_x, world_y)
 
         # Blockiere alle Zellen im Bereich
+        self._own_layers()
+        log = self._overlay_log
         half_size = size_in_grid // 2
+        blocked = []
         for dy in range(-half_size, half_size + 1):
             for dx in range(-half_size, half_size + 1):
                 gx, gy = center.x + dx, center.y + dy
                 if 0 <= gx < self.width and 0 <= gy < self.height:
+                    if self.is_walkable(gx, gy):
+                        blocked.append((gx, gy))
+                    if log is not None:
+                        log.append(("cell", "buildings", gy, gx, self.buildings[gy, gx]))
                     self.buildings[gy, gx] = 1
 
         # Tracking
         building_id = self.next_building_id
         self.next_building_id += 1
         self.building_positions[building_id] = (center, building_type, size_in_grid)
+        if log is not None:
+            log.append(("building_added", building_id))
 
         # Cache invalidieren
-        self.cache_valid = False
+        self._walkability_changed(blocked=blocked)
 
         return building_id
 
@@ -271,15 +876,24 @@ class WalkableGrid:
 
         center, building_type, size_in_grid = self.building_positions[building_id]
 
+        self._own_layers()
+        log = self._overlay_log
         half_size = size_in_grid // 2
+        freed = []
         for dy in range(-half_size, half_size + 1):
             for dx in range(-half_size, half_size + 1):
                 gx, gy = center.x + dx, center.y + dy
                 if 0 <= gx < self.width and 0 <= gy < self.height:
+                    if log is not None:
+                        log.append(("cell", "buildings", gy, gx, self.buildings[gy, gx]))
                     self.buildings[gy, gx] = 0
+                    if self.is_walkable(gx, gy):
+                        freed.append((gx, gy))
 
+        if log is not None:
+            log.append(("building_removed", building_id, self.building_positions[building_id]))
         del self.building_positions[building_id]
-        self.cache_valid = False
+        self._walkability_changed(freed=freed)
 
     # -------------------------------------------------------------------------
     # Baum-Management
@@ -289,14 +903,24 @@ class WalkableGrid:
         """Fügt einen Baum hinzu."""
         pos = GridPosition.from_world(world_x, world_y)
 
+        log = self._overlay_log
+        blocked = []
         if 0 <= pos.x < self.width and 0 <= pos.y < self.height:
+            self._own_layers()
+            if self.is_walkable(pos.x, pos.y):
+                blocked.append((pos.x, pos.y))
+            if log is not None:
+                log.append(("cell", "trees", pos.y, pos.x, self.trees[pos.y, pos.x]))
             self.trees[pos.y, pos.x] = 1
 
         tree_id = self.next_tree_id
         self.next_tree_id += 1
         self.tree_positions[tree_id] = pos
+        self.tree_index.insert(tree_id, pos.x, pos.y)
+        if log is not None:
+            log.append(("tree_added", tree_id))
 
-        self.cache_valid = False
+        self._walkability_changed(blocked=blocked)
         return tree_id
 
     def add_trees_batch(self, tree_list: List[Dict]) -> List[int]:
@@ -313,11 +937,21 @@ class WalkableGrid:
             return
 
         pos = self.tree_positions[tree_id]
+        log = self._overlay_log
+        freed = []
         if 0 <= pos.x < self.width and 0 <= pos.y < self.height:
+            self._own_layers()
+            if log is not None:
+                log.append(("cell", "trees", pos.y, pos.x, self.trees[pos.y, pos.x]))
             self.trees[pos.y, pos.x] = 0
+            if self.is_walkable(pos.x, pos.y):
+                freed.append((pos.x, pos.y))
 
+        if log is not None:
+            log.append(("tree_removed", tree_id, pos))
         del self.tree_positions[tree_id]
-        self.cache_valid = False
+        self.tree_index.remove(tree_id)
+        self._walkability_changed(freed=freed)
 
     def get_nearest_tree(self, world_x: float, world_y: float) -> Optional[Tuple[int, float]]:
         """Findet den nächsten Baum zu einer Position."""
@@ -326,16 +960,9 @@ class WalkableGrid:
 
         start = GridPosition.from_world(world_x, world_y)
 
-        min_dist = float('inf')
-        nearest_id = None
-
-        for tree_id, pos in self.tree_positions.items():
-            dist = abs(pos.x - start.x) + abs(pos.y - start.y)  # Manhattan
-            if dist < min_dist:
-                min_dist = dist
-                nearest_id = tree_id
-
-        if nearest_id is not None:
+        nearest = self.tree_index.nearest(start.x, start.y, k=1)
+        if nearest:
+            min_dist, nearest_id = nearest[0]
             world_dist = min_dist * ((SCALE_X + SCALE_Y) / 2)
             return (nearest_id, world_dist)
         return None
@@ -344,38 +971,98 @@ class WalkableGrid:
     # Bauplatz-Validierung
     # -------------------------------------------------------------------------
 
+    def _summed_area_tables(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Integralbilder (H+1 x W+1) von Terrain-Blockade, Gebäuden und Bäumen.
+
+        Summe über ein Rechteck = 4 Lookups. Werden nach Grid-Änderungen
+        beim nächsten Zugriff vektorisiert neu aufgebaut.
+        """
+        key = (self.version, id(self.terrain_base))
+        if self._sat_cache is None or self._sat_cache[0] != key:
+            tree_counts = np.zeros((self.height, self.width), dtype=np.int32)
+            if self.tree_positions:
+                xs = np.fromiter((p.x for p in self.tree_positions.values()), dtype=np.int64)
+                ys = np.fromiter((p.y for p in self.tree_positions.values()), dtype=np.int64)
+                inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+                np.add.at(tree_counts, (ys[inside], xs[inside]), 1)
+            self._sat_cache = (key,
+                               _summed_area_table(self.terrain_base == 0),
+                               _summed_area_table(self.buildings),
+                               _summed_area_table(tree_counts))
+        return self._sat_cache[1], self._sat_cache[2], self._sat_cache[3]
+
+    @staticmethod
+    def _footprint_half_size(building_type: str) -> int:
+        size = BUILDING_SIZES.get(building_type, 400)
+        size_in_grid = max(1, int(size / SCALE_X))
+        return size_in_grid // 2
+
+    def _footprint_sums(self, center: GridPosition, half_size: int) -> Optional[Tuple[int, int]]:
+        """(blockierte Zellen, Bäume) im Bereich, None wenn außerhalb der Karte."""
+        x0, y0 = center.x - half_size, center.y - half_size
+        x1, y1 = center.x + half_size + 1, center.y + half_size + 1
+        if x0 < 0 or y0 < 0 or x1 > self.width or y1 > self.height:
+            return None
+        terrain_sat, building_sat, tree_sat = self._summed_area_tables()
+
+        def rect(sat):
+            return int(sat[y1, x1] - sat[y0, x1] - sat[y1, x0] + sat[y0, x0])
+
+        return rect(terrain_sat) + rect(building_sat), rect(tree_sat)
+
     def can_build_at(self, world_x: float, world_y: float, building_type: str) -> bool:
         """
-        Prüft ob ein Gebäude an einer Position gebaut werden kann.
+        Prüft ob ein Gebäude an einer Position gebaut werden kann (O(1) über SAT).
 
         Bedingungen:
         1. Alle Zellen im Bereich müssen terrain-begehbar sein
         2. Keine anderen Gebäude im Weg
-        3. Keine Bäume im Weg (müssen erst gefällt werden)
+        3. Bäume blockieren nicht (müssen erst gefällt werden, siehe count_trees_in_footprint)
         """
-        size = BUILDING_SIZES.get(building_type, 400)
-        size_in_grid = max(1, int(size / SCALE_X))
+        center = GridPosition.from_world(world_x, world_y)
+        sums = self._footprint_sums(center, self._footprint_half_size(building_type))
+        return sums is not None and sums[0] == 0
 
+    def count_trees_in_footprint(self, world_x: float, world_y: float, building_type: str) -> int:
+        """Anzahl Bäume im Baubereich (O(1), entspricht len(get_trees_blocking_building))."""
         center = GridPosition.from_world(world_x, world_y)
-        half_size = size_in_grid // 2
+        sums = self._footprint_sums(center, self._footprint_half_size(building_type))
+        if sums is None:
+            return len(self.get_trees_blocking_building(world_x, world_y, building_type))
+        return sums[1]
 
-        for dy in range(-half_size, half_size + 1):
-            for dx in range(-half_size, half_size + 1):
-                gx, gy = center.x + dx, center.y + dy
+    def buildable_map(self, building_type: str, allow_trees: bool = True) -> np.ndarray:
+        """
+        Bool-Map (H x W) aller gültigen Gebäude-Zentren, vektorisiert.
 
-                # Außerhalb der Karte?
-                if not (0 <= gx < self.width and 0 <= gy < self.height):
-                    return False
+        Args:
+            allow_trees: False = Bäume im Bereich machen den Platz ungültig
 
-                # Terrain nicht begehbar?
-                if self.terrain_base[gy, gx] == 0:
-                    return False
+        Gecacht bis zur nächsten Grid-Änderung - Ergebnis nicht verändern!
+        """
+        half_size = self._footprint_half_size(building_type)
+        key = (self.version, id(self.terrain_base))
+        cached = self._buildable_cache.get((half_size, allow_trees))
+        if cached is not None and cached[0] == key:
+            return cached[1]
 
-                # Gebäude im Weg?
-                if self.buildings[gy, gx] == 1:
-                    return False
+        side = 2 * half_size + 1
+        result = np.zeros((self.height, self.width), dtype=bool)
+        if side > self.width or side > self.height:
+            return result
 
-        return True
+        terrain_sat, building_sat, tree_sat = self._summed_area_tables()
+
+        def window_sums(sat):
+            return sat[side:, side:] - sat[:-side, side:] - sat[side:, :-side] + sat[:-side, :-side]
+
+        valid = (window_sums(terrain_sat) + window_sums(building_sat)) == 0
+        if not allow_trees:
+            valid &= window_sums(tree_sat) == 0
+        result[half_size:self.height - half_size, half_size:self.width - half_size] = valid
+        self._buildable_cache[(half_size, allow_trees)] = (key, result)
+        return result
 
     def get_trees_blocking_building(self, world_x: float, world_y: float,
                                      building_type: str) -> List[int]:
@@ -386,15 +1073,9 @@ class WalkableGrid:
         center = GridPosition.from_world(world_x, world_y)
         half_size = size_in_grid // 2
 
-        blocking_trees = []
-
-        for tree_id, tree_pos in self.tree_positions.items():
-            # Ist der Baum im Baubereich?
-            if (center.x - half_size <= tree_pos.x <= center.x + half_size and
-                center.y - half_size <= tree_pos.y <= center.y + half_size):
-                blocking_trees.append(tree_id)
-
-        return blocking_trees
+        # Bäume im Baubereich über den räumlichen Index
+        return self.tree_index.within_rect(center.x - half_size, center.y - half_size,
+                                           center.x + half_size, center.y + half_size)
 
     def find_valid_building_positions(self, building_type: str,
                                        near_x: float, near_y: float,
@@ -427,7 +1108,7 @@ class WalkableGrid:
 
                     if self.can_build_at(world_x, world_y, building_type):
                         dist = np.sqrt((world_x - near_x)**2 + (world_y - near_y)**2)
-                        blocking = len(self.get_trees_blocking_building(world_x, world_y, building_type))
+                        blocking = self.count_trees_in_footprint(world_x, world_y, building_type)
                         valid_positions.append((world_x, world_y, dist, blocking))
 
                         if len(valid_positions) >= max_results * 2:
@@ -443,6 +1124,262 @@ class WalkableGrid:
 # A* PATHFINDING
 # =============================================================================
 
+class GridSearch:
+    """
+    A*-Kern auf flachen Zell-Indizes (gepaddetes Grid, siehe _padded_walkable).
+
+    - Keine GridPosition-Objekte während der Suche
+    - g/parent in vorallokierten NumPy-Arrays; ein Generationszähler markiert
+      gültige Einträge, sodass zwischen Suchen nichts zurückgesetzt werden muss
+    - Optional Jump Point Search (8-Nachbarschaft, uniforme Kosten, keine
+      Ecken-Abkürzung) - liefert dieselben Distanzen mit weniger Expansionen
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.row = width + 2
+        n = self.row * (height + 2)
+        self.g = np.zeros(n, dtype=np.int32)
+        self.parent = np.full(n, -1, dtype=np.int32)
+        self.generation = np.zeros(n, dtype=np.uint32)
+        # memoryviews: Einzelzugriffe fast so schnell wie Listen
+        self._g = memoryview(self.g)
+        self._parent = memoryview(self.parent)
+        self._generation = memoryview(self.generation)
+        self.current_generation = 0
+        self.moves = _field_moves(self.row)
+
+        # Statistik (für Benchmarks)
+        self.nodes_expanded = 0
+        self.total_nodes_expanded = 0
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.row + (x + 1)
+
+    def position(self, idx: int) -> Tuple[int, int]:
+        y, x = divmod(idx, self.row)
+        return (x - 1, y - 1)
+
+    def _next_generation(self) -> int:
+        if self.current_generation >= np.iinfo(np.uint32).max:
+            self.generation[:] = 0
+            self.current_generation = 0
+        self.current_generation += 1
+        return self.current_generation
+
+    def search(self, walk: bytes, start: int, goal: int, jps: bool = False) -> Optional[int]:
+        """
+        Kürzeste Grid-Distanz von start nach goal (beide begehbar).
+
+        Returns:
+            Grid-Distanz (COST_STRAIGHT pro gerader Schritt) oder None
+        """
+        if jps:
+            return self._search_jps(walk, start, goal)
+
+        gen = self._next_generation()
+        g_arr, parent, seen = self._g, self._parent, self._generation
+        row = self.row
+        goal_y, goal_x = divmod(goal, row)
+        diag_extra = COST_DIAGONAL - 2 * COST_STRAIGHT
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        seen[start] = gen
+        g_arr[start] = 0
+        parent[start] = -1
+        heap = [(0, 0, start)]
+        expanded = 0
+
+        while heap:
+            _, neg_g, u = heappop(heap)
+            g = -neg_g
+            if g > g_arr[u]:
+                continue
+            if u == goal:
+                self.nodes_expanded = expanded
+                self.total_nodes_expanded += expanded
+                return g
+            expanded += 1
+
+            for off, cost, c1, c2 in self.moves:
+                v = u + off
+                if not walk[v]:
+                    continue
+                if c1 and not (walk[u + c1] and walk[u + c2]):
+                    continue
+                ng = g + cost
+                if seen[v] != gen or ng < g_arr[v]:
+                    seen[v] = gen
+                    g_arr[v] = ng
+                    parent[v] = u
+                    vy, vx = divmod(v, row)
+                    dx = vx - goal_x if vx > goal_x else goal_x - vx
+                    dy = vy - goal_y if vy > goal_y else goal_y - vy
+                    h = COST_STRAIGHT * (dx + dy) + diag_extra * (dx if dx < dy else dy)
+                    # Bei gleichem f zuerst den Knoten mit größerem g (näher am Ziel)
+                    heappush(heap, (ng + h, -ng, v))
+
+        self.nodes_expanded = expanded
+        self.total_nodes_expanded += expanded
+        return None
+
+    # -------------------------------------------------------------------------
+    # Jump Point Search
+    # -------------------------------------------------------------------------
+
+    def _octile(self, a: int, b: int) -> int:
+        ay, ax = divmod(a, self.row)
+        by, bx = divmod(b, self.row)
+        dx, dy = abs(ax - bx), abs(ay - by)
+        return COST_STRAIGHT * (dx + dy) + (COST_DIAGONAL - 2 * COST_STRAIGHT) * min(dx, dy)
+
+    def _jump(self, walk: bytes, i: int, dx: int, dy: int, goal: int) -> int:
+        """Springt ab Zelle i in Richtung (dx, dy); -1 wenn kein Sprungpunkt."""
+        row = self.row
+        if dx != 0 and dy != 0:
+            dyr = dy * row
+            while True:
+                if not walk[i]:
+                    return -1
+                if i == goal:
+                    return i
+                if (self._jump(walk, i + dx, dx, 0, goal) >= 0 or
+                        self._jump(walk, i + dyr, 0, dy, goal) >= 0):
+                    return i
+                if not (walk[i + dx] and walk[i + dyr]):
+                    return -1
+                i += dx + dyr
+        if dx != 0:
+            while True:
+                if not walk[i]:
+                    return -1
+                if i == goal:
+                    return i
+                # Erzwungene Nachbarn: seitlich frei, aber hinter uns blockiert
+                if ((walk[i - row] and not walk[i - dx - row]) or
+                        (walk[i + row] and not walk[i - dx + row])):
+                    return i
+                i += dx
+        dyr = dy * row
+        while True:
+            if not walk[i]:
+                return -1
+            if i == goal:
+                return i
+            if ((walk[i - 1] and not walk[i - 1 - dyr]) or
+                    (walk[i + 1] and not walk[i + 1 - dyr])):
+                return i
+            i += dyr
+
+    def _jps_directions(self, walk: bytes, u: int, p: int) -> List[Tuple[int, int]]:
+        """Geprunte Suchrichtungen für Knoten u mit Vorgänger p."""
+        row = self.row
+        if p < 0:
+            return [(dx, dy) for dx, dy in DIRECTIONS
+                    if walk[u + dx + dy * row] and
+                    (dx == 0 or dy == 0 or (walk[u + dx] and walk[u + dy * row]))]
+
+        uy, ux = divmod(u, row)
+        py, px = divmod(p, row)
+        dx = (ux > px) - (ux < px)
+        dy = (uy > py) - (uy < py)
+        dirs = []
+        if dx != 0 and dy != 0:
+            vertical = walk[u + dy * row]
+            horizontal = walk[u + dx]
+            if vertical:
+                dirs.append((0, dy))
+            if horizontal:
+                dirs.append((dx, 0))
+            if vertical and horizontal:
+                dirs.append((dx, dy))
+        elif dx != 0:
+            ahead = walk[u + dx]
+            down = walk[u + row]
+            up = walk[u - row]
+            if ahead:
+                dirs.append((dx, 0))
+                if down:
+                    dirs.append((dx, 1))
+                if up:
+                    dirs.append((dx, -1))
+            if down:
+                dirs.append((0, 1))
+            if up:
+                dirs.append((0, -1))
+        else:
+            ahead = walk[u + dy * row]
+            right = walk[u + 1]
+            left = walk[u - 1]
+            if ahead:
+                dirs.append((0, dy))
+                if right:
+                    dirs.append((1, dy))
+                if left:
+                    dirs.append((-1, dy))
+            if right:
+                dirs.append((1, 0))
+            if left:
+                dirs.append((-1, 0))
+        return dirs
+
+    def _search_jps(self, walk: bytes, start: int, goal: int) -> Optional[int]:
+        gen = self._next_generation()
+        g_arr, parent, seen = self._g, self._parent, self._generation
+        row = self.row
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        seen[start] = gen
+        g_arr[start] = 0
+        parent[start] = -1
+        heap = [(0, 0, start)]
+        expanded = 0
+
+        while heap:
+            _, neg_g, u = heappop(heap)
+            g = -neg_g
+            if g > g_arr[u]:
+                continue
+            if u == goal:
+                self.nodes_expanded = expanded
+                self.total_nodes_expanded += expanded
+                return g
+            expanded += 1
+
+            for dx, dy in self._jps_directions(walk, u, parent[u]):
+                j = self._jump(walk, u + dx + dy * row, dx, dy, goal)
+                if j < 0:
+                    continue
+                ng = g + self._octile(u, j)
+                if seen[j] != gen or ng < g_arr[j]:
+                    seen[j] = gen
+                    g_arr[j] = ng
+                    parent[j] = u
+                    heappush(heap, (ng + self._octile(j, goal), -ng, j))
+
+        self.nodes_expanded = expanded
+        self.total_nodes_expanded += expanded
+        return None
+
+    def reconstruct(self, goal: int) -> List[int]:
+        """Zell-Indizes vom Start zum Ziel der letzten Suche (JPS-Segmente aufgefüllt)."""
+        row = self.row
+        path = [goal]
+        current = goal
+        prev = self._parent[current]
+        while prev >= 0:
+            cy, cx = divmod(current, row)
+            py, px = divmod(prev, row)
+            step = ((px > cx) - (px < cx)) + ((py > cy) - (py < cy)) * row
+            while current != prev:
+                current += step
+                path.append(current)
+            prev = self._parent[current]
+        path.reverse()
+        return path
+
+
 class AStarPathfinder:
     """
     A* Pfadfindung auf dem WalkableGrid.
@@ -450,12 +1387,29 @@ class AStarPathfinder:
     Features:
     - 8-direktionale Bewegung
     - Diagonale Kosten korrekt berechnet
-    - Optional: Pfad-Caching
-    - Optional: Pfad-Glättung
+    - Integer-Kern (GridSearch) auf flachen Zell-Indizes
+    - Optional: Jump Point Search (use_jps)
     """
 
-    def __init__(self, grid: WalkableGrid):
+    def __init__(self, grid: WalkableGrid, use_jps: bool = False):
         self.grid = grid
+        self.use_jps = use_jps
+        self._engine: Optional[GridSearch] = None
+
+    def __deepcopy__(self, memo):
+        """Snapshot-Kopie: Such-Arrays sind nur Scratch-Speicher und werden geteilt."""
+        new_finder = AStarPathfinder.__new__(AStarPathfinder)
+        memo[id(self)] = new_finder
+        new_finder.__dict__.update(self.__dict__)
+        new_finder.grid = copy.deepcopy(self.grid, memo)
+        return new_finder
+
+    @property
+    def engine(self) -> GridSearch:
+        """Such-Kern, wird bei der ersten Suche angelegt."""
+        if self._engine is None:
+            self._engine = GridSearch(self.grid.width, self.grid.height)
+        return self._engine
 
     def _heuristic(self, a: GridPosition, b: GridPosition) -> int:
         """Diagonale Distanz Heuristik (Octile distance)."""
@@ -463,18 +1417,9 @@ class AStarPathfinder:
         dy = abs(a.y - b.y)
         return COST_STRAIGHT * (dx + dy) + (COST_DIAGONAL - 2 * COST_STRAIGHT) * min(dx, dy)
 
-    def find_path(self, start_world: Tuple[float, float],
-                  goal_world: Tuple[float, float]) -> PathResult:
-        """
-        Findet den kürzesten Pfad zwischen zwei Welt-Positionen.
-
-        Args:
-            start_world: (x, y) Startposition in Spieleinheiten
-            goal_world: (x, y) Zielposition in Spieleinheiten
-
-        Returns:
-            PathResult mit Pfad und Distanz
-        """
+    def _resolve_endpoints(self, start_world: Tuple[float, float],
+                           goal_world: Tuple[float, float]) -> Optional[Tuple[GridPosition, GridPosition]]:
+        """Start/Ziel als Grid-Zellen, blockierte auf die nächste begehbare verschoben."""
         start = GridPosition.from_world(start_world[0], start_world[1])
         goal = GridPosition.from_world(goal_world[0], goal_world[1])
 
@@ -483,80 +1428,68 @@ class AStarPathfinder:
             # Finde nächste begehbare Zelle
             start = self._find_nearest_walkable(start)
             if start is None:
-                return PathResult(found=False)
+                return None
 
         if not self.grid.is_walkable_pos(goal):
-            goal = self._find_nearest_walkable(goal)
+            # Bevorzugt eine Zelle die vom Start aus erreichbar ist
+            start_component = self.grid.component_at(start.x, start.y)
+            goal = (self._find_nearest_walkable(goal, component=start_component) or
+                    self._find_nearest_walkable(goal))
             if goal is None:
-                return PathResult(found=False)
-
-        # A* Algorithmus
-        open_set = []
-        heapq.heappush(open_set, (0, id(start), start))
-
-        came_from: Dict[GridPosition, GridPosition] = {}
-        g_score: Dict[GridPosition, int] = {start: 0}
-        f_score: Dict[GridPosition, int] = {start: self._heuristic(start, goal)}
-
-        open_set_hash: Set[GridPosition] = {start}
+                return None
+        return start, goal
 
-        while open_set:
-            _, _, current = heapq.heappop(open_set)
-            open_set_hash.discard(current)
-
-            if current == goal:
-                # Pfad rekonstruieren
-                path = self._reconstruct_path(came_from, current)
-                grid_dist = g_score[current]
-                world_dist = grid_dist * ((SCALE_X + SCALE_Y) / 2) / COST_STRAIGHT
-
-                return PathResult(
-                    found=True,
-                    path=path,
-                    grid_distance=grid_dist,
-                    world_distance=world_dist
-                )
+    def _search(self, start: GridPosition, goal: GridPosition) -> Optional[int]:
+        # Verschiedene Komponenten: kein Pfad, ohne die Region abzusuchen
+        if not self.grid.is_reachable(start, goal):
+            return None
+        engine = self.engine
+        _, walk = self.grid.get_padded_walkable()
+        return engine.search(walk, engine.index(start.x, start.y),
+                             engine.index(goal.x, goal.y), jps=self.use_jps)
 
-            for dx, dy in DIRECTIONS:
-                neighbor = GridPosition(current.x + dx, current.y + dy)
+    def find_path(self, start_world: Tuple[float, float],
+                  goal_world: Tuple[float, float]) -> PathResult:
+        """
+        Findet den kürzesten Pfad zwischen zwei Welt-Positionen.
 
-                if not self.grid.is_walkable_pos(neighbor):
-                    continue
+        Args:
+            start_world: (x, y) Startposition in Spieleinheiten
+            goal_world: (x, y) Zielposition in Spieleinheiten
 
-                # Diagonale Bewegung: Prüfe ob Ecken frei sind
-                if dx != 0 and dy != 0:
-                    if not (self.grid.is_walkable(current.x + dx, current.y) and
-                            self.grid.is_walkable(current.x, current.y + dy)):
-                        continue
+        Returns:
+            PathResult mit Pfad und Distanz
+        """
+        endpoints = self._resolve_endpoints(start_world, goal_world)
+        if endpoints is None:
+            return PathResult(found=False)
+        start, goal = endpoints
+
+        grid_dist = self._search(start, goal)
+        if grid_dist is None:
+            # Kein Pfad gefunden
+            return PathResult(found=False)
+
+        engine = self.engine
+        path = [GridPosition(*engine.position(idx))
+                for idx in engine.reconstruct(engine.index(goal.x, goal.y))]
+        world_dist = grid_dist * ((SCALE_X + SCALE_Y) / 2) / COST_STRAIGHT
+
+        return PathResult(
+            found=True,
+            path=path,
+            grid_distance=grid_dist,
+            world_distance=world_dist
+        )
 
-                # Bewegungskosten
-                move_cost = COST_DIAGONAL if (dx != 0 and dy != 0) else COST_STRAIGHT
-                tentative_g = g_score[current] + move_cost
-
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + self._heuristic(neighbor, goal)
-
-                    if neighbor not in open_set_hash:
-                        heapq.heappush(open_set, (f_score[neighbor], id(neighbor), neighbor))
-                        open_set_hash.add(neighbor)
-
-        # Kein Pfad gefunden
-        return PathResult(found=False)
-
-    def _reconstruct_path(self, came_from: Dict[GridPosition, GridPosition],
-                          current: GridPosition) -> List[GridPosition]:
-        """Rekonstruiert den Pfad vom Ziel zum Start."""
-        path = [current]
-        while current in came_from:
-            current = came_from[current]
-            path.append(current)
-        path.reverse()
-        return path
+    def _find_nearest_walkable(self, pos: GridPosition, max_radius: int = SNAP_RADIUS,
+                               component: Optional[int] = None) -> Optional[GridPosition]:
+        """Findet die nächste begehbare Zelle.
 
-    def _find_nearest_walkable(self, pos: GridPosition, max_radius: int = 10) -> Optional[GridPosition]:
-        """Findet die nächste begehbare Zelle."""
+        Args:
+            component: Nur Zellen dieser Komponente (siehe WalkableGrid.component_at)
+        """
+        labels = self.grid.get_component_labels() if component else None
         for radius in range(1, max_radius + 1):
             for dy in range(-radius, radius + 1):
                 for dx in range(-radius, radius + 1):
@@ -565,14 +1498,322 @@ class AStarPathfinder:
 
                     neighbor = GridPosition(pos.x + dx, pos.y + dy)
                     if self.grid.is_walkable_pos(neighbor):
+                        if labels is not None and labels[neighbor.y, neighbor.x] != component:
+                            continue
                         return neighbor
         return None
 
     def get_path_distance(self, start_world: Tuple[float, float],
                           goal_world: Tuple[float, float]) -> float:
         """Gibt nur die Pfaddistanz zurück (schneller wenn Pfad nicht benötigt)."""
-        result = self.find_path(start_world, goal_world)
-        return result.world_distance if result.found else float('inf')
+        endpoints = self._resolve_endpoints(start_world, goal_world)
+        if endpoints is None:
+            return float('inf')
+        grid_dist = self._search(*endpoints)
+        if grid_dist is None:
+            return float('inf')
+        return grid_dist * ((SCALE_X + SCALE_Y) / 2) / COST_STRAIGHT
+
+
+# =============================================================================
+# DISTANZFELDER (Dijkstra von festen Quellen)
+# =============================================================================
+
+# Unerreichbare Zellen im Distanzfeld
+FIELD_INF = np.iinfo(np.int32).max
+
+
+def _padded_walkable(grid: 'WalkableGrid') -> np.ndarray:
+    """Begehbarkeit als flaches uint8-Array mit 1 Zelle blockiertem Rand.
+
+    Durch den Rand braucht die Nachbarsuche keine Bereichsprüfung:
+    Index = (y + 1) * (width + 2) + (x + 1).
+    """
+    return np.pad(grid.get_walkable_grid(), 1).ravel()
+
+
+def _field_moves(row: int) -> List[Tuple[int, int, int, int]]:
+    """(offset, kosten, ecke1, ecke2) für die 8 Richtungen im gepaddeten Grid.
+
+    Diagonalen sind nur erlaubt wenn beide Ecken frei sind (wie A*).
+    """
+    moves = []
+    for dx, dy in DIRECTIONS:
+        if dx != 0 and dy != 0:
+            moves.append((dy * row + dx, COST_DIAGONAL, dx, dy * row))
+        else:
+            moves.append((dy * row + dx, COST_STRAIGHT, 0, 0))
+    return moves
+
+
+def _propagate_field(walk, dist, parent, heap: list, row: int):
+    """Dijkstra-Relaxierung ab den Einträgen im Heap (in-place)."""
+    moves = _field_moves(row)
+    heappop, heappush = heapq.heappop, heapq.heappush
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        for off, cost, c1, c2 in moves:
+            v = u + off
+            if not walk[v]:
+                continue
+            if c1 and not (walk[u + c1] and walk[u + c2]):
+                continue
+            nd = d + cost
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                heappush(heap, (nd, v))
+
+
+def _edge_valid(walk, u: int, v: int, row: int) -> bool:
+    """Ist der Schritt u -> v (Nachbarn) im aktuellen Grid erlaubt?"""
+    if not (walk[u] and walk[v]):
+        return False
+    diff = v - u
+    if diff in (1, -1, row, -row):
+        return True
+    dx = 1 if diff in (row + 1, -row + 1) else -1
+    dy = row if diff > 0 else -row
+    return bool(walk[u + dx] and walk[u + dy])
+
+
+class DistanceField:
+    """
+    Kürzeste Laufdistanz (Grid-Kosten wie A*) von einer Quelle zu jeder Zelle.
+
+    Wird bei Grid-Änderungen lokal aktualisiert statt neu berechnet:
+    - Blockierte Zellen: betroffener Teilbaum des Kürzeste-Wege-Baums wird
+      zurückgesetzt und vom Rand aus neu relaxiert
+    - Freigegebene Zellen: Verbesserungen werden ab dem Rand propagiert
+
+    Arrays werden beim Kopieren geteilt (Copy-on-Write).
+    """
+
+    def __init__(self, width: int, height: int, source: int,
+                 walk: np.ndarray, dist: np.ndarray, parent: np.ndarray):
+        self.width = width
+        self.height = height
+        self.row = width + 2
+        self.source = source
+        self.walk = walk
+        self.dist = dist
+        self.parent = parent
+        self.valid = True
+        self._shared = False
+        # Grid-Version des letzten Abgleichs (None = noch nie, z.B. Vorlage)
+        self.synced_version: Optional[int] = None
+
+    @classmethod
+    def compute(cls, walk: np.ndarray, width: int, height: int, source: int) -> 'DistanceField':
+        """Volles Dijkstra ab source (gepaddeter Index)."""
+        n = len(walk)
+        # Listen sind für Einzelzugriffe deutlich schneller als NumPy-Arrays
+        dist = [FIELD_INF] * n
+        parent = [-1] * n
+        dist[source] = 0
+        _propagate_field(walk.tobytes(), dist, parent, [(0, source)], width + 2)
+        return cls(width, height, source, walk,
+                   np.array(dist, dtype=np.int32), np.array(parent, dtype=np.int32))
+
+    @classmethod
+    def from_distances(cls, walk: np.ndarray, width: int, height: int,
+                       source: int, dist: np.ndarray) -> 'DistanceField':
+        """Rekonstruiert die Parent-Zeiger aus einem gespeicherten Distanzfeld."""
+        row = width + 2
+        parent = np.full(len(dist), -1, dtype=np.int32)
+        reached = dist < FIELD_INF
+        interior = np.arange(row + 1, len(dist) - row - 1)
+        for off, cost, c1, c2 in _field_moves(row):
+            u = interior - off
+            ok = reached[interior] & reached[u] & (parent[interior] < 0)
+            ok &= dist[u].astype(np.int64) + cost == dist[interior]
+            if c1:
+                ok &= (walk[u + c1] & walk[u + c2]).astype(bool)
+            parent[interior[ok]] = u[ok]
+        parent[source] = -1
+        return cls(width, height, source, walk, dist, parent)
+
+    def copy(self) -> 'DistanceField':
+        """Copy-on-Write Kopie."""
+        new_field = DistanceField.__new__(DistanceField)
+        new_field.__dict__.update(self.__dict__)
+        self._shared = True
+        new_field._shared = True
+        return new_field
+
+    def _own_arrays(self):
+        if self._shared:
+            self.walk = self.walk.copy()
+            self.dist = self.dist.copy()
+            self.parent = self.parent.copy()
+            self._shared = False
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.row + (x + 1)
+
+    def position(self, idx: int) -> Tuple[int, int]:
+        y, x = divmod(idx, self.row)
+        return (x - 1, y - 1)
+
+    def distance_at(self, x: int, y: int) -> int:
+        """Grid-Distanz zur Zelle (x, y), FIELD_INF wenn unerreichbar."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return FIELD_INF
+        return int(self.dist[self.index(x, y)])
+
+    def sync(self, walk_now: np.ndarray):
+        """Übernimmt Änderungen der Begehbarkeit (Vergleich des ganzen Grids)."""
+        changed = np.flatnonzero(self.walk != walk_now)
+        self.apply_changes(changed, walk_now[changed])
+
+    def apply_changes(self, cells: np.ndarray, values: np.ndarray):
+        """Übernimmt die aktuelle Begehbarkeit values an den Zellen cells (gepaddet, eindeutig)."""
+        differ = self.walk[cells] != values
+        changed, values = cells[differ], values[differ]
+        if len(changed) == 0:
+            return
+        self._own_arrays()
+        self.walk[changed] = values
+        blocked = changed[values == 0]
+        freed = changed[values != 0]
+        if len(blocked):
+            self._update_blocked(blocked)
+        if self.valid and len(freed):
+            self._update_freed(freed)
+
+    def _ring(self, cells: np.ndarray) -> np.ndarray:
+        """Zellen plus ihre 8 Nachbarn (ohne Rand)."""
+        offsets = [0] + [off for off, _, _, _ in _field_moves(self.row)]
+        ring = np.unique((cells[:, None] + np.array(offsets)[None, :]).ravel())
+        return ring[(ring >= 0) & (ring < len(self.walk))]
+
+    def _update_blocked(self, blocked: np.ndarray):
+        if not self.walk[self.source]:
+            # Quelle selbst blockiert -> Feld muss neu berechnet werden
+            self.valid = False
+            return
+
+        walk, dist, parent, row = self.walk, self.dist, self.parent, self.row
+
+        # Wurzeln: erreichte Zellen deren Baum-Kante jetzt ungültig ist
+        roots = [int(c) for c in self._ring(blocked)
+                 if dist[c] < FIELD_INF and c != self.source
+                 and not _edge_valid(walk, int(parent[c]), int(c), row)]
+        if not roots:
+            return
+
+        # Betroffener Teilbaum (Kinder sind immer 8-Nachbarn)
+        moves = _field_moves(row)
+        affected = set(roots)
+        stack = list(roots)
+        while stack:
+            u = stack.pop()
+            for off, _, _, _ in moves:
+                v = u + off
+                if v not in affected and parent[v] == u:
+                    affected.add(v)
+                    stack.append(v)
+
+        affected_idx = np.fromiter(affected, dtype=np.int64, count=len(affected))
+        dist[affected_idx] = FIELD_INF
+        parent[affected_idx] = -1
+
+        # Vom unbetroffenen Rand aus neu relaxieren
+        heap = []
+        for v in affected:
+            if not walk[v]:
+                continue
+            best, best_u = FIELD_INF, -1
+            for off, cost, _, _ in moves:
+                u = v - off
+                du = dist[u]
+                if du < FIELD_INF and du + cost < best and _edge_valid(walk, u, v, row):
+                    best, best_u = int(du) + cost, u
+            if best_u >= 0:
+                dist[v] = best
+                parent[v] = best_u
+                heap.append((best, v))
+        heapq.heapify(heap)
+        _propagate_field(walk, dist, parent, heap, row)
+
+    def _update_freed(self, freed: np.ndarray):
+        walk, dist, parent, row = self.walk, self.dist, self.parent, self.row
+        moves = _field_moves(row)
+
+        # Neue Kanten liegen immer im 1-Ring der freigegebenen Zellen
+        heap = []
+        for v in self._ring(freed):
+            v = int(v)
+            if not walk[v]:
+                continue
+            for off, cost, _, _ in moves:
+                u = v - off
+                du = dist[u]
+                if du < FIELD_INF and du + cost < dist[v] and _edge_valid(walk, u, v, row):
+                    dist[v] = int(du) + cost
+                    parent[v] = u
+                    heap.append((int(dist[v]), v))
+        heapq.heapify(heap)
+        _propagate_field(walk, dist, parent, heap, row)
+
+
+class DistanceFieldStore:
+    """
+    Distanzfelder für statische Quellen auf dem Start-Grid.
+
+    Felder werden bei Bedarf berechnet und neben player1_walkable.npy
+    gespeichert (Dateiname enthält einen Hash des Start-Grids, damit
+    geänderte Karten nicht alte Felder laden).
+    """
+
+    def __init__(self, grid: 'WalkableGrid', cache_dir: Optional[str] = None):
+        self.width = grid.width
+        self.height = grid.height
+        self.walk = _padded_walkable(grid)
+        self.walk_hash = hashlib.sha1(self.walk.tobytes()).hexdigest()[:12]
+        self.cache_dir = cache_dir
+        self.fields: Dict[int, DistanceField] = {}
+
+    def _cache_file(self, source: int) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, "distance_fields",
+                            f"field_{self.walk_hash}_{source}.npz")
+
+    def get(self, source: int) -> DistanceField:
+        """Distanzfeld ab source (gepaddeter Index) auf dem Start-Grid."""
+        field = self.fields.get(source)
+        if field is not None:
+            return field
+
+        cache_file = self._cache_file(source)
+        if cache_file is not None and os.path.exists(cache_file):
+            stored = np.load(cache_file)["dist"]
+            dist = stored.astype(np.int32)
+            if stored.dtype == np.uint16:
+                dist[stored == np.iinfo(np.uint16).max] = FIELD_INF
+            field = DistanceField.from_distances(self.walk, self.width, self.height, source, dist)
+        else:
+            field = DistanceField.compute(self.walk, self.width, self.height, source)
+            if cache_file is not None:
+                self._save(cache_file, field.dist)
+
+        # Felder im Store sind Vorlagen und werden nur kopiert
+        field._shared = True
+        self.fields[source] = field
+        return field
+
+    @staticmethod
+    def _save(cache_file: str, dist: np.ndarray):
+        reached = dist[dist < FIELD_INF]
+        if len(reached) == 0 or reached.max() < np.iinfo(np.uint16).max:
+            stored = np.where(dist < FIELD_INF, dist, np.iinfo(np.uint16).max).astype(np.uint16)
+        else:
+            stored = dist
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        np.savez_compressed(cache_file, dist=stored)
 
 
 # =============================================================================
@@ -605,14 +1846,213 @@ class MapManager:
 
         # Baum-Tracking (Welt-Koordinaten -> Tree-ID)
         self.tree_world_positions: Dict[int, Tuple[float, float]] = {}
+        self.tree_index = TreeSpatialIndex(bucket_size=500.0, metric="euclidean")
+
+        # Distanzfelder: Vorlagen auf dem Start-Grid (geteilt) + lokal aktualisierte Kopien
+        self.field_store: Optional[DistanceFieldStore] = None
+        self.distance_fields: Dict[Tuple[int, int], DistanceField] = {}
+
+        # Laufzeit-Messung (PerfStats vom Environment, None = aus)
+        self.perf = None
+
+        # Overlay-Modus: seit enable_overlay() gefällte Bäume (tree_id -> Welt-Position)
+        self._removed_tree_worlds: Optional[Dict[int, Tuple[float, float]]] = None
+
+    def __deepcopy__(self, memo):
+        """Snapshot-Kopie mit Copy-on-Write Grid (siehe WalkableGrid.__deepcopy__)."""
+        new_manager = MapManager.__new__(MapManager)
+        memo[id(self)] = new_manager
+        new_manager.__dict__.update(self.__dict__)
+        new_manager.grid = copy.deepcopy(self.grid, memo)
+        new_manager.pathfinder = copy.deepcopy(self.pathfinder, memo)
+        new_manager.tree_world_positions = dict(self.tree_world_positions)
+        new_manager.tree_index = self.tree_index.copy()
+        new_manager.distance_fields = {key: f.copy() for key, f in self.distance_fields.items()}
+        if self._removed_tree_worlds is not None:
+            new_manager._removed_tree_worlds = dict(self._removed_tree_worlds)
+        return new_manager
+
+    def copy_trees_from(self, other: 'MapManager'):
+        """Übernimmt Baum-Layer, Baum-Tracking und Indizes eines anderen MapManagers (für schnelles Reset)."""
+        self.grid._own_layers()
+        self.grid.trees = other.grid.trees.copy()
+        self.grid.tree_positions = dict(other.grid.tree_positions)
+        self.grid.tree_index = other.grid.tree_index.copy()
+        self.grid.next_tree_id = other.grid.next_tree_id
+        self.grid.invalidate_walkability()
+        self.tree_world_positions = dict(other.tree_world_positions)
+        self.tree_index = other.tree_index.copy()
+
+    def enable_overlay(self):
+        """
+        Macht den aktuellen Stand (Bäume, Gebäude) zur Basis für reset_overlay().
+
+        Terrain und Layer bleiben wie sie sind; während der Episode werden nur
+        die geänderten Zellen und Tracking-Einträge protokolliert.
+        """
+        self.grid.enable_overlay()
+        self._removed_tree_worlds = {}
+
+    def reset_overlay(self):
+        """Verwirft alle Änderungen seit enable_overlay() (Kosten ~ Anzahl Änderungen)."""
+        if self._removed_tree_worlds is None:
+            raise RuntimeError("Overlay-Modus nicht aktiv (enable_overlay() fehlt)")
+        self.grid.revert_overlay()
+        for tree_id, (world_x, world_y) in self._removed_tree_worlds.items():
+            self.tree_world_positions[tree_id] = (world_x, world_y)
+            self.tree_index.insert(tree_id, world_x, world_y)
+        self._removed_tree_worlds.clear()
+        self.distance_fields = {}
+
+    # -------------------------------------------------------------------------
+    # Distanzfelder
+    # -------------------------------------------------------------------------
+
+    def enable_distance_fields(self, cache_dir: Optional[str] = None):
+        """Übernimmt das aktuelle Grid als Start-Grid für Distanzfelder.
+
+        Args:
+            cache_dir: Verzeichnis für gespeicherte Felder (None = nur im Speicher)
+        """
+        self.field_store = DistanceFieldStore(self.grid, cache_dir)
+        self.distance_fields = {}
+
+    def share_distance_fields(self, other: 'MapManager'):
+        """Verwendet die Feld-Vorlagen eines anderen MapManagers (für schnelles Reset)."""
+        self.field_store = other.field_store
+        self.distance_fields = {}
+
+    def _current_walkable(self) -> np.ndarray:
+        """Gepaddete Begehbarkeit, gecacht bis zur nächsten Grid-Änderung."""
+        return self.grid.get_padded_walkable()[0]
+
+    def _sync_field(self, field: DistanceField):
+        """Gleicht ein Feld mit dem Grid ab.
+
+        Nur die seit dem letzten Abgleich protokollierten Zellen werden
+        verglichen; ohne Protokoll (Vorlage, Terrain ersetzt) das ganze Grid.
+        """
+        grid = self.grid
+        if field.synced_version == grid.version:
+            return
+        cells = None
+        if field.synced_version is not None:
+            cells = grid.changed_cells_since(field.synced_version)
+        if cells is None:
+            field.sync(self._current_walkable())
+        elif cells:
+            xs, ys = np.array(cells, dtype=np.int64).T
+            idx, first = np.unique((ys + 1) * (grid.width + 2) + (xs + 1), return_index=True)
+            xs, ys = xs[first], ys[first]
+            values = (grid.terrain_base[ys, xs] & (1 - grid.buildings[ys, xs]) &
+                      (1 - grid.trees[ys, xs])).astype(np.uint8)
+            field.apply_changes(idx, values)
+        field.synced_version = grid.version
+
+    def _resolve_cell(self, world_x: float, world_y: float, max_radius: int = SNAP_RADIUS,
+                      component: Optional[int] = None) -> Optional[GridPosition]:
+        """Grid-Zelle zu einer Welt-Position, ggf. auf die nächste begehbare verschoben (wie A*)."""
+        local_x, local_y = self.to_local_coords(world_x, world_y)
+        pos = GridPosition.from_world(local_x, local_y)
+        if self.grid.is_walkable_pos(pos):
+            return pos
+        if component:
+            found = self.pathfinder._find_nearest_walkable(pos, max_radius, component=component)
+            if found is not None:
+                return found
+        return self.pathfinder._find_nearest_walkable(pos, max_radius)
+
+    def get_distance_field(self, world_x: float, world_y: float) -> Optional[DistanceField]:
+        """
+        Distanzfeld ab einer Quelle (HQ, Bauplatz, Schacht, Vorkommen).
+
+        Liegt die Quelle in einem Gebäude, startet das Feld wie bei A* an der
+        nächsten begehbaren Zelle (bis SNAP_RADIUS), sonst None - z.B. für die
+        HQ-Mitte, deren Gebäude größer als der Radius ist. Das Feld wird einmal
+        berechnet (bzw. von der Platte geladen) und danach nur lokal an
+        Grid-Änderungen angepasst.
+        """
+        if self.field_store is None:
+            self.enable_distance_fields()
+
+        local_x, local_y = self.to_local_coords(world_x, world_y)
+        key_pos = GridPosition.from_world(local_x, local_y)
+        key = (key_pos.x, key_pos.y)
+
+        field = self.distance_fields.get(key)
+        if field is not None:
+            self._sync_field(field)
+            if field.valid:
+                return field
+            del self.distance_fields[key]
+
+        store = self.field_store
+        source = self._resolve_cell(world_x, world_y)
+        if source is None:
+            return None
+        source_idx = (source.y + 1) * (self.grid.width + 2) + (source.x + 1)
+
+        walk_now = self._current_walkable()
+        if store.walk[source_idx]:
+            # Vorlage vom Start-Grid kopieren und an das aktuelle Grid anpassen
+            field = store.get(source_idx).copy()
+            field.sync(walk_now)
+            if not field.valid:
+                field = DistanceField.compute(walk_now.copy(), self.grid.width, self.grid.height, source_idx)
+        else:
+            # Quelle existiert im Start-Grid nicht -> direkt auf aktuellem Grid
+            field = DistanceField.compute(walk_now.copy(), self.grid.width, self.grid.height, source_idx)
+        field.synced_version = self.grid.version
+
+        self.distance_fields[key] = field
+        return field
+
+    @timed("map.field_distance")
+    def get_field_distance(self, source_world: Tuple[float, float],
+                           goal_world: Tuple[float, float]) -> float:
+        """Laufdistanz (Spieleinheiten) über ein Distanzfeld, inf wenn unerreichbar.
+
+        Entspricht find_path(source, goal).world_distance (gleiche Verschiebung
+        blockierter Start-/Zielpunkte, gleiche Kosten).
+        """
+        field = self.get_distance_field(source_world[0], source_world[1])
+        if field is None:
+            return float('inf')
+        source_x, source_y = field.position(field.source)
+        goal = self._resolve_cell(goal_world[0], goal_world[1],
+                                  component=self.grid.component_at(source_x, source_y))
+        if goal is None:
+            return float('inf')
+        grid_dist = field.distance_at(goal.x, goal.y)
+        if grid_dist >= FIELD_INF:
+            return float('inf')
+        return grid_dist * ((SCALE_X + SCALE_Y) / 2) / COST_STRAIGHT
+
+    def precompute_distance_fields(self, sources: List[Tuple[float, float]]) -> int:
+        """Berechnet/lädt die Vorlagen für statische Quellen (z.B. alle Bauplätze).
+
+        Returns: Anzahl Felder im Store
+        """
+        if self.field_store is None:
+            self.enable_distance_fields()
+        for world_x, world_y in sources:
+            source = self._resolve_cell(world_x, world_y)
+            if source is not None:
+                self.field_store.get((source.y + 1) * (self.grid.width + 2) + (source.x + 1))
+        return len(self.field_store.fields)
 
     def load_from_files(self,
                         walkable_file: str = None,
-                        resources_file: str = None):
+                        resources_file: str = None,
+                        data_root: str = None):
         """
         Lädt Kartendaten aus den exportierten Dateien.
+
+        Args:
+            data_root: Datenverzeichnis (None = SIEDLER_DATA_ROOT bzw. Repo-Verzeichnis)
         """
-        base_dir = r"c:\Users\marku\OneDrive\Desktop\siedler_ai"
+        from static_map_data import get_data_root
+        base_dir = get_data_root(data_root)
 
         # Walkable Grid laden
         if walkable_file is None:
@@ -640,18 +2080,29 @@ class MapManager:
             trees = resources.get("trees_all", resources.get("trees_nearest_50", []))
             tree_count = resources.get("trees_count", len(trees))
 
-            for tree in trees:
-                # Originale Welt-Koordinaten
-                world_x, world_y = tree["x"], tree["y"]
-                # Konvertiere zu lokalen Koordinaten für das Grid
-                local_x, local_y = self.to_local_coords(world_x, world_y)
-                # Füge zum Grid hinzu
-                tree_id = self.grid.add_tree(local_x, local_y)
-                # Speichere Welt-Position für späteres Lookup
-                self.tree_world_positions[tree_id] = (world_x, world_y)
+            self._load_trees_from_data(trees)
 
             print(f"Bäume geladen: {len(trees)} (von {tree_count} total)")
 
+    def load_static_data(self, static):
+        """
+        Übernimmt Terrain und Bäume aus StaticMapData (für schnelles Init).
+
+        Terrain und Baum-Layer werden nicht kopiert: das Terrain ist statisch,
+        der Baum-Layer wird per Copy-on-Write erst beim ersten Schreiben kopiert.
+        """
+        self.grid.terrain_base = static.terrain_base
+        self.grid.trees = static.trees_layer
+        self.grid.share_layers()
+        for tree_id, ((cell_x, cell_y), (world_x, world_y)) in enumerate(
+                zip(static.tree_cells.tolist(), static.tree_world.tolist()), start=1):
+            self.grid.tree_positions[tree_id] = GridPosition(cell_x, cell_y)
+            self.grid.tree_index.insert(tree_id, cell_x, cell_y)
+            self.tree_world_positions[tree_id] = (world_x, world_y)
+            self.tree_index.insert(tree_id, world_x, world_y)
+        self.grid.next_tree_id = static.n_trees + 1
+        self.grid.invalidate_walkability()
+
     def _load_trees_from_data(self, trees: list):
         """Lädt Bäume aus gecachten Daten (für schnelles Reset)."""
         for tree in trees:
@@ -659,6 +2110,7 @@ class MapManager:
             local_x, local_y = self.to_local_coords(world_x, world_y)
             tree_id = self.grid.add_tree(local_x, local_y)
             self.tree_world_positions[tree_id] = (world_x, world_y)
+            self.tree_index.insert(tree_id, world_x, world_y)
 
     def to_local_coords(self, world_x: float, world_y: float) -> Tuple[float, float]:
         """Konvertiert Welt-Koordinaten zu lokalen Quadrant-Koordinaten."""
@@ -675,29 +2127,62 @@ class MapManager:
         start_local = self.to_local_coords(start_world[0], start_world[1])
         goal_local = self.to_local_coords(goal_world[0], goal_world[1])
 
+        if self.perf is not None:
+            return self._measured_search("map.find_path", self.pathfinder.find_path, start_local, goal_local)
         return self.pathfinder.find_path(start_local, goal_local)
 
     def get_path_distance(self, start_world: Tuple[float, float],
                           goal_world: Tuple[float, float]) -> float:
         """Gibt nur die Pfaddistanz zurück."""
-        result = self.find_path(start_world, goal_world)
-        return result.world_distance if result.found else float('inf')
+        start_local = self.to_local_coords(start_world[0], start_world[1])
+        goal_local = self.to_local_coords(goal_world[0], goal_world[1])
+        if self.perf is not None:
+            return self._measured_search("map.path_distance", self.pathfinder.get_path_distance,
+                                         start_local, goal_local)
+        return self.pathfinder.get_path_distance(start_local, goal_local)
+
+    def _measured_search(self, name: str, search, start_local, goal_local):
+        """Suche mit Zeit- und Knoten-Messung (<name>.nodes = expandierte Knoten)."""
+        engine = self.pathfinder.engine
+        nodes = engine.total_nodes_expanded
+        start = time.perf_counter()
+        result = search(start_local, goal_local)
+        self.perf.add(name, time.perf_counter() - start)
+        self.perf.count(f"{name}.nodes", engine.total_nodes_expanded - nodes)
+        return result
 
     def add_building(self, world_x: float, world_y: float, building_type: str) -> int:
         """Fügt ein Gebäude hinzu."""
         local_x, local_y = self.to_local_coords(world_x, world_y)
         return self.grid.add_building(local_x, local_y, building_type)
 
+    def remove_building(self, building_id: int):
+        """Entfernt ein Gebäude."""
+        self.grid.remove_building(building_id)
+
     def can_build_at(self, world_x: float, world_y: float, building_type: str) -> bool:
         """Prüft ob ein Gebäude gebaut werden kann."""
         local_x, local_y = self.to_local_coords(world_x, world_y)
         return self.grid.can_build_at(local_x, local_y, building_type)
 
+    def buildable_map(self, building_type: str, allow_trees: bool = True) -> np.ndarray:
+        """Bool-Map aller gültigen Zentren im Grid (siehe WalkableGrid.buildable_map)."""
+        return self.grid.buildable_map(building_type, allow_trees)
+
+    def world_to_cell(self, world_x: float, world_y: float) -> Tuple[int, int]:
+        """Grid-Zelle (x, y) einer Welt-Position."""
+        local_x, local_y = self.to_local_coords(world_x, world_y)
+        pos = GridPosition.from_world(local_x, local_y)
+        return (pos.x, pos.y)
+
     def remove_tree(self, tree_id: int):
         """Entfernt einen Baum."""
         self.grid.remove_tree(tree_id)
         if tree_id in self.tree_world_positions:
+            if self._removed_tree_worlds is not None:
+                self._removed_tree_worlds.setdefault(tree_id, self.tree_world_positions[tree_id])
             del self.tree_world_positions[tree_id]
+        self.tree_index.remove(tree_id)
 
     def get_nearest_tree(self, world_x: float, world_y: float) -> Optional[Tuple[int, float, Tuple[float, float]]]:
         """
@@ -706,22 +2191,18 @@ class MapManager:
         Returns:
             (tree_id, distance, (world_x, world_y)) oder None
         """
-        if not self.tree_world_positions:
-            return None
-
-        min_dist = float('inf')
-        nearest_id = None
-
-        for tree_id, (tx, ty) in self.tree_world_positions.items():
-            dist = np.sqrt((tx - world_x)**2 + (ty - world_y)**2)
-            if dist < min_dist:
-                min_dist = dist
-                nearest_id = tree_id
-
-        if nearest_id is not None:
+        nearest = self.tree_index.nearest(world_x, world_y, k=1)
+        if nearest:
+            min_dist, nearest_id = nearest[0]
             return (nearest_id, min_dist, self.tree_world_positions[nearest_id])
         return None
 
+    def get_trees_in_radius(self, world_x: float, world_y: float,
+                            radius: float) -> List[Tuple[int, float, Tuple[float, float]]]:
+        """Alle Bäume im Radius als (tree_id, distance, (world_x, world_y)), nächster zuerst."""
+        return [(tree_id, dist, self.tree_world_positions[tree_id])
+                for dist, tree_id in self.tree_index.within_radius(world_x, world_y, radius)]
+
     def get_all_trees(self) -> List[Tuple[int, float, float]]:
         """Gibt alle Bäume zurück als Liste von (id, world_x, world_y)."""
         return [(tid, pos[0], pos[1]) for tid, pos in self.tree_world_positions.items()]
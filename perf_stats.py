@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Siedler AI - Laufzeit-Messpunkte
+
+Optionale Instrumentierung für Environment und MapManager: kumulierte
+Wall-Time und Aufrufzahl pro Messpunkt sowie freie Zähler (z.B. von A*
+expandierte Knoten).
+
+Ausgeschaltet (perf = None) kostet ein Messpunkt nur eine Attribut-Abfrage:
+
+    @timed("observation")
+    def get_observation(self, ...): ...
+
+    perf = self.perf
+    if perf is not None:
+        perf.mark()
+    ...
+    if perf is not None:
+        perf.lap("tick.cooldowns")   # Zeit seit mark()/letztem lap()
+
+Einschalten: SiedlerScharfschuetzenEnv(perf_stats=True) oder
+env.enable_perf_stats(); auslesen mit env.perf_stats().
+"""
+
+import functools
+import time
+from collections import defaultdict
+from typing import Dict, Iterable
+
+
+class PerfStats:
+    """Kumulierte Zeit (Sekunden) und Aufrufe pro Messpunkt, plus Zähler."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self._mark = 0.0
+
+    def add(self, name: str, seconds: float, calls: int = 1):
+        self.seconds[name] += seconds
+        self.calls[name] += calls
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def mark(self):
+        """Startpunkt für den nächsten lap()."""
+        self._mark = time.perf_counter()
+
+    def lap(self, name: str):
+        """Bucht die Zeit seit mark()/letztem lap() auf name."""
+        now = time.perf_counter()
+        self.seconds[name] += now - self._mark
+        self.calls[name] += 1
+        self._mark = now
+
+    def reset(self):
+        self.seconds.clear()
+        self.calls.clear()
+        self.counters.clear()
+
+    def as_dict(self) -> dict:
+        """{"timers": {name: {"calls", "total_ms", "mean_us"}}, "counters": {name: n}}"""
+        return {
+            "timers": {name: {"calls": self.calls[name],
+                              "total_ms": seconds * 1000,
+                              "mean_us": seconds * 1e6 / max(self.calls[name], 1)}
+                       for name, seconds in sorted(self.seconds.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+def merge_stats(stats: Iterable[dict]) -> dict:
+    """Summiert as_dict()-Ergebnisse mehrerer Envs (z.B. aus env_method("perf_stats"))."""
+    timers, counters = {}, defaultdict(int)
+    for entry in stats:
+        for name, timer in entry.get("timers", {}).items():
+            total = timers.setdefault(name, {"calls": 0, "total_ms": 0.0})
+            total["calls"] += timer["calls"]
+            total["total_ms"] += timer["total_ms"]
+        for name, n in entry.get("counters", {}).items():
+            counters[name] += n
+    for timer in timers.values():
+        timer["mean_us"] = timer["total_ms"] * 1000 / max(timer["calls"], 1)
+    return {"timers": dict(sorted(timers.items())), "counters": dict(sorted(counters.items()))}
+
+
+def timed(name: str):
+    """Misst eine Methode unter name, wenn self.perf gesetzt ist."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            perf = self.perf
+            if perf is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                perf.add(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
@@ -21,10 +21,12 @@ SERFS:
 """
 
 import json
+import numpy as np
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
-from worker_simulation import Position, Worker, WorkerState, WorkforceManager
+from worker_simulation import (Position, Worker, WorkerState, WorkforceManager,
+                               first_tick_reaching, walk_steps)
 
 
 class ResourceType(Enum):
@@ -116,6 +118,8 @@ class Refiner:
     initial_factor: int = 4  # Umwandlungsrate
     transport_amount: int = 5  # Pro Trip
     worker_speed: int = 320
+    # (Positionen, Speed) -> Zykluszeit; neu berechnet wenn sich eins davon ändert
+    _cycle_cache: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
 
     def get_cycle_time(self) -> float:
         """
@@ -123,10 +127,14 @@ class Refiner:
 
         Zyklus = Hin + Verarbeitung + Zurück
         """
-        distance = self.position.distance_to(self.supplier_position)
-        walk_time = (distance * 2) / self.worker_speed  # Hin und zurück
-        work_time = 5.0  # Verarbeitungszeit (geschätzt)
-        return walk_time + work_time
+        key = (self.position.x, self.position.y,
+               self.supplier_position.x, self.supplier_position.y, self.worker_speed)
+        if self._cycle_cache is None or self._cycle_cache[0] != key:
+            distance = self.position.distance_to(self.supplier_position)
+            walk_time = (distance * 2) / self.worker_speed  # Hin und zurück
+            work_time = 5.0  # Verarbeitungszeit (geschätzt)
+            self._cycle_cache = (key, walk_time + work_time)
+        return self._cycle_cache[1]
 
     def get_production_rate(self, worker_efficiency: float) -> float:
         """
@@ -162,11 +170,331 @@ class SerfState(Enum):
     BUILDING = "building"  # NEU: Baut ein Gebäude
 
 
-@dataclass
+# Codes der Zustände/Ressourcen in den SerfPool-Arrays
+SERF_STATES = list(SerfState)
+_SERF_STATE_CODE = {state: code for code, state in enumerate(SERF_STATES)}
+_IDLE = _SERF_STATE_CODE[SerfState.IDLE]
+_WALK_RES = _SERF_STATE_CODE[SerfState.WALKING_TO_RESOURCE]
+_EXTRACT = _SERF_STATE_CODE[SerfState.EXTRACTING]
+_WALK_BUILD = _SERF_STATE_CODE[SerfState.WALKING_TO_BUILD]
+_BUILD = _SERF_STATE_CODE[SerfState.BUILDING]
+
+SERF_RESOURCES = list(ResourceType)
+_RESOURCE_CODE = {resource: code for code, resource in enumerate(SERF_RESOURCES)}
+# Pro Ressourcen-Code: extrahierbar?, Gesamtzeit (Delay + Animation), Menge
+_EXTRACTABLE = np.array([r in SERF_EXTRACTION for r in SERF_RESOURCES])
+_EXTRACTION_TIME = np.array([SERF_EXTRACTION[r]["delay"] + SERF_EXTRACTION[r].get("animation", 0.0)
+                             if r in SERF_EXTRACTION else np.inf for r in SERF_RESOURCES])
+_EXTRACTION_AMOUNT = np.array([SERF_EXTRACTION[r]["amount"] if r in SERF_EXTRACTION else 0
+                               for r in SERF_RESOURCES], dtype=np.int64)
+# Ganze Ticks pro Extraktion bei dt=1 (Timer ab 0: fertig im ersten Tick mit Timer >= Gesamtzeit)
+_EXTRACTION_PERIOD = np.array([np.ceil(t) if np.isfinite(t) else 0 for t in _EXTRACTION_TIME], dtype=np.int64)
+
+
+class SerfPool:
+    """
+    Alle Leibeigenen als parallele NumPy-Arrays (Struct-of-Arrays).
+
+    tick() bewegt, extrahiert und baut für alle Serfs mit maskierten
+    Vektor-Operationen statt einem Methodenaufruf pro Serf. Nach außen
+    verhält sich der Pool wie die frühere List[Serf]: Iteration, len(),
+    Indexzugriff, append() und pop() arbeiten mit Serf-Views.
+    """
+
+    # Spalten mit Vektor-Operationen (alle gleich lang, Kapazität wächst x2)
+    _ARRAYS = ("state", "pos_x", "pos_y", "target_x", "target_y", "has_target",
+               "timer", "resource", "speed", "build_site_id", "has_build_target")
+    # Selten gelesene Spalten ohne Vektor-Operationen
+    _LISTS = ("tree_id", "work_location", "build_target", "path_distance")
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(capacity, 1)
+        self.n = 0
+        self.state = np.full(capacity, _IDLE, dtype=np.int8)
+        self.pos_x = np.zeros(capacity)
+        self.pos_y = np.zeros(capacity)
+        self.target_x = np.zeros(capacity)
+        self.target_y = np.zeros(capacity)
+        self.has_target = np.zeros(capacity, dtype=bool)
+        self.timer = np.zeros(capacity)
+        self.resource = np.full(capacity, -1, dtype=np.int8)  # -1 = keine Ressource
+        self.speed = np.zeros(capacity)
+        self.build_site_id = np.full(capacity, -1, dtype=np.int64)  # -1 = kein Bauplatz
+        self.has_build_target = np.zeros(capacity, dtype=bool)
+        self.tree_id: List[Optional[int]] = []
+        self.work_location: List[Optional[str]] = []
+        self.build_target: List[Optional[str]] = []
+        self.path_distance: List[Optional[float]] = []
+        self._views: List['Serf'] = []
+        # Ereignis-Plan für den "event"-Modus (siehe quiet_ticks), None = neu berechnen
+        self._plan: Optional[Tuple] = None
+
+    # ==================== LISTEN-SCHNITTSTELLE ====================
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self):
+        return iter(self._views)
+
+    def __getitem__(self, index: int) -> 'Serf':
+        return self._views[index]
+
+    def add(self, position: Position) -> 'Serf':
+        """Fügt einen untätigen Serf hinzu."""
+        serf = Serf.__new__(Serf)
+        serf._pool = self
+        serf._slot = self._add(position=position)
+        self._views.append(serf)
+        return serf
+
+    def append(self, serf: 'Serf'):
+        """Übernimmt einen (eigenständig erzeugten) Serf in den Pool."""
+        slot = self._add(**serf._fields())
+        serf._pool = self
+        serf._slot = slot
+        self._views.append(serf)
+
+    def pop(self, index: int = -1) -> 'Serf':
+        """Entfernt einen Serf; die zurückgegebene View bleibt gültig."""
+        if index < 0:
+            index += self.n
+        serf = self._views.pop(index)
+        SerfPool(capacity=1).append(serf)
+
+        last = self.n - 1
+        for name in self._ARRAYS:
+            array = getattr(self, name)
+            array[index:last] = array[index + 1:self.n]
+        for name in self._LISTS:
+            del getattr(self, name)[index]
+        self.n = last
+        self._plan = None
+        for view in self._views[index:]:
+            view._slot -= 1
+        return serf
+
+    def at_build_site(self, site_id: int) -> List['Serf']:
+        """Alle Serfs die einem Bauplatz zugewiesen sind."""
+        slots = np.flatnonzero(self.build_site_id[:self.n] == site_id)
+        return [self._views[slot] for slot in slots.tolist()]
+
+    def only_idle_or_building(self) -> bool:
+        """True wenn kein Serf läuft oder extrahiert (Bauen nur mit Bauziel)."""
+        state = self.state[:self.n]
+        building = (state == _BUILD) & self.has_build_target[:self.n]
+        return bool(np.all((state == _IDLE) | building))
+
+    def _add(self, position: Position, target_resource: Optional[ResourceType] = None,
+             target_position: Optional[Position] = None, extraction_timer: float = 0.0,
+             state: SerfState = SerfState.IDLE, speed: float = 400, tree_id: Optional[int] = None,
+             work_location: Optional[str] = None, build_target: Optional[str] = None,
+             build_site_id: Optional[int] = None, path_distance: Optional[float] = None) -> int:
+        if self.n == len(self.state):
+            for name in self._ARRAYS:
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate([array, np.zeros_like(array)]))
+        slot = self.n
+        self.n += 1
+        self.state[slot] = _SERF_STATE_CODE[state]
+        self.pos_x[slot] = position.x
+        self.pos_y[slot] = position.y
+        self.has_target[slot] = target_position is not None
+        if target_position is not None:
+            self.target_x[slot] = target_position.x
+            self.target_y[slot] = target_position.y
+        self.timer[slot] = extraction_timer
+        self.resource[slot] = -1 if target_resource is None else _RESOURCE_CODE[target_resource]
+        self.speed[slot] = speed
+        self.build_site_id[slot] = -1 if build_site_id is None else build_site_id
+        self.has_build_target[slot] = build_target is not None
+        self.tree_id.append(tree_id)
+        self.work_location.append(work_location)
+        self.build_target.append(build_target)
+        self.path_distance.append(path_distance)
+        self._plan = None
+        return slot
+
+    # ==================== SIMULATION ====================
+
+    def tick(self, dt: float) -> Dict[ResourceType, float]:
+        """
+        Simuliert einen Zeitschritt für alle Serfs.
+
+        Laufen: Position rückt um speed*dt Richtung Ziel; bei Ankunft beginnt
+        die Extraktion (Timer 0) bzw. der Bau. Extraktion: Timer läuft, bei
+        Delay + Animation gibt es die Menge der Ressource und der Timer
+        beginnt von vorn (Serf bleibt EXTRACTING, auch bei Holz). Bau:
+        Fortschritt wird in environment.py berechnet.
+
+        Returns:
+            Extrahierte Mengen pro Ressource (nur Ressourcen mit Extraktion)
+        """
+        n = self.n
+        if n == 0:
+            return {}
+        plan, self._plan = self._plan, None
+        state = self.state[:n]
+
+        # Bauen ohne Bauziel -> IDLE
+        self.state[:n][(state == _BUILD) & ~self.has_build_target[:n]] = _IDLE
+
+        # Extraktion (vor dem Laufen, damit Ankömmlinge erst im nächsten Tick extrahieren)
+        resource = self.resource[:n]
+        extracting = np.flatnonzero((state == _EXTRACT) & (resource >= 0))
+        production = {}
+        if len(extracting):
+            codes = resource[extracting]
+            extracting = extracting[_EXTRACTABLE[codes]]
+            codes = resource[extracting]
+            self.timer[extracting] += dt
+            done = self.timer[extracting] >= _EXTRACTION_TIME[codes]
+            if done.any():
+                self.timer[extracting[done]] = 0.0
+                counts = np.bincount(codes[done], minlength=len(SERF_RESOURCES))
+                for code in np.flatnonzero(counts).tolist():
+                    production[SERF_RESOURCES[code]] = float(counts[code] * _EXTRACTION_AMOUNT[code])
+
+        # Laufen (zur Ressource oder zum Bauplatz)
+        walking = np.flatnonzero((state == _WALK_RES) | (state == _WALK_BUILD))
+        if len(walking):
+            no_target = walking[~self.has_target[walking]]
+            self.state[no_target] = _IDLE
+            walking = walking[self.has_target[walking]]
+
+            dx = self.pos_x[walking] - self.target_x[walking]
+            dy = self.pos_y[walking] - self.target_y[walking]
+            distance = np.sqrt(dx * dx + dy * dy)
+            walk_distance = self.speed[walking] * dt
+            arrived = walk_distance >= distance
+
+            done = walking[arrived]
+            self.pos_x[done] = self.target_x[done]
+            self.pos_y[done] = self.target_y[done]
+            to_resource = done[self.state[done] == _WALK_RES]
+            self.state[to_resource] = _EXTRACT
+            self.timer[to_resource] = 0.0
+            self.state[done[self.state[done] == _WALK_BUILD]] = _BUILD
+
+            moving = walking[~arrived]
+            ratio = walk_distance[~arrived] / distance[~arrived]
+            self.pos_x[moving] += ratio * (self.target_x[moving] - self.pos_x[moving])
+            self.pos_y[moving] += ratio * (self.target_y[moving] - self.pos_y[moving])
+
+        # Gültiger Plan -> in diesem Tick kein Übergang, er gilt eine Sekunde kürzer weiter
+        if dt == 1 and plan is not None and plan[0] > 1:
+            self._plan = (plan[0] - 1, plan[1] + 1) + plan[2:]
+        return production
+
+    # ==================== EREIGNIS-PLANUNG ("event"-Modus) ====================
+
+    def quiet_ticks(self) -> float:
+        """
+        Anzahl folgender 1-Sekunden-Ticks ohne Zustandsübergang (inf wenn keiner ansteht).
+
+        Übergänge sind Ankunft am Ziel und Bau/Laufen ohne Ziel. Extraktionen
+        sind keine Übergänge: bei ganzzahligem Timer fällt die nächste im
+        Tick ceil(Gesamtzeit) - Timer an, danach alle ceil(Gesamtzeit) Ticks.
+        Der Plan hält dafür die Erträge pro Sekunde über eine gemeinsame
+        Periode aller Extraktionen (kgV, z.B. 30 Ticks) und gilt bis zur
+        nächsten Änderung von außen oder bis zu einem Tick mit Übergang.
+        """
+        if self._plan is None:
+            self._plan = self._make_plan()
+        return self._plan[0] - 1
+
+    def _make_plan(self) -> Tuple:
+        """
+        (Tick des nächsten Übergangs, Ticks seit Planung, extrahierende Zeilen,
+        deren Periode, Timer und erster Extraktions-Tick, Erträge pro Sekunde
+        der gemeinsamen Periode, Läufer).
+        """
+        n = self.n
+        state = self.state[:n]
+        resource = self.resource[:n]
+        extracting = np.flatnonzero((state == _EXTRACT) & (resource >= 0))
+        extracting = extracting[_EXTRACTABLE[resource[extracting]]]
+        codes = resource[extracting]
+        walking = np.flatnonzero((state == _WALK_RES) | (state == _WALK_BUILD))
+        timer = self.timer[extracting]
+        period = _EXTRACTION_PERIOD[codes]
+
+        # Sofort fällig: Bauen ohne Bauziel, Laufen ohne Ziel, Extraktions-Timer mit Bruchteil
+        if (np.count_nonzero((state == _BUILD) & ~self.has_build_target[:n])
+                or np.count_nonzero(~self.has_target[walking]) or np.count_nonzero(timer % 1)):
+            return (1, 0, extracting, period, timer, None, None, walking)
+
+        # Extraktionen in den Ticks t >= 1 mit t = first_done (mod period)
+        first_done = np.maximum(1, period - timer.astype(np.int64))
+        cycle = int(np.lcm.reduce(period)) if len(period) else 1
+        ticks = np.arange(1, cycle + 1)[:, None]
+        hits = (ticks - first_done) % period == 0
+        yields = np.zeros((cycle, len(SERF_RESOURCES)))
+        for code in np.unique(codes).tolist():
+            yields[:, code] = np.count_nonzero(hits[:, codes == code], axis=1) * float(_EXTRACTION_AMOUNT[code])
+
+        steps = walk_steps(self.pos_x[walking] - self.target_x[walking],
+                           self.pos_y[walking] - self.target_y[walking], self.speed[walking])
+        return (first_tick_reaching(steps), 0, extracting, period, timer, first_done, yields, walking)
+
+    def idle_ticks(self) -> float:
+        """Folgende Ticks ohne Extraktion (inf wenn keine ansteht; gilt innerhalb von quiet_ticks())."""
+        if self._plan is None:
+            self._plan = self._make_plan()
+        elapsed, yields = self._plan[1], self._plan[6]
+        if yields is None:
+            return 0
+        producing = np.flatnonzero(yields.any(axis=1))
+        if not len(producing):
+            return np.inf
+        # Tick elapsed + 1 + i steht in Zeile (elapsed + i) % Periode
+        return int(((producing - elapsed) % len(yields)).min())
+
+    def advance_quiet(self, ticks: int) -> np.ndarray:
+        """
+        Schreibt `ticks` übergangsfreie Sekunden fort (ticks <= quiet_ticks()).
+
+        Returns:
+            (ticks, R) extrahierte Mengen pro Sekunde und Ressourcen-Code,
+            gleich den Rückgaben von `ticks` Aufrufen von tick(1)
+        """
+        if self._plan is None:
+            self._plan = self._make_plan()
+        first, elapsed, extracting, period, timer, first_done, yields, walking = self._plan
+        now = elapsed + ticks
+
+        if len(extracting):
+            seconds = np.arange(elapsed, now) % len(yields)
+            production = yields[seconds]
+            # Timer seit der letzten Extraktion (bzw. seit Planung, falls noch keine)
+            self.timer[extracting] = np.where(first_done <= now, (now - first_done) % period, timer + now)
+        else:
+            production = np.zeros((ticks, len(SERF_RESOURCES)))
+
+        if len(walking):
+            x, y = self.pos_x[walking], self.pos_y[walking]
+            target_x, target_y = self.target_x[walking], self.target_y[walking]
+            speed = self.speed[walking]
+            for _ in range(ticks):
+                dx = x - target_x
+                dy = y - target_y
+                ratio = speed / np.sqrt(dx * dx + dy * dy)
+                x += ratio * (target_x - x)
+                y += ratio * (target_y - y)
+            self.pos_x[walking] = x
+            self.pos_y[walking] = y
+        self._plan = (first - ticks, now) + self._plan[2:]
+        return production
+
+
 class Serf:
     """
     Serf (Leibeigener) für Ressourcen-Extraktion UND Gebäude-Bau.
 
+    View auf eine Zeile eines SerfPool: alle Attribute lesen und schreiben
+    die Pool-Arrays. Eigenständig erzeugte Serfs (Serf(position=...)) haben
+    einen eigenen Pool mit einer Zeile und werden von pool.append() übernommen.
+
     WICHTIG - Korrektes Spielverhalten:
     - Leibeigene werden zu einer Ressource GESCHICKT
     - Sie LAUFEN zur Ressource (Zeit = Distanz / Speed)
@@ -180,135 +508,144 @@ class Serf:
     - Sie laufen zum Bauplatz und bauen dann
     - Mehrere Leibeigene = schnellerer Bau
     """
-    position: Position
-    target_resource: Optional[ResourceType] = None
-    target_position: Optional[Position] = None
-    extraction_timer: float = 0.0
-    state: SerfState = SerfState.IDLE
-    speed: int = 400  # Serf-Geschwindigkeit (aus PU_Serf.xml: Speed=400)
-    tree_id: Optional[int] = None  # ID des zugewiesenen Baums (für Holz)
-    # NEU: Unterscheidung zwischen Vorkommen und Mine
-    work_location: Optional[str] = None  # "deposit", "mine", oder "wood"
-    # NEU: Bau-spezifische Felder
-    build_target: Optional[str] = None  # Name des zu bauenden Gebäudes
-    build_site_id: Optional[int] = None  # ID des Bauplatzes
-
-    def tick(self, dt: float) -> Optional[Tuple[ResourceType, int]]:
-        """
-        Simuliert einen Zeitschritt.
+    __slots__ = ("_pool", "_slot")
+
+    def __init__(self, position: Position, target_resource: Optional[ResourceType] = None,
+                 target_position: Optional[Position] = None, extraction_timer: float = 0.0,
+                 state: SerfState = SerfState.IDLE,
+                 speed: int = 400,  # Serf-Geschwindigkeit (aus PU_Serf.xml: Speed=400)
+                 tree_id: Optional[int] = None,  # ID des zugewiesenen Baums (für Holz)
+                 work_location: Optional[str] = None,  # "deposit", "mine", oder "wood"
+                 build_target: Optional[str] = None,  # Name des zu bauenden Gebäudes
+                 build_site_id: Optional[int] = None):  # ID des Bauplatzes
+        pool = SerfPool(capacity=1)
+        self._pool = pool
+        self._slot = pool._add(position, target_resource, target_position, extraction_timer,
+                               state, speed, tree_id, work_location, build_target, build_site_id)
+        pool._views.append(self)
+
+    def _fields(self) -> Dict:
+        """Alle Felder als Keyword-Argumente für SerfPool._add()."""
+        return {
+            "position": self.position, "target_resource": self.target_resource,
+            "target_position": self.target_position, "extraction_timer": self.extraction_timer,
+            "state": self.state, "speed": self.speed, "tree_id": self.tree_id,
+            "work_location": self.work_location, "build_target": self.build_target,
+            "build_site_id": self.build_site_id, "path_distance": self.path_distance,
+        }
 
-        Returns:
-            (ResourceType, Menge) wenn Extraktion fertig, sonst None
-            Für Bau-States wird ("BUILD", build_progress) zurückgegeben
-        """
-        if self.state == SerfState.IDLE:
-            return None
+    def __repr__(self) -> str:
+        return (f"Serf(state={self.state.value}, position=({self.position.x:.0f}, {self.position.y:.0f}), "
+                f"target_resource={self.target_resource}, build_target={self.build_target})")
 
-        elif self.state == SerfState.WALKING_TO_RESOURCE:
-            return self._tick_walking(dt)
+    # ==================== FELDER (Pool-Arrays) ====================
 
-        elif self.state == SerfState.EXTRACTING:
-            return self._tick_extracting(dt)
+    @property
+    def position(self) -> Position:
+        return Position(float(self._pool.pos_x[self._slot]), float(self._pool.pos_y[self._slot]))
 
-        elif self.state == SerfState.WALKING_TO_BUILD:
-            return self._tick_walking_to_build(dt)
+    @position.setter
+    def position(self, value: Position):
+        self._pool.pos_x[self._slot] = value.x
+        self._pool.pos_y[self._slot] = value.y
+        self._pool._plan = None
 
-        elif self.state == SerfState.BUILDING:
-            return self._tick_building(dt)
+    @property
+    def target_position(self) -> Optional[Position]:
+        pool, slot = self._pool, self._slot
+        if not pool.has_target[slot]:
+            return None
+        return Position(float(pool.target_x[slot]), float(pool.target_y[slot]))
 
-        return None
+    @target_position.setter
+    def target_position(self, value: Optional[Position]):
+        self._pool.has_target[self._slot] = value is not None
+        if value is not None:
+            self._pool.target_x[self._slot] = value.x
+            self._pool.target_y[self._slot] = value.y
+        self._pool._plan = None
 
-    def _tick_walking(self, dt: float) -> None:
-        """Läuft zur Ressource."""
-        if self.target_position is None:
-            self.state = SerfState.IDLE
-            return None
+    @property
+    def state(self) -> SerfState:
+        return SERF_STATES[self._pool.state[self._slot]]
 
-        # Distanz berechnen
-        distance = self.position.distance_to(self.target_position)
-        walk_distance = self.speed * dt
+    @state.setter
+    def state(self, value: SerfState):
+        self._pool.state[self._slot] = _SERF_STATE_CODE[value]
+        self._pool._plan = None
 
-        if walk_distance >= distance:
-            # Angekommen! Starte Extraktion
-            self.position = Position(self.target_position.x, self.target_position.y)
-            self.state = SerfState.EXTRACTING
-            self.extraction_timer = 0.0
-        else:
-            # Noch unterwegs - Position updaten
-            ratio = walk_distance / distance
-            self.position.x += ratio * (self.target_position.x - self.position.x)
-            self.position.y += ratio * (self.target_position.y - self.position.y)
+    @property
+    def target_resource(self) -> Optional[ResourceType]:
+        code = self._pool.resource[self._slot]
+        return None if code < 0 else SERF_RESOURCES[code]
 
-        return None
+    @target_resource.setter
+    def target_resource(self, value: Optional[ResourceType]):
+        self._pool.resource[self._slot] = -1 if value is None else _RESOURCE_CODE[value]
+        self._pool._plan = None
 
-    def _tick_extracting(self, dt: float) -> Optional[Tuple[ResourceType, int]]:
-        """Extrahiert Ressourcen (mit Animations-Zeit!)."""
-        if self.target_resource is None:
-            return None
+    @property
+    def extraction_timer(self) -> float:
+        return float(self._pool.timer[self._slot])
 
-        extraction_data = SERF_EXTRACTION.get(self.target_resource)
-        if not extraction_data:
-            return None
+    @extraction_timer.setter
+    def extraction_timer(self, value: float):
+        self._pool.timer[self._slot] = value
+        self._pool._plan = None
 
-        self.extraction_timer += dt
+    @property
+    def speed(self) -> float:
+        return float(self._pool.speed[self._slot])
 
-        # Gesamtzeit = Delay + Animation (aus extra2 XMLs)
-        total_extraction_time = extraction_data["delay"] + extraction_data.get("animation", 0.0)
+    @speed.setter
+    def speed(self, value: float):
+        self._pool.speed[self._slot] = value
+        self._pool._plan = None
 
-        if self.extraction_timer >= total_extraction_time:
-            # Extraktion fertig!
-            self.extraction_timer = 0.0
-            result = (self.target_resource, extraction_data["amount"])
+    @property
+    def build_site_id(self) -> Optional[int]:
+        site_id = int(self._pool.build_site_id[self._slot])
+        return None if site_id < 0 else site_id
 
-            # HOLZ: Serf extrahiert MEHRFACH vom gleichen Baum!
-            # Der Baum hat ResourceAmount=75, jede Extraktion gibt Amount=2.
-            # Erst wenn resource_remaining <= 0 wird der Serf IDLE.
-            # Das Tracking passiert in environment._tick_time() die
-            # resource_remaining dekrementiert und den Serf stoppt wenn leer.
-            #
-            # WICHTIG: Serf bleibt im EXTRACTING-State und extrahiert weiter!
-            # (kein automatisches IDLE mehr hier)
+    @build_site_id.setter
+    def build_site_id(self, value: Optional[int]):
+        self._pool.build_site_id[self._slot] = -1 if value is None else value
 
-            return result
+    @property
+    def build_target(self) -> Optional[str]:
+        return self._pool.build_target[self._slot]
 
-        return None
+    @build_target.setter
+    def build_target(self, value: Optional[str]):
+        self._pool.build_target[self._slot] = value
+        self._pool.has_build_target[self._slot] = value is not None
+        self._pool._plan = None
 
-    def _tick_walking_to_build(self, dt: float) -> None:
-        """Läuft zum Bauplatz."""
-        if self.target_position is None:
-            self.state = SerfState.IDLE
-            return None
+    @property
+    def tree_id(self) -> Optional[int]:
+        return self._pool.tree_id[self._slot]
 
-        # Distanz berechnen
-        distance = self.position.distance_to(self.target_position)
-        walk_distance = self.speed * dt
+    @tree_id.setter
+    def tree_id(self, value: Optional[int]):
+        self._pool.tree_id[self._slot] = value
 
-        if walk_distance >= distance:
-            # Angekommen! Starte Bau
-            self.position = Position(self.target_position.x, self.target_position.y)
-            self.state = SerfState.BUILDING
-        else:
-            # Noch unterwegs - Position updaten
-            ratio = walk_distance / distance
-            self.position.x += ratio * (self.target_position.x - self.position.x)
-            self.position.y += ratio * (self.target_position.y - self.position.y)
+    @property
+    def work_location(self) -> Optional[str]:
+        return self._pool.work_location[self._slot]
 
-        return None
+    @work_location.setter
+    def work_location(self, value: Optional[str]):
+        self._pool.work_location[self._slot] = value
 
-    def _tick_building(self, dt: float) -> Optional[Tuple[str, float]]:
-        """
-        Baut am Gebäude.
+    @property
+    def path_distance(self) -> Optional[float]:
+        return self._pool.path_distance[self._slot]
 
-        Returns:
-            ("BUILD", dt) um anzuzeigen wie viel Bau-Fortschritt gemacht wurde
-        """
-        if self.build_target is None:
-            self.state = SerfState.IDLE
-            return None
+    @path_distance.setter
+    def path_distance(self, value: Optional[float]):
+        self._pool.path_distance[self._slot] = value
 
-        # Gib Bau-Fortschritt zurück (dt Sekunden Arbeit)
-        # Die tatsächliche Bauzeit-Reduktion wird in environment.py berechnet
-        return ("BUILD", dt)
+    # ==================== AKTIONEN ====================
 
     def assign_to_build(self, building_name: str, build_position: Position,
                         start_position: Position, build_site_id: int = None):
@@ -372,7 +709,7 @@ class Serf:
             return 0.0
 
         # Verwende A* Distanz wenn verfügbar
-        if hasattr(self, 'path_distance') and self.path_distance is not None:
+        if self.path_distance is not None:
             distance = self.path_distance
         else:
             # Fallback: Luftlinie
@@ -426,6 +763,120 @@ class Serf:
         self.stop()
 
 
+@dataclass
+class ProductionFlows:
+    """
+    Raten aller Minen und Refiner bei Effizienz 1.0 (stückweise konstant).
+
+    Zwischen zwei Zustandsänderungen (Worker, Level, Gebäude) sind alle
+    Raten konstant; integrate() rechnet Produktion und Input-Verbrauch
+    exakt über ein beliebiges Intervall. Läuft ein Input-Lager leer,
+    werden die verbrauchenden Refiner ab diesem Zeitpunkt auf den Zufluss
+    gedrosselt (anteilig, wenn sich mehrere Refiner einen Input teilen).
+    """
+    mine_rates: np.ndarray       # (R,) Output pro Sekunde aus Minen
+    active_mines: np.ndarray     # (R,) Anzahl Minen mit Workern pro Ressource
+    refiner_output: np.ndarray   # (K,) Ressourcen-Code des Outputs
+    refiner_input: np.ndarray    # (K,) Ressourcen-Code des Inputs
+    refiner_rates: np.ndarray    # (K,) Output pro Sekunde (0 wenn ohne aktive Mine gesperrt)
+    refiner_consumption: np.ndarray  # (K,) Input pro Sekunde (0 bei Input == Output)
+
+    def production_rates(self, efficiency: float) -> np.ndarray:
+        """Output pro Sekunde und Ressource bei vollem Input."""
+        n = len(SERF_RESOURCES)
+        return (self.mine_rates + np.bincount(self.refiner_output, self.refiner_rates, minlength=n)) * efficiency
+
+    def consumption_rates(self, efficiency: float) -> np.ndarray:
+        """Input-Verbrauch pro Sekunde und Ressource bei vollem Input."""
+        return np.bincount(self.refiner_input, self.refiner_consumption, minlength=len(SERF_RESOURCES)) * efficiency
+
+    def _speeds(self, stock: np.ndarray, efficiency: float) -> np.ndarray:
+        """
+        Laufgrad jedes Refiners (0..1): 1 solange sein Input-Lager > 0 ist,
+        sonst Zufluss / Bedarf seines Inputs. Da gedrosselte Refiner selbst
+        weniger liefern, wird bis zum Fixpunkt iteriert.
+        """
+        n = len(SERF_RESOURCES)
+        empty = stock <= 0
+        demand = np.bincount(self.refiner_input, self.refiner_consumption, minlength=n) * efficiency
+        speeds = np.ones(len(self.refiner_rates))
+        for _ in range(n + 1):
+            inflow = (self.mine_rates + np.bincount(self.refiner_output, self.refiner_rates * speeds, minlength=n)) * efficiency
+            factor = np.ones(n)
+            limited = empty & (demand > inflow)
+            factor[limited] = inflow[limited] / demand[limited]
+            new_speeds = factor[self.refiner_input]
+            if np.array_equal(new_speeds, speeds):
+                break
+            speeds = new_speeds
+        return speeds
+
+    def _rates(self, stock: np.ndarray, efficiency: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(Zufluss, Abfluss) pro Sekunde und Ressource beim aktuellen Lagerbestand."""
+        n = len(SERF_RESOURCES)
+        speeds = self._speeds(stock, efficiency)
+        inflow = (self.mine_rates + np.bincount(self.refiner_output, self.refiner_rates * speeds, minlength=n)) * efficiency
+        outflow = np.bincount(self.refiner_input, self.refiner_consumption * speeds, minlength=n) * efficiency
+        return inflow, outflow
+
+    def quiet_ticks(self, stock: np.ndarray, efficiency: float) -> float:
+        """
+        Sekunden-Ticks, in denen integrate(stock, 1) mit konstanten Raten rechnet.
+
+        Das gilt solange kein Lager mit Bedarf leer ist oder innerhalb eines
+        Ticks leerläuft; die Schranke liegt einen Tick vor der Schätzung.
+        """
+        demand = self.consumption_rates(efficiency)
+        if not np.any(demand > 0):
+            return np.inf
+        if np.any((demand > 0) & (stock <= 0)):
+            return 0
+        inflow, outflow = self._rates(stock, efficiency)
+        net = inflow - outflow
+        draining = net < 0
+        if not draining.any():
+            return np.inf
+        return max(0.0, float(np.floor((stock[draining] / -net[draining]).min())) - 2)
+
+    def integrate(self, stock: np.ndarray, dt: float, efficiency: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Integriert Produktion und Verbrauch exakt über dt Sekunden.
+
+        Das Intervall wird an den Zeitpunkten geteilt, an denen ein Lager
+        leerläuft; dazwischen ist alles linear.
+
+        Args:
+            stock: (R,) Lagerbestand zu Beginn (wird nicht verändert)
+            dt: Intervall in Sekunden
+            efficiency: Worker-Effizienz (konstant im Intervall)
+
+        Returns:
+            (Lagerbestand am Ende, produzierter Output pro Ressource)
+        """
+        n = len(SERF_RESOURCES)
+        stock = stock.astype(np.float64)
+        produced = np.zeros(n)
+        remaining = float(dt)
+        # Jedes Ereignis leert ein Lager; die Schranke fängt nur Rundungsfälle ab
+        for _ in range(4 * n + 1):
+            if remaining <= 0:
+                break
+            inflow, outflow = self._rates(stock, efficiency)
+            net = inflow - outflow
+
+            # Nächstes Ereignis: ein Lager mit Bestand läuft leer
+            draining = np.flatnonzero((net < 0) & (stock > 0))
+            until_empty = stock[draining] / -net[draining]
+            step = min(remaining, float(until_empty.min())) if len(draining) else remaining
+            emptied = draining[until_empty <= step]
+
+            stock += net * step
+            stock[emptied] = 0.0
+            produced += inflow * step
+            remaining -= step
+        return stock, produced
+
+
 @dataclass
 class ProductionSystem:
     """
@@ -439,9 +890,11 @@ class ProductionSystem:
     """
     mines: Dict[str, Mine] = field(default_factory=dict)
     refiners: Dict[str, Refiner] = field(default_factory=dict)
-    serfs: List[Serf] = field(default_factory=list)
+    serfs: SerfPool = field(default_factory=SerfPool)
     resources: Dict[ResourceType, float] = field(default_factory=dict)
     workforce_manager: Optional[WorkforceManager] = None
+    # Zustand aller Minen/Refiner -> ProductionFlows (neu gebaut wenn sich etwas ändert)
+    _flows_cache: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         # Ressourcen initialisieren
@@ -466,17 +919,13 @@ class ProductionSystem:
         if self.workforce_manager:
             efficiency = self.workforce_manager.get_average_efficiency()
 
-        # Minen produzieren
-        mine_production = self._tick_mines(dt, efficiency)
-        for resource, amount in mine_production.items():
-            produced[resource] += amount
-            self.resources[resource] += amount
-
-        # Refiner produzieren
-        refiner_production = self._tick_refiners(dt, efficiency)
-        for resource, amount in refiner_production.items():
-            produced[resource] += amount
-            self.resources[resource] += amount
+        # Minen und Refiner: exakt über dt integriert (dt=1 × 60 == dt=60)
+        if self.mines or self.refiners:
+            stock = np.array([self.resources[r] for r in SERF_RESOURCES], dtype=np.float64)
+            stock, output = self.get_flows().integrate(stock, dt, efficiency)
+            for code, resource in enumerate(SERF_RESOURCES):
+                self.resources[resource] = float(stock[code])
+                produced[resource] += float(output[code])
 
         # Serfs extrahieren
         serf_production = self._tick_serfs(dt)
@@ -486,93 +935,103 @@ class ProductionSystem:
 
         return produced
 
-    def _tick_mines(self, dt: float, efficiency: float) -> Dict[ResourceType, float]:
-        """Tick für alle Minen."""
-        production = {}
-
-        for mine in self.mines.values():
-            rate = mine.get_production_rate(efficiency)
-            amount = rate * dt
+    def quiet_ticks(self) -> float:
+        """Sekunden-Ticks ohne Serf-Übergang und mit konstanten Minen-/Refiner-Raten."""
+        quiet = self.serfs.quiet_ticks()
+        if self.mines or self.refiners:
+            quiet = min(quiet, self.get_flows().quiet_ticks(self._stock(), self._efficiency()))
+        return quiet
 
-            if mine.resource_type not in production:
-                production[mine.resource_type] = 0.0
-            production[mine.resource_type] += amount
+    def idle_ticks(self) -> float:
+        """Folgende Sekunden-Ticks ohne Ressourcen-Änderung (Minen/Refiner produzieren jede Sekunde)."""
+        if self.mines or self.refiners:
+            return 0
+        return self.serfs.idle_ticks()
 
-        return production
+    def advance_quiet(self, ticks: int) -> List[List[float]]:
+        """
+        Schreibt `ticks` ruhige Sekunden fort (ticks <= quiet_ticks()).
 
-    def _tick_refiners(self, dt: float, efficiency: float) -> Dict[ResourceType, float]:
-        """Tick für alle Refiner."""
-        production = {}
+        Lager und Rückgaben entsprechen `ticks` Aufrufen von tick(1): die
+        Raten sind konstant, pro Sekunde wird mit denselben Additionen
+        fortgeschrieben wie in integrate() und beim Serf-Ertrag.
 
-        for refiner in self.refiners.values():
-            # Wenn Input == Output (z.B. Eisen -> Eisen): Kein Input-Verbrauch!
-            # Im echten Spiel holen Refiner Rohstoffe von der Mine (lokaler Speicher),
-            # aber da unsere Minen direkt in den globalen Pool produzieren,
-            # wuerde Input-Verbrauch bei gleicher Ressource einen Netto-Verlust erzeugen.
-            # Refiner agieren hier als Zusatz-Produzenten, aber NUR wenn eine
-            # zugehoerige Mine aktiv ist (mit Workern). Ohne aktive Mine produziert
-            # der Refiner nichts - er "veredelt" ja das Minen-Output.
-            if refiner.input_resource == refiner.resource_type:
-                # Pruefe ob eine Mine fuer diese Ressource aktiv ist
-                has_active_mine = any(
-                    m.resource_type == refiner.resource_type and m.current_workers > 0
-                    for m in self.mines.values()
-                )
-                if not has_active_mine:
-                    continue  # Ohne aktive Mine kein Refiner-Output
-
-                # Zusatz-Produzent - kein Input-Verbrauch, aber nur mit aktiver Mine
-                output_rate = refiner.get_production_rate(efficiency)
-                amount = output_rate * dt
-
-                if refiner.resource_type not in production:
-                    production[refiner.resource_type] = 0.0
-                production[refiner.resource_type] += amount
+        Returns:
+            Pro Sekunde eine Liste der produzierten Mengen je Ressourcen-Code
+        """
+        extracted = self.serfs.advance_quiet(ticks).tolist()
+        has_flows = bool(self.mines or self.refiners)
+        if has_flows:
+            stock = self._stock()
+            inflow, outflow = self.get_flows()._rates(stock, self._efficiency())
+            net = (inflow - outflow).tolist()
+            inflow = inflow.tolist()
+            stock = stock.tolist()
+        else:
+            stock = [self.resources[r] for r in SERF_RESOURCES]
+        produced = []
+        for amounts in extracted:
+            if has_flows:
+                stock = [value + change for value, change in zip(stock, net)]
+                output = inflow.copy()
             else:
-                # Verschiedene Input/Output Ressourcen - normaler Verbrauch
-                input_rate = refiner.get_input_consumption_rate(efficiency)
-                input_needed = input_rate * dt
-
-                available = self.resources.get(refiner.input_resource, 0)
-                if available < input_needed:
-                    # Nicht genug Input - proportional reduzieren
-                    if input_needed > 0:
-                        ratio = available / input_needed
-                    else:
-                        ratio = 0
-                    input_needed = available
-                else:
-                    ratio = 1.0
-
-                # Input verbrauchen
-                self.resources[refiner.input_resource] -= input_needed
-
-                # Output produzieren
-                output_rate = refiner.get_production_rate(efficiency)
-                amount = output_rate * dt * ratio
-
-                if refiner.resource_type not in production:
-                    production[refiner.resource_type] = 0.0
-                production[refiner.resource_type] += amount
+                output = [0.0] * len(amounts)
+            for code, amount in enumerate(amounts):
+                if amount > 0:
+                    stock[code] += amount
+                    output[code] += amount
+            produced.append(output)
+        for code, resource in enumerate(SERF_RESOURCES):
+            self.resources[resource] = stock[code]
+        return produced
 
-        return production
+    def _stock(self) -> np.ndarray:
+        return np.array([self.resources[r] for r in SERF_RESOURCES], dtype=np.float64)
 
-    def _tick_serfs(self, dt: float) -> Dict[ResourceType, float]:
-        """Tick für alle Serfs."""
-        production = {}
+    def _efficiency(self) -> float:
+        return self.workforce_manager.get_average_efficiency() if self.workforce_manager else 1.0
 
-        for serf in self.serfs:
-            result = serf.tick(dt)
-            if result:
-                resource, amount = result
-                # BUILD-Ergebnisse ignorieren - werden in environment.py behandelt
-                if resource == "BUILD":
-                    continue
-                if resource not in production:
-                    production[resource] = 0.0
-                production[resource] += amount
+    def get_flows(self) -> ProductionFlows:
+        """
+        Raten-Tabelle aller Minen und Refiner (gecacht).
 
-        return production
+        Neu gebaut nur wenn sich Worker, Level, Ressource oder Zykluszeit
+        eines Gebäudes ändern; der Index aktiver Minen pro Ressource ersetzt
+        die Suche über alle Minen pro Refiner.
+        """
+        key = (tuple((m.resource_type, m.current_workers, m.level) for m in self.mines.values()),
+               tuple((r.resource_type, r.input_resource, r.current_workers, r.transport_amount,
+                      r.initial_factor, r.get_cycle_time()) for r in self.refiners.values()))
+        if self._flows_cache is not None and self._flows_cache[0] == key:
+            return self._flows_cache[1]
+
+        n = len(SERF_RESOURCES)
+        mine_rates = np.zeros(n)
+        active_mines = np.zeros(n, dtype=np.int64)
+        for mine in self.mines.values():
+            code = _RESOURCE_CODE[mine.resource_type]
+            mine_rates[code] += mine.get_production_rate(1.0)
+            active_mines[code] += mine.current_workers > 0
+
+        refiners = list(self.refiners.values())
+        refiner_output = np.array([_RESOURCE_CODE[r.resource_type] for r in refiners], dtype=np.int64)
+        refiner_input = np.array([_RESOURCE_CODE[r.input_resource] for r in refiners], dtype=np.int64)
+        refiner_rates = np.array([r.get_production_rate(1.0) for r in refiners], dtype=np.float64)
+        same = refiner_input == refiner_output
+        # Input == Output: Zusatz-Produzent ohne Verbrauch, aber nur mit aktiver Mine
+        # (siehe get_production_rates); sonst normaler Verbrauch mit InitialFactor
+        refiner_rates[same & (active_mines[refiner_output] == 0)] = 0.0
+        factors = np.array([r.initial_factor for r in refiners], dtype=np.float64)
+        refiner_consumption = np.where(same, 0.0, refiner_rates * factors)
+
+        flows = ProductionFlows(mine_rates, active_mines, refiner_output, refiner_input,
+                                refiner_rates, refiner_consumption)
+        self._flows_cache = (key, flows)
+        return flows
+
+    def _tick_serfs(self, dt: float) -> Dict[ResourceType, float]:
+        """Tick für alle Serfs (vektorisiert im SerfPool, Bau-Fortschritt in environment.py)."""
+        return self.serfs.tick(dt)
 
     # ==================== GEBÄUDE-MANAGEMENT ====================
 
@@ -605,9 +1064,7 @@ class ProductionSystem:
 
     def add_serf(self, position: Position) -> Serf:
         """Fügt einen Serf hinzu."""
-        serf = Serf(position=position)
-        self.serfs.append(serf)
-        return serf
+        return self.serfs.add(position)
 
     def assign_workers_to_mine(self, mine_name: str, count: int) -> int:
         """Weist Worker einer Mine zu."""
@@ -635,23 +1092,9 @@ class ProductionSystem:
 
     def get_production_rates(self, efficiency: float = 1.0) -> Dict[ResourceType, float]:
         """Gibt Produktionsraten pro Sekunde für alle Ressourcen zurück."""
-        rates = {r: 0.0 for r in ResourceType}
-
-        for mine in self.mines.values():
-            rate = mine.get_production_rate(efficiency)
-            rates[mine.resource_type] += rate
-
-        for refiner in self.refiners.values():
-            # Bei Input==Output: Nur zaehlen wenn aktive Mine vorhanden
-            if refiner.input_resource == refiner.resource_type:
-                has_active_mine = any(
-                    m.resource_type == refiner.resource_type and m.current_workers > 0
-                    for m in self.mines.values()
-                )
-                if not has_active_mine:
-                    continue
-            rate = refiner.get_production_rate(efficiency)
-            rates[refiner.resource_type] += rate
+        # Minen und Refiner (bei Input==Output nur mit aktiver Mine)
+        building_rates = self.get_flows().production_rates(efficiency)
+        rates = {r: float(building_rates[code]) for code, r in enumerate(SERF_RESOURCES)}
 
         # Serfs (nur wenn sie tatsächlich extrahieren, nicht beim Laufen)
         for serf in self.serfs:
@@ -666,16 +1109,9 @@ class ProductionSystem:
 
     def get_consumption_rates(self, efficiency: float = 1.0) -> Dict[ResourceType, float]:
         """Gibt Verbrauchsraten pro Sekunde für alle Ressourcen zurück."""
-        rates = {r: 0.0 for r in ResourceType}
-
-        for refiner in self.refiners.values():
-            # Kein Verbrauch wenn Input == Output (siehe _tick_refiners)
-            if refiner.input_resource == refiner.resource_type:
-                continue
-            rate = refiner.get_input_consumption_rate(efficiency)
-            rates[refiner.input_resource] += rate
-
-        return rates
+        # Kein Verbrauch wenn Input == Output (siehe ProductionFlows)
+        consumption = self.get_flows().consumption_rates(efficiency)
+        return {r: float(consumption[code]) for code, r in enumerate(SERF_RESOURCES)}
 
     def get_net_rates(self, efficiency: float = 1.0) -> Dict[ResourceType, float]:
         """Gibt Netto-Raten (Produktion - Verbrauch) zurück."""
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Siedler AI - Statische Kartendaten
+
+Terrain, Baum-Layer, Baum-Positionen und das Tree-ID Mapping ändern sich
+zwischen Episoden und Env-Instanzen nie. Der erste Prozess baut sie einmal
+auf und legt sie als .npy unter <data_root>/static_map/<fingerprint>/ ab;
+alle weiteren Instanzen (auch in SubprocVecEnv-Workern) hängen die Dateien
+per np.load(mmap_mode="r") schreibgeschützt ein. Die Seiten liegen dann nur
+einmal im Page-Cache des Betriebssystems, statt pro Env kopiert zu werden.
+
+Innerhalb eines Prozesses wird pro Datenverzeichnis nur einmal geladen.
+
+Datenverzeichnis (erste Angabe gewinnt):
+1. explizites data_root Argument
+2. Umgebungsvariable SIEDLER_DATA_ROOT
+3. Verzeichnis dieses Moduls (wenn dort player1_walkable.npy liegt)
+
+Sonst bricht get_data_root() mit einer FileNotFoundError ab.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from pathfinding import MapManager
+
+
+DATA_ROOT_ENV = "SIEDLER_DATA_ROOT"
+WALKABLE_FILE = "player1_walkable.npy"
+RESOURCES_FILE = "player1_resources.json"
+STATIC_CACHE_DIR = "static_map"
+
+# Arrays die gespeichert und per Memory-Map geteilt werden
+_ARRAY_NAMES = ("terrain_base", "trees_layer", "tree_cells", "tree_world", "tree_id_mapping")
+
+# Pro Prozess: Datenverzeichnis -> geladene Daten
+_LOADED: Dict[str, 'StaticMapData'] = {}
+
+
+def get_data_root(data_root: Optional[str] = None) -> str:
+    """Löst das Verzeichnis mit player1_walkable.npy / player1_resources.json auf."""
+    if data_root:
+        return data_root
+    if os.environ.get(DATA_ROOT_ENV):
+        return os.environ[DATA_ROOT_ENV]
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    if os.path.exists(os.path.join(module_dir, WALKABLE_FILE)):
+        return module_dir
+    raise FileNotFoundError(
+        f"Kartendaten nicht gefunden: {WALKABLE_FILE} liegt nicht in {module_dir}. "
+        f"Datenverzeichnis über {DATA_ROOT_ENV} oder data_root angeben.")
+
+
+@dataclass
+class StaticMapData:
+    """Unveränderliche Kartendaten eines Spielers (alle Arrays schreibgeschützt)."""
+    data_root: str
+    resources: dict
+    terrain_base: np.ndarray       # (H, W) uint8, 1 = begehbar
+    trees_layer: np.ndarray        # (H, W) uint8, 1 = Baum
+    tree_cells: np.ndarray         # (N, 2) int32, Grid-Zelle von Baum-ID i+1
+    tree_world: np.ndarray         # (N, 2) float64, Welt-Position von Baum-ID i+1
+    tree_id_mapping: np.ndarray    # (M,) int32, Index in PLAYER_1_TREES_NEAREST -> Baum-ID (-1 = keiner)
+    mapped: bool = False           # True wenn die Arrays Memory-Maps sind
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.tree_cells)
+
+    def tree_id_mapping_dict(self) -> Dict[int, int]:
+        """Tree-ID Mapping im Format von env.tree_id_mapping."""
+        return {i: int(tree_id) for i, tree_id in enumerate(self.tree_id_mapping.tolist()) if tree_id >= 0}
+
+
+def _fingerprint(walkable_file: str, resources_file: str, trees_nearest: List[dict]) -> str:
+    """Ändert sich wenn eine Quelldatei oder die Mapping-Liste sich ändert."""
+    h = hashlib.sha1()
+    for path in (walkable_file, resources_file):
+        stat = os.stat(path)
+        h.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    h.update(json.dumps(trees_nearest, sort_keys=True).encode())
+    return h.hexdigest()[:12]
+
+
+def _build_arrays(walkable_file: str, resources: dict, trees_nearest: List[dict]) -> Dict[str, np.ndarray]:
+    """Baut alle statischen Arrays über einen MapManager (gleiche Semantik wie vorher)."""
+    manager = MapManager()
+    manager.grid.load_terrain_from_array(np.load(walkable_file))
+    manager._load_trees_from_data(resources.get('trees_all', resources.get('trees_nearest_50', [])))
+
+    tree_ids = sorted(manager.grid.tree_positions)
+    tree_id_mapping = np.full(len(trees_nearest), -1, dtype=np.int32)
+    for i, tree in enumerate(trees_nearest):
+        nearest = manager.get_nearest_tree(tree["x"], tree["y"])
+        if nearest:
+            tree_id_mapping[i] = nearest[0]
+
+    return {
+        "terrain_base": manager.grid.terrain_base,
+        "trees_layer": manager.grid.trees,
+        "tree_cells": np.array([(manager.grid.tree_positions[t].x, manager.grid.tree_positions[t].y)
+                                for t in tree_ids], dtype=np.int32).reshape(-1, 2),
+        "tree_world": np.array([manager.tree_world_positions[t] for t in tree_ids],
+                               dtype=np.float64).reshape(-1, 2),
+        "tree_id_mapping": tree_id_mapping,
+    }
+
+
+def _publish(cache_dir: str, arrays: Dict[str, np.ndarray]):
+    """Schreibt die Arrays atomar; meta.json zuletzt markiert den Cache als vollständig."""
+    os.makedirs(cache_dir, exist_ok=True)
+    for name in _ARRAY_NAMES:
+        tmp_path = os.path.join(cache_dir, f"{name}.{os.getpid()}.tmp.npy")
+        np.save(tmp_path, arrays[name])
+        os.replace(tmp_path, os.path.join(cache_dir, f"{name}.npy"))
+    tmp_path = os.path.join(cache_dir, f"meta.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump({"n_trees": int(len(arrays["tree_cells"]))}, f)
+    os.replace(tmp_path, os.path.join(cache_dir, "meta.json"))
+
+
+def load_static_map(data_root: Optional[str] = None,
+                    trees_nearest: Optional[List[dict]] = None) -> StaticMapData:
+    """
+    Lädt die statischen Kartendaten (einmal pro Prozess und Datenverzeichnis).
+
+    Existiert der Cache auf der Platte, werden die Arrays schreibgeschützt
+    eingehängt; sonst werden sie gebaut und für alle anderen Prozesse abgelegt.
+
+    Args:
+        data_root: Datenverzeichnis (None = get_data_root())
+        trees_nearest: Baumliste für das Tree-ID Mapping (None = PLAYER_1_TREES_NEAREST)
+    """
+    root = get_data_root(data_root)
+    key = os.path.abspath(root)
+    if key in _LOADED:
+        return _LOADED[key]
+
+    if trees_nearest is None:
+        from map_config_wintersturm import PLAYER_1_TREES_NEAREST
+        trees_nearest = PLAYER_1_TREES_NEAREST
+
+    walkable_file = os.path.join(root, WALKABLE_FILE)
+    resources_file = os.path.join(root, RESOURCES_FILE)
+    with open(resources_file, 'r') as f:
+        resources = json.load(f)
+
+    cache_dir = os.path.join(root, STATIC_CACHE_DIR, _fingerprint(walkable_file, resources_file, trees_nearest))
+    mapped = os.path.exists(os.path.join(cache_dir, "meta.json"))
+    if not mapped:
+        arrays = _build_arrays(walkable_file, resources, trees_nearest)
+        try:
+            _publish(cache_dir, arrays)
+            mapped = True
+        except OSError as e:
+            # z.B. schreibgeschütztes Datenverzeichnis: nur im Speicher halten
+            print(f"[WARN] Statische Kartendaten nicht gespeichert: {e}")
+            for array in arrays.values():
+                array.flags.writeable = False
+
+    if mapped:
+        arrays = {name: np.asarray(np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r"))
+                  for name in _ARRAY_NAMES}
+
+    static = StaticMapData(data_root=root, resources=resources, mapped=mapped, **arrays)
+    _LOADED[key] = static
+    return static
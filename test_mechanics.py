@@ -164,6 +164,746 @@ def test_tax_motivation():
     print(f"  [OK] Steuern-Effekt funktioniert: {start_motivation} -> {end_motivation}")
 
 
+def test_event_time_mode():
+    """Test: Event-Modus liefert dasselbe Ergebnis wie der 1-Sekunden-Tick"""
+    print("\n=== Test: Event-Zeitmodus ===")
+
+    import numpy as np
+
+    def setup(env):
+        env.reset(seed=0)
+        env.resources = {"Taler": 50000, "Holz": 50000, "Stein": 50000,
+                         "Lehm": 50000, "Eisen": 5000, "Schwefel": 5000}
+        env.buildings["Hochschule_1"] = 1
+        env.buildings["Kloster_1"] = 1
+        env.faith = 6000
+        env._bless(0)
+        env._build_building("Wohnhaus_1")
+        env._assign_build_batch(3)
+        tech = next(t for t in env.tech_list if env._can_research(t))
+        env._research_tech(tech)
+
+    fixed = SiedlerScharfschuetzenEnv()
+    event = SiedlerScharfschuetzenEnv(time_mode="event")
+    setup(fixed)
+    setup(event)
+
+    for _ in range(600):
+        fixed._tick_time()
+    event.advance_time(600)
+
+    print(f"  Zeit: fixed={fixed.current_time}, event={event.current_time}")
+    assert fixed.current_time == event.current_time
+    assert fixed.resources == event.resources, "Ressourcen weichen ab"
+    assert fixed.buildings == event.buildings, "Gebäude weichen ab"
+    assert fixed.researched_techs == event.researched_techs, "Forschung weicht ab"
+    assert fixed.faith == event.faith, "Glaube weicht ab"
+    assert np.array_equal(fixed._get_observation(), event._get_observation())
+    print("  [OK] Event-Modus identisch zum 1-Sekunden-Tick")
+
+
+def test_event_time_mode_economy():
+    """Test: Event-Modus mit Workern, Minen und sammelnden Leibeigenen"""
+    print("\n=== Test: Event-Zeitmodus mit Wirtschaft ===")
+
+    import numpy as np
+
+    def setup(env):
+        env.reset(seed=0)
+        env.resources = {"Taler": 90000, "Holz": 90000, "Stein": 90000,
+                         "Lehm": 90000, "Eisen": 9000, "Schwefel": 9000}
+        hx, hy = env.hq_position
+        for i, building in enumerate(["Dorfzentrum_1", "Bauernhof_1", "Wohnhaus_1",
+                                      "Lehmmine_1", "Sägemühle_1", "Kloster_1"]):
+            env.buildings[building] = env.buildings.get(building, 0) + 1
+            env._on_building_completed(building, (hx + 700 * i - 1500, hy + 900))
+        for _ in range(20):
+            env._buy_serf()
+        env._assign_wood_zone_batch(env.wood_zone_names[0], 5)
+        for category in env.deposit_category_names:
+            env._assign_deposit_batch(category, 1)
+
+    fixed = SiedlerScharfschuetzenEnv(idle_fast_forward=True)
+    event = SiedlerScharfschuetzenEnv(idle_fast_forward=True, time_mode="event")
+    setup(fixed)
+    setup(event)
+    assert len(fixed.workforce_manager.workers) > 0
+
+    # Vorgespulte waits springen gleich weit
+    for _ in range(5):
+        _, _, _, _, info = fixed.step(0)
+        _, _, _, _, info_event = event.step(0)
+        assert info["elapsed_time"] == info_event["elapsed_time"]
+
+    for _ in range(900):
+        fixed._tick_time()
+    event.advance_time(900)
+
+    print(f"  Zeit: {event.current_time}s, Worker: {len(event.workforce_manager.workers)}")
+    assert fixed.current_time == event.current_time
+    assert fixed.resources == event.resources, "Ressourcen weichen ab"
+    assert fixed.free_leibeigene == event.free_leibeigene
+    assert np.array_equal(fixed.tree_table.trees, event.tree_table.trees), "Bäume weichen ab"
+    assert [w.work_time for w in fixed.workforce_manager.workers] == \
+        [w.work_time for w in event.workforce_manager.workers], "WorkTime weicht ab"
+    assert np.array_equal(fixed._get_observation(), event._get_observation())
+    assert np.array_equal(fixed.get_action_mask(), event.get_action_mask())
+    print("  [OK] Event-Modus identisch zum 1-Sekunden-Tick")
+
+
+def test_idle_fast_forward():
+    """Test: Vorgespultes wait == einzelne waits bis zum nächsten Ereignis"""
+    print("\n=== Test: Idle-Fast-Forward ===")
+
+    import numpy as np
+    from environment import MAX_IDLE_SECONDS
+
+    def setup(env):
+        env.reset(seed=0)
+        env.resources = {"Taler": 3000, "Holz": 2000, "Stein": 1000,
+                         "Lehm": 1000, "Eisen": 500, "Schwefel": 500}
+        env.buildings["Kloster_1"] = 1
+        env.faith = 6000
+        env._bless(0)
+        env._build_building("Wohnhaus_1")
+        env._assign_build_batch(3)
+
+    plain = SiedlerScharfschuetzenEnv()
+    fast = SiedlerScharfschuetzenEnv(idle_fast_forward=True)
+    fast_event = SiedlerScharfschuetzenEnv(idle_fast_forward=True, time_mode="event")
+    for env in (plain, fast, fast_event):
+        setup(env)
+
+    jumps = []
+    while plain.current_time < 900:
+        _, _, _, _, info = fast.step(0)
+        _, _, _, _, info_event = fast_event.step(0)
+        elapsed = info["elapsed_time"]
+        assert info_event["elapsed_time"] == elapsed, "Event-Modus muss gleich weit springen"
+        assert 1 <= elapsed <= MAX_IDLE_SECONDS
+        jumps.append(elapsed)
+
+        mask = plain.get_action_mask()
+        revision = plain.completion_scheduler.revision
+        free_serfs = plain.free_leibeigene
+        for second in range(elapsed):
+            _, _, _, _, plain_info = plain.step(0)
+            assert plain_info["elapsed_time"] == 1
+            event = (plain.completion_scheduler.revision != revision
+                     or plain.free_leibeigene > free_serfs
+                     or not np.array_equal(plain.get_action_mask(), mask))
+            last = second == elapsed - 1
+            assert event == last or (last and elapsed == MAX_IDLE_SECONDS), \
+                f"Ereignis bei Sekunde {second + 1} von {elapsed}"
+        assert plain.current_time == fast.current_time == fast_event.current_time
+        assert np.array_equal(plain._get_observation(), fast._get_observation())
+        assert np.array_equal(fast._get_observation(), fast_event._get_observation())
+
+    assert max(jumps) > 1
+    print(f"  [OK] {len(jumps)} Entscheidungen statt {plain.current_time} (größter Sprung {max(jumps)}s)")
+
+    # Andere Aktionen laufen weiter genau eine Sekunde
+    before = fast.current_time
+    action = next(a for a in range(1, len(fast.action_masks())) if fast.action_masks()[a])
+    _, _, _, _, info = fast.step(action)
+    while "elapsed_time" not in info:
+        _, _, _, _, info = fast.step(int(np.flatnonzero(fast.action_masks())[0]))
+    assert info["elapsed_time"] == 1 and fast.current_time == before + 1
+    print("  [OK] Nur wait wird vorgespult")
+
+
+def test_action_mask_cache():
+    """Test: Inkrementelle Action-Maske == Vollberechnung"""
+    print("\n=== Test: Action-Masken-Cache ===")
+
+    import numpy as np
+
+    env = SiedlerScharfschuetzenEnv(mask_debug=True)
+    env.reset(seed=0)
+    env.resources = {"Taler": 50000, "Holz": 50000, "Stein": 50000,
+                     "Lehm": 50000, "Eisen": 5000, "Schwefel": 5000}
+    env.buildings["Hochschule_1"] = 1
+    env.buildings["Kloster_1"] = 1
+
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        # mask_debug wirft RuntimeError wenn der Cache veraltet ist
+        env.get_action_mask()
+        mask = env.action_masks()
+        action = rng.choice(np.flatnonzero(mask))
+        _, _, terminated, _, _ = env.step(int(action))
+        if terminated:
+            env.reset()
+
+    # Phasen-Masken aus dem Cache entsprechen den _can_*-Prüfungen
+    main = env._mask_main_actions()
+    assert main[1] == any(env._can_build(b) for b in env.buildable_buildings)
+    assert main[4] == any(env._can_recruit(s) for s in env.soldier_types)
+    print("  [OK] 500 Steps ohne Abweichung")
+
+
+def test_snapshot_restore():
+    """Test: restore(snapshot()) reproduziert denselben Verlauf"""
+    print("\n=== Test: Snapshot/Restore ===")
+
+    import numpy as np
+
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=0)
+    env.resources = {"Taler": 50000, "Holz": 50000, "Stein": 50000,
+                     "Lehm": 50000, "Eisen": 5000, "Schwefel": 5000}
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        env.step(int(rng.choice(np.flatnonzero(env.action_masks()))))
+
+    snap = env.snapshot()
+    grid_before = env.map_manager.grid.buildings.copy()
+
+    actions = []
+    first_run = []
+    for _ in range(300):
+        action = int(rng.choice(np.flatnonzero(env.action_masks())))
+        actions.append(action)
+        first_run.append(env.step(action)[0])
+
+    env.restore(snap)
+    assert np.array_equal(env.map_manager.grid.buildings, grid_before), "Grid nicht zurückgesetzt"
+
+    for action, expected in zip(actions, first_run):
+        obs = env.step(action)[0]
+        assert np.array_equal(obs, expected), "Verlauf nach Restore weicht ab"
+
+    # Snapshot ist mehrfach verwendbar
+    env.restore(snap)
+    assert np.array_equal(env.map_manager.grid.buildings, grid_before)
+    print("  [OK] 300 Steps nach Restore identisch")
+
+
+def test_serf_pool():
+    """Test: Vektorisierter SerfPool (Laufen, Extraktion, Bau, Listen-Schnittstelle)"""
+    print("\n=== Test: SerfPool ===")
+
+    import copy
+    import math
+    from worker_simulation import Position
+    from production_system import ProductionSystem, ResourceType, Serf, SerfState, SERF_EXTRACTION
+
+    system = ProductionSystem()
+    hq = Position(41100, 23100)
+    tree = Position(42330, 24030)
+    stone = Position(39000, 23100)
+
+    wood_serf = system.add_serf(hq)
+    wood_serf.assign_to_resource(ResourceType.WOOD, tree, hq)
+    stone_serf = Serf(position=Position(hq.x, hq.y))
+    system.serfs.append(stone_serf)
+    stone_serf.assign_to_resource(ResourceType.STONE, stone, hq)
+    builder = system.add_serf(hq)
+    builder.assign_to_build("Wohnhaus_1", Position(41500, 23100), hq, build_site_id=7)
+    idle = system.add_serf(hq)
+
+    # Ankunft nach ceil(Distanz / Speed) Ticks, danach Extraktion alle Delay+Animation
+    walk_ticks = math.ceil(hq.distance_to(tree) / 400)
+    for t in range(1, 61):
+        system.tick(1.0)
+        if t == walk_ticks - 1:
+            assert wood_serf.state == SerfState.WALKING_TO_RESOURCE
+        if t == walk_ticks:
+            assert wood_serf.state == SerfState.EXTRACTING
+            assert (wood_serf.position.x, wood_serf.position.y) == (tree.x, tree.y)
+    wood_cycle = SERF_EXTRACTION[ResourceType.WOOD]
+    cycle_ticks = math.ceil(wood_cycle["delay"] + wood_cycle["animation"])
+    expected_wood = (60 - walk_ticks) // cycle_ticks * wood_cycle["amount"]
+    assert system.resources[ResourceType.WOOD] == expected_wood, system.resources[ResourceType.WOOD]
+    assert system.resources[ResourceType.STONE] > 0
+    assert builder.state == SerfState.BUILDING and idle.is_idle()
+
+    # Listen-Schnittstelle: pop() hält alle Views gültig
+    assert system.serfs.at_build_site(7) == [builder]
+    snapshot = copy.deepcopy(system)
+    removed = system.serfs.pop(1)
+    assert len(system.serfs) == 3 and removed.target_resource == ResourceType.STONE
+    assert list(system.serfs) == [wood_serf, builder, idle]
+    assert builder.build_site_id == 7 and idle.is_idle()
+    builder.stop()
+    assert system.serfs.only_idle_or_building() is False  # Holz-Serf extrahiert noch
+    assert snapshot.serfs[2].state == SerfState.BUILDING, "Kopie verändert"
+    print("  [OK] SerfPool konsistent")
+
+
+def test_workforce_counters():
+    """Test: Inkrementelle Workforce-Zähler == Neuberechnung über alle Worker"""
+    print("\n=== Test: Workforce-Zähler ===")
+
+    import random
+    from worker_simulation import WorkforceManager, WorkerState, Position, WORKER_PARAMS
+
+    random.seed(0)
+    manager = WorkforceManager()
+    manager.set_village_capacity(100)
+    for _ in range(3):
+        manager.add_farm(Position(random.uniform(0, 6000), random.uniform(0, 6000)), level=2)
+        manager.add_residence(Position(random.uniform(0, 6000), random.uniform(0, 6000)))
+    types = list(WORKER_PARAMS) + ["serf"]
+    for _ in range(80):
+        pos = Position(random.uniform(0, 8000), random.uniform(0, 8000))
+        manager.add_worker(random.choice(types), pos, Position(pos.x, pos.y))
+
+    for t in range(400):
+        manager.tick(random.choice((0.1, 1.0, 5.0)))
+        if t % 50 == 0:
+            # Direkte Änderung über die View hält die Zähler synchron
+            manager.workers[t % 80].work_time = -5.0
+        workers = list(manager.workers)
+        efficiency = sum(w.get_efficiency() for w in workers) / len(workers)
+        assert abs(manager.get_average_efficiency() - efficiency) < 1e-9
+        assert manager.get_exhausted_workers() == sum(w.work_time <= 0 for w in workers)
+        by_state = {s: sum(w.state == s for w in workers) for s in WorkerState}
+        assert manager.get_workers_by_state() == by_state
+        worktime = [w.work_time for w in workers if w.has_worktime_system]
+        assert abs(manager.get_average_worktime() - sum(worktime) / len(worktime)) < 1e-9
+        scholars = [w.get_efficiency() for w in workers if w.worker_type == "scholar"]
+        assert abs(manager.get_type_efficiency("scholar") - sum(scholars) / len(scholars)) < 1e-9
+        eaters = sum(f.current_eaters for f in manager.farms)
+        assert eaters == sum(w.assigned_farm is not None for w in workers)
+    print("  [OK] Zähler konsistent")
+
+
+def test_workforce_infrastructure_events():
+    """Test: Farms/Wohnhäuser/Dorfzentren nur über Bau-, Upgrade- und Abriss-Ereignisse"""
+    print("\n=== Test: Workforce-Infrastruktur ===")
+
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=0)
+    manager = env.workforce_manager
+    assert len(manager.camps) == 1 and manager.max_workers_from_village == 0
+
+    for building, pos in [("Dorfzentrum_1", (40000, 23000)), ("Bauernhof_1", (40500, 23000)),
+                          ("Bauernhof_1", (41500, 23000)), ("Wohnhaus_1", (40800, 23000))]:
+        env.buildings[building] += 1
+        env.building_position_map[f"{building}_{len(env.building_position_map)}"] = pos
+        env._on_building_completed(building, pos)
+    assert manager.max_workers_from_village == 75
+    assert manager.get_total_farm_capacity() == 16 and manager.get_total_residence_capacity() == 6
+
+    # Belegung überlebt Ticks (kein Neuaufbau pro Tick)
+    farm = manager.farms[0]
+    farm.current_eaters = 3
+    for _ in range(5):
+        env._tick_time()
+    assert manager.farms[0] is farm and farm.current_eaters == 3
+
+    # Upgrade behält Objekt und Belegung, Abriss entfernt das Gebäude an der Position
+    def upgrade(old, new):
+        env.buildings[old] -= 1
+        env.buildings[new] += 1
+        env._on_upgrade_completed(old, new)
+
+    upgrade("Bauernhof_1", "Bauernhof_2")
+    assert farm.level == 2 and farm.current_eaters == 3
+    assert manager.get_total_farm_capacity() == 18
+    env._demolish_building("Bauernhof_1")
+    assert manager.farms == [farm] and manager.get_total_farm_capacity() == 10
+    upgrade("Dorfzentrum_1", "Dorfzentrum_2")
+    assert manager.max_workers_from_village == 100
+    env._demolish_building("Dorfzentrum_1")  # nach Upgrade keins mehr vorhanden
+    assert manager.max_workers_from_village == 100
+    print("  [OK] Infrastruktur ereignisgesteuert")
+
+
+def test_break_site_index():
+    """Test: Räumlicher Farm-/Wohnhaus-Index == lineare Suche, Batch-Vergabe hält Kapazität"""
+    print("\n=== Test: Pausen-Gebäude-Index ===")
+
+    import math
+    import random
+    from worker_simulation import WorkforceManager, Position, WORKER_PARAMS, CAMPER_RANGE
+
+    random.seed(3)
+    manager = WorkforceManager()
+    manager.set_village_capacity(400)
+    for _ in range(40):
+        manager.add_farm(Position(random.uniform(0, 30000), random.uniform(0, 30000)),
+                         level=random.choice((1, 2, 3)))
+    farms = manager.farms
+    for farm in farms[::3]:
+        farm.current_eaters = farm.eat_capacity
+        manager.farm_index.update(farm)
+    manager.remove_farm(farms[5])
+
+    def linear(x, y):
+        nearest, min_dist = None, CAMPER_RANGE
+        for farm in manager.farms:
+            dist = math.sqrt((x - farm.position.x) ** 2 + (y - farm.position.y) ** 2)
+            if farm.has_space() and dist < min_dist:
+                nearest, min_dist = farm, dist
+        return nearest
+
+    for _ in range(300):
+        x, y = random.uniform(-2000, 32000), random.uniform(-2000, 32000)
+        assert manager.farm_index.nearest_with_space(x, y, CAMPER_RANGE) is linear(x, y)
+    assert manager.farm_index.total_free == sum(f.free_slots() for f in manager.farms)
+
+    # Gedränge: viele Worker um wenige Gebäude, Kapazität wird nie überschritten
+    for _ in range(3):
+        manager.add_residence(Position(random.uniform(0, 3000), random.uniform(0, 3000)))
+    types = list(WORKER_PARAMS)
+    for _ in range(300):
+        pos = Position(random.uniform(0, 3000), random.uniform(0, 3000))
+        manager.add_worker(random.choice(types), pos, Position(pos.x, pos.y))
+    for _ in range(300):
+        manager.tick(1.0)
+        for index, sites in ((manager.farm_index, manager.farms), (manager.residence_index, manager.residences)):
+            assert all(0 <= site.free_slots() for site in sites)
+            assert index.total_free == sum(site.free_slots() for site in sites)
+        residents = sum(r.current_residents for r in manager.residences)
+        assert residents == sum(w.assigned_residence is not None for w in manager.workers)
+    print("  [OK] Index und Batch-Vergabe konsistent")
+
+
+def test_break_site_snapshot():
+    """Test: Pausen-Gebäude-Index bleibt nach Snapshot/Restore mit den kopierten Gebäuden verbunden"""
+    print("\n=== Test: Pausen-Gebäude-Index nach Restore ===")
+
+    import pickle
+    from worker_simulation import Position, CAMPER_RANGE
+
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=0)
+    hq_x, hq_y = env.hq_position
+    for i in range(2):
+        env._register_workforce_building("Bauernhof_1", Position(hq_x + 500 * i, hq_y + 800))
+    manager = env.workforce_manager
+    for farm in manager.farms:
+        farm.current_eaters = farm.eat_capacity
+        manager.farm_index.update(farm)
+    assert manager.farm_index.total_free == 0
+
+    snap = env.snapshot()
+    env.restore(snap)
+    manager = env.workforce_manager
+    farm = manager.farms[0]
+    assert all(f in manager.farm_index for f in manager.farms), "Farms nach Restore nicht im Index"
+
+    # Ein Esser geht: freier Platz muss im Index ankommen
+    manager.farm_index.release(farm)
+    assert manager.farm_index.total_free == 1
+    assert manager.farm_index.nearest_with_space(hq_x, hq_y + 800, CAMPER_RANGE) is farm
+
+    # Abriss nach Restore entfernt die Farm aus dem Index
+    env._unregister_workforce_building("Bauernhof_1", (hq_x, hq_y + 800))
+    assert farm not in manager.farm_index and len(manager.farm_index) == 1
+    assert manager.farm_index.total_free == 0
+    assert manager.farm_index.nearest_with_space(hq_x, hq_y + 800, CAMPER_RANGE) is None
+
+    # Pickle (Subprozesse) baut die Schlüssel ebenso neu auf
+    clone = pickle.loads(pickle.dumps(manager))
+    assert all(f in clone.farm_index for f in clone.farms)
+    print("  [OK] Index nach Restore, Abriss und Pickle konsistent")
+
+
+def test_production_integration_dt():
+    """Test: Minen/Refiner liefern bei dt=1 (×60) und dt=60 dieselben Summen, auch bei leerem Input"""
+    print("\n=== Test: Produktion unabhängig von dt ===")
+
+    from production_system import ProductionSystem, ResourceType
+    from worker_simulation import Position
+
+    def build():
+        system = ProductionSystem()
+        system.resources[ResourceType.GOLD] = 30
+        system.resources[ResourceType.IRON] = 5
+        system.add_mine("iron", Position(0, 0), ResourceType.IRON, level=2)
+        system.assign_workers_to_mine("iron", 3)
+        # Zwei Refiner teilen sich Eisen, einer davon liefert Schwefel an einen dritten
+        system.add_refiner("sulfur", Position(2000, 0), ResourceType.SULFUR, ResourceType.IRON, Position(0, 0))
+        system.assign_workers_to_refiner("sulfur", 2)
+        system.add_refiner("stone", Position(1000, 0), ResourceType.STONE, ResourceType.IRON, Position(0, 0), initial_factor=2)
+        system.assign_workers_to_refiner("stone", 1)
+        system.add_refiner("gold", Position(500, 0), ResourceType.GOLD, ResourceType.SULFUR, Position(0, 0), initial_factor=2)
+        system.assign_workers_to_refiner("gold", 2)
+        system.add_refiner("wood", Position(1000, 0), ResourceType.WOOD, ResourceType.GOLD, Position(0, 0), initial_factor=2)
+        system.assign_workers_to_refiner("wood", 3)
+        # Input == Output ohne aktive Mine: gesperrt
+        system.add_refiner("clay", Position(500, 0), ResourceType.CLAY, ResourceType.CLAY, Position(0, 0))
+        system.assign_workers_to_refiner("clay", 1)
+        return system
+
+    results = []
+    for steps in ([1.0] * 60, [60.0], [0.1] * 600, [7.0] * 8 + [4.0]):
+        system = build()
+        totals = {r: 0.0 for r in ResourceType}
+        for dt in steps:
+            for resource, amount in system.tick(dt).items():
+                totals[resource] += amount
+        results.append((dict(system.resources), totals))
+
+    reference = results[0]
+    for resources, totals in results[1:]:
+        for resource in ResourceType:
+            assert abs(resources[resource] - reference[0][resource]) < 1e-9, resource
+            assert abs(totals[resource] - reference[1][resource]) < 1e-9, resource
+    assert all(v >= 0 for v in reference[0].values())
+    assert reference[0][ResourceType.IRON] == 0.0 and reference[1][ResourceType.IRON] > 0
+    assert reference[1][ResourceType.CLAY] == 0.0
+    print("  [OK] dt-unabhängig")
+
+
+def test_completion_scheduler():
+    """Test: Fertigstellungs-Planer == schrittweises Dekrementieren, auch bei Ratenwechseln"""
+    print("\n=== Test: Fertigstellungs-Planer ===")
+
+    import math
+    import random
+    from completion_scheduler import CompletionScheduler
+
+    random.seed(5)
+    scheduler = CompletionScheduler(step=1)
+    reference = {}  # seq -> [remaining, rate]
+    finished_ref, finished = [], []
+    for tick in range(1, 400):
+        if random.random() < 0.2:
+            remaining, rate = random.choice((20, 45, 90)), random.choice((0, 1, 1.5, 0.37))
+            entry = scheduler.add("job", tick, remaining, rate)
+            reference[entry.seq] = [remaining, rate]
+        if random.random() < 0.1 and scheduler.entries:
+            entry = random.choice(list(scheduler.entries.values()))
+            rate = random.choice((0, 1, 2.5, 0.1))
+            scheduler.rekey(entry, rate)
+            reference[entry.seq][1] = rate
+
+        scheduler.advance()
+        for seq in sorted(reference):
+            reference[seq][0] -= 1 * reference[seq][1]
+            if reference[seq][0] <= 0:
+                finished_ref.append((tick, seq))
+                del reference[seq]
+        finished += [(tick, entry.seq) for entry in scheduler.pop_due(("job",))]
+    assert finished == finished_ref and len(finished) > 20
+    assert sorted(scheduler.entries) == sorted(reference)
+
+    # Environment: Listen sind Nur-Lese-Sichten, Serf-Zuweisung plant neu ein
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=0)
+    env.resources = {r: 10000 for r in env.resources}
+    building = next(b for b in env.buildable_buildings if env._can_build(b))
+    env._build_building(building)
+    assert isinstance(env.construction_sites, tuple) and len(env.construction_sites) == 1
+    site = env.construction_sites[0]
+    for _ in range(5):
+        env._tick_time()
+    assert env.construction_sites[0]["remaining_work"] == site["total_time"]  # ohne Serfs kein Fortschritt
+    env._assign_build_batch(3)
+    ticks = 0
+    while env.construction_sites:
+        env._tick_time()
+        ticks += 1
+    assert ticks == math.ceil(site["total_time"] / 2.0)  # 3 Serfs = 2.0 pro Sekunde
+    assert env.buildings[building] >= 1
+    print("  [OK] Planer konsistent")
+
+
+def test_tree_table():
+    """Test: Eine Baum-Tabelle für Zonen-, Flach- und Nächste-Bäume-Sicht"""
+    print("\n=== Test: Baum-Tabelle ===")
+
+    import numpy as np
+    from static_map_data import load_static_map
+    from tree_table import TREE_AMOUNT
+
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=0)
+    table = env.tree_table
+    layout = table.layout
+    zone = layout.zone_names[0]
+    zone_trees = layout.n_zone_trees
+    assert len(env.tree_list_internal) == zone_trees == table.live_count
+    assert len(env.trees_list) == len(layout.trees_nearest)
+    assert env.tree_id_mapping == load_static_map(env.data_root, layout.trees_nearest).tree_id_mapping_dict()
+
+    # Zonen-Zuweisung landet in derselben Zeile wie die flache Sicht
+    env.free_leibeigene = env.total_leibeigene
+    env._assign_wood_zone_batch(zone, 3)
+    rows = table.zone_live_rows(zone)
+    assert list(table.trees["serfs_assigned"][rows[:3]]) == [1, 1, 1]
+    assert sum(t["serfs_assigned"] for t in env.tree_list_internal) == 3
+
+    # Erschöpfung: Zähler pro Zone und erster lebender Baum
+    first = table.first_live_row()
+    depleted = list(table.extract(TREE_AMOUNT * 2 + 1))
+    assert depleted == [first, first + 1]
+    assert table.live_count == zone_trees - 2
+    assert table.first_live_row() == first + 2
+    assert table.trees["remaining"][first + 2] == TREE_AMOUNT - 1
+    for name in layout.zone_names:
+        assert table.zone_live[layout.zone_codes[name]] == len(table.zone_live_rows(name))
+
+    # Radius-Abfrage == Brute Force über lebende Zonen-Bäume
+    x, y = table.position(int(rows[0]))
+    trees = table.trees[:zone_trees]
+    dist = np.sqrt((trees["x"] - x) ** 2 + (trees["y"] - y) ** 2)
+    expected = set(np.flatnonzero((dist <= 4500) & (trees["remaining"] > 0)).tolist())
+    assert set(table.live_in_radius(x, y, 4500)) == expected
+
+    # Reservierung verkürzt die Nächste-Bäume-Sicht
+    env._assign_serf_to_resource("Holz")
+    assert env.trees_list[0] == layout.trees_nearest[1]
+
+    # Snapshot kopiert den Zustand, das Layout bleibt geteilt
+    snap = env.snapshot()
+    list(table.extract(TREE_AMOUNT))
+    env.restore(snap)
+    assert env.tree_table.live_count == zone_trees - 2
+    assert env.tree_table.layout is layout
+    print("  [OK] Baum-Tabelle konsistent")
+
+
+def test_action_decode_tables():
+    """Test: Kompilierte Dekodier-Tabellen == schrittweiser Multi-Step-Flow"""
+    print("\n=== Test: Action-Dekodierung ===")
+
+    import numpy as np
+    from environment import SerfArea
+
+    stepped = SiedlerScharfschuetzenEnv()
+    flat = SiedlerScharfschuetzenEnv()
+    stepped.reset(seed=0)
+    flat.reset(seed=0)
+    rng = np.random.default_rng(3)
+    for _ in range(300):
+        actions = [int(rng.choice(np.flatnonzero(stepped.action_masks())))]
+        result = stepped.step(actions[0])
+        while stepped.current_phase.value != "main":
+            actions.append(int(rng.choice(np.flatnonzero(stepped.action_masks()))))
+            result = stepped.step(actions[-1])
+        fast = flat.step_flat(tuple(actions))
+        assert np.array_equal(result[0], fast[0]) and result[1:] == fast[1:]
+    print("  [OK] step_flat == schrittweiser Flow")
+
+    name, handler, args = flat.decode_action((7, 0, 9, 1))  # assign_serf FREE -> WOOD_HQ
+    assert name == "assign_serf" and args == (SerfArea.FREE, 20, SerfArea.WOOD_HQ)
+    assert flat.decode_action((1, 10 ** 6))[2] == (None, 0)  # Index außerhalb -> ungültig
+
+    assert len(flat._legacy_decode) == flat.total_actions
+    handler, args = flat.decode_legacy_action(flat.offset_build_batch + 1)
+    assert args == (flat.buildable_buildings[0], flat.build_batch_sizes[1])
+    handler, args = flat.decode_legacy_action(flat.offset_alarm + 1)
+    assert args == (1,)
+    print("  [OK] Legacy-Tabelle deckt alle Indizes ab")
+
+
+def test_observation_writer():
+    """Test: Inkrementeller Beobachtungs-Puffer == Vollberechnung"""
+    print("\n=== Test: Beobachtungs-Puffer ===")
+
+    import numpy as np
+
+    env = SiedlerScharfschuetzenEnv(mask_debug=True)  # prüft jede Beobachtung
+    env.reset(seed=0)
+    env.resources = {r: 50000 for r in env.resources}
+    rng = np.random.default_rng(7)
+    for step in range(400):
+        obs, _, terminated, _, _ = env.step(int(rng.choice(np.flatnonzero(env.action_masks()))))
+        if step == 200:
+            snap = env.snapshot()
+            snap_obs = obs
+        if terminated:
+            break
+    env.restore(snap)
+    assert np.array_equal(env.get_observation(), snap_obs)
+    print("  [OK] Puffer konsistent (inkl. restore)")
+
+    view = env.get_observation(copy=False)
+    assert np.shares_memory(view, env._obs_buffer) and not view.flags.writeable
+    copied = env.get_observation()
+    assert not np.shares_memory(copied, env._obs_buffer) and copied.dtype == np.float32
+    assert copied.shape == env.observation_space.shape
+    print("  [OK] Sicht ohne Kopie / Kopie")
+
+
+def test_perf_stats():
+    """Test: Laufzeit-Messpunkte (aus = leer, an = Zeiten/Aufrufe/Knoten)"""
+    print("\n=== Test: Perf-Stats ===")
+
+    import numpy as np
+    from pathfinding import SCALE_X, SCALE_Y
+
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=0)
+    env.step(0)
+    assert env.perf is None and env.perf_stats() == {}
+    print("  [OK] Standardmäßig aus")
+
+    env.enable_perf_stats()
+    snap = env.snapshot()
+    rng = np.random.default_rng(3)
+    for _ in range(300):
+        env.step(int(rng.choice(np.flatnonzero(env.action_masks()))))
+    env.restore(snap)
+    assert env.map_manager.perf is env.perf, "restore muss die Messung behalten"
+
+    cell = env.map_manager._resolve_cell(env.hq_position[0], env.hq_position[1], 16)
+    door = env.map_manager.to_world_coords((cell.x + 0.5) * SCALE_X, (cell.y + 0.5) * SCALE_Y)
+    tree = env.tree_table.position(env.tree_table.first_live_row())
+    assert env.map_manager.find_path(door, tree).found
+
+    stats = env.perf_stats(reset=True)
+    timers = stats["timers"]
+    assert timers["step"]["calls"] == 300 and timers["action_masks"]["calls"] == 300
+    ticks = timers["tick"]["calls"]
+    assert ticks > 0
+    for name in ("workforce.tick", "production.tick", "tick.extraction", "tick.completions"):
+        assert timers[name]["calls"] == ticks, name
+    phases = sum(t["total_ms"] for n, t in timers.items()
+                 if n.startswith("tick.") or n.endswith(".tick"))
+    assert phases <= timers["tick"]["total_ms"]
+    assert timers["map.find_path"]["calls"] == 1 and stats["counters"]["map.find_path.nodes"] > 0
+    assert env.perf_stats()["timers"] == {}, "reset=True muss zurücksetzen"
+    print(f"  [OK] {ticks} Ticks, Phasen {phases:.1f} ms <= Tick {timers['tick']['total_ms']:.1f} ms")
+
+    env.enable_perf_stats(False)
+    assert env.perf is None and env.map_manager.perf is None
+    print("  [OK] Wieder ausgeschaltet")
+
+
+def test_hq_field_distance():
+    """Test: Distanzfeld ab dem HQ == find_path (gleiche Verschiebung), Serfs wie A*"""
+    print("\n=== Test: HQ-Distanzfeld ===")
+
+    import math
+    from environment import RESOURCE_HOLZ
+    from pathfinding import SCALE_X, SCALE_Y
+
+    env = SiedlerScharfschuetzenEnv()
+    env.reset(seed=0)
+    manager = env.map_manager
+    hq = (float(env.hq_position[0]), float(env.hq_position[1]))
+    cell = manager._resolve_cell(hq[0], hq[1], 16)
+    door = manager.to_world_coords((cell.x + 0.5) * SCALE_X, (cell.y + 0.5) * SCALE_Y)
+
+    trees = env.tree_table.trees
+    goals = [(float(trees["x"][row]), float(trees["y"][row]))
+             for rows in env._tree_layout.zone_rows for row in rows[:3]]
+    goals += [(hq[0] - 3000, hq[1] - 3000), (hq[0] + 2500, hq[1] + 1200)]
+    for source in (hq, door):
+        for goal in goals:
+            result = manager.find_path(source, goal)
+            dist = manager.get_field_distance(source, goal)
+            assert result.found == (dist < float('inf')), (source, goal)
+            if result.found:
+                assert abs(dist - result.world_distance) < 1e-6, (source, goal)
+    assert manager.get_distance_field(*hq) is None, "HQ-Mitte liegt außerhalb SNAP_RADIUS"
+    print("  [OK] Feld == find_path (HQ-Mitte und Tür)")
+
+    # Ohne Pfad ab der HQ-Mitte laufen Serfs die Luftlinie (wie mit A*)
+    serf = next(s for s in env.production_system.serfs if s.is_idle())
+    env._assign_serf_to_resource(RESOURCE_HOLZ)
+    target = serf.target_position
+    straight = math.sqrt((target.x - hq[0])**2 + (target.y - hq[1])**2)
+    assert abs(serf.path_distance - straight) < 1e-6
+    print("  [OK] Serf-Laufweg == Luftlinie")
+
+
 def test_worker_types():
     """Test: Alle neuen Worker-Typen sind definiert"""
     print("\n=== Test: Worker-Typen ===")
@@ -187,12 +927,29 @@ if __name__ == "__main__":
 
     try:
         test_worker_types()
+        test_serf_pool()
+        test_workforce_counters()
+        test_workforce_infrastructure_events()
+        test_break_site_index()
+        test_break_site_snapshot()
+        test_production_integration_dt()
+        test_completion_scheduler()
+        test_tree_table()
+        test_action_decode_tables()
+        test_observation_writer()
+        test_perf_stats()
+        test_hq_field_distance()
         test_bless_cooldown()
         test_monastery_motivation()
         test_motivation_modifier()
         test_scholar_creation()
         test_scholar_efficiency()
         test_tax_motivation()
+        test_event_time_mode()
+        test_event_time_mode_economy()
+        test_idle_fast_forward()
+        test_action_mask_cache()
+        test_snapshot_restore()
 
         print("\n" + "=" * 50)
         print("=== ALLE TESTS BESTANDEN ===")
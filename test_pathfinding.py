@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+"""
+Test-Skript für Pathfinding-Strukturen
+Verifiziert: Räumlicher Baum-Index liefert dieselben Ergebnisse wie lineare Suche
+"""
+
+import numpy as np
+
+from pathfinding import TreeSpatialIndex, MapManager, DistanceField, FIELD_INF, CHANGE_LOG_LIMIT
+
+
+def test_tree_index_matches_brute_force():
+    """Test: k-nächste, Radius- und Rechteck-Abfragen == lineare Suche"""
+    print("\n=== Test: Baum-Index vs. lineare Suche ===")
+
+    rng = np.random.default_rng(0)
+    for metric in ("euclidean", "manhattan"):
+        index = TreeSpatialIndex(bucket_size=50.0, metric=metric)
+        points = {}
+        for item_id, (x, y) in enumerate(rng.uniform(0, 1000, size=(400, 2)).round()):
+            index.insert(item_id, float(x), float(y))
+            points[item_id] = (float(x), float(y))
+        for item_id in range(0, 400, 7):
+            index.remove(item_id)
+            del points[item_id]
+
+        def dist(p, x, y):
+            if metric == "manhattan":
+                return abs(p[0] - x) + abs(p[1] - y)
+            return float(np.sqrt((p[0] - x)**2 + (p[1] - y)**2))
+
+        for x, y in rng.uniform(-200, 1200, size=(50, 2)):
+            brute = sorted((dist(p, x, y), i) for i, p in points.items())
+            assert index.nearest(x, y, k=5) == brute[:5], f"nearest ({metric})"
+            assert index.within_radius(x, y, 120.0) == [b for b in brute if b[0] <= 120.0]
+            rect = sorted(i for i, p in points.items()
+                          if x - 60 <= p[0] <= x + 60 and y - 40 <= p[1] <= y + 40)
+            assert index.within_rect(x - 60, y - 40, x + 60, y + 40) == rect
+
+    print("  [OK] Abfragen identisch")
+
+
+def test_grid_tree_index_consistent():
+    """Test: WalkableGrid/MapManager halten den Index bei Add/Remove/Copy synchron"""
+    print("\n=== Test: Baum-Index im Grid ===")
+
+    import copy
+
+    manager = MapManager()
+    trees = [{"x": 25240 + 33.5 * x, "y": 33.8 * y} for x, y in [(10, 10), (12, 11), (300, 200), (40, 600)]]
+    manager._load_trees_from_data(trees)
+
+    site = (25240 + 33.5 * 11, 33.8 * 10)
+    local_site = manager.to_local_coords(*site)
+    tree_id, _, _ = manager.get_nearest_tree(*site)
+    assert tree_id in (1, 2)
+    assert manager.grid.get_trees_blocking_building(*local_site, "Unbekannt") == [1, 2]
+
+    clone = copy.deepcopy(manager)
+    manager.remove_tree(1)
+    assert manager.grid.get_trees_blocking_building(*local_site, "Unbekannt") == [2]
+    assert clone.grid.get_trees_blocking_building(*local_site, "Unbekannt") == [1, 2], "Kopie verändert"
+
+    fresh = MapManager()
+    fresh.copy_trees_from(clone)
+    assert fresh.get_nearest_tree(25240 + 33.5 * 300, 33.8 * 200)[0] == 3
+    assert fresh.grid.next_tree_id == clone.grid.next_tree_id
+    print("  [OK] Index synchron")
+
+
+def _random_manager(seed: int, width: int = 80, height: int = 60) -> MapManager:
+    rng = np.random.default_rng(seed)
+    manager = MapManager(width=width, height=height)
+    manager.offset_x = 0.0
+    terrain = (rng.random((height, width)) > 0.2).astype(np.uint8)
+    manager.grid.load_terrain_from_array(terrain)
+    return manager
+
+
+def test_distance_field_updates():
+    """Test: Distanzfeld == Neuberechnung nach Gebäude/Baum-Änderungen == A*"""
+    print("\n=== Test: Distanzfelder ===")
+
+    import tempfile
+
+    manager = _random_manager(1)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        manager.enable_distance_fields(cache_dir)
+        source = (40 * 33.5, 30 * 33.8)
+        rng = np.random.default_rng(2)
+
+        def check():
+            field = manager.get_distance_field(*source)
+            walk = manager._current_walkable().copy()
+            reference = DistanceField.compute(walk, 80, 60, field.source)
+            assert np.array_equal(field.dist, reference.dist), "Lokales Update weicht ab"
+            for _ in range(10):
+                goal = (rng.uniform(0, 80 * 33.5), rng.uniform(0, 60 * 33.8))
+                result = manager.find_path(source, goal)
+                dist = manager.get_field_distance(source, goal)
+                assert result.found == (dist < float('inf'))
+                if result.found:
+                    assert abs(dist - result.world_distance) < 1e-6
+
+        check()
+        building_ids = [manager.add_building(rng.uniform(0, 2600), rng.uniform(0, 2000), "Wohnhaus")
+                        for _ in range(4)]
+        check()
+        manager.remove_building(building_ids[1])
+        check()
+
+        # Abgleich nur über die protokollierten Zellen (ohne neues gepaddetes Grid)
+        field = manager.get_distance_field(*source)
+        manager.add_building(rng.uniform(0, 2600), rng.uniform(0, 2000), "Wohnhaus")
+        manager.get_field_distance(source, (10 * 33.5, 10 * 33.8))
+        assert field.synced_version == manager.grid.version
+        assert manager.grid._padded_cache[0] != manager.grid.version, "Ganzes Grid verglichen"
+        check()
+
+        # Protokoll übergelaufen -> Vergleich des ganzen Grids
+        for _ in range(CHANGE_LOG_LIMIT + 1):
+            manager.remove_building(manager.add_building(rng.uniform(0, 2600), rng.uniform(0, 2000), "Wohnhaus"))
+        assert manager.grid.changed_cells_since(field.synced_version) is None
+        check()
+
+        # Vorlage von der Platte laden liefert dasselbe Feld
+        template = manager.field_store.get(manager.get_distance_field(*source).source)
+        reloaded = MapManager(width=80, height=60)
+        reloaded.grid.terrain_base = manager.grid.terrain_base
+        reloaded.offset_x = 0.0
+        reloaded.enable_distance_fields(cache_dir)
+        loaded = reloaded.field_store.get(template.source)
+        assert np.array_equal(loaded.dist, template.dist)
+        assert np.array_equal(loaded.parent >= 0, template.parent >= 0)
+
+    print("  [OK] Felder konsistent")
+
+
+def test_grid_search_matches_dijkstra():
+    """Test: A* und JPS liefern die exakten Dijkstra-Distanzen und gültige Pfade"""
+    print("\n=== Test: GridSearch (A*/JPS) ===")
+
+    from pathfinding import GridSearch, COST_STRAIGHT, COST_DIAGONAL
+
+    rng = np.random.default_rng(3)
+    for seed in range(10):
+        manager = _random_manager(seed, width=int(rng.integers(10, 60)), height=int(rng.integers(10, 60)))
+        width, height = manager.grid.width, manager.grid.height
+        walk, walk_bytes = manager.grid.get_padded_walkable()
+        engine = GridSearch(width, height)
+        free = np.flatnonzero(walk)
+
+        for _ in range(20):
+            start, goal = (int(i) for i in rng.choice(free, 2))
+            reference = DistanceField.compute(walk.copy(), width, height, start).dist[goal]
+            expected = None if reference >= FIELD_INF else int(reference)
+
+            for jps in (False, True):
+                assert engine.search(walk_bytes, start, goal, jps=jps) == expected, f"jps={jps}"
+                if expected is None:
+                    continue
+                path = engine.reconstruct(goal)
+                assert path[0] == start and path[-1] == goal
+                cost = 0
+                for u, v in zip(path, path[1:]):
+                    assert walk[v], "Pfad durch blockierte Zelle"
+                    cost += COST_STRAIGHT if abs(v - u) in (1, engine.row) else COST_DIAGONAL
+                assert cost == expected
+
+    # find_path / get_path_distance über beide Modi identisch
+    manager = _random_manager(42)
+    for _ in range(20):
+        a = (rng.uniform(0, 80 * 33.5), rng.uniform(0, 60 * 33.8))
+        b = (rng.uniform(0, 80 * 33.5), rng.uniform(0, 60 * 33.8))
+        manager.pathfinder.use_jps = False
+        plain = manager.get_path_distance(a, b)
+        manager.pathfinder.use_jps = True
+        assert manager.get_path_distance(a, b) == plain
+        assert manager.find_path(a, b).found == (plain < float('inf'))
+
+    print("  [OK] Distanzen identisch")
+
+
+def test_component_labels_incremental():
+    """Test: Lokal aktualisierte Komponenten == Neuberechnung, unerreichbar in O(1)"""
+    print("\n=== Test: Zusammenhangskomponenten ===")
+
+    from pathfinding import _label_components
+
+    def same_partition(a, b):
+        pairs = np.unique(np.stack([a.ravel(), b.ravel()]), axis=1)
+        return pairs.shape[1] == len(np.unique(a)) == len(np.unique(b))
+
+    for seed in range(5):
+        manager = _random_manager(seed)
+        grid = manager.grid
+        rng = np.random.default_rng(seed)
+        grid.get_component_labels()
+        building_ids, tree_ids = [], []
+        for _ in range(30):
+            r = rng.random()
+            pos = (rng.uniform(0, 80 * 33.5), rng.uniform(0, 60 * 33.8))
+            if r < 0.4:
+                building_ids.append(manager.add_building(*pos, "Wohnhaus"))
+            elif r < 0.6 and building_ids:
+                manager.remove_building(building_ids.pop(int(rng.integers(len(building_ids)))))
+            elif r < 0.8:
+                tree_ids.append(grid.add_tree(*pos))
+            elif tree_ids:
+                grid.remove_tree(tree_ids.pop(int(rng.integers(len(tree_ids)))))
+            assert grid._labels_version == grid.version, "Labels nicht lokal aktualisiert"
+            reference = _label_components(grid.get_walkable_grid())
+            assert same_partition(grid.component_labels, reference), "Komponenten weichen ab"
+            labels = grid.component_labels
+            counts = np.bincount(labels.ravel())
+            assert grid._component_sizes == {l: int(counts[l]) for l in np.flatnonzero(counts[1:]) + 1}, \
+                "Komponenten-Größen weichen ab"
+            for label, (y0, y1, x0, x1) in grid._component_bounds.items():
+                assert np.count_nonzero(labels[y0:y1 + 1, x0:x1 + 1] == label) == counts[label], \
+                    "Bounding-Box zu klein"
+
+    # Zwei durch eine Wand getrennte Hälften: kein Pfad, ohne Suche
+    manager = MapManager(width=40, height=20)
+    manager.offset_x = 0.0
+    terrain = np.ones((20, 40), dtype=np.uint8)
+    terrain[:, 20] = 0
+    manager.grid.load_terrain_from_array(terrain)
+    engine = manager.pathfinder.engine
+    engine.total_nodes_expanded = 0
+    assert not manager.find_path((5 * 33.5, 5 * 33.8), (30 * 33.5, 5 * 33.8)).found
+    assert engine.total_nodes_expanded == 0, "Unerreichbares Ziel wurde abgesucht"
+
+    # Blockiertes Ziel an der Wand: nächste Zelle auf der erreichbaren Seite
+    manager.add_building(20 * 33.5, 10 * 33.8, "Unbekannt")
+    result = manager.find_path((30 * 33.5, 5 * 33.8), (20.5 * 33.5, 10 * 33.8))
+    assert result.found and result.path[-1].x > 20
+    print("  [OK] Komponenten konsistent")
+
+
+def test_summed_area_placement():
+    """Test: SAT-Bauplatzprüfung == Zell-Schleife, buildable_map == can_build_at"""
+    print("\n=== Test: Bauplatz-Prüfung (SAT) ===")
+
+    manager = _random_manager(7)
+    grid = manager.grid
+    rng = np.random.default_rng(7)
+    for _ in range(5):
+        manager.add_building(rng.uniform(0, 2600), rng.uniform(0, 2000), "Wohnhaus")
+    for _ in range(40):
+        grid.add_tree(rng.uniform(0, 2600), rng.uniform(0, 2000))
+
+    for building_type in ("Wohnhaus", "Kaserne", "Hauptquartier"):
+        half = grid._footprint_half_size(building_type)
+        buildable = grid.buildable_map(building_type)
+        no_trees = grid.buildable_map(building_type, allow_trees=False)
+        for y in range(grid.height):
+            for x in range(grid.width):
+                inside = half <= x < grid.width - half and half <= y < grid.height - half
+                window = (slice(y - half, y + half + 1), slice(x - half, x + half + 1))
+                expected = inside and bool(grid.terrain_base[window].all() and not grid.buildings[window].any())
+                assert buildable[y, x] == expected, f"{building_type} ({x}, {y})"
+                assert no_trees[y, x] == (expected and not grid.trees[window].any())
+
+        world = (30.5 * 33.5, 20.5 * 33.8)
+        assert grid.can_build_at(*world, building_type) == buildable[20, 30]
+        assert (grid.count_trees_in_footprint(*world, building_type) ==
+                len(grid.get_trees_blocking_building(*world, building_type)))
+
+    print("  [OK] Bauplatz-Prüfung konsistent")
+
+
+def test_static_map_data_shared():
+    """Test: Statische Kartendaten per Memory-Map == direkt geladener MapManager"""
+    print("\n=== Test: Statische Kartendaten ===")
+
+    import json
+    import os
+    import tempfile
+    import static_map_data
+    from static_map_data import load_static_map
+
+    rng = np.random.default_rng(8)
+    trees = [{"x": 25240 + float(x), "y": float(y)}
+             for x, y in rng.uniform(0, 20000, size=(60, 2))]
+    nearest = trees[::5]
+    with tempfile.TemporaryDirectory() as root:
+        np.save(os.path.join(root, "player1_walkable.npy"),
+                (rng.random((747, 754)) > 0.2).astype(np.uint8))
+        with open(os.path.join(root, "player1_resources.json"), "w") as f:
+            json.dump({"trees_all": trees}, f)
+
+        static_map_data._LOADED.pop(os.path.abspath(root), None)
+        built = load_static_map(root, nearest)
+        assert load_static_map(root, nearest) is built, "Nicht pro Prozess gecacht"
+        static_map_data._LOADED.pop(os.path.abspath(root), None)
+        attached = load_static_map(root, nearest)
+        static_map_data._LOADED.pop(os.path.abspath(root), None)
+        assert attached.mapped and not attached.terrain_base.flags.writeable
+        assert isinstance(attached.terrain_base.base, np.memmap), "Keine Memory-Map"
+
+        reference = MapManager()
+        reference.load_from_files(data_root=root)
+        manager = MapManager()
+        manager.load_static_data(attached)
+        assert np.array_equal(manager.grid.terrain_base, reference.grid.terrain_base)
+        assert np.array_equal(manager.grid.trees, reference.grid.trees)
+        assert manager.grid.tree_positions == reference.grid.tree_positions
+        assert manager.tree_world_positions == reference.tree_world_positions
+        for tree in nearest:
+            assert attached.tree_id_mapping_dict()[nearest.index(tree)] == \
+                reference.get_nearest_tree(tree["x"], tree["y"])[0]
+
+        # Schreibzugriff kopiert den geteilten Baum-Layer (COW)
+        manager.remove_tree(1)
+        assert attached.trees_layer.sum() == reference.grid.trees.sum()
+
+    print("  [OK] Geteilte Daten identisch")
+
+
+def test_overlay_reset():
+    """Test: reset_overlay() stellt Layer, Tracking, Indizes und Komponenten der Basis wieder her"""
+    print("\n=== Test: Overlay-Reset ===")
+
+    import copy
+    from pathfinding import _label_components
+
+    def state(manager):
+        grid = manager.grid
+        return (grid.buildings.copy(), grid.trees.copy(), dict(grid.building_positions),
+                dict(grid.tree_positions), dict(grid.tree_index.positions),
+                dict(manager.tree_world_positions), dict(manager.tree_index.positions),
+                grid.next_building_id, grid.next_tree_id)
+
+    def assert_state(manager, expected):
+        for actual, wanted in zip(state(manager), expected):
+            if isinstance(actual, np.ndarray):
+                assert np.array_equal(actual, wanted), "Layer nicht zurückgesetzt"
+            else:
+                assert actual == wanted, "Tracking nicht zurückgesetzt"
+        labels = manager.grid.get_component_labels()
+        reference = _label_components(manager.grid.get_walkable_grid())
+        pairs = np.unique(np.stack([labels.ravel(), reference.ravel()]), axis=1)
+        assert pairs.shape[1] == len(np.unique(labels)) == len(np.unique(reference)), \
+            "Komponenten weichen ab"
+
+    manager = _random_manager(3)
+    rng = np.random.default_rng(3)
+    manager._load_trees_from_data([{"x": float(x), "y": float(y)}
+                                   for x, y in rng.uniform(0, 60 * 33.5, size=(40, 2))])
+    manager.add_building(40 * 33.5, 30 * 33.8, "Hauptquartier")
+    manager.enable_overlay()
+    manager.grid.get_component_labels()
+    base = state(manager)
+
+    snapshot = None
+    for episode in range(3):
+        building_ids = []
+        tree_ids = list(manager.tree_world_positions)
+        for step in range(25):
+            pos = (rng.uniform(0, 80 * 33.5), rng.uniform(0, 60 * 33.8))
+            r = rng.random()
+            if r < 0.4:
+                building_ids.append(manager.add_building(*pos, "Wohnhaus"))
+            elif r < 0.6 and building_ids:
+                manager.remove_building(building_ids.pop(int(rng.integers(len(building_ids)))))
+            elif r < 0.8 and tree_ids:
+                manager.remove_tree(tree_ids.pop(int(rng.integers(len(tree_ids)))))
+            else:
+                manager.grid.add_tree(*pos)
+            if episode == 1 and step == 10:
+                snapshot = copy.deepcopy(manager)
+        manager.reset_overlay()
+        assert_state(manager, base)
+        assert not manager.grid._overlay_log, "Protokoll nicht geleert"
+
+    # Snapshot mitten in der Episode: eigenes Protokoll, Reset führt ebenfalls zur Basis
+    assert snapshot.grid._overlay_log, "Snapshot ohne Protokoll"
+    snapshot.reset_overlay()
+    assert_state(snapshot, base)
+    print("  [OK] Overlay-Reset == Basis")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("SIEDLER AI - PATHFINDING-TESTS")
+    print("=" * 50)
+
+    try:
+        test_tree_index_matches_brute_force()
+        test_grid_tree_index_consistent()
+        test_distance_field_updates()
+        test_grid_search_matches_dijkstra()
+        test_component_labels_incremental()
+        test_summed_area_placement()
+        test_static_map_data_shared()
+        test_overlay_reset()
+
+        print("\n" + "=" * 50)
+        print("=== ALLE TESTS BESTANDEN ===")
+        print("=" * 50)
+    except AssertionError as e:
+        print(f"\n[FEHLER] TEST FEHLGESCHLAGEN: {e}")
+    except Exception as e:
+        print(f"\n[FEHLER] FEHLER: {e}")
+        import traceback
+        traceback.print_exc()
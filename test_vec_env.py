@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Test-Skript für SiedlerVecEnv
+Verifiziert: Gleiches Verhalten wie Einzel-Env, Batch-Puffer, gebündelte Masken/Ticks
+"""
+
+from functools import partial
+
+import numpy as np
+
+from environment import RESOURCE_NAMES, SiedlerScharfschuetzenEnv
+from vec_env import SiedlerVecEnv, SiedlerSubprocVecEnv, _random_masked_actions
+from evaluation import evaluate_parallel, t_critical
+
+
+def test_vec_env_matches_single_env():
+    """Test: VecEnv liefert dieselbe Trajektorie wie Einzel-Envs (inkl. Auto-Reset)"""
+    print("\n=== Test: VecEnv == Einzel-Env ===")
+
+    n_envs = 2
+    vec = SiedlerVecEnv(n_envs=n_envs, check=True)
+    vec.seed(42)
+    vec_obs = vec.reset()
+
+    singles = [SiedlerScharfschuetzenEnv() for _ in range(n_envs)]
+    single_obs = np.stack([env.reset(seed=42 + i)[0] for i, env in enumerate(singles)])
+
+    assert np.array_equal(vec_obs, single_obs), "Reset-Beobachtungen unterschiedlich"
+
+    # Kurze Episoden, damit der Auto-Reset im Test vorkommt
+    vec.set_attr("max_time", 120)
+    for env in singles:
+        env.max_time = 120
+
+    rng = np.random.default_rng(0)
+    resets = 0
+    for step in range(600):
+        masks = vec.action_masks()
+        actions = _random_masked_actions(rng, masks)
+
+        vec_obs, vec_rew, vec_done, vec_infos = vec.step(actions)
+        for i, env in enumerate(singles):
+            obs, reward, terminated, truncated, _ = env.step(int(actions[i]))
+            if terminated or truncated:
+                assert np.array_equal(vec_infos[i]["terminal_observation"], obs)
+                obs, _ = env.reset()
+                resets += 1
+            assert np.array_equal(vec_obs[i], obs), f"Beobachtung Env {i} weicht ab (Step {step})"
+            assert abs(vec_rew[i] - reward) < 1e-5, f"Reward Env {i} weicht ab (Step {step})"
+            assert vec_done[i] == (terminated or truncated)
+    assert resets > 0
+
+    print(f"  [OK] 600 Steps identisch ({resets} Auto-Resets)")
+
+
+def test_vec_env_batched_economy():
+    """Test: Gebündelte Masken/Ticks bei Forschung, Kloster, Segen, Einkommen (check=True)"""
+    print("\n=== Test: Gebündelte Wirtschaft ===")
+
+    def enrich(env):
+        for resource in RESOURCE_NAMES:
+            env.resources[resource] = 200000.0
+        env.faith = 4000
+        for building in ("Hochschule_1", "Kloster_1", "Kaserne_1"):
+            env.buildings[building] = 1
+
+    n_envs = 2
+    vec = SiedlerVecEnv(n_envs=n_envs, check=True)
+    vec.seed(5)
+    vec.reset()
+    singles = [SiedlerScharfschuetzenEnv() for _ in range(n_envs)]
+    for i, env in enumerate(singles):
+        env.reset(seed=5 + i)
+        enrich(env)
+        enrich(vec.envs[i])
+    vec.mark_dirty()
+
+    # Die Envs arbeiten direkt auf ihrer Ledger-Zeile
+    assert vec.envs[1].resources["Holz"] == vec.ledger.resources[1, RESOURCE_NAMES.index("Holz")]
+    vec.envs[1].faith = 4000
+    assert vec.ledger.faith[1] == 4000
+
+    rng = np.random.default_rng(3)
+    actions_done = set()
+    for step in range(1500):
+        actions = _random_masked_actions(rng, vec.action_masks())
+        vec_obs, vec_rew, _, _ = vec.step(actions)
+        for i, env in enumerate(singles):
+            obs, reward, _, _, info = env.step(int(actions[i]))
+            actions_done.add(info.get("action_name"))
+            assert np.array_equal(vec_obs[i], obs), f"Beobachtung Env {i} weicht ab (Step {step})"
+            assert abs(vec_rew[i] - reward) < 1e-5
+
+    assert {"research", "bless", "recruit"} <= actions_done, actions_done
+    assert any(env.researched_techs for env in vec.envs)
+    print(f"  [OK] 1500 Steps identisch, Zeit {[env.current_time for env in vec.envs]}")
+
+
+def test_vec_env_mixed_time_modes():
+    """Test: Ereignis-Modus und Vorspulen laufen pro Episode, der Rest gebündelt"""
+    print("\n=== Test: Gemischte Zeitmodi ===")
+
+    env_fns = [partial(SiedlerScharfschuetzenEnv, time_mode="event"),
+               partial(SiedlerScharfschuetzenEnv, idle_fast_forward=True),
+               SiedlerScharfschuetzenEnv]
+    vec = SiedlerVecEnv(env_fns=env_fns, check=True)
+    vec.seed(9)
+    vec.reset()
+    singles = [fn() for fn in env_fns]
+    for i, env in enumerate(singles):
+        env.reset(seed=9 + i)
+
+    rng = np.random.default_rng(2)
+    for step in range(400):
+        actions = _random_masked_actions(rng, vec.action_masks())
+        vec_obs, _, vec_done, _ = vec.step(actions)
+        for i, env in enumerate(singles):
+            obs, _, terminated, _, _ = env.step(int(actions[i]))
+            if terminated:
+                obs, _ = env.reset()
+            assert np.array_equal(vec_obs[i], obs), f"Beobachtung Env {i} weicht ab (Step {step})"
+            assert vec_done[i] == terminated
+
+    print("  [OK] 400 Steps identisch")
+
+
+def test_vec_env_batch_buffers():
+    """Test: Batch-Puffer spiegeln die Einzel-Envs und werden als Kopie geliefert"""
+    print("\n=== Test: Batch-Puffer ===")
+
+    vec = SiedlerVecEnv(n_envs=3)
+    obs = vec.reset()
+
+    assert obs.shape == (3,) + vec.observation_space.shape
+    current = vec._get_observation()
+    for i, env in enumerate(vec.envs):
+        assert np.array_equal(current[i], env.get_observation())
+        mask = env.action_masks()
+        assert np.array_equal(vec.action_masks()[i, :len(mask)], mask)
+
+    # Rückgaben sind Kopien: spätere Steps verändern sie nicht
+    vec.step(np.zeros(3, dtype=np.int64))
+    assert np.array_equal(obs, current), "Puffer nicht kopiert"
+
+    print("  [OK] Puffer konsistent")
+
+
+def test_vec_env_masks_padded():
+    """Test: Masken sind auf max. Phasengröße gepaddet"""
+    print("\n=== Test: Gepaddete Masken ===")
+
+    vec = SiedlerVecEnv(n_envs=2)
+    vec.reset()
+    masks = vec.action_masks()
+
+    assert masks.shape == (2, vec.max_actions)
+    assert masks[:, 0].all(), "wait muss immer erlaubt sein"
+    assert not masks[:, 12:].any(), "MAIN-Phase hat nur 12 Aktionen"
+    print("  [OK] Masken gepaddet")
+
+
+def test_subproc_vec_env_matches_vec_env():
+    """Test: Subprozess-Variante == SiedlerVecEnv (inkl. Masken und Auto-Reset)"""
+    print("\n=== Test: SubprocVecEnv == VecEnv ===")
+
+    n_envs = 2
+    local = SiedlerVecEnv(n_envs=n_envs)
+    remote = SiedlerSubprocVecEnv(n_envs=n_envs)
+    try:
+        assert remote.action_space == local.action_space
+        assert remote.has_attr("action_masks")
+        local.seed(7)
+        remote.seed(7)
+        assert np.array_equal(local.reset(), remote.reset())
+
+        # Kurze Episoden erzwingen, damit der Auto-Reset mitten im Test passiert
+        local.set_attr("max_time", 40)
+        remote.set_attr("max_time", 40)
+
+        rng = np.random.default_rng(1)
+        resets = 0
+        for step in range(200):
+            masks = local.action_masks()
+            assert np.array_equal(masks, remote.action_masks()), f"Maske weicht ab (Step {step})"
+            assert np.array_equal(masks, np.stack(remote.env_method("action_masks")))
+            actions = _random_masked_actions(rng, masks)
+            local_result = local.step(actions)
+            remote_result = remote.step(actions)
+            for expected, actual in zip(local_result[:3], remote_result[:3]):
+                assert np.array_equal(expected, actual), f"Step {step} weicht ab"
+            resets += int(remote_result[2].sum())
+        assert resets > 0
+        assert remote.get_attr("current_phase") == local.get_attr("current_phase")
+    finally:
+        remote.close()
+
+    print(f"  [OK] 200 Steps identisch ({resets} Auto-Resets)")
+
+
+class _LastValidActionModel:
+    """Deterministische Test-Policy: letzte gültige Aktion jeder Maske."""
+
+    def __init__(self, action_space):
+        self.action_space = action_space
+        self.batch_sizes = []
+
+    def predict(self, obs, deterministic=True, action_masks=None):
+        self.batch_sizes.append(len(obs))
+        return np.array([np.flatnonzero(mask)[-1] for mask in action_masks]), None
+
+
+def test_parallel_evaluation():
+    """Test: Evaluation verteilt Episoden, fragt gebündelt ab und aggregiert"""
+    print("\n=== Test: Parallele Evaluation ===")
+
+    model = _LastValidActionModel(SiedlerVecEnv(env_fns=[SiedlerScharfschuetzenEnv]).action_space)
+    streamed = []
+    report = evaluate_parallel(model, n_episodes=5, subproc=False, seed=3,
+                               env_fns=[SiedlerScharfschuetzenEnv] * 2, on_episode=streamed.append)
+
+    assert report.n_episodes == 5 and streamed == report.episodes
+    assert [r.episode for r in report.episodes] == list(range(5))
+    assert sorted(r.env_index for r in report.episodes) == [0, 0, 1, 1, 1]
+    assert set(model.batch_sizes) == {2}, "Policy muss gebündelt abgefragt werden"
+    assert all(r.time >= SiedlerScharfschuetzenEnv().max_time and r.action_history
+               for r in report.episodes)
+
+    # Reward = Summe der Schritt-Rewards einer Einzel-Episode mit denselben Aktionen
+    env = SiedlerScharfschuetzenEnv()
+    obs, _ = env.reset(seed=3)
+    total, done = 0.0, False
+    while not done:
+        mask = np.zeros(model.action_space.n, dtype=bool)
+        mask[:env.action_space.n] = env.action_masks()
+        obs, reward, done, _, info = env.step(int(np.flatnonzero(mask)[-1]))
+        total += reward
+    first = next(r for r in report.episodes if r.env_index == 0)
+    assert abs(first.reward - total) < 1e-4
+    assert first.scharfschuetzen == info["episode_summary"]["scharfschuetzen"]
+    assert first.techs == info["episode_summary"]["techs"]
+
+    rewards = np.array([r.reward for r in report.episodes])
+    stat = report.stats["reward"]
+    assert abs(stat.mean - rewards.mean()) < 1e-6
+    assert abs(stat.std - rewards.std(ddof=1)) < 1e-6
+    low, high = stat.ci95()
+    half = t_critical(4) * rewards.std(ddof=1) / np.sqrt(5)
+    assert abs((high - low) / 2 - half) < 1e-6
+    assert report.summary()["metrics"]["scharfschuetzen"]["ci95"][0] <= report.stats["scharfschuetzen"].mean
+
+    # Subprozesse liefern dieselben Episoden
+    remote = evaluate_parallel(model, n_episodes=5, subproc=True, seed=3, env_fns=[SiedlerScharfschuetzenEnv] * 2,
+                               keep_histories=False)
+    key = lambda r: (r.env_index, r.reward, r.scharfschuetzen, r.techs, r.time)
+    assert sorted(map(key, remote.episodes)) == sorted(map(key, report.episodes))
+    assert all(r.action_history is None for r in remote.episodes)
+
+    print(f"  [OK] 5 Episoden auf 2 Envs, Reward {stat.mean:.1f} "
+          f"95%-KI [{low:.1f}, {high:.1f}]")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("SIEDLER AI - VEC-ENV-TESTS")
+    print("=" * 50)
+
+    try:
+        test_vec_env_batch_buffers()
+        test_vec_env_masks_padded()
+        test_vec_env_matches_single_env()
+        test_vec_env_batched_economy()
+        test_vec_env_mixed_time_modes()
+        test_subproc_vec_env_matches_vec_env()
+        test_parallel_evaluation()
+
+        print("\n" + "=" * 50)
+        print("=== ALLE TESTS BESTANDEN ===")
+        print("=" * 50)
+    except AssertionError as e:
+        print(f"\n[FEHLER] TEST FEHLGESCHLAGEN: {e}")
+    except Exception as e:
+        print(f"\n[FEHLER] FEHLER: {e}")
+        import traceback
+        traceback.print_exc()
@@ -2,16 +2,28 @@
 """
 Siedler AI - Training mit 100k Steps
 Starte dieses Skript für ein erstes sinnvolles Training.
+
+Paralleles Sammeln der Rollouts (ein Env pro Subprozess):
+    python train_100k.py --n-envs 8
+
+Laufzeit pro Subsystem in TensorBoard (Gruppe perf/):
+    python train_100k.py --perf-stats
 """
 
+import argparse
 import os
+import time
 from datetime import datetime
 
 from sb3_contrib import MaskablePPO
 from sb3_contrib.common.wrappers import ActionMasker
 from stable_baselines3.common.callbacks import BaseCallback, CheckpointCallback
+from stable_baselines3.common.vec_env import VecMonitor
 
 from environment import SiedlerScharfschuetzenEnv
+from evaluation import evaluate_parallel, print_episode
+from perf_stats import merge_stats
+from vec_env import SiedlerSubprocVecEnv
 
 # Pfad für Modelle
 SAVE_PATH = "./siedler_training_100k"
@@ -26,33 +38,57 @@ class DetailedCallback(BaseCallback):
         self.check_freq = check_freq
         self.best_scharfschuetzen = 0
         self.episode_count = 0
+        self.start_time = None
+
+    def _on_training_start(self) -> None:
+        self.start_time = time.perf_counter()
 
     def _on_step(self) -> bool:
-        # Episode-Ende erkennen
-        if self.locals.get("dones", [False])[0]:
-            self.episode_count += 1
+        # Episode-Ende erkennen (alle Envs)
+        self.episode_count += int(sum(self.locals.get("dones", [False])))
 
         if self.n_calls % self.check_freq == 0:
-            if hasattr(self.training_env, 'envs'):
-                env = self.training_env.envs[0]
-                if hasattr(env, 'unwrapped'):
-                    env = env.unwrapped
-
-                scharfschuetzen = getattr(env, 'scharfschuetzen', 0)
-                current_time = getattr(env, 'current_time', 0)
-                researched = list(getattr(env, 'researched_techs', set()))
-                buildings = {k: v for k, v in getattr(env, 'buildings', {}).items() if v > 0}
-
-                if scharfschuetzen > self.best_scharfschuetzen:
-                    self.best_scharfschuetzen = scharfschuetzen
-                    print(f"[NEUER REKORD] {scharfschuetzen} Scharfschuetzen!")
-
-                print(f"\n--- Step {self.n_calls} (Episode ~{self.episode_count}) ---")
-                print(f"  Zeit: {current_time}s")
-                print(f"  Techs: {researched[:5]}{'...' if len(researched) > 5 else ''}")
-                print(f"  Scharfschuetzen: {scharfschuetzen} (Best: {self.best_scharfschuetzen})")
-                print(f"  Gebaeude: {list(buildings.keys())[:5]}")
+            # get_attr funktioniert für DummyVecEnv und Subprozesse (Env 0)
+            env = self.training_env
+            scharfschuetzen = env.get_attr('scharfschuetzen', indices=[0])[0]
+            current_time = env.get_attr('current_time', indices=[0])[0]
+            researched = list(env.get_attr('researched_techs', indices=[0])[0])
+            buildings = {k: v for k, v in env.get_attr('buildings', indices=[0])[0].items() if v > 0}
+            steps_per_sec = self.num_timesteps / max(time.perf_counter() - self.start_time, 1e-9)
+
+            if scharfschuetzen > self.best_scharfschuetzen:
+                self.best_scharfschuetzen = scharfschuetzen
+                print(f"[NEUER REKORD] {scharfschuetzen} Scharfschuetzen!")
+
+            print(f"\n--- Step {self.num_timesteps} (Episode ~{self.episode_count}) ---")
+            print(f"  Durchsatz: {steps_per_sec:.0f} Steps/s ({env.num_envs} Envs)")
+            print(f"  Zeit: {current_time}s")
+            print(f"  Techs: {researched[:5]}{'...' if len(researched) > 5 else ''}")
+            print(f"  Scharfschuetzen: {scharfschuetzen} (Best: {self.best_scharfschuetzen})")
+            print(f"  Gebaeude: {list(buildings.keys())[:5]}")
+
+        return True
+
+
+class PerfStatsCallback(BaseCallback):
+    """Schreibt die Laufzeit-Messpunkte aller Envs (env.perf_stats) nach TensorBoard."""
 
+    def __init__(self, log_freq: int = 2048):
+        super().__init__()
+        self.log_freq = log_freq
+
+    def _on_training_start(self) -> None:
+        self.training_env.env_method("enable_perf_stats")
+
+    def _on_step(self) -> bool:
+        if self.n_calls % self.log_freq == 0:
+            stats = merge_stats(self.training_env.env_method("perf_stats", reset=True))
+            steps = self.log_freq * self.training_env.num_envs
+            for name, timer in stats["timers"].items():
+                self.logger.record(f"perf/{name}_us_per_step", timer["total_ms"] * 1000 / steps)
+                self.logger.record(f"perf/{name}_calls_per_step", timer["calls"] / steps)
+            for name, count in stats["counters"].items():
+                self.logger.record(f"perf/{name}_per_step", count / steps)
         return True
 
 
@@ -63,16 +99,28 @@ def create_env():
     return env
 
 
-def train():
-    """Training mit 100k Steps."""
+def create_vec_env(n_envs: int):
+    """
+    N Environments in Subprozessen.
+
+    Die gepaddeten Phasen-Masken kommen mit jedem Step über die
+    VecEnv-Schnittstelle (env_method("action_masks")). VecMonitor liefert
+    die Episoden-Statistiken (rollout/ep_rew_mean, rollout/ep_len_mean).
+    """
+    return VecMonitor(SiedlerSubprocVecEnv(n_envs=n_envs, player_id=1))
+
+
+def train(n_envs: int = 1, perf_stats: bool = False):
+    """Training mit 100k Steps (n_envs > 1: Rollouts parallel in Subprozessen)."""
     print("=" * 70)
     print("SIEDLER AI - 100K TRAINING")
     print("=" * 70)
     print(f"Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Save Path: {SAVE_PATH}")
+    print(f"Environments: {n_envs}{' (Subprozesse)' if n_envs > 1 else ''}")
     print("=" * 70)
 
-    env = create_env()
+    env = create_env() if n_envs == 1 else create_vec_env(n_envs)
     print(f"Action Space: {env.action_space.n}")
     print(f"Observation Space: {env.observation_space.shape}")
 
@@ -100,15 +148,22 @@ def train():
         name_prefix="siedler"
     )
     progress_callback = DetailedCallback(check_freq=5000)
+    callbacks = [checkpoint_callback, progress_callback]
+    if perf_stats:
+        callbacks.append(PerfStatsCallback())
 
     print("\nStarte Training (100.000 Steps)...")
     print("-" * 70)
 
+    start = time.perf_counter()
     model.learn(
         total_timesteps=100_000,
-        callback=[checkpoint_callback, progress_callback],
+        callback=callbacks,
         progress_bar=True,
     )
+    elapsed = time.perf_counter() - start
+    print(f"\nDurchsatz: {model.num_timesteps / elapsed:.0f} Steps/s "
+          f"({model.num_timesteps} Steps in {elapsed:.0f}s, {n_envs} Envs)")
 
     # Speichern
     model.save(f"{SAVE_PATH}/siedler_100k_final")
@@ -119,25 +174,33 @@ def train():
     print("FINALE EVALUATION (3 Episoden)")
     print("=" * 70)
 
-    total_scharfschuetzen = 0
-    for ep in range(3):
-        obs, _ = env.reset()
-        done = False
-        reward_sum = 0
-
-        while not done:
-            action_mask = env.unwrapped.get_action_mask()
-            action, _ = model.predict(obs, deterministic=True, action_masks=action_mask)
-            obs, reward, terminated, truncated, info = env.step(action)
-            reward_sum += reward
-            done = terminated or truncated
-
-        final_env = env.unwrapped
-        total_scharfschuetzen += final_env.scharfschuetzen
-        print(f"Episode {ep+1}: Scharfschuetzen={final_env.scharfschuetzen}, "
-              f"Techs={len(final_env.researched_techs)}, Reward={reward_sum:.1f}")
-
-    print(f"\nDurchschnitt: {total_scharfschuetzen/3:.1f} Scharfschuetzen")
+    if n_envs > 1:
+        # Episoden parallel, eine gebündelte Policy-Abfrage pro Schritt
+        env.close()
+        report = evaluate_parallel(model, n_episodes=3, n_envs=n_envs, on_episode=print_episode,
+                                   keep_histories=False)
+        report.print_summary()
+        print(f"\nDurchschnitt: {report.stats['scharfschuetzen'].mean:.1f} Scharfschuetzen")
+    else:
+        total_scharfschuetzen = 0
+        for ep in range(3):
+            obs, _ = env.reset()
+            done = False
+            reward_sum = 0
+
+            while not done:
+                action_mask = env.unwrapped.get_action_mask()
+                action, _ = model.predict(obs, deterministic=True, action_masks=action_mask)
+                obs, reward, terminated, truncated, info = env.step(action)
+                reward_sum += reward
+                done = terminated or truncated
+
+            final_env = env.unwrapped
+            total_scharfschuetzen += final_env.scharfschuetzen
+            print(f"Episode {ep+1}: Scharfschuetzen={final_env.scharfschuetzen}, "
+                  f"Techs={len(final_env.researched_techs)}, Reward={reward_sum:.1f}")
+
+        print(f"\nDurchschnitt: {total_scharfschuetzen/3:.1f} Scharfschuetzen")
     print(f"Beste je erreicht: {progress_callback.best_scharfschuetzen}")
 
     print("\n" + "=" * 70)
@@ -149,4 +212,10 @@ def train():
 
 
 if __name__ == "__main__":
-    train()
+    parser = argparse.ArgumentParser(description="Siedler AI - Training mit 100k Steps")
+    parser.add_argument("--n-envs", type=int, default=1,
+                        help="Anzahl Environments; > 1 sammelt parallel in Subprozessen")
+    parser.add_argument("--perf-stats", action="store_true",
+                        help="Laufzeit pro Subsystem nach TensorBoard schreiben (perf/)")
+    args = parser.parse_args()
+    train(n_envs=args.n_envs, perf_stats=args.perf_stats)
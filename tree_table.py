@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Siedler AI - Baum-Tabelle für das Holz-Tracking
+
+Alle Bäume die Leibeigene fällen können (Bäume der Holz-Zonen plus die
+nächsten Bäume am HQ) stehen in EINEM NumPy Structured Array. Zeilen:
+zuerst die Zonen-Bäume in WOOD_ZONES-Reihenfolge (= frühere
+tree_list_internal), danach die restlichen Bäume aus PLAYER_1_TREES_NEAREST.
+
+Statisch (TreeLayout, einmal pro Env, von Snapshots geteilt):
+- Startzustand der Tabelle inkl. MapManager Baum-ID (grid_id)
+- Zeilen pro Zone nach Distanz zum Zonenzentrum
+- Zeilen der nächsten Bäume in PLAYER_1_TREES_NEAREST-Reihenfolge
+- Radius-Index über die Zonen-Bäume
+
+Pro Episode (TreeTable): Restholz, zugewiesene Leibeigene, Reservierung
+sowie Zähler lebender Bäume (gesamt und pro Zone). Bäume werden nur
+leerer, nie wieder voll; der erste lebende Baum wird deshalb über einen
+Zeiger gefunden statt die Liste jedes Mal von vorn zu durchsuchen.
+
+Die früheren Listen (trees_list, tree_list_internal, Bäume pro Zone,
+tree_id_mapping) sind Sichten auf diese Tabelle.
+"""
+
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from pathfinding import TreeSpatialIndex
+
+
+TREE_AMOUNT = 75  # ResourceAmount pro Baum (37 Extraktionen à 2 Holz)
+
+TREE_DTYPE = np.dtype([
+    ("x", np.float64),
+    ("y", np.float64),
+    ("zone", np.int16),           # Index in TreeLayout.zone_names, -1 = keine Holz-Zone
+    ("dist", np.float64),         # Distanz zum Zonenzentrum (Reihenfolge in der Zone)
+    ("remaining", np.float64),    # Restholz
+    ("serfs_assigned", np.int32),
+    ("grid_id", np.int32),        # Baum-ID im MapManager (-1 = keiner)
+    ("nearest_rank", np.int32),   # Index in PLAYER_1_TREES_NEAREST (-1 = nicht enthalten)
+    ("reserved", np.bool_),       # von einem einzelnen Leibeigenen reserviert
+])
+
+
+class TreeLayout:
+    """Statischer Teil der Baum-Tabelle (ändert sich zwischen Episoden nie)."""
+
+    def __init__(self, wood_zones: Dict[str, dict], trees_nearest: List[dict], map_manager):
+        """
+        Args:
+            wood_zones: WOOD_ZONES (Zonen mit "trees": [{"x", "y", "dist"}])
+            trees_nearest: PLAYER_1_TREES_NEAREST (nach Distanz zum HQ)
+            map_manager: MapManager im Startzustand (für grid_id)
+        """
+        self.zone_names = list(wood_zones)
+        self.zone_codes = {name: code for code, name in enumerate(self.zone_names)}
+        self.trees_nearest = trees_nearest
+
+        rows = []
+        for code, zone in enumerate(wood_zones.values()):
+            for tree in zone.get("trees", []):
+                rows.append([tree["x"], tree["y"], code, tree["dist"], -1])
+        self.n_zone_trees = len(rows)
+
+        row_at = {}
+        for row, (x, y, *_rest) in enumerate(rows):
+            row_at.setdefault((x, y), row)
+        for rank, tree in enumerate(trees_nearest):
+            row = row_at.get((tree["x"], tree["y"]))
+            if row is None:
+                row = len(rows)
+                rows.append([tree["x"], tree["y"], -1, 0.0, -1])
+                row_at[(tree["x"], tree["y"])] = row
+            if rows[row][4] < 0:
+                rows[row][4] = rank
+
+        initial = np.zeros(len(rows), dtype=TREE_DTYPE)
+        for row, (x, y, zone, dist, rank) in enumerate(rows):
+            nearest = map_manager.get_nearest_tree(x, y)
+            initial[row] = (x, y, zone, dist, TREE_AMOUNT, 0, nearest[0] if nearest else -1, rank, False)
+        initial.flags.writeable = False
+        self.initial = initial
+
+        # Zeilen pro Zone nach Distanz (stabil: gleiche Distanz -> Listen-Reihenfolge)
+        self.zone_rows = []
+        for code in range(len(self.zone_names)):
+            rows_in_zone = np.flatnonzero(initial["zone"] == code)
+            self.zone_rows.append(rows_in_zone[np.argsort(initial["dist"][rows_in_zone], kind="stable")])
+        ranked = np.flatnonzero(initial["nearest_rank"] >= 0)
+        self.nearest_rows = ranked[np.argsort(initial["nearest_rank"][ranked], kind="stable")]
+
+        # Radius-Index über die Zonen-Bäume (ID = Zeile)
+        self.index = TreeSpatialIndex(bucket_size=1000.0, metric="euclidean")
+        for row in range(self.n_zone_trees):
+            self.index.insert(row, float(initial["x"][row]), float(initial["y"][row]))
+
+
+class TreeTable:
+    """Zustand aller Bäume einer Episode (eine Zeile pro Baum, siehe TREE_DTYPE)."""
+
+    def __init__(self, layout: TreeLayout):
+        self.layout = layout
+        self.trees = layout.initial.copy()
+        self.trees.flags.writeable = True
+        n_zones = len(layout.zone_names)
+        zones = self.trees["zone"][:layout.n_zone_trees]
+        self.zone_live = np.bincount(zones, minlength=n_zones).astype(np.int64)
+        self.live_count = layout.n_zone_trees  # lebende Zonen-Bäume
+        self._first_live = 0                   # alle Zonen-Bäume davor sind leer
+        self._next_nearest = 0                 # Position in layout.nearest_rows
+
+    # ==================== ABFRAGEN ====================
+
+    def is_live(self, row: int) -> bool:
+        return self.trees["remaining"][row] > 0
+
+    def first_live_row(self) -> Optional[int]:
+        """Erster lebender Zonen-Baum in Tabellen-Reihenfolge (None wenn alle leer)."""
+        remaining = self.trees["remaining"]
+        while self._first_live < self.layout.n_zone_trees and remaining[self._first_live] <= 0:
+            self._first_live += 1
+        return self._first_live if self._first_live < self.layout.n_zone_trees else None
+
+    def zone_live_rows(self, zone_name: str) -> np.ndarray:
+        """Lebende Bäume einer Zone, nächster zum Zonenzentrum zuerst."""
+        rows = self.layout.zone_rows[self.layout.zone_codes[zone_name]]
+        return rows[self.trees["remaining"][rows] > 0]
+
+    def zone_has_live(self, zone_name: str) -> bool:
+        return self.zone_live[self.layout.zone_codes[zone_name]] > 0
+
+    def live_in_radius(self, x: float, y: float, radius: float) -> Iterator[int]:
+        """Lebende Zonen-Bäume mit Distanz <= radius, nächster zuerst."""
+        remaining = self.trees["remaining"]
+        for _, row in self.layout.index.within_radius(x, y, radius):
+            if remaining[row] > 0:
+                yield row
+
+    def unreserved_nearest(self) -> np.ndarray:
+        """Nicht reservierte Bäume aus PLAYER_1_TREES_NEAREST in deren Reihenfolge."""
+        return self.layout.nearest_rows[self._next_nearest:]
+
+    def position(self, row: int):
+        return float(self.trees["x"][row]), float(self.trees["y"][row])
+
+    # ==================== ÄNDERUNGEN ====================
+
+    def assign(self, row: int, count: int = 1):
+        self.trees["serfs_assigned"][row] += count
+
+    def reserve_next(self) -> Optional[int]:
+        """Reserviert den nächsten freien Baum der Nächste-Bäume-Liste."""
+        if self._next_nearest >= len(self.layout.nearest_rows):
+            return None
+        row = int(self.layout.nearest_rows[self._next_nearest])
+        self._next_nearest += 1
+        self.trees["reserved"][row] = True
+        return row
+
+    def extract(self, amount: float) -> Iterator[int]:
+        """
+        Verteilt amount Holz first-fit auf die lebenden Zonen-Bäume.
+
+        Liefert jede Zeile sobald der Baum leer ist; der Aufrufer kann
+        Leibeigene umsetzen, bevor der Rest weiterverteilt wird.
+        """
+        trees = self.trees
+        row = self.first_live_row()
+        while amount > 0 and row is not None:
+            remaining = float(trees["remaining"][row])
+            if remaining > 0:
+                extracted = min(remaining, amount)
+                remaining -= extracted
+                amount -= extracted
+                trees["remaining"][row] = remaining
+                if remaining <= 0:
+                    self.live_count -= 1
+                    self.zone_live[trees["zone"][row]] -= 1
+                    yield row
+            row += 1
+            if row >= self.layout.n_zone_trees:
+                break
+
+    def quiet_extractions(self, amount: float) -> float:
+        """Wie oft extract(amount) sicher keinen Baum leert (inf wenn keiner mehr lebt)."""
+        row = self.first_live_row()
+        if row is None:
+            return np.inf
+        return max(0, int(self.trees["remaining"][row] // amount) - 2)
+
+    def extract_repeated(self, amount: float, times: int):
+        """`times` Aufrufe von extract(amount) ohne geleerten Baum (times <= quiet_extractions)."""
+        row = self.first_live_row()
+        if row is None:
+            return
+        remaining = float(self.trees["remaining"][row])
+        for _ in range(times):
+            remaining -= min(remaining, amount)
+        self.trees["remaining"][row] = remaining
+
+    # ==================== SICHTEN ====================
+
+    def tree_dicts(self, rows) -> List[dict]:
+        """Zeilen im Format der früheren tree_list_internal (Kopien)."""
+        zone_names = self.layout.zone_names
+        trees = self.trees
+        return [{"x": float(trees["x"][row]), "y": float(trees["y"][row]),
+                 "dist": float(trees["dist"][row]),
+                 "resource_remaining": float(trees["remaining"][row]),
+                 "serfs_assigned": int(trees["serfs_assigned"][row]),
+                 "zone": zone_names[trees["zone"][row]] if trees["zone"][row] >= 0 else None}
+                for row in rows]
+
+    def tree_id_mapping(self) -> Dict[int, int]:
+        """Index in PLAYER_1_TREES_NEAREST -> MapManager Baum-ID."""
+        trees = self.layout.initial
+        return {int(trees["nearest_rank"][row]): int(trees["grid_id"][row])
+                for row in self.layout.nearest_rows if trees["grid_id"][row] >= 0}
@@ -0,0 +1,923 @@
+# -*- coding: utf-8 -*-
+"""
+Siedler AI - Gebündeltes Vector-Environment
+
+SiedlerVecEnv hält N Episoden von SiedlerScharfschuetzenEnv im selben
+Prozess und rechnet die Wirtschaft als Struct-of-Arrays:
+
+- Ressourcen, Zeit, Glaube, Alarm, Steuer, Motivation und Segen stehen in
+  einem gemeinsamen EconomyLedger (N Zeilen), die Envs arbeiten über
+  attach_ledger direkt auf ihrer Zeile.
+- Gebäude-, Soldaten-, Forschungs-, Arbeiter-, Positions- und
+  Serf-Bereichs-Zähler werden als (N, k) Arrays gespiegelt. Eine Zeile wird
+  nur neu gelesen, wenn sich ihre Episode geändert haben kann (Aktion,
+  Reset, Fertigstellung, Erschöpfung, Vorspulen).
+- action_masks() und _get_observation() rechnen daraus mit Kosten- und
+  Voraussetzungs-Matrizen für alle Episoden in Array-Operationen; nur die
+  WorkTime-/Effizienz-Abschnitte der Beobachtung und die Positions-Maske
+  kommen aus den Einzel-Envs.
+- step() tickt Uhr, Cooldowns, Glaube und Einkommen aller Episoden
+  gemeinsam; die Worker-/Produktions-Simulation und die Fertigstellungen
+  laufen weiter pro Episode (Pfadfindung, Serf-Objekte).
+
+Gleicher Seed und gleiche Aktionen ergeben dieselbe Trajektorie wie im
+Einzel-Env; check=True vergleicht jede gebündelte Beobachtung und Maske
+mit den Einzel-Envs. Episoden im Ereignis-Zeitmodus und vorgespulte
+wait-Aktionen werden pro Episode simuliert.
+
+Die Action-Space ist Discrete(max Phasengröße); Masken kürzerer Phasen
+werden mit False aufgefüllt, damit MaskablePPO eine feste Größe sieht.
+
+SiedlerSubprocVecEnv verteilt die Episoden auf Subprozesse (ein Env pro
+Prozess) für Training auf mehreren Kernen. Jede Antwort eines Workers
+enthält die gepaddete Maske des nächsten Schritts, MaskablePPO liest sie
+über env_method("action_masks") ohne weiteren Prozess-Roundtrip.
+
+Benchmark gegen DummyVecEnv:
+    python vec_env.py --n-envs 8 --steps 2000
+    python vec_env.py --n-envs 8 --steps 2000 --subproc
+"""
+
+import argparse
+import multiprocessing as mp
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper
+
+from economy_ledger import EconomyLedger
+from environment import (
+    ALARM_RECHARGE_TIME, BLESS_CATEGORIES, BLESS_COOLDOWN, BLESS_REQUIRED_FAITH,
+    FARM_EAT_CAPACITY, GAME_RULES, INCOME_CYCLE, MAX_POSSIBLE_LEIBEIGENE, MONASTERY_BUILDINGS,
+    PRIESTS_PER_MONASTERY, RESIDENCE_CAPACITY, RESOURCE_MAP, RESOURCE_NAMES, RESOURCE_TALER,
+    SCHEDULE_BUILD, SCHEDULE_RESEARCH, SERF_BUY_COST, TAX_LEVELS, TIME_STEP,
+    VILLAGE_CENTER_CAPACITY, ActionPhase, SerfArea, SiedlerScharfschuetzenEnv,
+    buildings_db, gather_rates, get_base_building_name, soldiers_db, technologies,
+)
+
+
+# Aktionen, die nur Ledger-Spalten ändern (keine gespiegelten Zähler)
+LEDGER_ONLY_ACTIONS = frozenset({"wait", "tax", "alarm", "bless"})
+
+
+# =============================================================================
+# STATISCHE TABELLEN (Kosten, Voraussetzungen, Kapazitäten)
+# =============================================================================
+
+def _cost_matrix(costs: Sequence[dict]):
+    """Kosten-Dicts -> ((K, R) Beträge, (K, R) Maske "Kosten vorhanden")."""
+    amount = np.zeros((len(costs), len(RESOURCE_NAMES)))
+    has = np.zeros((len(costs), len(RESOURCE_NAMES)), dtype=bool)
+    for k, cost in enumerate(costs):
+        for resource, value in cost.items():
+            amount[k, RESOURCE_NAMES.index(resource)] = value
+            has[k, RESOURCE_NAMES.index(resource)] = True
+    return amount, has
+
+
+def _affordable(resources: np.ndarray, amount: np.ndarray, has: np.ndarray) -> np.ndarray:
+    """(N, K): Ressourcen jeder Episode reichen für jede Kostenzeile."""
+    return ((resources[:, None, :] >= amount[None]) | ~has[None]).all(axis=2)
+
+
+def _requirements_met(have: np.ndarray, required: np.ndarray) -> np.ndarray:
+    """(N, K): alle Voraussetzungen (Zeilen von required, 0/1) sind in have (N, M) erfüllt."""
+    return have.astype(np.int64) @ required.T == required.sum(axis=1)
+
+
+class _EconomyTables:
+    """Aus buildings_db/technologies/soldiers_db abgeleitete Arrays für Masken, Beobachtung und Ticks."""
+
+    def __init__(self, env: SiedlerScharfschuetzenEnv):
+        self.building_names = list(buildings_db)
+        self.building_index = {b: j for j, b in enumerate(self.building_names)}
+        self.tech_index = {t: k for k, t in enumerate(env.tech_list)}
+        self.mine_types = list(dict.fromkeys(info["mine_type"] for info in buildings_db.values()
+                                             if info.get("mine_type")))
+        n_buildings, n_techs = len(self.building_names), len(env.tech_list)
+
+        def building_vector(values: Dict[str, int]) -> np.ndarray:
+            vector = np.zeros(n_buildings, dtype=np.int64)
+            for name, value in values.items():
+                if name in self.building_index:
+                    vector[self.building_index[name]] = value
+            return vector
+
+        # Kapazitäten, Einkommen, Glaube (Gebäude-Zähler @ Vektor)
+        self.village_capacity = building_vector(VILLAGE_CENTER_CAPACITY)
+        self.farm_capacity = building_vector(FARM_EAT_CAPACITY)
+        self.residence_capacity = building_vector(RESIDENCE_CAPACITY)
+        self.monasteries = building_vector({b: 1 for b in MONASTERY_BUILDINGS})
+        self.universities = building_vector({"Hochschule_1": 1, "Hochschule_2": 1})
+        self.taler_income = np.array([info.get("taler_income", 0) for info in buildings_db.values()],
+                                     dtype=np.int64)
+
+        # Produktion: (Gebäude, Ressource) in db-Reihenfolge wie _get_production_rate
+        output = np.array([[info.get("resource_output", {}).get(r, 0) for r in RESOURCE_MAP]
+                           for info in buildings_db.values()], dtype=np.int64)
+        self.producers = np.flatnonzero(output.any(axis=1))
+        self.producer_output = output[self.producers]
+        self.gather_rates = np.array([gather_rates.get(r, 0.5) for r in RESOURCE_MAP])
+
+        # Steuerstufen
+        self.tax_rate = np.array([TAX_LEVELS[level]["regular_tax"] for level in range(len(TAX_LEVELS))])
+        self.tax_motivation = np.array([TAX_LEVELS[level]["motivation_change"]
+                                        for level in range(len(TAX_LEVELS))])
+
+        # Bauen (Batch x1 == _can_build)
+        infos = [buildings_db[b] for b in env.buildable_buildings]
+        self.buildable = np.array([self.building_index[b] for b in env.buildable_buildings])
+        self.build_cost, self.build_has_cost = _cost_matrix([info["cost"] for info in infos])
+        self.build_possible = np.ones(len(infos), dtype=bool)
+        build_tech = np.full(len(infos), -1)
+        build_mine = np.full(len(infos), -1)
+        for k, info in enumerate(infos):
+            tech_req = info.get("tech_required")
+            if tech_req:
+                if tech_req in self.tech_index:
+                    build_tech[k] = self.tech_index[tech_req]
+                else:
+                    self.build_possible[k] = False
+            if info.get("mine_type"):
+                build_mine[k] = self.mine_types.index(info["mine_type"])
+        self.build_needs_tech = build_tech >= 0
+        self.build_tech = np.maximum(build_tech, 0)
+        self.build_is_mine = build_mine >= 0
+        self.build_mine = np.maximum(build_mine, 0)
+        self.demolishable = np.array(["Hauptquartier" not in b for b in env.buildable_buildings])
+
+        # Upgrades
+        self.upgradeable = np.array([self.building_index[b] for b in env.upgradeable_buildings], dtype=np.int64)
+        self.upgrade_cost, self.upgrade_has_cost = _cost_matrix(
+            [buildings_db[b].get("upgrade_cost", {}) for b in env.upgradeable_buildings])
+
+        # Forschung
+        self.tech_cost, self.tech_has_cost = _cost_matrix([technologies[t]["cost"] for t in env.tech_list])
+        self.tech_requires = np.zeros((n_techs, n_techs), dtype=np.int64)
+        self.tech_building = np.zeros((n_techs, n_buildings), dtype=np.int64)
+        self.tech_possible = np.ones(n_techs, dtype=bool)
+        for k, tech in enumerate(env.tech_list):
+            info = technologies[tech]
+            for req in info.get("tech_required", []):
+                if req in self.tech_index:
+                    self.tech_requires[k, self.tech_index[req]] = 1
+                else:
+                    self.tech_possible[k] = False
+            req_building = info.get("requires_building")
+            if req_building:
+                if req_building in self.building_index:
+                    self.tech_building[k, self.building_index[req_building]] = 1
+                else:
+                    self.tech_possible[k] = False
+
+        # Rekrutierung
+        self.recruit_cost, self.recruit_has_cost = _cost_matrix([soldiers_db[s]["cost"]
+                                                                 for s in env.soldier_types])
+        self.recruit_building = np.zeros((len(env.soldier_types), n_buildings), dtype=np.int64)
+        self.recruit_tech = np.zeros((len(env.soldier_types), n_techs), dtype=np.int64)
+        self.recruit_possible = np.ones(len(env.soldier_types), dtype=bool)
+        unit_rules = GAME_RULES.get("units", {})
+        for k, soldier in enumerate(env.soldier_types):
+            for req in soldiers_db[soldier].get("requirements", []):
+                if req in buildings_db:
+                    self.recruit_building[k, self.building_index[req]] = 1
+                elif req in technologies:
+                    if req in self.tech_index:
+                        self.recruit_tech[k, self.tech_index[req]] = 1
+                    else:
+                        self.recruit_possible[k] = False
+            base_name = get_base_building_name(soldier)
+            if base_name in unit_rules and unit_rules[base_name] == 0:
+                self.recruit_possible[k] = False
+
+        # Zustandsunabhängige Phasen-Masken
+        self.static_masks = {
+            ActionPhase.QUANTITY: env._mask_quantity(),
+            ActionPhase.TARGET: env._mask_target_areas(),
+            ActionPhase.TAX_LEVEL: env._mask_tax_levels(),
+            ActionPhase.ON_OFF: np.ones(2, dtype=bool),
+        }
+        self.source_areas = np.array([area.value < 35 for area in SerfArea])
+        self.source_values = np.array([area.value for area in SerfArea])[self.source_areas]
+
+
+# =============================================================================
+# GEBÜNDELTES VEC-ENV
+# =============================================================================
+
+class SiedlerVecEnv(VecEnv):
+    """
+    N Siedler-Episoden im selben Prozess mit Struct-of-Arrays-Wirtschaft.
+
+    Kompatibel mit der Stable-Baselines3 VecEnv-API und mit MaskablePPO
+    (action_masks() liefert die gepaddete (N, A) Maske).
+
+    Args:
+        check: jede gebündelte Beobachtung/Maske mit den Einzel-Envs
+               vergleichen (RuntimeError bei Abweichung, nur zum Testen)
+    """
+
+    def __init__(self, n_envs: int = 8, player_id: int = 1,
+                 env_fns: Optional[Sequence[Callable[[], SiedlerScharfschuetzenEnv]]] = None,
+                 check: bool = False):
+        if env_fns is None:
+            env_fns = [lambda: SiedlerScharfschuetzenEnv(player_id=player_id)] * n_envs
+        self.envs: List[SiedlerScharfschuetzenEnv] = [fn() for fn in env_fns]
+        n_envs = len(self.envs)
+        self.check = check
+
+        first = self.envs[0]
+        self.max_actions = max(space.n for space in first.action_spaces.values())
+        super().__init__(n_envs, first.observation_space, spaces.Discrete(self.max_actions))
+
+        # Gemeinsames Ledger: Env i arbeitet auf Zeile i
+        self.ledger = EconomyLedger(n_envs, RESOURCE_NAMES, BLESS_CATEGORIES)
+        for i, env in enumerate(self.envs):
+            env.attach_ledger(self.ledger, i)
+        self._tables = _EconomyTables(first)
+
+        # Gespiegelte Zähler (Zeile i = Env i)
+        tables = self._tables
+        self._buildings = np.zeros((n_envs, len(tables.building_names)), dtype=np.int64)
+        self._in_construction = np.zeros((n_envs, len(tables.building_names)), dtype=np.int64)
+        self._researched = np.zeros((n_envs, len(first.tech_list)), dtype=bool)
+        self._research_active = np.zeros(n_envs, dtype=bool)
+        self._researching = np.full(n_envs, -1)
+        self._soldiers = np.zeros((n_envs, len(first.soldier_types)), dtype=np.int64)
+        self._resource_workers = np.zeros((n_envs, len(RESOURCE_MAP)), dtype=np.int64)
+        self._free_serfs = np.zeros(n_envs, dtype=np.int64)
+        self._total_serfs = np.zeros(n_envs, dtype=np.int64)
+        self._n_positions = np.zeros(n_envs, dtype=np.int64)
+        self._free_mine_slots = np.zeros((n_envs, len(tables.mine_types)), dtype=np.int64)
+        self._serf_areas = np.zeros((n_envs, len(SerfArea)), dtype=np.int64)
+        self._signatures: List[Optional[tuple]] = [None] * n_envs
+        self._dirty = np.ones(n_envs, dtype=bool)
+
+        # Beobachtungs-Abschnitte: gebündelt, wenn es einen Array-Schreiber gibt
+        batch_writers = {
+            "_write_obs_resources": self._batch_obs_resources,
+            "_write_obs_workers": self._batch_obs_workers,
+            "_write_obs_buildings": self._batch_obs_buildings,
+            "_write_obs_techs": self._batch_obs_techs,
+            "_write_obs_soldiers": self._batch_obs_soldiers,
+            "_write_obs_time": self._batch_obs_time,
+            "_write_obs_production": self._batch_obs_production,
+            "_write_obs_capacity": self._batch_obs_capacity,
+            "_write_obs_actions": self._batch_obs_actions,
+        }
+        self._obs_batched = []
+        self._obs_per_env = []
+        for write, slots, _ in first._obs_sections:
+            if write.__name__ in batch_writers:
+                self._obs_batched.append((batch_writers[write.__name__], slots))
+            else:
+                self._obs_per_env.append((write.__name__, slots))
+
+        # Batch-Puffer
+        self._obs_buf = np.zeros((n_envs,) + self.observation_space.shape, dtype=np.float32)
+        self._mask_buf = np.zeros((n_envs, self.max_actions), dtype=bool)
+        self._rew_buf = np.zeros(n_envs, dtype=np.float32)
+        self._done_buf = np.zeros(n_envs, dtype=bool)
+        self._infos: List[dict] = [{} for _ in range(n_envs)]
+        self._masks_valid = False
+        self._actions = None
+
+    # =========================================================================
+    # GESPIEGELTE ZÄHLER
+    # =========================================================================
+
+    @staticmethod
+    def _tick_signature(env: SiedlerScharfschuetzenEnv) -> tuple:
+        """Ändert sich, wenn ein Tick gespiegelte Zähler verändert haben kann."""
+        return (env.completion_scheduler.revision, env._depletion_epoch,
+                env.free_leibeigene, env.total_leibeigene)
+
+    def _refresh_row(self, i: int):
+        """Liest die gespiegelten Zähler von Env i neu."""
+        env, tables = self.envs[i], self._tables
+        buildings = env.buildings
+        self._buildings[i] = [buildings.get(b, 0) for b in tables.building_names]
+        in_construction = self._in_construction[i]
+        in_construction[:] = 0
+        for entry in env.completion_scheduler.view(SCHEDULE_BUILD):
+            j = tables.building_index.get(entry.payload[0])
+            if j is not None:
+                in_construction[j] += 1
+        self._researched[i] = [t in env.researched_techs for t in env.tech_list]
+        research = env.completion_scheduler.view(SCHEDULE_RESEARCH)
+        self._research_active[i] = bool(research)
+        self._researching[i] = tables.tech_index.get(research[0].payload, -1) if research else -1
+        self._soldiers[i] = [env.soldiers.get(s, 0) for s in env.soldier_types]
+        self._resource_workers[i] = [env.resource_workers.get(r, 0) for r in RESOURCE_MAP]
+        self._free_serfs[i] = env.free_leibeigene
+        self._total_serfs[i] = env.total_leibeigene
+        self._n_positions[i] = len(env.available_positions)
+        self._free_mine_slots[i] = [len(env.mine_positions.get(m, [])) - len(env.built_mines.get(m, []))
+                                    for m in tables.mine_types]
+        # serf_areas wird in SerfArea-Reihenfolge angelegt und nie verkleinert
+        self._serf_areas[i] = [area["count"] for area in env.serf_areas.values()]
+        self._signatures[i] = self._tick_signature(env)
+        self._dirty[i] = False
+
+    def _sync(self):
+        """Aktualisiert alle als geändert markierten Zeilen."""
+        for i in np.flatnonzero(self._dirty):
+            self._refresh_row(i)
+
+    def mark_dirty(self, indices=None):
+        """Nach direkten Zustandsänderungen an self.envs[i] aufrufen (Zähler neu lesen)."""
+        for i in self._get_indices(indices):
+            self._dirty[i] = True
+        self._masks_valid = False
+
+    # =========================================================================
+    # GEBÜNDELTER TICK
+    # =========================================================================
+
+    def _tick_rows(self, rows: List[int]):
+        """
+        Eine Spielsekunde für die Episoden rows (wie _tick_time).
+
+        Uhr, Cooldowns, Glaube und Einkommen als Array-Operationen auf dem
+        Ledger, Simulation und Fertigstellungen pro Episode.
+        """
+        ledger, tables = self.ledger, self._tables
+        idx = np.asarray(rows)
+
+        # Uhr, Segen-/Alarm-Cooldowns, Glaube (_tick_clock)
+        ledger.time[idx] += TIME_STEP
+        for i in rows:
+            self.envs[i].completion_scheduler.advance(1)
+        for column in (ledger.bless_cooldowns, ledger.bless_active, ledger.alarm_cooldown):
+            values = column[idx]
+            column[idx] = np.where(values > 0, np.maximum(0, values - TIME_STEP), values)
+        monasteries = self._buildings[idx] @ tables.monasteries
+        faith = ledger.faith[idx]
+        ledger.faith[idx] = np.where(
+            monasteries > 0,
+            np.minimum(faith + monasteries * PRIESTS_PER_MONASTERY * TIME_STEP, BLESS_REQUIRED_FAITH * 5),
+            faith)
+
+        for i in rows:
+            self.envs[i]._tick_simulation()
+
+        # Steuer- und Gebäude-Einkommen (_tick_income)
+        paying = idx[ledger.time[idx] % INCOME_CYCLE == 0]
+        if len(paying):
+            level = ledger.tax_level[paying]
+            n_workers = np.array([len(self.envs[i].workforce_manager.workers) for i in paying])
+            income = tables.tax_rate[level] * n_workers + self._buildings[paying] @ tables.taler_income
+            ledger.resources[paying, RESOURCE_NAMES.index(RESOURCE_TALER)] += income
+            ledger.motivation[paying] = np.clip(ledger.motivation[paying] + tables.tax_motivation[level],
+                                                0.25, 3.0)
+
+        for i in rows:
+            env = self.envs[i]
+            env._tick_completions()
+            if self._tick_signature(env) != self._signatures[i]:
+                self._dirty[i] = True
+
+    # =========================================================================
+    # VECENV API
+    # =========================================================================
+
+    def reset(self):
+        for i, env in enumerate(self.envs):
+            _, self.reset_infos[i] = env.reset(seed=self._seeds[i], options=self._options[i])
+        self._reset_seeds()
+        self._reset_options()
+        self.mark_dirty()
+        return self._get_observation()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = actions
+
+    def step_wait(self):
+        actions = self._actions
+        self._masks_valid = False
+        finished = []
+        tick_rows = []
+        for i, env in enumerate(self.envs):
+            completed = env._apply_step_action(int(actions[i]))
+            if completed is None:
+                self._rew_buf[i] = 0.0
+                self._done_buf[i] = False
+                self._infos[i] = {"multi_step": True, "phase": env.current_phase.value,
+                                  "TimeLimit.truncated": False}
+                continue
+            action_name, reward = completed
+            env.action_space = env.action_spaces[ActionPhase.MAIN]
+            finished.append((i, action_name, reward, env.current_time))
+            if action_name not in LEDGER_ONLY_ACTIONS:
+                self._dirty[i] = True
+            if env.time_mode == "fixed" and env.perf is None and not (
+                    env.idle_fast_forward and action_name == "wait"):
+                tick_rows.append(i)
+            else:
+                env._advance_step_time(action_name)
+                self._dirty[i] = True
+
+        if tick_rows:
+            self._sync()  # Aktionen dieses Schritts vor dem Tick übernehmen
+            self._tick_rows(tick_rows)
+
+        for i, action_name, reward, start_time in finished:
+            env = self.envs[i]
+            reward, terminated, info = env._step_outcome(action_name, reward, start_time)
+            info["TimeLimit.truncated"] = False
+            if terminated:
+                info["terminal_observation"] = env.get_observation()
+                _, self.reset_infos[i] = env.reset()
+                self._dirty[i] = True
+            self._rew_buf[i] = reward
+            self._done_buf[i] = terminated
+            self._infos[i] = info
+
+        return self._get_observation(), self._rew_buf.copy(), self._done_buf.copy(), list(self._infos)
+
+    def action_masks(self) -> np.ndarray:
+        """Gepaddete Masken aller Episoden als (N, max_actions) Array."""
+        if not self._masks_valid:
+            self._sync()
+            self._compute_masks()
+            self._masks_valid = True
+            if self.check:
+                for i, env in enumerate(self.envs):
+                    expected = padded_action_mask(env, self.max_actions)
+                    if not np.array_equal(expected, self._mask_buf[i]):
+                        diff = np.flatnonzero(expected != self._mask_buf[i]).tolist()
+                        raise RuntimeError(f"Gebündelte Maske Env {i} ({env.current_phase.value}) "
+                                           f"weicht ab an Indizes {diff}")
+        return self._mask_buf.copy()
+
+    def close(self) -> None:
+        for env in self.envs:
+            env.close()
+
+    def get_images(self):
+        return [None for _ in self.envs]
+
+    def _get_target_envs(self, indices) -> List[SiedlerScharfschuetzenEnv]:
+        return [self.envs[i] for i in self._get_indices(indices)]
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return [getattr(env, attr_name) for env in self._get_target_envs(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        for env in self._get_target_envs(indices):
+            setattr(env, attr_name, value)
+        self.mark_dirty(indices)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        if method_name == "action_masks":
+            masks = self.action_masks()
+            return [masks[i] for i in self._get_indices(indices)]
+        results = [getattr(env, method_name)(*method_args, **method_kwargs)
+                   for env in self._get_target_envs(indices)]
+        self.mark_dirty(indices)
+        return results
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [isinstance(env, wrapper_class) for env in self._get_target_envs(indices)]
+
+    # =========================================================================
+    # GEBÜNDELTE BEOBACHTUNG
+    # =========================================================================
+
+    def _get_observation(self) -> np.ndarray:
+        """Aktuelle Beobachtungen aller Episoden als (N, obs_dim) Array."""
+        self._sync()
+        buffer = self._obs_buf
+        for write, slots in self._obs_batched:
+            write(buffer[:, slots])
+        for name, slots in self._obs_per_env:
+            for i, env in enumerate(self.envs):
+                getattr(env, name)(buffer[i, slots])
+        if self.check:
+            for i, env in enumerate(self.envs):
+                expected = env.get_observation(copy=False)
+                if not np.array_equal(expected, buffer[i]):
+                    diff = np.flatnonzero(expected != buffer[i]).tolist()
+                    raise RuntimeError(f"Gebündelte Beobachtung Env {i} weicht ab an Slots {diff}")
+        return buffer.copy()
+
+    def _batch_obs_resources(self, out):
+        out[:] = self.ledger.resources / 1000.0
+
+    def _batch_obs_workers(self, out):
+        n_map = len(RESOURCE_MAP)
+        out[:, :n_map] = self._resource_workers / 50.0
+        out[:, n_map] = self._free_serfs / 100.0
+        out[:, n_map + 1] = self._total_serfs / 100.0
+
+    def _batch_obs_buildings(self, out):
+        tables = self._tables
+        n_buildable = len(tables.buildable)
+        out[:, 0:2 * n_buildable:2] = self._buildings[:, tables.buildable] / 10.0
+        out[:, 1:2 * n_buildable:2] = self._in_construction[:, tables.buildable] / 5.0
+        out[:, 2 * n_buildable:] = self._buildings[:, tables.upgradeable] / 5.0
+
+    def _batch_obs_techs(self, out):
+        out[:, 0::2] = self._researched
+        out[:, 1::2] = np.arange(self._researched.shape[1]) == self._researching[:, None]
+
+    def _batch_obs_soldiers(self, out):
+        out[:] = self._soldiers / 50.0
+
+    def _batch_obs_time(self, out):
+        max_time = np.array([env.max_time for env in self.envs])
+        current_time = self.ledger.time
+        out[:, 0] = current_time / max_time
+        out[:, 1] = (max_time - current_time) / max_time
+
+    def _batch_obs_production(self, out):
+        """Wie _get_production_rate: Sammler zuerst, dann Gebäude in db-Reihenfolge aufaddieren."""
+        tables = self._tables
+        rate = self._resource_workers * tables.gather_rates
+        counts = self._buildings[:, tables.producers]
+        # Gebäude ohne Exemplar in allen Episoden tragen exakt 0 bei
+        for k in np.flatnonzero(counts.any(axis=0)):
+            rate += tables.producer_output[k] * counts[:, k, None]
+        out[:, :len(RESOURCE_MAP)] = rate / 10.0
+        out[:, len(RESOURCE_MAP)] = (self._buildings @ tables.taler_income) / 100.0
+
+    def _batch_obs_capacity(self, out):
+        farm = self._buildings @ self._tables.farm_capacity
+        residence = self._buildings @ self._tables.residence_capacity
+        n_workers = np.array([len(env.workforce_manager.workers) for env in self.envs])
+        out[:, 0] = farm / 50.0
+        out[:, 1] = n_workers / np.maximum(1, farm)
+        out[:, 2] = residence / 50.0
+        out[:, 3] = n_workers / np.maximum(1, residence)
+
+    def _batch_obs_actions(self, out):
+        ledger = self.ledger
+        n_bless = len(BLESS_CATEGORIES)
+        out[:, 0] = ledger.tax_level / 4.0
+        out[:, 1] = ledger.alarm_active
+        out[:, 2] = ledger.alarm_cooldown / ALARM_RECHARGE_TIME
+        out[:, 3] = ledger.faith / BLESS_REQUIRED_FAITH
+        out[:, 4:4 + n_bless] = ledger.bless_cooldowns / BLESS_COOLDOWN
+        out[:, 4 + n_bless:] = ledger.bless_active > 0
+
+    # =========================================================================
+    # GEBÜNDELTE ACTION-MASKEN
+    # =========================================================================
+
+    def _compute_masks(self):
+        """Alle Phasen-Masken als Array-Operationen, dann pro Episode die Maske ihrer Phase."""
+        tables = self._tables
+        resources = self.ledger.resources
+        buildings = self._buildings
+        researched = self._researched
+        has_building = buildings >= 1
+
+        build = (_affordable(resources, tables.build_cost, tables.build_has_cost) & tables.build_possible
+                 & (researched[:, tables.build_tech] | ~tables.build_needs_tech)
+                 & np.where(tables.build_is_mine, self._free_mine_slots[:, tables.build_mine] >= 1,
+                            self._n_positions[:, None] >= 1))
+        upgrade = has_building[:, tables.upgradeable] & _affordable(resources, tables.upgrade_cost,
+                                                                    tables.upgrade_has_cost)
+        research = (~researched & ~self._research_active[:, None] & tables.tech_possible
+                    & _affordable(resources, tables.tech_cost, tables.tech_has_cost)
+                    & _requirements_met(researched, tables.tech_requires)
+                    & _requirements_met(has_building, tables.tech_building)
+                    & (buildings @ tables.universities >= 1)[:, None])
+        recruit = (_affordable(resources, tables.recruit_cost, tables.recruit_has_cost) & tables.recruit_possible
+                   & _requirements_met(has_building, tables.recruit_building)
+                   & _requirements_met(researched, tables.recruit_tech))
+        demolish = has_building[:, tables.buildable] & tables.demolishable
+        can_bless = (buildings @ tables.monasteries >= 1) & (self.ledger.faith >= BLESS_REQUIRED_FAITH)
+        bless = can_bless[:, None] & ~(self.ledger.bless_cooldowns > 0)
+        buy_serf = ((resources[:, RESOURCE_NAMES.index(RESOURCE_TALER)] >= SERF_BUY_COST)
+                    & (self._total_serfs + 1 <= buildings @ tables.village_capacity)
+                    & (self._total_serfs + 1 <= MAX_POSSIBLE_LEIBEIGENE))
+        has_serfs = self._serf_areas > 0
+
+        main = np.ones((self.num_envs, 12), dtype=bool)
+        main[:, 1] = build.any(axis=1)
+        main[:, 2] = upgrade.any(axis=1)
+        main[:, 3] = research.any(axis=1)
+        main[:, 4] = recruit.any(axis=1)
+        main[:, 5] = buy_serf
+        main[:, 6] = self._free_serfs >= 1
+        main[:, 7] = has_serfs.any(axis=1)
+        main[:, 8] = demolish.any(axis=1)
+        main[:, 9] = can_bless
+
+        source = np.zeros((self.num_envs, 35), dtype=bool)
+        source[:, tables.source_values] = has_serfs[:, tables.source_areas]
+        for choices, fallback in ((research, 0), (recruit, 0), (bless, 0), (source, SerfArea.FREE.value)):
+            choices[~choices.any(axis=1), fallback] = True
+
+        buf = self._mask_buf
+        for i, env in enumerate(self.envs):
+            phase = env.current_phase
+            if phase == ActionPhase.MAIN:
+                mask = main[i]
+            elif phase == ActionPhase.BUILDING:
+                if env.current_flow == "build":
+                    mask = build[i]
+                elif env.current_flow == "upgrade":
+                    mask = np.zeros(len(tables.buildable), dtype=bool)
+                    n = min(len(mask), len(tables.upgradeable))
+                    mask[:n] = upgrade[i, :n]
+                elif env.current_flow == "demolish":
+                    mask = demolish[i]
+                else:
+                    mask = np.ones(env.action_spaces[ActionPhase.BUILDING].n, dtype=bool)
+            elif phase == ActionPhase.TECH:
+                mask = research[i]
+            elif phase == ActionPhase.SOLDIER:
+                mask = recruit[i]
+            elif phase == ActionPhase.CATEGORY:
+                mask = bless[i]
+            elif phase == ActionPhase.SOURCE:
+                mask = source[i]
+            elif phase in tables.static_masks:
+                mask = tables.static_masks[phase]
+            else:
+                mask = env.action_masks()  # Positionen: Platzprüfung pro Gebäude im Env
+            buf[i, :len(mask)] = mask
+            buf[i, len(mask):] = False
+
+
+# =============================================================================
+# SUBPROZESS-VARIANTE
+# =============================================================================
+
+def padded_action_mask(env: SiedlerScharfschuetzenEnv, max_actions: int) -> np.ndarray:
+    """
+    Maske der aktuellen Phase, mit False auf max_actions aufgefüllt.
+
+    Passt zu Modellen die mit SiedlerVecEnv/SiedlerSubprocVecEnv trainiert
+    wurden (Action-Space Discrete(max_actions)).
+    """
+    row = np.zeros(max_actions, dtype=bool)
+    mask = env.action_masks()
+    row[:len(mask)] = mask
+    return row
+
+
+def _subproc_worker(remote, parent_remote, env_fn_wrapper: CloudpickleWrapper):
+    """
+    Worker-Schleife: ein Env pro Prozess.
+
+    step setzt eine beendete Episode sofort zurück (Auto-Reset). Eine
+    Episode endet nur nach einer kompletten Aktion, das neue Env startet
+    damit immer in Phase MAIN. Jede Antwort auf step/reset enthält die
+    gepaddete Maske für den nächsten Schritt.
+    """
+    parent_remote.close()
+    env = env_fn_wrapper.var()
+    max_actions = max(space.n for space in env.action_spaces.values())
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                obs, reward, terminated, truncated, info = env.step(data)
+                done = terminated or truncated
+                info["TimeLimit.truncated"] = truncated and not terminated
+                reset_info = None
+                if done:
+                    info["terminal_observation"] = obs
+                    obs, reset_info = env.reset()
+                remote.send((obs, reward, done, info, reset_info, padded_action_mask(env, max_actions)))
+            elif cmd == "reset":
+                seed, options = data
+                obs, reset_info = env.reset(seed=seed, options=options)
+                remote.send((obs, reset_info, padded_action_mask(env, max_actions)))
+            elif cmd == "get_spaces":
+                remote.send((env.observation_space, max_actions))
+            elif cmd == "env_method":
+                method_name, args, kwargs = data
+                remote.send(getattr(env, method_name)(*args, **kwargs))
+            elif cmd == "get_attr":
+                remote.send(getattr(env, data))
+            elif cmd == "has_attr":
+                remote.send(hasattr(env, data))
+            elif cmd == "set_attr":
+                remote.send(setattr(env, data[0], data[1]))
+            elif cmd == "is_wrapped":
+                remote.send(isinstance(env, data))
+            elif cmd == "close":
+                env.close()
+                remote.close()
+                break
+            else:
+                raise NotImplementedError(f"Unbekannter Befehl '{cmd}'")
+    except (EOFError, KeyboardInterrupt):
+        pass
+
+
+class SiedlerSubprocVecEnv(VecEnv):
+    """
+    N Siedler-Episoden in N Subprozessen.
+
+    Gleiche Action-Space und Masken wie SiedlerVecEnv (Discrete(max
+    Phasengröße), gepaddete Masken), dadurch ist das Verhalten pro Episode
+    identisch mit dem Einzel-Env. Die Masken kommen mit den step/reset
+    Antworten und liegen in einem (N, A) Puffer.
+    """
+
+    def __init__(self, n_envs: int = 8, player_id: int = 1,
+                 env_fns: Optional[Sequence[Callable[[], SiedlerScharfschuetzenEnv]]] = None,
+                 start_method: Optional[str] = None):
+        if env_fns is None:
+            env_fns = [partial(SiedlerScharfschuetzenEnv, player_id=player_id)] * n_envs
+        n_envs = len(env_fns)
+        if start_method is None:
+            # forkserver ist schneller als spawn und sicherer als fork
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+
+        self.waiting = False
+        self.closed = False
+        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in range(n_envs)])
+        self.processes = []
+        for work_remote, remote, env_fn in zip(self.work_remotes, self.remotes, env_fns):
+            process = ctx.Process(target=_subproc_worker, args=(work_remote, remote, CloudpickleWrapper(env_fn)),
+                                  daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+        self.remotes[0].send(("get_spaces", None))
+        observation_space, self.max_actions = self.remotes[0].recv()
+        super().__init__(n_envs, observation_space, spaces.Discrete(self.max_actions))
+
+        self._obs_buf = np.zeros((n_envs,) + self.observation_space.shape, dtype=np.float32)
+        self._mask_buf = np.zeros((n_envs, self.max_actions), dtype=bool)
+        self._rew_buf = np.zeros(n_envs, dtype=np.float32)
+        self._done_buf = np.zeros(n_envs, dtype=bool)
+
+    def reset(self):
+        for i, remote in enumerate(self.remotes):
+            remote.send(("reset", (self._seeds[i], self._options[i])))
+        for i, remote in enumerate(self.remotes):
+            self._obs_buf[i], self.reset_infos[i], self._mask_buf[i] = remote.recv()
+        self._reset_seeds()
+        self._reset_options()
+        return self._obs_buf.copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        for remote, action in zip(self.remotes, actions):
+            remote.send(("step", int(action)))
+        self.waiting = True
+
+    def step_wait(self):
+        infos = []
+        for i, remote in enumerate(self.remotes):
+            obs, reward, done, info, reset_info, mask = remote.recv()
+            self._obs_buf[i] = obs
+            self._rew_buf[i] = reward
+            self._done_buf[i] = done
+            self._mask_buf[i] = mask
+            if reset_info is not None:
+                self.reset_infos[i] = reset_info
+            infos.append(info)
+        self.waiting = False
+        return self._obs_buf.copy(), self._rew_buf.copy(), self._done_buf.copy(), infos
+
+    def action_masks(self) -> np.ndarray:
+        """Gepaddete Masken aller Episoden als (N, max_actions) Array."""
+        return self._mask_buf.copy()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+    def get_images(self):
+        return [None for _ in self.remotes]
+
+    def _get_target_remotes(self, indices) -> list:
+        return [self.remotes[i] for i in self._get_indices(indices)]
+
+    def _request(self, cmd: str, data, indices=None) -> List[Any]:
+        remotes = self._get_target_remotes(indices)
+        for remote in remotes:
+            remote.send((cmd, data))
+        return [remote.recv() for remote in remotes]
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return self._request("get_attr", attr_name, indices)
+
+    def has_attr(self, attr_name: str) -> bool:
+        return all(self._request("has_attr", attr_name))
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        self._request("set_attr", (attr_name, value), indices)
+        self._refresh_masks(indices)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        if method_name == "action_masks":
+            return [self._mask_buf[i].copy() for i in self._get_indices(indices)]
+        results = self._request("env_method", (method_name, method_args, method_kwargs), indices)
+        self._refresh_masks(indices)
+        return results
+
+    def _refresh_masks(self, indices=None):
+        """Holt die Masken nach direkten Zustandsänderungen neu."""
+        for i, remote in zip(self._get_indices(indices), self._get_target_remotes(indices)):
+            remote.send(("env_method", ("action_masks", (), {})))
+            mask = remote.recv()
+            self._mask_buf[i] = False
+            self._mask_buf[i, :len(mask)] = mask
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return self._request("is_wrapped", wrapper_class, indices)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def _random_masked_actions(rng: np.random.Generator, masks: np.ndarray) -> np.ndarray:
+    """Wählt pro Zeile eine zufällige erlaubte Aktion."""
+    actions = np.zeros(len(masks), dtype=np.int64)
+    for i, row in enumerate(masks):
+        valid = np.flatnonzero(row)
+        actions[i] = rng.choice(valid) if len(valid) else 0
+    return actions
+
+
+def measure_steps_per_second(vec: VecEnv, n_steps: int, seed: int = 0) -> float:
+    """Steps/Sekunde (über alle Episoden) mit zufälligen, gültigen Aktionen."""
+    vec.reset()
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    for _ in range(n_steps):
+        actions = _random_masked_actions(rng, vec.action_masks())
+        vec.step(actions)
+    return n_steps * vec.num_envs / (time.perf_counter() - start)
+
+
+def benchmark(n_envs: int = 8, n_steps: int = 2000, seed: int = 0, subproc: bool = False) -> dict:
+    """
+    Vergleicht Steps/Sekunde von SiedlerVecEnv mit DummyVecEnv(ActionMasker).
+
+    Alle werden mit denselben zufälligen, gültigen Aktionen getrieben.
+    subproc=True misst zusätzlich SiedlerSubprocVecEnv.
+    """
+    from sb3_contrib.common.wrappers import ActionMasker
+    from stable_baselines3.common.vec_env import DummyVecEnv
+
+    def make_masked():
+        env = SiedlerScharfschuetzenEnv(player_id=1)
+        return ActionMasker(env, lambda e: e.unwrapped.action_masks())
+
+    results = {}
+
+    dummy = DummyVecEnv([make_masked] * n_envs)
+    dummy.reset()
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    for _ in range(n_steps):
+        masks = dummy.env_method("action_masks")
+        actions = _random_masked_actions(rng, masks)
+        dummy.step(actions)
+    results["dummy_vec_env"] = n_steps * n_envs / (time.perf_counter() - start)
+    dummy.close()
+
+    vec = SiedlerVecEnv(n_envs=n_envs)
+    results["siedler_vec_env"] = measure_steps_per_second(vec, n_steps, seed)
+    vec.close()
+
+    if subproc:
+        vec = SiedlerSubprocVecEnv(n_envs=n_envs)
+        results["siedler_subproc_vec_env"] = measure_steps_per_second(vec, n_steps, seed)
+        vec.close()
+
+    results["speedup"] = results["siedler_vec_env"] / results["dummy_vec_env"]
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SiedlerVecEnv vs DummyVecEnv Benchmark")
+    parser.add_argument("--n-envs", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--subproc", action="store_true", help="SiedlerSubprocVecEnv mitmessen")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"BENCHMARK: {args.n_envs} Envs x {args.steps} Steps")
+    print("=" * 60)
+    res = benchmark(args.n_envs, args.steps, args.seed, args.subproc)
+    print(f"  DummyVecEnv:    {res['dummy_vec_env']:.0f} Steps/s")
+    print(f"  SiedlerVecEnv:  {res['siedler_vec_env']:.0f} Steps/s")
+    print(f"  Speedup:        {res['speedup']:.2f}x")
+    if args.subproc:
+        print(f"  SubprocVecEnv:  {res['siedler_subproc_vec_env']:.0f} Steps/s")
@@ -12,6 +12,7 @@ Kritische Mechaniken:
 
 import json
 import math
+import numpy as np
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Dict, Optional, Tuple
@@ -188,6 +189,23 @@ WORKER_CAMPER_RANGE: Dict[str, int] = {
 CAMPER_RANGE = 5000  # Max-Distanz für Pausen-Gebäude
 WORK_TIME_START = 100  # Startwert WorkTime
 EXHAUSTED_THRESHOLD = 0  # Ab wann erschöpft
+# Gleitkomma-Ketten (WorkTime, Laufwege) weichen Sekunde für Sekunde in den
+# letzten Bits von der geschlossenen Form ab: liegt ein geschätzter Übergang
+# so knapp über einer ganzen Sekunde, wird er eine Sekunde früher angesetzt
+EVENT_MARGIN = 1e-6
+
+
+def walk_steps(dx: np.ndarray, dy: np.ndarray, speed: np.ndarray) -> np.ndarray:
+    """Sekunden bis zur Ankunft (Restdistanz / speed; inf bei speed 0 und Restweg)."""
+    distance = np.sqrt(dx * dx + dy * dy)
+    return np.divide(distance, speed, out=np.where(distance > 0, np.inf, 0.0), where=speed > 0)
+
+
+def first_tick_reaching(steps: np.ndarray) -> float:
+    """Erster Tick j >= 1 mit j >= steps für alle Einträge (inf wenn leer), siehe EVENT_MARGIN."""
+    if len(steps) == 0:
+        return np.inf
+    return max(1.0, float(np.ceil(steps.min() - EVENT_MARGIN)))
 
 
 @dataclass
@@ -205,6 +223,12 @@ class Farm:
     def has_space(self) -> bool:
         return self.current_eaters < self.eat_capacity
 
+    def free_slots(self) -> int:
+        return self.eat_capacity - self.current_eaters
+
+    def add_occupants(self, delta: int):
+        self.current_eaters += delta
+
 
 @dataclass
 class Residence:
@@ -221,6 +245,12 @@ class Residence:
     def has_space(self) -> bool:
         return self.current_residents < self.live_capacity
 
+    def free_slots(self) -> int:
+        return self.live_capacity - self.current_residents
+
+    def add_occupants(self, delta: int):
+        self.current_residents += delta
+
 
 @dataclass
 class Camp:
@@ -228,222 +258,758 @@ class Camp:
     position: Position
 
 
-@dataclass
-class Worker:
+class BreakSiteIndex:
     """
-    Simuliert einen einzelnen Arbeiter mit WorkTime und Pausen-Laufwegen.
+    Bucket-Grid über Farms oder Wohnhäuser mit Frei-Platz-Zählern.
 
-    WICHTIG: Serfs haben KEIN WorkTime-System und werden separat behandelt!
+    Jedes Gebäude bekommt eine fortlaufende Nummer (Einfüge-Reihenfolge);
+    bei gleicher Distanz gewinnt die kleinere Nummer, genau wie bei der
+    bisherigen linearen Suche über die Liste. Pro Bucket und insgesamt
+    werden die freien Plätze mitgeführt, volle Buckets werden übersprungen.
+
+    Belegung nur über occupy()/release() ändern; nach direkten Änderungen
+    an current_eaters/current_residents oder level update() aufrufen.
     """
-    worker_type: str
-    position: Position
-    workplace_position: Position
-    work_time: float = WORK_TIME_START
-    state: WorkerState = WorkerState.IDLE
-    state_timer: float = 0.0  # in Sekunden
-    target_position: Optional[Position] = None
-    assigned_farm: Optional[Farm] = None
-    assigned_residence: Optional[Residence] = None
 
-    def __post_init__(self):
-        """Initialisiert Worker-spezifische Parameter."""
-        self.params = WORKER_PARAMS.get(self.worker_type, WorkTimeParams())
-        self.speed = WORKER_SPEEDS.get(self.worker_type, 320)
-        self.has_worktime_system = self.worker_type != "serf"
+    def __init__(self, bucket_size: float = CAMPER_RANGE / 2):
+        self.bucket_size = bucket_size
+        self.buckets: Dict[Tuple[int, int], List[int]] = {}  # Bucket -> Nummern (aufsteigend)
+        self.bucket_free: Dict[Tuple[int, int], int] = {}
+        self.sites: Dict[int, object] = {}  # Nummer -> Gebäude
+        self.free: Dict[int, int] = {}      # Nummer -> freie Plätze (Stand letztes update())
+        self.total_free = 0
+        self._numbers: Dict[int, int] = {}  # id(Gebäude) -> Nummer
+        self._next_number = 0
+
+    @classmethod
+    def from_buildings(cls, buildings: list) -> 'BreakSiteIndex':
+        index = cls()
+        for building in buildings:
+            index.add(building)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.sites)
+
+    def __contains__(self, building) -> bool:
+        return id(building) in self._numbers
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_numbers"]
+        return state
+
+    def __setstate__(self, state: dict):
+        """Kopie/Pickle: die Gebäude sind neue Objekte, id()-Schlüssel neu aufbauen."""
+        self.__dict__.update(state)
+        self._numbers = {id(building): number for number, building in self.sites.items()}
+
+    def _bucket_key(self, x: float, y: float) -> Tuple[int, int]:
+        return (int(x // self.bucket_size), int(y // self.bucket_size))
+
+    def add(self, building):
+        """Nimmt ein Gebäude auf (hinter allen vorhandenen)."""
+        number = self._next_number
+        self._next_number += 1
+        self._numbers[id(building)] = number
+        self.sites[number] = building
+        self.free[number] = 0
+        key = self._bucket_key(building.position.x, building.position.y)
+        self.buckets.setdefault(key, []).append(number)
+        self.bucket_free.setdefault(key, 0)
+        self.update(building)
+
+    def remove(self, building):
+        """Entfernt ein Gebäude (ignoriert unbekannte)."""
+        number = self._numbers.pop(id(building), None)
+        if number is None:
+            return
+        del self.sites[number]
+        key = self._bucket_key(building.position.x, building.position.y)
+        self.bucket_free[key] -= self.free[number]
+        self.total_free -= self.free.pop(number)
+        self.buckets[key].remove(number)
+        if not self.buckets[key]:
+            del self.buckets[key]
+            del self.bucket_free[key]
+
+    def update(self, building):
+        """Gleicht die Frei-Zähler mit Kapazität/Belegung des Gebäudes ab."""
+        number = self._numbers.get(id(building))
+        if number is None:
+            return
+        free = max(building.free_slots(), 0)
+        delta = free - self.free[number]
+        self.free[number] = free
+        self.bucket_free[self._bucket_key(building.position.x, building.position.y)] += delta
+        self.total_free += delta
+
+    def occupy(self, building):
+        building.add_occupants(1)
+        self.update(building)
+
+    def release(self, building):
+        building.add_occupants(-1)
+        self.update(building)
+
+    def candidates(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                   include_full: bool = False) -> list:
+        """Gebäude in Buckets die das Rechteck schneiden, nach Nummer sortiert."""
+        min_bx, min_by = self._bucket_key(min_x, min_y)
+        max_bx, max_by = self._bucket_key(max_x, max_y)
+        numbers = []
+        for (bx, by), bucket in self.buckets.items():
+            if min_bx <= bx <= max_bx and min_by <= by <= max_by:
+                if include_full or self.bucket_free[(bx, by)] > 0:
+                    numbers.extend(bucket)
+        numbers.sort()
+        return [self.sites[number] for number in numbers]
+
+    def nearest_with_space(self, x: float, y: float, max_dist: float):
+        """Nächstes Gebäude mit freiem Platz und Distanz < max_dist (sonst None)."""
+        if self.total_free <= 0:
+            return None
+        nearest = None
+        min_dist = max_dist
+        for building in self.candidates(x - max_dist, y - max_dist, x + max_dist, y + max_dist):
+            if building.has_space():
+                dx = x - building.position.x
+                dy = y - building.position.y
+                dist = math.sqrt(dx * dx + dy * dy)
+                if dist < min_dist:
+                    nearest = building
+                    min_dist = dist
+        return nearest
+
+
+# Codes der Zustände in den WorkerPool-Arrays
+WORKER_STATES = list(WorkerState)
+_WORKER_STATE_CODE = {state: code for code, state in enumerate(WORKER_STATES)}
+_IDLE = _WORKER_STATE_CODE[WorkerState.IDLE]
+_WORKING = _WORKER_STATE_CODE[WorkerState.WORKING]
+_EATING = _WORKER_STATE_CODE[WorkerState.EATING]
+_RESTING = _WORKER_STATE_CODE[WorkerState.RESTING]
+_CAMPING = _WORKER_STATE_CODE[WorkerState.CAMPING]
+_WALK_FARM = _WORKER_STATE_CODE[WorkerState.WALKING_TO_FARM]
+_WALK_RESIDENCE = _WORKER_STATE_CODE[WorkerState.WALKING_TO_RESIDENCE]
+_WALK_CAMP = _WORKER_STATE_CODE[WorkerState.WALKING_TO_CAMP]
+_WALK_WORK = _WORKER_STATE_CODE[WorkerState.WALKING_TO_WORK]
+# Zustand -> läuft ein Timer? / läuft der Worker? (Lookup statt np.isin)
+_TIMED_STATE = np.zeros(len(WORKER_STATES), dtype=bool)
+_TIMED_STATE[[_WORKING, _EATING, _RESTING, _CAMPING]] = True
+_WALKING_STATE = np.zeros(len(WORKER_STATES), dtype=bool)
+_WALKING_STATE[[_WALK_FARM, _WALK_RESIDENCE, _WALK_CAMP, _WALK_WORK]] = True
+# Lauf-Zustand -> Zustand bei Ankunft
+_ARRIVAL_STATE = np.arange(len(WORKER_STATES), dtype=np.int8)
+_ARRIVAL_STATE[[_WALK_FARM, _WALK_RESIDENCE, _WALK_CAMP, _WALK_WORK]] = [_EATING, _RESTING, _CAMPING, _WORKING]
+
+# Spalten der Parameter-Tabelle (eine Zeile pro Worker-Typ)
+_TYPE_PARAM_FIELDS = ("work_wait_until", "eat_wait", "rest_wait", "work_time_change_work",
+                      "work_time_change_farm", "work_time_change_residence", "work_time_change_camp",
+                      "work_time_max_farm", "work_time_max_residence", "exhausted_malus")
+(_P_WAIT, _P_EAT, _P_REST, _P_CHANGE_WORK, _P_CHANGE_FARM, _P_CHANGE_RESIDENCE, _P_CHANGE_CAMP,
+ _P_MAX_FARM, _P_MAX_RESIDENCE, _P_MALUS) = range(len(_TYPE_PARAM_FIELDS))
+_P_SPEED, _P_RANGE, _P_HAS_WORKTIME = range(len(_TYPE_PARAM_FIELDS), len(_TYPE_PARAM_FIELDS) + 3)
+
+# Effizienz-Klassen: keine Produktion, volle Effizienz, erschöpft (exhausted_malus)
+_EFF_NONE, _EFF_FULL, _EFF_EXHAUSTED = 0, 1, 2
+
+
+class WorkerPool:
+    """
+    Alle Worker als parallele NumPy-Arrays (Struct-of-Arrays).
 
-    def tick(self, dt: float, farms: List[Farm], residences: List[Residence], camps: List[Camp],
-             motivation_mod: float = 1.0):
+    tick() rechnet Timer, WorkTime, Regeneration und Laufen mit maskierten
+    Vektor-Operationen. Nur Übergänge die Farm-/Wohnhaus-Belegung ändern
+    (Hunger, fertig gegessen, fertig geruht) laufen in Worker-Reihenfolge
+    einzeln, damit die Belegung exakt wie vorher vergeben wird.
+
+    Zähler pro Zustand, pro Typ und Effizienz-Klasse sowie die Anzahl
+    Erschöpfter werden bei jedem Übergang mitgeführt; die Statistiken des
+    WorkforceManagers sind dadurch O(1). Nach außen verhält sich der Pool
+    wie die frühere List[Worker] (Iteration, len(), Index, append()).
+    """
+
+    _ARRAYS = ("type_code", "state", "work_time", "state_timer", "pos_x", "pos_y",
+               "target_x", "target_y", "has_target", "work_x", "work_y", "speed",
+               "eff_class", "exhausted")
+    _LISTS = ("worker_type", "assigned_farm", "assigned_residence")
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(capacity, 1)
+        self.n = 0
+        self.type_code = np.zeros(capacity, dtype=np.int16)
+        self.state = np.full(capacity, _IDLE, dtype=np.int8)
+        self.work_time = np.zeros(capacity)
+        self.state_timer = np.zeros(capacity)  # ms
+        self.pos_x = np.zeros(capacity)
+        self.pos_y = np.zeros(capacity)
+        self.target_x = np.zeros(capacity)
+        self.target_y = np.zeros(capacity)
+        self.has_target = np.zeros(capacity, dtype=bool)
+        self.work_x = np.zeros(capacity)
+        self.work_y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.eff_class = np.full(capacity, _EFF_NONE, dtype=np.int8)
+        self.exhausted = np.zeros(capacity, dtype=bool)
+        self.worker_type: List[str] = []
+        self.assigned_farm: List[Optional[Farm]] = []
+        self.assigned_residence: List[Optional[Residence]] = []
+        self._views: List['Worker'] = []
+
+        # Parameter pro Worker-Typ (Zeile = type_code)
+        self.types: List[str] = []
+        self.type_params = np.zeros((0, len(_TYPE_PARAM_FIELDS) + 3))
+
+        # Inkrementelle Zähler
+        self.state_counts = np.zeros(len(WORKER_STATES), dtype=np.int64)
+        self.eff_counts = np.zeros((0, 3), dtype=np.int64)  # pro Typ und Effizienz-Klasse
+        self.exhausted_count = 0
+        self.worktime_workers = 0  # Worker mit WorkTime-System (= ohne Serfs)
+        self._worktime_sum: Optional[float] = None  # lazy, bis zur nächsten Änderung
+        # Ereignis-Plan für den "event"-Modus (siehe quiet_ticks), None = neu berechnen
+        self._plan: Optional[Tuple] = None
+
+    # ==================== LISTEN-SCHNITTSTELLE ====================
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self):
+        return iter(self._views)
+
+    def __getitem__(self, index: int) -> 'Worker':
+        return self._views[index]
+
+    def add(self, worker_type: str, position: Position, workplace_position: Position) -> 'Worker':
+        """Fügt einen Worker hinzu."""
+        worker = Worker.__new__(Worker)
+        worker._pool = self
+        worker._slot = self._add(worker_type, position, workplace_position)
+        self._views.append(worker)
+        return worker
+
+    def append(self, worker: 'Worker'):
+        """Übernimmt einen (eigenständig erzeugten) Worker in den Pool."""
+        slot = self._add(**worker._fields())
+        worker._pool = self
+        worker._slot = slot
+        self._views.append(worker)
+
+    def _type_code(self, worker_type: str) -> int:
+        if worker_type in self.types:
+            return self.types.index(worker_type)
+        params = WORKER_PARAMS.get(worker_type, WorkTimeParams())
+        row = [float(getattr(params, name)) for name in _TYPE_PARAM_FIELDS]
+        row += [WORKER_SPEEDS.get(worker_type, 320),
+                WORKER_CAMPER_RANGE.get(worker_type, CAMPER_RANGE),
+                worker_type != "serf"]
+        self.types.append(worker_type)
+        self.type_params = np.vstack([self.type_params, row])
+        self.eff_counts = np.vstack([self.eff_counts, np.zeros((1, 3), dtype=np.int64)])
+        return len(self.types) - 1
+
+    def _add(self, worker_type: str, position: Position, workplace_position: Position,
+             work_time: float = WORK_TIME_START, state: WorkerState = WorkerState.IDLE,
+             state_timer: float = 0.0, target_position: Optional[Position] = None,
+             assigned_farm: Optional[Farm] = None, assigned_residence: Optional[Residence] = None) -> int:
+        if self.n == len(self.state):
+            for name in self._ARRAYS:
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate([array, np.zeros_like(array)]))
+        slot = self.n
+        self.n += 1
+        code = self._type_code(worker_type)
+        self.type_code[slot] = code
+        self.state[slot] = _WORKER_STATE_CODE[state]
+        self.state_counts[self.state[slot]] += 1
+        self.work_time[slot] = work_time
+        self.state_timer[slot] = state_timer
+        self.pos_x[slot] = position.x
+        self.pos_y[slot] = position.y
+        self.has_target[slot] = target_position is not None
+        if target_position is not None:
+            self.target_x[slot] = target_position.x
+            self.target_y[slot] = target_position.y
+        self.work_x[slot] = workplace_position.x
+        self.work_y[slot] = workplace_position.y
+        self.speed[slot] = self.type_params[code, _P_SPEED]
+        self.eff_class[slot] = _EFF_NONE
+        self.eff_counts[code, _EFF_NONE] += 1
+        self.exhausted[slot] = False
+        self.worktime_workers += worker_type != "serf"
+        self.worker_type.append(worker_type)
+        self.assigned_farm.append(assigned_farm)
+        self.assigned_residence.append(assigned_residence)
+        self._refresh(np.array([slot]))
+        self._plan = None
+        return slot
+
+    # ==================== ZÄHLER ====================
+
+    def _set_states(self, idx: np.ndarray, codes):
+        """Zustandswechsel für idx (codes: Skalar oder Array) inkl. Zustandszähler."""
+        if len(idx) == 0:
+            return
+        self._plan = None
+        minlength = len(WORKER_STATES)
+        self.state_counts -= np.bincount(self.state[idx], minlength=minlength)
+        self.state[idx] = codes
+        self.state_counts += np.bincount(self.state[idx], minlength=minlength)
+
+    def _set_state(self, slot: int, code: int):
+        self._plan = None
+        self.state_counts[self.state[slot]] -= 1
+        self.state[slot] = code
+        self.state_counts[code] += 1
+
+    def _refresh(self, idx: np.ndarray):
+        """Aktualisiert Effizienz-Klasse und Erschöpfung von idx (nach State/WorkTime-Änderung)."""
+        self._worktime_sum = None
+        if len(idx) == 0:
+            return
+        types = self.type_code[idx]
+        exhausted = self.work_time[idx] <= EXHAUSTED_THRESHOLD
+        eff = np.where(self.state[idx] != _WORKING, _EFF_NONE,
+                       np.where(exhausted, _EFF_EXHAUSTED, _EFF_FULL))
+        eff[self.type_params[types, _P_HAS_WORKTIME] == 0] = _EFF_FULL
+        np.subtract.at(self.eff_counts, (types, self.eff_class[idx]), 1)
+        np.add.at(self.eff_counts, (types, eff), 1)
+        self.eff_class[idx] = eff
+        self.exhausted_count += int(np.count_nonzero(exhausted)) - int(np.count_nonzero(self.exhausted[idx]))
+        self.exhausted[idx] = exhausted
+
+    def efficiency_sum(self, type_code: Optional[int] = None) -> float:
+        """Summe der Effizienzen (aller Worker oder eines Typs), O(Anzahl Typen)."""
+        counts = self.eff_counts if type_code is None else self.eff_counts[type_code:type_code + 1]
+        malus = self.type_params[:, _P_MALUS] if type_code is None else self.type_params[type_code:type_code + 1, _P_MALUS]
+        return float(counts[:, _EFF_FULL].sum() + (counts[:, _EFF_EXHAUSTED] * malus).sum())
+
+    def worktime_sum(self) -> float:
+        """Summe der WorkTime aller Worker mit WorkTime-System (gecacht bis zur nächsten Änderung)."""
+        if self._worktime_sum is None:
+            n = self.n
+            has_worktime = self.type_params[self.type_code[:n], _P_HAS_WORKTIME] > 0
+            self._worktime_sum = float(self.work_time[:n][has_worktime].sum())
+        return self._worktime_sum
+
+    # ==================== SIMULATION ====================
+
+    def tick(self, dt: float, farms, residences, motivation_mod: float = 1.0):
         """
-        Simuliert einen Zeitschritt.
+        Simuliert einen Zeitschritt für alle Worker.
 
         Args:
             dt: Delta-Zeit in Sekunden
-            farms: Liste aller Farms
-            residences: Liste aller Wohnhäuser
-            camps: Liste aller Camps
+            farms: BreakSiteIndex (oder Liste) aller Farms
+            residences: BreakSiteIndex (oder Liste) aller Wohnhäuser
             motivation_mod: Motivation-Modifier für Regeneration (1.0 = normal)
         """
-        if not self.has_worktime_system:
-            # Serfs arbeiten ENDLOS ohne Pausen!
-            self.state = WorkerState.WORKING
+        n = self.n
+        if n == 0:
             return
+        plan, self._plan = self._plan, None
+        state = self.state[:n].copy()  # Zustände zu Beginn des Ticks
+        params = self.type_params[self.type_code[:n]]
+        has_worktime = params[:, _P_HAS_WORKTIME] > 0
+        dt_ms = dt * 1000
+
+        # Serfs arbeiten ENDLOS ohne Pausen!
+        serfs = np.flatnonzero(~has_worktime)
+        self._set_states(serfs, _WORKING)
+
+        # Idle Worker starten Arbeit
+        idle = np.flatnonzero(has_worktime & (state == _IDLE))
+        self._set_states(idle, _WORKING)
+        self.state_timer[idle] = 0.0
+
+        # Timer laufen in Arbeits-, Ess-, Ruhe- und Camp-Phase
+        timed = np.flatnonzero(has_worktime & _TIMED_STATE[state])
+        self.state_timer[timed] += dt_ms
+        timer = self.state_timer
+
+        # Arbeiten: WorkTime sinkt kontinuierlich; Hunger nach einem Zyklus oder bei WorkTime <= 20
+        working = timed[state[timed] == _WORKING]
+        wait = params[working, _P_WAIT]
+        self.work_time[working] += params[working, _P_CHANGE_WORK] * (dt_ms / wait)
+        hungry = working[(timer[working] >= wait) | (self.work_time[working] <= 20)]
+
+        # Essen/Ruhen/Campen fertig: WorkTime regenerieren (Anteil von Max - Aktuell) × Motivation
+        eating = timed[state[timed] == _EATING]
+        ate = eating[timer[eating] >= params[eating, _P_EAT]]
+        resting = timed[state[timed] == _RESTING]
+        rested = resting[timer[resting] >= params[resting, _P_REST]]
+        camping = timed[state[timed] == _CAMPING]
+        camped = camping[timer[camping] >= params[camping, _P_EAT] + params[camping, _P_REST]]
+        for done, change, max_col in ((ate, _P_CHANGE_FARM, _P_MAX_FARM),
+                                      (rested, _P_CHANGE_RESIDENCE, _P_MAX_RESIDENCE),
+                                      (camped, _P_CHANGE_CAMP, _P_MAX_FARM)):
+            regen_rate = params[done, change] * motivation_mod
+            self.work_time[done] += regen_rate * (params[done, max_col] - self.work_time[done])
+
+        # Zurück zur Arbeit (nach Ruhen/Campen)
+        back_to_work = np.concatenate([rested, camped])
+        self._send(back_to_work, _WALK_WORK, self.work_x[back_to_work], self.work_y[back_to_work])
+
+        # Farm-/Wohnhaus-Belegung in Worker-Reihenfolge vergeben
+        events = np.concatenate([hungry, ate, rested])
+        if len(events):
+            self._assign_breaks(hungry, ate, rested, farms, residences)
+        self.state_timer[events] = 0.0
+        self.state_timer[camped] = 0.0
+
+        # Laufen (Position rückt um speed*dt Richtung Ziel)
+        walking = np.flatnonzero(has_worktime & _WALKING_STATE[state])
+        no_target = walking[~self.has_target[walking]]
+        self._set_states(no_target, _ARRIVAL_STATE[state[no_target]])
+        walking = walking[self.has_target[walking]]
+
+        dx = self.pos_x[walking] - self.target_x[walking]
+        dy = self.pos_y[walking] - self.target_y[walking]
+        distance = np.sqrt(dx * dx + dy * dy)
+        walk_distance = self.speed[walking] * dt
+        arrived = walk_distance >= distance
+
+        done = walking[arrived]
+        self.pos_x[done] = self.target_x[done]
+        self.pos_y[done] = self.target_y[done]
+        self.has_target[done] = False
+        self._set_states(done, _ARRIVAL_STATE[state[done]])
+        self.state_timer[done] = 0.0
+
+        moving = walking[~arrived]
+        ratio = walk_distance[~arrived] / distance[~arrived]
+        self.pos_x[moving] += ratio * (self.target_x[moving] - self.pos_x[moving])
+        self.pos_y[moving] += ratio * (self.target_y[moving] - self.pos_y[moving])
+
+        self._refresh(np.concatenate([serfs, idle, working, ate, rested, camped, no_target, done]))
+
+        # Gültiger Plan -> in diesem Tick kein Übergang, er gilt eine Sekunde kürzer weiter
+        if dt == 1 and plan is not None and plan[0] > 1:
+            self._plan = (plan[0] - 1,) + plan[1:]
+
+    def _send(self, idx: np.ndarray, code: int, target_x, target_y):
+        """Schickt Worker idx mit Lauf-Zustand code zu einem Ziel."""
+        self.target_x[idx] = target_x
+        self.target_y[idx] = target_y
+        self.has_target[idx] = True
+        self._set_states(idx, code)
+
+    def _assign_breaks(self, hungry: np.ndarray, ate: np.ndarray, rested: np.ndarray,
+                       farms, residences):
+        """
+        Vergibt Farms (Hungrige) und Wohnhäuser (fertig Gegessene) im Batch.
+
+        Die Distanzen aller Suchenden zu den Kandidaten im Umkreis werden
+        einmal als Matrix berechnet und pro Zeile sortiert. Die Belegung
+        wird danach in Worker-Reihenfolge vergeben (inkl. Freigaben durch
+        fertig Gegessene/Geruhte), jeder Worker nimmt das erste Gebäude
+        seiner Rangfolge mit freiem Platz: gleiche Wahl wie die lineare
+        Suche, ohne pro Worker alle Gebäude zu durchlaufen.
+        """
+        if not isinstance(farms, BreakSiteIndex):
+            farms = BreakSiteIndex.from_buildings(farms)
+        if not isinstance(residences, BreakSiteIndex):
+            residences = BreakSiteIndex.from_buildings(residences)
+        farm_table = self._break_table(hungry, farms, releasing=len(ate) > 0)
+        residence_table = self._break_table(ate, residences, releasing=len(rested) > 0)
+
+        events = np.concatenate([hungry, ate, rested])
+        kinds = np.repeat((0, 1, 2), (len(hungry), len(ate), len(rested)))
+        rows = np.concatenate([np.arange(len(hungry)), np.arange(len(ate)), np.arange(len(rested))])
+        order = np.argsort(events, kind="stable")
+        for slot, kind, row in zip(events[order].tolist(), kinds[order].tolist(), rows[order].tolist()):
+            if kind == 0:
+                farm = self._pick_site(farm_table, row)
+                if farm:
+                    self._send_one(slot, _WALK_FARM, farm.position.x, farm.position.y)
+                    self.assigned_farm[slot] = farm
+                    farms.occupy(farm)
+                else:
+                    # Kein Platz: Camp (vereinfacht: Camp ist am Arbeitsplatz)
+                    self._send_one(slot, _WALK_CAMP, self.work_x[slot], self.work_y[slot])
+            elif kind == 1:
+                farm = self.assigned_farm[slot]
+                if farm:
+                    farms.release(farm)
+                    self.assigned_farm[slot] = None
+                residence = self._pick_site(residence_table, row)
+                if residence:
+                    self._send_one(slot, _WALK_RESIDENCE, residence.position.x, residence.position.y)
+                    self.assigned_residence[slot] = residence
+                    residences.occupy(residence)
+                else:
+                    # Kein Wohnhaus: direkt zurück zur Arbeit
+                    self._send_one(slot, _WALK_WORK, self.work_x[slot], self.work_y[slot])
+            else:
+                residence = self.assigned_residence[slot]
+                if residence:
+                    residences.release(residence)
+                    self.assigned_residence[slot] = None
+
+    def _break_table(self, seekers: np.ndarray, index: BreakSiteIndex, releasing: bool):
+        """
+        Kandidaten, Distanzen und Rangfolge für alle Suchenden eines Ticks.
 
-        if self.state == WorkerState.WORKING:
-            self._tick_working(dt, farms)
+        Distanzen >= Worker-spezifische CamperRange sind inf. Volle Gebäude
+        sind nur Kandidaten wenn im selben Tick Plätze frei werden können.
 
-        elif self.state == WorkerState.WALKING_TO_FARM:
-            self._tick_walking(dt, WorkerState.EATING)
+        Returns:
+            (sites, dist, order) oder None wenn nichts zu vergeben ist
+        """
+        if len(seekers) == 0 or len(index) == 0 or (index.total_free <= 0 and not releasing):
+            return None
+        x = self.pos_x[seekers]
+        y = self.pos_y[seekers]
+        max_range = self.type_params[self.type_code[seekers], _P_RANGE]
+        reach = float(max_range.max())
+        sites = index.candidates(float(x.min()) - reach, float(y.min()) - reach,
+                                 float(x.max()) + reach, float(y.max()) + reach, include_full=releasing)
+        if not sites:
+            return None
+        dx = x[:, None] - np.array([site.position.x for site in sites])
+        dy = y[:, None] - np.array([site.position.y for site in sites])
+        dist = np.sqrt(dx * dx + dy * dy)
+        dist[dist >= max_range[:, None]] = np.inf
+        # stabil: bei gleicher Distanz gewinnt das zuerst eingefügte Gebäude
+        return sites, dist, np.argsort(dist, axis=1, kind="stable")
+
+    @staticmethod
+    def _pick_site(table, row: int):
+        """Erstes Gebäude der Rangfolge mit freiem Platz (None wenn keins in Reichweite)."""
+        if table is None:
+            return None
+        sites, dist, order = table
+        for col in order[row]:
+            if dist[row, col] == np.inf:
+                return None
+            if sites[col].has_space():
+                return sites[col]
+        return None
+
+    def _send_one(self, slot: int, code: int, target_x: float, target_y: float):
+        self.target_x[slot] = target_x
+        self.target_y[slot] = target_y
+        self.has_target[slot] = True
+        self._set_state(slot, code)
+
+    # ==================== EREIGNIS-PLANUNG ("event"-Modus) ====================
+
+    def quiet_ticks(self) -> float:
+        """
+        Anzahl folgender 1-Sekunden-Ticks ohne Zustandsübergang (inf wenn keiner ansteht).
+
+        Übergänge sind: Idle startet, Hunger (Timer >= WorkWaitUntil oder
+        WorkTime <= 20), Essen/Ruhen/Campen fertig, Ankunft am Ziel. Der
+        Plan wird einmal berechnet und gilt bis zur nächsten Änderung von
+        außen (Views, _add, Zustandswechsel) oder dem nächsten tick().
+        Timer sind ganzzahlig (ms) und exakt; WorkTime und Laufwege sind
+        Gleitkomma-Ketten (siehe EVENT_MARGIN).
+        """
+        if self._plan is None:
+            self._plan = self._make_plan()
+        return self._plan[0] - 1
+
+    def _make_plan(self) -> Tuple:
+        """(Tick des nächsten Übergangs, Timer-Zeilen, arbeitende Zeilen, WorkTime-Änderung, Läufer)."""
+        n = self.n
+        state = self.state[:n]
+        params = self.type_params[self.type_code[:n]]
+        has_worktime = params[:, _P_HAS_WORKTIME] > 0
+        timed = np.flatnonzero(has_worktime & _TIMED_STATE[state])
+        working = timed[state[timed] == _WORKING]
+        inc = params[working, _P_CHANGE_WORK] * (1000 / params[working, _P_WAIT])
+        walking = np.flatnonzero(has_worktime & _WALKING_STATE[state])
+        plan = (1, timed, working, inc, walking)
+
+        timer = self.state_timer[timed]
+        # Sofort fällig: Idle startet, Serf-Worker nicht WORKING, Laufen ohne Ziel, Timer mit Bruchteil
+        if (np.count_nonzero(np.where(has_worktime, state == _IDLE, state != _WORKING))
+                or np.count_nonzero(~self.has_target[walking]) or np.count_nonzero(timer % 1)):
+            return plan
+
+        # Timer: Übergang im ersten Tick mit timer + 1000*j >= Schwelle
+        timed_state = state[timed]
+        threshold = np.where(timed_state == _WORKING, params[timed, _P_WAIT],
+                             np.where(timed_state == _EATING, params[timed, _P_EAT],
+                                      np.where(timed_state == _RESTING, params[timed, _P_REST],
+                                               params[timed, _P_EAT] + params[timed, _P_REST])))
+        steps = [(threshold - timer) / 1000]
+        # WorkTime sinkt um inc pro Tick bis <= 20
+        falling = inc < 0
+        steps.append((self.work_time[working[falling]] - 20) / -inc[falling])
+        # Laufen: Ankunft sobald speed >= Restdistanz
+        steps.append(walk_steps(self.pos_x[walking] - self.target_x[walking],
+                                self.pos_y[walking] - self.target_y[walking], self.speed[walking]))
+        steps = np.concatenate(steps)
+        return (first_tick_reaching(steps),) + plan[1:]
+
+    def advance_quiet(self, ticks: int):
+        """
+        Schreibt `ticks` übergangsfreie Sekunden fort (ticks <= quiet_ticks()).
 
-        elif self.state == WorkerState.EATING:
-            self._tick_eating(dt, residences, motivation_mod)
+        Gleiches Ergebnis wie `ticks` Aufrufe von tick(1): Timer in einem
+        Schritt, WorkTime und Positionen mit denselben Operationen pro
+        Sekunde (ohne Übergangs-Prüfungen und Zähler-Pflege).
+        """
+        if self._plan is None:
+            self._plan = self._make_plan()
+        first, timed, working, inc, walking = self._plan
+        self.state_timer[timed] += 1000 * ticks
+        if len(working):
+            work_time = self.work_time[working]
+            for _ in range(ticks):
+                work_time += inc
+            self.work_time[working] = work_time
+            self._worktime_sum = None
+        if len(walking):
+            x, y = self.pos_x[walking], self.pos_y[walking]
+            target_x, target_y = self.target_x[walking], self.target_y[walking]
+            speed = self.speed[walking]
+            for _ in range(ticks):
+                dx = x - target_x
+                dy = y - target_y
+                ratio = speed / np.sqrt(dx * dx + dy * dy)
+                x += ratio * (target_x - x)
+                y += ratio * (target_y - y)
+            self.pos_x[walking] = x
+            self.pos_y[walking] = y
+        self._plan = (first - ticks, timed, working, inc, walking)
 
-        elif self.state == WorkerState.WALKING_TO_RESIDENCE:
-            self._tick_walking(dt, WorkerState.RESTING)
 
-        elif self.state == WorkerState.RESTING:
-            self._tick_resting(dt, motivation_mod)
+class Worker:
+    """
+    Simuliert einen einzelnen Arbeiter mit WorkTime und Pausen-Laufwegen.
 
-        elif self.state == WorkerState.WALKING_TO_CAMP:
-            self._tick_walking(dt, WorkerState.CAMPING)
+    View auf eine Zeile eines WorkerPool; alle Attribute lesen und schreiben
+    die Pool-Arrays. Eigenständig erzeugte Worker haben einen eigenen Pool.
 
-        elif self.state == WorkerState.CAMPING:
-            self._tick_camping(dt, motivation_mod)
+    WICHTIG: Serfs haben KEIN WorkTime-System und werden separat behandelt!
+    """
+    __slots__ = ("_pool", "_slot")
+
+    def __init__(self, worker_type: str, position: Position, workplace_position: Position,
+                 work_time: float = WORK_TIME_START, state: WorkerState = WorkerState.IDLE,
+                 state_timer: float = 0.0,  # in Millisekunden
+                 target_position: Optional[Position] = None,
+                 assigned_farm: Optional[Farm] = None,
+                 assigned_residence: Optional[Residence] = None):
+        pool = WorkerPool(capacity=1)
+        self._pool = pool
+        self._slot = pool._add(worker_type, position, workplace_position, work_time, state,
+                               state_timer, target_position, assigned_farm, assigned_residence)
+        pool._views.append(self)
+
+    def _fields(self) -> Dict:
+        """Alle Felder als Keyword-Argumente für WorkerPool._add()."""
+        return {
+            "worker_type": self.worker_type, "position": self.position,
+            "workplace_position": self.workplace_position, "work_time": self.work_time,
+            "state": self.state, "state_timer": self.state_timer,
+            "target_position": self.target_position, "assigned_farm": self.assigned_farm,
+            "assigned_residence": self.assigned_residence,
+        }
 
-        elif self.state == WorkerState.WALKING_TO_WORK:
-            self._tick_walking(dt, WorkerState.WORKING)
+    def __repr__(self) -> str:
+        return f"Worker({self.worker_type}, state={self.state.value}, work_time={self.work_time:.1f})"
 
-        elif self.state == WorkerState.IDLE:
-            # Idle Worker starten Arbeit
-            self.state = WorkerState.WORKING
-            self.state_timer = 0.0
+    # ==================== FELDER (Pool-Arrays) ====================
 
-    def _tick_working(self, dt: float, farms: List[Farm]):
-        """Arbeits-Phase."""
-        self.state_timer += dt * 1000  # ms
+    @property
+    def worker_type(self) -> str:
+        return self._pool.worker_type[self._slot]
 
-        # WorkTime sinkt kontinuierlich
-        work_progress = (dt * 1000) / self.params.work_wait_until
-        self.work_time += self.params.work_time_change_work * work_progress
+    @property
+    def params(self) -> WorkTimeParams:
+        return WORKER_PARAMS.get(self.worker_type, WorkTimeParams())
 
-        # Hunger-Check: Nach einem Arbeitszyklus oder wenn WorkTime niedrig
-        if self.state_timer >= self.params.work_wait_until or self.work_time <= 20:
-            self._find_farm(farms)
-            self.state_timer = 0.0
+    @property
+    def speed(self) -> float:
+        return float(self._pool.speed[self._slot])
 
-    def _tick_eating(self, dt: float, residences: List[Residence], motivation_mod: float = 1.0):
-        """Essen-Phase."""
-        self.state_timer += dt * 1000  # ms
+    @property
+    def has_worktime_system(self) -> bool:
+        return self.worker_type != "serf"
 
-        if self.state_timer >= self.params.eat_wait:
-            # WorkTime regenerieren: +70% von (Max - Aktuell) × Motivation
-            max_val = self.params.work_time_max_farm
-            regen_rate = self.params.work_time_change_farm * motivation_mod
-            self.work_time += regen_rate * (max_val - self.work_time)
+    @property
+    def position(self) -> Position:
+        return Position(float(self._pool.pos_x[self._slot]), float(self._pool.pos_y[self._slot]))
 
-            # Farm freigeben
-            if self.assigned_farm:
-                self.assigned_farm.current_eaters -= 1
-                self.assigned_farm = None
+    @position.setter
+    def position(self, value: Position):
+        self._pool.pos_x[self._slot] = value.x
+        self._pool.pos_y[self._slot] = value.y
+        self._pool._plan = None
 
-            # Nächstes: Wohnhaus suchen
-            self._find_residence(residences)
-            self.state_timer = 0.0
+    @property
+    def workplace_position(self) -> Position:
+        return Position(float(self._pool.work_x[self._slot]), float(self._pool.work_y[self._slot]))
 
-    def _tick_resting(self, dt: float, motivation_mod: float = 1.0):
-        """Ruhe-Phase."""
-        self.state_timer += dt * 1000  # ms
+    @workplace_position.setter
+    def workplace_position(self, value: Position):
+        self._pool.work_x[self._slot] = value.x
+        self._pool.work_y[self._slot] = value.y
 
-        if self.state_timer >= self.params.rest_wait:
-            # WorkTime regenerieren: +50% von (Max - Aktuell) × Motivation
-            max_val = self.params.work_time_max_residence
-            regen_rate = self.params.work_time_change_residence * motivation_mod
-            self.work_time += regen_rate * (max_val - self.work_time)
+    @property
+    def target_position(self) -> Optional[Position]:
+        pool, slot = self._pool, self._slot
+        if not pool.has_target[slot]:
+            return None
+        return Position(float(pool.target_x[slot]), float(pool.target_y[slot]))
 
-            # Wohnhaus freigeben
-            if self.assigned_residence:
-                self.assigned_residence.current_residents -= 1
-                self.assigned_residence = None
+    @target_position.setter
+    def target_position(self, value: Optional[Position]):
+        self._pool.has_target[self._slot] = value is not None
+        if value is not None:
+            self._pool.target_x[self._slot] = value.x
+            self._pool.target_y[self._slot] = value.y
+        self._pool._plan = None
 
-            # Zurück zur Arbeit
-            self._return_to_work()
-            self.state_timer = 0.0
+    @property
+    def work_time(self) -> float:
+        return float(self._pool.work_time[self._slot])
 
-    def _tick_camping(self, dt: float, motivation_mod: float = 1.0):
-        """Camping-Phase (Notfall - nur +10% Regeneration)."""
-        self.state_timer += dt * 1000  # ms
+    @work_time.setter
+    def work_time(self, value: float):
+        self._pool.work_time[self._slot] = value
+        self._pool._refresh(np.array([self._slot]))
+        self._pool._plan = None
 
-        # Camping dauert so lange wie Essen + Ruhen zusammen
-        camp_duration = self.params.eat_wait + self.params.rest_wait
+    @property
+    def state(self) -> WorkerState:
+        return WORKER_STATES[self._pool.state[self._slot]]
 
-        if self.state_timer >= camp_duration:
-            # Nur +10% Regeneration × Motivation
-            max_val = self.params.work_time_max_farm
-            regen_rate = self.params.work_time_change_camp * motivation_mod
-            self.work_time += regen_rate * (max_val - self.work_time)
+    @state.setter
+    def state(self, value: WorkerState):
+        self._pool._set_state(self._slot, _WORKER_STATE_CODE[value])
+        self._pool._refresh(np.array([self._slot]))
 
-            # Zurück zur Arbeit
-            self._return_to_work()
-            self.state_timer = 0.0
+    @property
+    def state_timer(self) -> float:
+        return float(self._pool.state_timer[self._slot])
 
-    def _tick_walking(self, dt: float, next_state: WorkerState):
-        """Lauf-Phase."""
-        if self.target_position is None:
-            self.state = next_state
-            return
+    @state_timer.setter
+    def state_timer(self, value: float):
+        self._pool.state_timer[self._slot] = value
+        self._pool._plan = None
 
-        distance = self.position.distance_to(self.target_position)
-        walk_distance = self.speed * dt
-
-        if walk_distance >= distance:
-            # Angekommen
-            self.position = Position(self.target_position.x, self.target_position.y)
-            self.target_position = None
-            self.state = next_state
-            self.state_timer = 0.0
-        else:
-            # Noch unterwegs - Position updaten
-            ratio = walk_distance / distance
-            self.position.x += ratio * (self.target_position.x - self.position.x)
-            self.position.y += ratio * (self.target_position.y - self.position.y)
-
-    def _get_camper_range(self) -> int:
-        """Gibt die Worker-spezifische CamperRange zurück."""
-        return WORKER_CAMPER_RANGE.get(self.worker_type, CAMPER_RANGE)
-
-    def _find_farm(self, farms: List[Farm]):
-        """Findet nächsten Bauernhof in Worker-spezifischer CAMPER_RANGE."""
-        nearest = None
-        camper_range = self._get_camper_range()
-        min_dist = camper_range
+    @property
+    def assigned_farm(self) -> Optional[Farm]:
+        return self._pool.assigned_farm[self._slot]
 
-        for farm in farms:
-            if farm.has_space():
-                dist = self.position.distance_to(farm.position)
-                if dist < min_dist:
-                    nearest = farm
-                    min_dist = dist
+    @assigned_farm.setter
+    def assigned_farm(self, value: Optional[Farm]):
+        self._pool.assigned_farm[self._slot] = value
 
-        if nearest:
-            self.target_position = nearest.position
-            self.state = WorkerState.WALKING_TO_FARM
-            self.assigned_farm = nearest
-            nearest.current_eaters += 1
-        else:
-            # Kein Bauernhof in Reichweite -> Camp suchen
-            self._go_to_camp()
-
-    def _find_residence(self, residences: List[Residence]):
-        """Findet nächstes Wohnhaus in Worker-spezifischer CAMPER_RANGE."""
-        nearest = None
-        camper_range = self._get_camper_range()
-        min_dist = camper_range
+    @property
+    def assigned_residence(self) -> Optional[Residence]:
+        return self._pool.assigned_residence[self._slot]
 
-        for residence in residences:
-            if residence.has_space():
-                dist = self.position.distance_to(residence.position)
-                if dist < min_dist:
-                    nearest = residence
-                    min_dist = dist
+    @assigned_residence.setter
+    def assigned_residence(self, value: Optional[Residence]):
+        self._pool.assigned_residence[self._slot] = value
 
-        if nearest:
-            self.target_position = nearest.position
-            self.state = WorkerState.WALKING_TO_RESIDENCE
-            self.assigned_residence = nearest
-            nearest.current_residents += 1
-        else:
-            # Kein Wohnhaus in Reichweite -> Direkt zur Arbeit
-            self._return_to_work()
-
-    def _go_to_camp(self):
-        """Geht zum Camp (Notfall-Pause mit nur +10%)."""
-        # Vereinfacht: Camp ist am Arbeitsplatz
-        self.target_position = self.workplace_position
-        self.state = WorkerState.WALKING_TO_CAMP
-
-    def _return_to_work(self):
-        """Kehrt zum Arbeitsplatz zurück."""
-        self.target_position = self.workplace_position
-        self.state = WorkerState.WALKING_TO_WORK
+    # ==================== ABFRAGEN ====================
 
     def get_efficiency(self) -> float:
         """
@@ -452,20 +1018,14 @@ class Worker:
         Returns:
             0.0 - 1.0 (1.0 = volle Effizienz)
         """
-        if not self.has_worktime_system:
-            # Serfs haben immer 100% Effizienz (arbeiten endlos)
+        eff_class = self._pool.eff_class[self._slot]
+        if eff_class == _EFF_FULL:
             return 1.0
-
-        if self.state != WorkerState.WORKING:
-            # Nicht arbeitend = keine Produktion
-            return 0.0
-
-        if self.work_time <= EXHAUSTED_THRESHOLD:
-            # Erschöpft = nur 10% Effizienz
-            return self.params.exhausted_malus
-
-        # Volle Effizienz
-        return 1.0
+        if eff_class == _EFF_EXHAUSTED:
+            # Erschöpft = nur exhausted_malus
+            return float(self._pool.type_params[self._pool.type_code[self._slot], _P_MALUS])
+        # Nicht arbeitend = keine Produktion
+        return 0.0
 
     def is_working(self) -> bool:
         """Prüft ob Worker gerade arbeitet."""
@@ -473,7 +1033,7 @@ class Worker:
 
     def is_exhausted(self) -> bool:
         """Prüft ob Worker erschöpft ist."""
-        return self.work_time <= EXHAUSTED_THRESHOLD
+        return bool(self._pool.exhausted[self._slot])
 
 
 @dataclass
@@ -482,12 +1042,13 @@ class WorkforceManager:
     Verwaltet alle Arbeiter mit Kapazitäten und Laufwegen.
 
     Trackt:
-    - Alle Worker mit WorkTime-Status
+    - Alle Worker mit WorkTime-Status (als WorkerPool)
     - Alle Farms mit Essen-Kapazität
     - Alle Wohnhäuser mit Wohn-Kapazität
-    - Gesamt-Effizienz der Belegschaft
+    - Räumlicher Index über Farms/Wohnhäuser mit freien Plätzen
+    - Gesamt-Effizienz der Belegschaft (inkrementelle Zähler, O(1))
     """
-    workers: List[Worker] = field(default_factory=list)
+    workers: WorkerPool = field(default_factory=WorkerPool)
     farms: List[Farm] = field(default_factory=list)
     residences: List[Residence] = field(default_factory=list)
     camps: List[Camp] = field(default_factory=list)
@@ -495,6 +1056,18 @@ class WorkforceManager:
     max_workers_from_village: int = 0
     # NEU: Motivation-Modifier beeinflusst WorkTime-Regeneration
     motivation_modifier: float = 1.0
+    # Kapazitäts-Summen, mitgeführt von add/remove/set_*_level
+    farm_capacity: int = 0
+    residence_capacity: int = 0
+    # Pausen-Gebäude mit Frei-Platz-Zählern (Farms/Wohnhäuser nur über add/remove ändern)
+    farm_index: BreakSiteIndex = field(init=False, repr=False)
+    residence_index: BreakSiteIndex = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.farm_capacity = sum(f.eat_capacity for f in self.farms)
+        self.residence_capacity = sum(r.live_capacity for r in self.residences)
+        self.farm_index = BreakSiteIndex.from_buildings(self.farms)
+        self.residence_index = BreakSiteIndex.from_buildings(self.residences)
 
     def set_motivation_modifier(self, motivation: float):
         """Setzt den globalen Motivation-Modifier für alle Worker.
@@ -505,9 +1078,15 @@ class WorkforceManager:
 
     def tick(self, dt: float):
         """Simuliert alle Worker für einen Zeitschritt."""
-        for worker in self.workers:
-            worker.tick(dt, self.farms, self.residences, self.camps,
-                       motivation_mod=self.motivation_modifier)
+        self.workers.tick(dt, self.farm_index, self.residence_index, motivation_mod=self.motivation_modifier)
+
+    def quiet_ticks(self) -> float:
+        """Sekunden-Ticks bis vor den nächsten Worker-Übergang (siehe WorkerPool.quiet_ticks)."""
+        return self.workers.quiet_ticks()
+
+    def advance_quiet(self, ticks: int):
+        """Schreibt `ticks` übergangsfreie Sekunden fort (Farms/Wohnhäuser unverändert)."""
+        self.workers.advance_quiet(ticks)
 
     def set_village_capacity(self, capacity: int):
         """Setzt die maximale Worker-Kapazität basierend auf Dorfzentren."""
@@ -522,33 +1101,55 @@ class WorkforceManager:
         """
         if not self.can_add_worker():
             return None
-
-        worker = Worker(
-            worker_type=worker_type,
-            position=position,
-            workplace_position=workplace,
-        )
-        self.workers.append(worker)
-        return worker
+        return self.workers.add(worker_type, position, workplace)
 
     def can_add_worker(self) -> bool:
         """Prüft ob Dorfzentrum-Kapazität für einen weiteren Worker verfügbar ist.
         Wohnhäuser begrenzen NICHT die Bevölkerung - nur Dorfzentren!"""
-        current_workers = len([w for w in self.workers if w.worker_type != "serf"])
-        return current_workers < self.max_workers_from_village
+        return self.get_current_workers() < self.max_workers_from_village
 
     def add_farm(self, position: Position, level: int = 1) -> Farm:
         """Fügt einen Bauernhof hinzu."""
         farm = Farm(position=position, level=level)
         self.farms.append(farm)
+        self.farm_capacity += farm.eat_capacity
+        self.farm_index.add(farm)
         return farm
 
+    def remove_farm(self, farm: Farm):
+        """Entfernt einen Bauernhof (zugewiesene Worker essen noch fertig)."""
+        self.farms.pop(next(i for i, f in enumerate(self.farms) if f is farm))
+        self.farm_capacity -= farm.eat_capacity
+        self.farm_index.remove(farm)
+
+    def set_farm_level(self, farm: Farm, level: int):
+        """Upgrade eines Bauernhofs; aktuelle Esser bleiben erhalten."""
+        self.farm_capacity -= farm.eat_capacity
+        farm.level = level
+        self.farm_capacity += farm.eat_capacity
+        self.farm_index.update(farm)
+
     def add_residence(self, position: Position, level: int = 1) -> Residence:
         """Fügt ein Wohnhaus hinzu."""
         residence = Residence(position=position, level=level)
         self.residences.append(residence)
+        self.residence_capacity += residence.live_capacity
+        self.residence_index.add(residence)
         return residence
 
+    def remove_residence(self, residence: Residence):
+        """Entfernt ein Wohnhaus (zugewiesene Worker ruhen noch fertig)."""
+        self.residences.pop(next(i for i, r in enumerate(self.residences) if r is residence))
+        self.residence_capacity -= residence.live_capacity
+        self.residence_index.remove(residence)
+
+    def set_residence_level(self, residence: Residence, level: int):
+        """Upgrade eines Wohnhauses; aktuelle Bewohner bleiben erhalten."""
+        self.residence_capacity -= residence.live_capacity
+        residence.level = level
+        self.residence_capacity += residence.live_capacity
+        self.residence_index.update(residence)
+
     def add_camp(self, position: Position) -> Camp:
         """Fügt ein Camp hinzu."""
         camp = Camp(position=position)
@@ -559,43 +1160,49 @@ class WorkforceManager:
 
     def get_total_residence_capacity(self) -> int:
         """Gesamt-Wohnkapazität."""
-        return sum(r.live_capacity for r in self.residences)
+        return self.residence_capacity
 
     def get_total_farm_capacity(self) -> int:
         """Gesamt-Essen-Kapazität."""
-        return sum(f.eat_capacity for f in self.farms)
+        return self.farm_capacity
 
     def get_current_workers(self) -> int:
         """Anzahl aktuelle Worker (ohne Serfs)."""
-        return len([w for w in self.workers if w.worker_type != "serf"])
+        return self.workers.worktime_workers
 
     def get_working_workers(self) -> int:
         """Anzahl arbeitender Worker."""
-        return len([w for w in self.workers if w.is_working()])
+        return int(self.workers.state_counts[_WORKING])
 
     def get_exhausted_workers(self) -> int:
         """Anzahl erschöpfter Worker."""
-        return len([w for w in self.workers if w.is_exhausted()])
+        return self.workers.exhausted_count
 
     def get_average_efficiency(self) -> float:
         """Durchschnittliche Effizienz aller Worker."""
         if not self.workers:
             return 1.0
-        return sum(w.get_efficiency() for w in self.workers) / len(self.workers)
+        return self.workers.efficiency_sum() / len(self.workers)
+
+    def get_type_efficiency(self, worker_type: str) -> Optional[float]:
+        """Durchschnittliche Effizienz eines Worker-Typs (None wenn keiner existiert)."""
+        if worker_type not in self.workers.types:
+            return None
+        code = self.workers.types.index(worker_type)
+        count = int(self.workers.eff_counts[code].sum())
+        if count == 0:
+            return None
+        return self.workers.efficiency_sum(code) / count
 
     def get_average_worktime(self) -> float:
         """Durchschnittliche WorkTime aller Worker."""
-        worktime_workers = [w for w in self.workers if w.has_worktime_system]
-        if not worktime_workers:
+        if self.workers.worktime_workers == 0:
             return 100.0
-        return sum(w.work_time for w in worktime_workers) / len(worktime_workers)
+        return self.workers.worktime_sum() / self.workers.worktime_workers
 
     def get_workers_by_state(self) -> Dict[WorkerState, int]:
         """Anzahl Worker pro Zustand."""
-        counts = {state: 0 for state in WorkerState}
-        for worker in self.workers:
-            counts[worker.state] += 1
-        return counts
+        return {state: int(count) for state, count in zip(WORKER_STATES, self.workers.state_counts)}
 
     def get_residence_utilization(self) -> float:
         """Auslastung der Wohnhäuser (0.0 - 1.0)."""
@@ -609,8 +1216,7 @@ class WorkforceManager:
         capacity = self.get_total_farm_capacity()
         if capacity == 0:
             return 1.0
-        eating = len([w for w in self.workers if w.state == WorkerState.EATING])
-        return eating / capacity
+        return int(self.workers.state_counts[_EATING]) / capacity
 
     def get_exhausted_ratio(self) -> float:
         """Anteil der erschöpften Worker (0.0 - 1.0)."""
@@ -620,21 +1226,14 @@ class WorkforceManager:
 
     def get_stats(self) -> Dict[str, float]:
         """Gibt alle wichtigen Statistiken zurück."""
-        # Zähle Worker nach Zustand
-        eating_workers = len([w for w in self.workers if w.state == WorkerState.EATING])
-        resting_workers = len([w for w in self.workers if w.state == WorkerState.RESTING])
-        walking_workers = len([w for w in self.workers if w.state in [
-            WorkerState.WALKING_TO_FARM, WorkerState.WALKING_TO_RESIDENCE, WorkerState.WALKING_TO_CAMP
-        ]])
-        camping_workers = len([w for w in self.workers if w.state == WorkerState.CAMPING])
-
+        counts = self.workers.state_counts
         return {
             "total_workers": len(self.workers),
             "working_workers": self.get_working_workers(),
-            "eating_workers": eating_workers,
-            "resting_workers": resting_workers,
-            "walking_workers": walking_workers,
-            "camping_workers": camping_workers,
+            "eating_workers": int(counts[_EATING]),
+            "resting_workers": int(counts[_RESTING]),
+            "walking_workers": int(counts[_WALK_FARM] + counts[_WALK_RESIDENCE] + counts[_WALK_CAMP]),
+            "camping_workers": int(counts[_CAMPING]),
             "exhausted_workers": self.get_exhausted_workers(),
             "exhausted_ratio": self.get_exhausted_ratio(),
             "average_efficiency": self.get_average_efficiency(),